@@ -125,11 +125,22 @@ const ChatMessage: React.FC<ChatMessageProps> = ({
             </div>
           </button>
         ))}
-        {message.debug_info && (
+        {message.debug_info &&
+          (message.debug_info.original_query || message.debug_info.cache?.hit) && (
           <div className="col-span-full mt-2 p-3 bg-secondary-verba rounded-lg text-xs text-text-alt-verba border border-button-verba">
             <div className="font-semibold mb-2 text-text-verba">🔍 Debug Info</div>
             <div className="space-y-1">
-              <div><strong>Query original:</strong> {message.debug_info.original_query}</div>
+              {message.debug_info.original_query && (
+                <div><strong>Query original:</strong> {message.debug_info.original_query}</div>
+              )}
+              {message.debug_info.cache?.hit && (
+                <div>
+                  <strong>Cache:</strong> {message.debug_info.cache.hit}
+                  {message.debug_info.cache.similarity !== undefined &&
+                    ` (${message.debug_info.cache.similarity})`}
+                  {` — ${message.debug_info.cache.saved_ms ?? 0} ms economizados`}
+                </div>
+              )}
               {message.debug_info.rewritten_query && (
                 <div><strong>Query reescrita:</strong> {message.debug_info.rewritten_query}</div>
               )}
@@ -79,6 +79,13 @@ export type DebugInfo = {
   search_mode?: string;
   explanation?: string;
   intent?: string;
+  cache?: {
+    hit: "exact" | "semantic" | null;
+    latency_ms: number;
+    saved_ms?: number;
+    similarity?: number;
+    generation: number;
+  };
 };
 
 export type QueryPayload = {
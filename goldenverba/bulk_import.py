@@ -0,0 +1,390 @@
+"""
+Pipelined bulk import.
+
+`VerbaManager.import_document` runs read -> chunk -> embed -> ingest strictly
+in sequence for one file, and the websocket import serializes files. The
+`BulkImportPipeline` connects the same stages (the `VerbaManager` stage
+methods) with bounded asyncio queues and a configurable number of workers
+per stage, so the embedding of file N overlaps the parsing and chunking of
+file N+1 and Weaviate ingestion of file N-1.
+
+The Chunker (spaCy parsing, sentence splitting) is CPU-bound and blocks the
+event loop; with `chunk_processes > 0` it runs in a process pool instead.
+
+Environment variables (defaults for the endpoint and the CLI):
+- VERBA_BULK_READ_WORKERS (default: 2)
+- VERBA_BULK_CHUNK_WORKERS (default: 2)
+- VERBA_BULK_EMBED_WORKERS (default: 2)
+- VERBA_BULK_INGEST_WORKERS (default: 2)
+- VERBA_BULK_QUEUE_SIZE: max items waiting between two stages (default: 4)
+- VERBA_BULK_CHUNK_PROCESSES: chunker processes, 0 = in event loop (default: 0)
+"""
+
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Optional
+
+from wasabi import msg
+
+from goldenverba.components.fingerprints import (
+    DocumentUnchanged,
+    SourceUnchanged,
+    get_fingerprint_store,
+    verify_documents,
+)
+from goldenverba.server.helpers import LoggerManager
+from goldenverba.server.types import FileConfig, FileStatus
+
+_STOP = object()
+
+# Managers created lazily inside chunker worker processes
+_worker_chunker_manager = None
+_worker_embedder_manager = None
+
+
+def chunk_in_worker(
+    chunker: str, embedder: str, fileConfig: FileConfig, document
+) -> list:
+    """Runs `ChunkerManager.chunk` for one document inside a worker process."""
+    global _worker_chunker_manager, _worker_embedder_manager
+    if _worker_chunker_manager is None:
+        # Already in a worker process: parse spaCy docs here, not in a nested pool
+        os.environ["VERBA_SPACY_PARSE_PROCESSES"] = "0"
+        from goldenverba.components.managers import ChunkerManager, EmbeddingManager
+
+        _worker_chunker_manager = ChunkerManager()
+        _worker_embedder_manager = EmbeddingManager()
+
+    chunked_documents = asyncio.run(
+        _worker_chunker_manager.chunk(
+            chunker,
+            fileConfig,
+            [document],
+            _worker_embedder_manager.embedders[embedder],
+            LoggerManager(),
+        )
+    )
+    # The parsed spaCy doc is only needed by the Chunker, don't ship it back
+    for chunked_document in chunked_documents:
+        chunked_document.spacy_doc = None
+    return chunked_documents
+
+
+def strip_private_meta(document):
+    """Removes runtime-only meta entries (loggers, sockets) before pickling."""
+    if getattr(document, "meta", None):
+        document.meta = {
+            key: value for key, value in document.meta.items() if not key.startswith("_")
+        }
+    return document
+
+
+class StageMetrics:
+    """Throughput counters for one pipeline stage."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.first_start: Optional[float] = None
+        self.last_end: Optional[float] = None
+
+    def record(self, started: float, ended: float, ok: bool):
+        self.items += 1 if ok else 0
+        self.errors += 0 if ok else 1
+        self.busy_time += ended - started
+        self.first_start = started if self.first_start is None else min(self.first_start, started)
+        self.last_end = ended if self.last_end is None else max(self.last_end, ended)
+
+    def to_dict(self) -> dict:
+        active = (self.last_end - self.first_start) if self.first_start is not None else 0.0
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_time, 3),
+            "active_seconds": round(active, 3),
+            "items_per_second": round(self.items / active, 3) if active > 0 else 0.0,
+            # Share of worker time spent processing (1.0 = stage is the bottleneck)
+            "utilization": round(self.busy_time / (active * self.workers), 3)
+            if active > 0
+            else 0.0,
+        }
+
+
+class _FileState:
+    def __init__(self, fileConfig: FileConfig, started: float):
+        self.fileConfig = fileConfig
+        self.started = started
+        self.pending = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.read_done = False
+        self.error: Optional[str] = None
+
+
+class BulkImportPipeline:
+    """Imports many files through bounded read/chunk/embed/ingest stages."""
+
+    def __init__(
+        self,
+        manager,
+        read_workers: int = 2,
+        chunk_workers: int = 2,
+        embed_workers: int = 2,
+        ingest_workers: int = 2,
+        queue_size: int = 4,
+        chunk_processes: int = 0,
+    ):
+        self.manager = manager
+        self.workers = {
+            "read": max(1, read_workers),
+            "chunk": max(1, chunk_workers),
+            "embed": max(1, embed_workers),
+            "ingest": max(1, ingest_workers),
+        }
+        self.queue_size = max(1, queue_size)
+        self.chunk_processes = max(0, chunk_processes)
+        self.metrics = {
+            stage: StageMetrics(stage, workers) for stage, workers in self.workers.items()
+        }
+        self.files: dict[str, _FileState] = {}
+
+    @classmethod
+    def from_env(cls, manager, **overrides) -> "BulkImportPipeline":
+        settings = {
+            "read_workers": int(os.getenv("VERBA_BULK_READ_WORKERS", "2")),
+            "chunk_workers": int(os.getenv("VERBA_BULK_CHUNK_WORKERS", "2")),
+            "embed_workers": int(os.getenv("VERBA_BULK_EMBED_WORKERS", "2")),
+            "ingest_workers": int(os.getenv("VERBA_BULK_INGEST_WORKERS", "2")),
+            "queue_size": int(os.getenv("VERBA_BULK_QUEUE_SIZE", "4")),
+            "chunk_processes": int(os.getenv("VERBA_BULK_CHUNK_PROCESSES", "0")),
+        }
+        settings.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(manager, **settings)
+
+    async def run(
+        self,
+        client,
+        fileConfigs: list[FileConfig],
+        logger: LoggerManager = LoggerManager(),
+    ) -> dict:
+        """Imports all files and returns per-file results and per-stage metrics."""
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        self.client = client
+        self.logger = logger
+        self.executor = (
+            ProcessPoolExecutor(max_workers=self.chunk_processes)
+            if self.chunk_processes > 0
+            else None
+        )
+
+        read_queue: asyncio.Queue = asyncio.Queue()
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        ingest_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        for fileConfig in fileConfigs:
+            read_queue.put_nowait(fileConfig)
+
+        stages = [
+            ("read", read_queue, chunk_queue, self._read),
+            ("chunk", chunk_queue, embed_queue, self._chunk),
+            ("embed", embed_queue, ingest_queue, self._embed),
+            ("ingest", ingest_queue, None, self._ingest),
+        ]
+        tasks = {
+            name: [
+                asyncio.create_task(self._worker(name, inbox, outbox, handler))
+                for _ in range(self.workers[name])
+            ]
+            for name, inbox, outbox, handler in stages
+        }
+        try:
+            # Stop stages in order: a stage is stopped once every upstream
+            # worker has exited, so all of its input is already queued
+            for name, inbox, _, _ in stages:
+                for _ in tasks[name]:
+                    await inbox.put(_STOP)
+                await asyncio.gather(*tasks[name])
+        finally:
+            for workers in tasks.values():
+                for task in workers:
+                    task.cancel()
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+
+        elapsed = round(loop.time() - start_time, 2)
+        results = {
+            file_id: {
+                "filename": state.fileConfig.filename,
+                "documents": state.succeeded,
+                "failed_documents": state.failed,
+                "error": state.error or "",
+            }
+            for file_id, state in self.files.items()
+        }
+        msg.good(
+            f"[BULK] Imported {sum(1 for r in results.values() if not r['error'])}/{len(fileConfigs)} files in {elapsed}s"
+        )
+        return {
+            "files": results,
+            "took": elapsed,
+            "stages": {name: metrics.to_dict() for name, metrics in self.metrics.items()},
+        }
+
+    async def _worker(self, name: str, inbox: asyncio.Queue, outbox, handler):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await inbox.get()
+            if item is _STOP:
+                return
+            started = loop.time()
+            ok = True
+            try:
+                outputs = await handler(item)
+            except Exception as e:
+                ok = False
+                outputs = []
+                await self._fail(item, name, e)
+            self.metrics[name].record(started, loop.time(), ok)
+            if outbox is not None:
+                for output in outputs:
+                    await outbox.put(output)
+
+    # Stages
+
+    async def _read(self, fileConfig: FileConfig) -> list:
+        loop = asyncio.get_running_loop()
+        state = _FileState(fileConfig, loop.time())
+        self.files[fileConfig.fileID] = state
+        await self.logger.send_report(
+            fileConfig.fileID, FileStatus.STARTING, "Queued for bulk import", took=0
+        )
+
+        duplicate_uuid = await self.manager.weaviate_manager.exist_document_name(
+            self.client, fileConfig.filename
+        )
+        if duplicate_uuid is not None and not fileConfig.overwrite:
+            raise Exception(f"{fileConfig.filename} already exists in Verba")
+        elif duplicate_uuid is not None and fileConfig.isURL:
+            # Files are replaced in prepare_document, after the content check
+            await self.manager.weaviate_manager.delete_document(self.client, duplicate_uuid)
+
+        reader = fileConfig.rag_config["Reader"].selected
+        try:
+            with verify_documents(
+                partial(self.manager.weaviate_manager.existing_document_titles, self.client)
+            ):
+                documents = await self.manager.reader_manager.load(
+                    reader, fileConfig, self.logger
+                )
+        except SourceUnchanged as e:
+            state.read_done = True
+            await self._send(
+                fileConfig.fileID, FileStatus.DONE, str(e), round(loop.time() - state.started, 2)
+            )
+            return []
+        if not documents:
+            raise Exception(f"No documents loaded from {fileConfig.filename}")
+
+        outputs = []
+        for document in documents:
+            currentFileConfig = await self.manager.prepare_file_config(
+                document, fileConfig, self.logger
+            )
+            outputs.append((fileConfig.fileID, currentFileConfig, document))
+        state.pending = len(outputs)
+        state.read_done = True
+        return outputs
+
+    async def _chunk(self, item) -> list:
+        file_id, currentFileConfig, document = item
+        try:
+            document = await self.manager.prepare_document(
+                self.client, document, currentFileConfig
+            )
+        except DocumentUnchanged:
+            await asyncio.to_thread(get_fingerprint_store().remember, document)
+            state = self.files[file_id]
+            state.succeeded += 1
+            state.skipped += 1
+            await self._document_finished(state)
+            return []
+        chunked_documents = await self.manager.chunk_document(
+            document, currentFileConfig, self.logger, executor=self.executor
+        )
+        return [(file_id, currentFileConfig, chunked_documents)]
+
+    async def _embed(self, item) -> list:
+        file_id, currentFileConfig, chunked_documents = item
+        vectorized_documents = await self.manager.embed_documents(
+            chunked_documents, currentFileConfig, self.logger
+        )
+        return [(file_id, currentFileConfig, vectorized_documents)]
+
+    async def _ingest(self, item) -> list:
+        file_id, currentFileConfig, vectorized_documents = item
+        self.client = await self.manager.ingest_documents(
+            self.client, vectorized_documents, currentFileConfig, self.logger
+        )
+        state = self.files[file_id]
+        state.succeeded += 1
+        await self._document_finished(state)
+        return []
+
+    # Bookkeeping
+
+    async def _fail(self, item, stage: str, error: Exception):
+        if isinstance(item, FileConfig):
+            file_id, state = item.fileID, self.files.get(item.fileID)
+        else:
+            file_id, state = item[0], self.files.get(item[0])
+        msg.fail(f"[BULK] {stage} failed for {file_id}: {type(error).__name__}: {str(error)}")
+        if state is None:
+            return
+        if isinstance(item, FileConfig):
+            # The whole file failed before its documents were queued
+            state.error = f"{stage}: {str(error)}"
+            await self._send(
+                file_id, FileStatus.ERROR, f"Import for {item.filename} failed: {str(error)}", 0
+            )
+            return
+        state.failed += 1
+        state.error = state.error or f"{stage}: {str(error)}"
+        await self._document_finished(state)
+
+    async def _document_finished(self, state: _FileState):
+        if not state.read_done or state.succeeded + state.failed < state.pending:
+            return
+        took = round(asyncio.get_running_loop().time() - state.started, 2)
+        fileConfig = state.fileConfig
+        if state.succeeded == 0:
+            await self._send(
+                fileConfig.fileID,
+                FileStatus.ERROR,
+                f"Import for {fileConfig.filename} failed: {state.error}",
+                took,
+            )
+        else:
+            # Partial failures are reported but don't fail the file
+            state.error = None if state.failed == 0 else state.error
+            await self._send(
+                fileConfig.fileID,
+                FileStatus.DONE,
+                f"Import for {fileConfig.filename} completed ({state.succeeded} documents"
+                + (f", {state.skipped} unchanged)" if state.skipped else ")"),
+                took,
+            )
+
+    async def _send(self, file_id: str, status: FileStatus, message: str, took: float):
+        try:
+            await self.logger.send_report(file_id, status, message, took=took)
+        except Exception:
+            pass  # Ignore if WebSocket is closed
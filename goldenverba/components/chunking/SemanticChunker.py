@@ -1,10 +1,5 @@
-import contextlib
-
 from wasabi import msg
 
-with contextlib.suppress(Exception):
-    from sklearn.metrics.pairwise import cosine_similarity
-
 from goldenverba.components.chunk import Chunk
 from goldenverba.components.interfaces import Chunker
 from goldenverba.components.document import Document
@@ -22,7 +17,7 @@ class SemanticChunker(Chunker):
     def __init__(self):
         super().__init__()
         self.name = "Semantic"
-        self.requires_library = ["sklearn"]
+        self.requires_spacy_doc = True
         self.description = (
             "Split documents based on semantic similarity or max sentences"
         )
@@ -39,6 +34,12 @@ class SemanticChunker(Chunker):
                 description="Maximum number of sentences per chunk",
                 values=[],
             ),
+            "Reuse Sentence Embeddings": InputConfig(
+                type="bool",
+                value=False,
+                description="Use the mean of the sentence embeddings as chunk vector instead of embedding chunks again",
+                values=[],
+            ),
         }
 
     async def chunk(
@@ -54,6 +55,10 @@ class SemanticChunker(Chunker):
             config["Breakpoint Percentile Threshold"].value
         )
         max_sentences = int(config["Max Sentences Per Chunk"].value)
+        reuse_embeddings = (
+            "Reuse Sentence Embeddings" in config
+            and bool(config["Reuse Sentence Embeddings"].value)
+        )
 
         for document in documents:
 
@@ -89,107 +94,76 @@ class SemanticChunker(Chunker):
 
             msg.info(f"Generated {len(embeddings)} embeddings")
 
-            for i, sentence in enumerate(sentences):
-                sentence["combined_sentence_embedding"] = embeddings[i]
-
-            distances, sentences = self.calculate_cosine_distances(sentences)
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+            distances, sentences = self.calculate_cosine_distances(sentences, embeddings)
 
             breakpoint_distance_threshold = np.percentile(
                 distances, breakpoint_percentile_threshold
             )
 
-            chunks = []
-            current_chunk = []
-            char_is = []
-            sentence_count = 0
-            char_end_i = -1
-            for i, sentence in enumerate(sentences):
-                current_chunk.append(sentence["sentence"])
-                sentence_count += 1
-
+            # Sentence index ranges [start, end) of each chunk
+            spans = []
+            start = 0
+            for i in range(len(sentences)):
                 # new chunk found (distance breakpoint not reached or reached max sentences)
                 if (
                     i < len(distances) and distances[i] > breakpoint_distance_threshold
-                ) or sentence_count >= max_sentences:
-                    
-                    chunk_text = " ".join(current_chunk)
-                    chunks.append(chunk_text)
-
-                    char_start_i = char_end_i + 1
-                    char_end_i = char_start_i + len(chunk_text)
-                    char_is.append((char_start_i, char_end_i))
-
-                    current_chunk = []
-                    sentence_count = 0
+                ) or i + 1 - start >= max_sentences:
+                    spans.append((start, i + 1))
+                    start = i + 1
 
             # Add any remaining sentences as the last chunk
-            if current_chunk:
-                chunk_text = " ".join(current_chunk)
-                chunks.append(chunk_text)
-                char_is.append((char_end_i + 1, char_end_i + 1 + len(chunk_text)))
+            if start < len(sentences):
+                spans.append((start, len(sentences)))
 
-            for i, chunk in enumerate(chunks):
-                document.chunks.append(
-                    Chunk(
-                        content=chunk,
-                        chunk_id=i,
-                        start_i=char_is[i][0],
-                        end_i=char_is[i][1],
-                        content_without_overlap=chunk,
-                    )
+            char_end_i = -1
+            for i, (span_start, span_end) in enumerate(spans):
+                chunk_text = " ".join(
+                    sentence["sentence"] for sentence in sentences[span_start:span_end]
                 )
+                char_start_i = char_end_i + 1
+                char_end_i = char_start_i + len(chunk_text)
+
+                chunk = Chunk(
+                    content=chunk_text,
+                    chunk_id=i,
+                    start_i=char_start_i,
+                    end_i=char_end_i,
+                    content_without_overlap=chunk_text,
+                )
+                if reuse_embeddings:
+                    # Mean of the window embeddings; EmbeddingManager skips chunks with a vector
+                    chunk.vector = embeddings[span_start:span_end].mean(axis=0).tolist()
+                document.chunks.append(chunk)
 
         return documents
 
     def combine_sentences(self, sentences, buffer_size=1):
-        # Go through each sentence dict
-        for i in range(len(sentences)):
-
-            # Create a string that will hold the sentences which are joined
-            combined_sentence = ""
-
-            # Add sentences before the current one, based on the buffer size.
-            for j in range(i - buffer_size, i):
-                # Check if the index j is not negative (to avoid index out of range like on the first one)
-                if j >= 0:
-                    # Add the sentence at index j to the combined_sentence string
-                    combined_sentence += sentences[j]["sentence"] + " "
-
-            # Add the current sentence
-            combined_sentence += sentences[i]["sentence"]
-
-            # Add sentences after the current one, based on the buffer size
-            for j in range(i + 1, i + 1 + buffer_size):
-                # Check if the index j is within the range of the sentences list
-                if j < len(sentences):
-                    # Add the sentence at index j to the combined_sentence string
-                    combined_sentence += " " + sentences[j]["sentence"]
-
-            # Then add the whole thing to your dict
-            # Store the combined sentence in the current sentence dict
-            sentences[i]["combined_sentence"] = combined_sentence
-
+        """Stores each sentence joined with its `buffer_size` neighbours as combined_sentence"""
+        texts = [sentence["sentence"] for sentence in sentences]
+        for i, sentence in enumerate(sentences):
+            sentence["combined_sentence"] = " ".join(
+                texts[max(0, i - buffer_size) : i + 1 + buffer_size]
+            )
         return sentences
 
-    def calculate_cosine_distances(self, sentences):
-        distances = []
-        for i in range(len(sentences) - 1):
-            embedding_current = sentences[i]["combined_sentence_embedding"]
-            embedding_next = sentences[i + 1]["combined_sentence_embedding"]
-
-            # Calculate cosine similarity
-            similarity = cosine_similarity([embedding_current], [embedding_next])[0][0]
-
-            # Convert to cosine distance
-            distance = 1 - similarity
-
-            # Append cosine distance to the list
-            distances.append(distance)
-
-            # Store distance in the dictionary
-            sentences[i]["distance_to_next"] = distance
-
-        # Optionally handle the last sentence
-        # sentences[-1]['distance_to_next'] = None  # or a default value
+    def calculate_cosine_distances(self, sentences, embeddings=None):
+        """Cosine distance between each pair of adjacent sentence windows
+        @parameter: embeddings : np.ndarray | None - (n_sentences, dim) matrix, defaults to the combined_sentence_embedding of each sentence
+        """
+        if embeddings is None:
+            embeddings = [sentence["combined_sentence_embedding"] for sentence in sentences]
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if len(matrix) < 2:
+            return [], sentences
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        normalized = matrix / np.where(norms == 0, 1, norms)
+        # Row-wise dot product of each window with the next one
+        similarities = np.einsum("ij,ij->i", normalized[:-1], normalized[1:])
+        distances = (1 - similarities).tolist()
+
+        for sentence, distance in zip(sentences, distances):
+            sentence["distance_to_next"] = distance
 
         return distances, sentences
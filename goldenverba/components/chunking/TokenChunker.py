@@ -15,6 +15,7 @@ class TokenChunker(Chunker):
     def __init__(self):
         super().__init__()
         self.name = "Token"
+        self.requires_spacy_doc = True
         self.description = "Splits documents based on word tokens"
         self.config = {
             "Tokens": InputConfig(
@@ -0,0 +1,142 @@
+"""
+In-memory chunk and document counts per embedding collection.
+
+`/api/query` used to build a `WeaviateManager`, verify the embedding
+collection and run `aggregate.over_all(total_count=True)` on every request
+just to refuse queries against an empty database, and `/api/get_datacount`
+and `get_chunk_count` ran a `GroupByAggregate` over `doc_uuid` each time.
+`CollectionStats` keeps, per client and embedder, the number of chunks of
+every document:
+
+- loaded with one grouped aggregate the first time an embedder is used
+- updated incrementally by `WeaviateManager` on import and delete
+- refreshed in the background once older than `VERBA_COLLECTION_STATS_TTL`,
+  which picks up changes made by other processes
+
+A refresh that overlaps an incremental update is discarded and retried on
+the next read, so it never drops a document imported meanwhile.
+
+Environment variables:
+- VERBA_COLLECTION_STATS_TTL: seconds before counts are refreshed in the background (default: 300)
+"""
+
+import os
+import time
+import asyncio
+import weakref
+from typing import Awaitable, Callable, Optional
+
+from wasabi import msg
+
+# An empty collection is re-read at most this often before refusing a query
+EMPTY_RECHECK = 5.0
+
+
+class EmbedderStats:
+    """Chunk count of every document in one embedding collection"""
+
+    def __init__(self, chunks_by_doc: dict[str, int]):
+        self.chunks_by_doc = dict(chunks_by_doc)
+        self.loaded_at = time.monotonic()
+
+    @property
+    def chunk_count(self) -> int:
+        return sum(self.chunks_by_doc.values())
+
+    @property
+    def document_count(self) -> int:
+        return len(self.chunks_by_doc)
+
+    def count_documents(self, document_uuids: list[str]) -> int:
+        return sum(1 for uuid in set(document_uuids) if uuid in self.chunks_by_doc)
+
+
+class CollectionStats:
+    """Counts per client and embedder, refreshed lazily in the background"""
+
+    def __init__(
+        self,
+        load: Callable[[object, str], Awaitable[dict[str, int]]],
+        ttl: float = 300.0,
+    ):
+        self.load = load
+        self.ttl = ttl
+        self._stats: "weakref.WeakKeyDictionary[object, dict[str, EmbedderStats]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._tasks: "weakref.WeakKeyDictionary[object, dict[str, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Bumped by every incremental update, so overlapping loads are discarded
+        self._changes = 0
+
+    @classmethod
+    def from_env(cls, load) -> "CollectionStats":
+        return cls(load, ttl=float(os.getenv("VERBA_COLLECTION_STATS_TTL", "300")))
+
+    def peek(self, client, embedder: str) -> Optional[EmbedderStats]:
+        return self._stats.get(client, {}).get(embedder)
+
+    async def _load(self, client, embedder: str) -> EmbedderStats:
+        for _ in range(3):
+            changes = self._changes
+            stats = EmbedderStats(await self.load(client, embedder))
+            if changes == self._changes:
+                break
+            current = self.peek(client, embedder)
+            if current is not None:
+                # Updated while loading; keep the incremental counts
+                return current
+        self._stats.setdefault(client, {})[embedder] = stats
+        return stats
+
+    def _load_task(self, client, embedder: str) -> asyncio.Task:
+        tasks = self._tasks.setdefault(client, {})
+        task = tasks.get(embedder)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._load(client, embedder))
+            tasks[embedder] = task
+        return task
+
+    async def _refresh(self, client, embedder: str) -> None:
+        try:
+            await self._load_task(client, embedder)
+        except Exception as e:
+            msg.warn(f"Failed to refresh collection stats for {embedder}: {str(e)}")
+
+    async def get(self, client, embedder: str) -> EmbedderStats:
+        stats = self.peek(client, embedder)
+        if stats is None:
+            # Concurrent first reads share one load
+            return await asyncio.shield(self._load_task(client, embedder))
+        if time.monotonic() - stats.loaded_at > self.ttl:
+            asyncio.create_task(self._refresh(client, embedder))
+        return stats
+
+    async def has_chunks(self, client, embedder: str) -> bool:
+        stats = await self.get(client, embedder)
+        if stats.chunk_count == 0 and time.monotonic() - stats.loaded_at > EMPTY_RECHECK:
+            # Another process may have imported since; only paid while empty
+            stats = await self._load_task(client, embedder)
+        return stats.chunk_count > 0
+
+    def add_document(self, client, embedder: str, doc_uuid: str, chunks: int) -> None:
+        stats = self.peek(client, embedder)
+        if stats is not None:
+            stats.chunks_by_doc[str(doc_uuid)] = chunks
+        self._changes += 1
+
+    def remove_document(self, client, embedder: str, doc_uuid: str) -> None:
+        stats = self.peek(client, embedder)
+        if stats is not None:
+            stats.chunks_by_doc.pop(str(doc_uuid), None)
+        self._changes += 1
+
+    def invalidate(self, client=None, embedder: Optional[str] = None) -> None:
+        self._changes += 1
+        if client is None:
+            self._stats.clear()
+        elif embedder is None:
+            self._stats.pop(client, None)
+        else:
+            self._stats.get(client, {}).pop(embedder, None)
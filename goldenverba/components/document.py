@@ -1,33 +1,31 @@
 from goldenverba.server.types import FileConfig
 from goldenverba.components.chunk import Chunk
+from goldenverba.components.spacy_registry import (
+    SENTENCIZER,
+    SpacyPipeline,
+    get_spacy_registry,
+    load_blank_pipeline,
+)
 from spacy.tokens import Doc
-from spacy.language import Language
-import spacy
 import json
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
 
 from langdetect import detect
 
+# Content is parsed in slices of this size and merged with Doc.from_docs
+MAX_BATCH_SIZE = 500000
+
 
 def load_nlp_for_language(language: str):
-    """Load SpaCy models based on language"""
-    if language == "en":
-        nlp = spacy.blank("en")
-    elif language == "zh":
-        nlp = spacy.blank("zh")
-    elif language == "zh-hant":
-        nlp = spacy.blank("zh-hant")
-    elif language == "fr":
-        nlp = spacy.blank("fr")
-    elif language == "de":
-        nlp = spacy.blank("de")
-    elif language == "nl":
-        nlp = spacy.blank("nl")
-    else:
-        nlp = spacy.blank("en")
-
-    nlp.add_pipe("sentencizer")
-
-    return nlp
+    """Load a blank SpaCy pipeline with a sentencizer for the language"""
+    return load_blank_pipeline(language)
+
+
+def get_nlp_for_language(language: str) -> SpacyPipeline:
+    """Sentencizer pipeline for the language, shared through the spaCy registry"""
+    return get_spacy_registry().get(language, SENTENCIZER)
 
 
 def detect_language(text: str) -> str:
@@ -43,6 +41,78 @@ def detect_language(text: str) -> str:
         return "unknown"
 
 
+def parse_content(content: str) -> Doc:
+    """Runs the sentencizer pipeline on content, in MAX_BATCH_SIZE slices"""
+    nlp = get_nlp_for_language(detect_language(content[0:MAX_BATCH_SIZE]))
+    if len(content) > MAX_BATCH_SIZE:
+        slices = [
+            content[i : i + MAX_BATCH_SIZE]
+            for i in range(0, len(content), MAX_BATCH_SIZE)
+        ]
+        return Doc.from_docs(list(nlp.pipe(slices)))
+    return nlp(content)
+
+
+_parse_executor = None
+
+
+def _get_parse_executor():
+    """Process pool for large inputs (VERBA_SPACY_PARSE_PROCESSES=0 disables it)"""
+    global _parse_executor
+    processes = int(os.getenv("VERBA_SPACY_PARSE_PROCESSES", "2"))
+    if processes <= 0:
+        return None
+    if _parse_executor is None:
+        _parse_executor = ProcessPoolExecutor(max_workers=processes)
+    return _parse_executor
+
+
+def parse_documents(documents: list["Document"]):
+    """Parses all unparsed documents, batching small ones per language with nlp.pipe"""
+    by_language: dict[str, list[Document]] = {}
+    for document in documents:
+        if document.is_parsed:
+            continue
+        if len(document.content) > MAX_BATCH_SIZE:
+            document.ensure_parsed()
+            continue
+        language = detect_language(document.content)
+        by_language.setdefault(language, []).append(document)
+
+    for language, group in by_language.items():
+        nlp = get_nlp_for_language(language)
+        for document, doc in zip(group, nlp.pipe(d.content for d in group)):
+            document._spacy_doc = doc
+
+
+async def aparse_documents(documents: list["Document"]):
+    """Parses documents without blocking the event loop.
+
+    Inputs of VERBA_SPACY_PROCESS_MIN_CHARS or more are parsed in a worker
+    process, the rest are batched with nlp.pipe in a thread.
+    """
+    loop = asyncio.get_running_loop()
+    min_chars = int(os.getenv("VERBA_SPACY_PROCESS_MIN_CHARS", "1000000"))
+    executor = _get_parse_executor()
+
+    large = [
+        document
+        for document in documents
+        if not document.is_parsed and len(document.content) >= min_chars
+    ]
+    if executor is not None and large:
+        docs = await asyncio.gather(
+            *[
+                loop.run_in_executor(executor, parse_content, document.content)
+                for document in large
+            ]
+        )
+        for document, doc in zip(large, docs):
+            document._spacy_doc = doc
+
+    await asyncio.to_thread(parse_documents, documents)
+
+
 class Document:
     def __init__(
         self,
@@ -64,27 +134,26 @@ class Document:
         self.meta = meta
         self.metadata = metadata
         self.chunks: list[Chunk] = []
-
-        MAX_BATCH_SIZE = 500000
-
-        if len(content) > MAX_BATCH_SIZE:
-            # Process content in batches
-            docs = []
-            detected_language = detect_language(content[0:MAX_BATCH_SIZE])
-            nlp = load_nlp_for_language(detected_language)
-
-            for i in range(0, len(content), MAX_BATCH_SIZE):
-                docs.append(nlp(content[i : i + MAX_BATCH_SIZE]))
-
-            # Merged all processed docs
-            doc = Doc.from_docs(docs)
-        else:
-            # Process smaller content, directly based on language
-            detected_language = detect_language(content)
-            nlp = load_nlp_for_language(detected_language)
-            doc = nlp(content)
-
-        self.spacy_doc = doc
+        # Parsed lazily on first access of spacy_doc (see ensure_parsed)
+        self._spacy_doc = None
+
+    @property
+    def spacy_doc(self) -> Doc:
+        return self.ensure_parsed()
+
+    @spacy_doc.setter
+    def spacy_doc(self, doc: Doc):
+        self._spacy_doc = doc
+
+    @property
+    def is_parsed(self) -> bool:
+        return self._spacy_doc is not None
+
+    def ensure_parsed(self) -> Doc:
+        """Parses the content with spaCy once and caches the result"""
+        if self._spacy_doc is None:
+            self._spacy_doc = parse_content(self.content)
+        return self._spacy_doc
 
     @staticmethod
     def to_json(document) -> dict:
@@ -0,0 +1,71 @@
+"""
+In-process cache of document titles and metadata.
+
+Retrievers need the title and metadata of every document in a result set.
+Resolving them with `WeaviateManager.get_document` costs an `exists()` and
+a `fetch_object_by_id` round-trip per document; `get_documents_metadata`
+serves what it can from this cache and fetches the rest in one filtered
+query. Entries expire after a TTL and the least recently used entries are
+evicted first; `WeaviateManager` invalidates entries on import and delete.
+
+Environment variables:
+- VERBA_DOC_CACHE_SIZE: max cached documents, 0 disables the cache (default: 4096)
+- VERBA_DOC_CACHE_TTL: seconds an entry stays valid (default: 300)
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class DocumentMetadataCache:
+    """LRU cache with a TTL, keyed by document UUID"""
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "DocumentMetadataCache":
+        return cls(
+            max_entries=int(os.getenv("VERBA_DOC_CACHE_SIZE", "4096")),
+            ttl=float(os.getenv("VERBA_DOC_CACHE_TTL", "300")),
+        )
+
+    def get(self, uuid: str) -> Optional[dict]:
+        entry = self._entries.get(str(uuid))
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            if entry is not None:
+                del self._entries[str(uuid)]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(str(uuid))
+        self.hits += 1
+        return entry[1]
+
+    def set(self, uuid: str, document: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[str(uuid)] = (time.monotonic(), document)
+        self._entries.move_to_end(str(uuid))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, uuid: str) -> None:
+        self._entries.pop(str(uuid), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total * 100) if total else 0.0,
+        }
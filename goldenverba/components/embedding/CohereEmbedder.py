@@ -18,6 +18,8 @@ class CohereEmbedder(Embedding):
     def __init__(self):
         super().__init__()
         self.name = "Cohere"
+        # Cohere accepts at most 96 texts per embed call
+        self.max_batch_size = 96
         self.description = "Vectorizes documents and queries using Cohere"
         self.url = os.getenv("COHERE_BASE_URL", "https://api.cohere.com/v1")
         models = get_models(self.url, get_token("COHERE_API_KEY", None), "embed")
@@ -55,16 +57,16 @@ class CohereEmbedder(Embedding):
 
         all_embeddings = []
 
-        async with aiohttp.ClientSession() as session:
-            for chunk in chunks(content, 96):
-                data = {"texts": chunk, "model": model, "input_type": "search_document"}
-                async with session.post(
-                    self.url + "/embed", data=json.dumps(data), headers=headers
-                ) as response:
-                    response.raise_for_status()
-                    response_data = await response.json()
-                    embeddings = response_data.get("embeddings", [])
-                    all_embeddings.extend(embeddings)
+        session = self.get_session(self.url)
+        for chunk in chunks(content, 96):
+            data = {"texts": chunk, "model": model, "input_type": "search_document"}
+            async with session.post(
+                self.url + "/embed", data=json.dumps(data), headers=headers
+            ) as response:
+                response.raise_for_status()
+                response_data = await response.json()
+                embeddings = response_data.get("embeddings", [])
+                all_embeddings.extend(embeddings)
 
         return all_embeddings
 
@@ -14,6 +14,8 @@ class OllamaEmbedder(Embedding):
     def __init__(self):
         super().__init__()
         self.name = "Ollama"
+        # Local model: batch similar lengths together to reduce padding
+        self.sort_by_length = True
         self.url = os.getenv("OLLAMA_URL", "http://localhost:11434")
         self.description = f"Vectorizes documents and queries using Ollama. If your Ollama instance is not running on {self.url}, you can change the URL by setting the OLLAMA_URL environment variable."
         models = get_models(self.url)
@@ -33,12 +35,12 @@ class OllamaEmbedder(Embedding):
 
         data = {"model": model, "input": content}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(urljoin(self.url, "/api/embed"), json=data) as response:
-                response.raise_for_status()
-                data = await response.json()
-                embeddings = data.get("embeddings", [])
-                return embeddings
+        session = self.get_session(self.url)
+        async with session.post(urljoin(self.url, "/api/embed"), json=data) as response:
+            response.raise_for_status()
+            data = await response.json()
+            embeddings = data.get("embeddings", [])
+            return embeddings
 
 
 def get_models(url: str):
@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 from typing import List
 import io
 
@@ -9,6 +10,7 @@ from wasabi import msg
 from goldenverba.components.interfaces import Embedding
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment, get_token
+from goldenverba.components.embedding.scheduler import retryable_from_client_error
 
 
 class OpenAIEmbedder(Embedding):
@@ -17,6 +19,8 @@ class OpenAIEmbedder(Embedding):
     def __init__(self):
         super().__init__()
         self.name = "OpenAI"
+        # OpenAI caps a single embeddings request at 300k tokens
+        self.max_batch_tokens = 300000
         self.description = "Vectorizes documents and queries using OpenAI"
 
         # If a different key is set for the OpenAI embedding, use it
@@ -63,7 +67,10 @@ class OpenAIEmbedder(Embedding):
             )
 
     async def vectorize(self, config: dict, content: List[str]) -> List[List[float]]:
-        """Vectorize the input content using OpenAI's API with caching."""
+        """Vectorize the input content using OpenAI's API.
+
+        Caching happens in the EmbeddingManager (shared by all embedders).
+        """
         model = config.get("Model", {"value": "text-embedding-ada-002"}).value
         key_name = (
             "OPENAI_EMBED_API_KEY"
@@ -85,83 +92,42 @@ class OpenAIEmbedder(Embedding):
             "Authorization": f"Bearer {api_key}",
         }
 
-        # Embeddings Cache (RAG2) - integrado
-        try:
-            from verba_extensions.utils.embeddings_cache import (
-                get_cached_embedding,
-                get_cache_key
-            )
-            use_cache = True
-        except ImportError:
-            use_cache = False
-        
-        # Se cache disponível e apenas 1 item (query), usar cache
-        if use_cache and len(content) == 1:
-            text = content[0]
-            cache_key = get_cache_key(text=text, doc_uuid="", parent_type="query")
-            
-            async def _embed_single(t: str) -> List[float]:
-                single_payload = {"input": [t], "model": model}
-                payload_bytes = json.dumps(single_payload).encode("utf-8")
-                payload_io = io.BytesIO(payload_bytes)
-                
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"{base_url}/embeddings",
-                        headers=headers,
-                        data=payload_io,
-                        timeout=30,
-                    ) as response:
-                        response.raise_for_status()
-                        data = await response.json()
-                        if "data" not in data or not data["data"]:
-                            raise ValueError(f"Unexpected API response: {data}")
-                        return data["data"][0]["embedding"]
-            
-            # Obter embedding com cache
-            embedding, was_cached = get_cached_embedding(
-                text=text,
-                cache_key=cache_key,
-                embed_fn=lambda t: _embed_single(t),
-                enable_cache=True
-            )
-            return [embedding]
-        
-        # Para batches, processar normalmente (mais eficiente)
         payload = {"input": content, "model": model}
         payload_bytes = json.dumps(payload).encode("utf-8")
         payload_io = io.BytesIO(payload_bytes)
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"{base_url}/embeddings",
-                    headers=headers,
-                    data=payload_io,
-                    timeout=30,
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-
-                    if "data" not in data:
-                        raise ValueError(f"Unexpected API response: {data}")
-
-                    embeddings = [item["embedding"] for item in data["data"]]
-                    if len(embeddings) != len(content):
-                        raise ValueError(
-                            f"Mismatch in embedding count: got {len(embeddings)}, expected {len(content)}"
-                        )
-
-                    return embeddings
-
-            except aiohttp.ClientError as e:
-                if isinstance(e, aiohttp.ClientResponseError) and e.status == 429:
-                    raise Exception("Rate limit exceeded. Waiting before retrying...")
-                raise Exception(f"API request failed: {str(e)}")
-
-            except Exception as e:
-                msg.fail(f"Unexpected error: {type(e).__name__} - {str(e)}")
-                raise
+        session = self.get_session(base_url)
+        try:
+            async with session.post(
+                f"{base_url}/embeddings",
+                headers=headers,
+                data=payload_io,
+                timeout=30,
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+
+                if "data" not in data:
+                    raise ValueError(f"Unexpected API response: {data}")
+
+                embeddings = [item["embedding"] for item in data["data"]]
+                if len(embeddings) != len(content):
+                    raise ValueError(
+                        f"Mismatch in embedding count: got {len(embeddings)}, expected {len(content)}"
+                    )
+
+                return embeddings
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            retryable = retryable_from_client_error(e)
+            if retryable is not None:
+                # Retried with backoff by the EmbeddingScheduler
+                raise retryable
+            raise Exception(f"API request failed: {str(e)}")
+
+        except Exception as e:
+            msg.fail(f"Unexpected error: {type(e).__name__} - {str(e)}")
+            raise
 
     @staticmethod
     def get_models(token: str, url: str) -> List[str]:
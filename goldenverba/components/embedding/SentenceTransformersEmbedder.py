@@ -1,10 +1,6 @@
 from goldenverba.components.interfaces import Embedding
 from goldenverba.components.types import InputConfig
-
-try:
-    from sentence_transformers import SentenceTransformer
-except Exception as e:
-    pass
+from goldenverba.components.embedding.model_registry import get_model_registry
 
 
 class SentenceTransformersEmbedder(Embedding):
@@ -15,6 +11,8 @@ class SentenceTransformersEmbedder(Embedding):
     def __init__(self):
         super().__init__()
         self.name = "SentenceTransformers"
+        # Local model: batch similar lengths together to reduce padding
+        self.sort_by_length = True
         self.requires_library = ["sentence_transformers"]
         self.description = "Embeds and retrieves objects using SentenceTransformer"
         self.config = {
@@ -34,48 +32,16 @@ class SentenceTransformersEmbedder(Embedding):
         }
 
     async def vectorize(self, config: dict, content: list[str]) -> list[float]:
-        """Vectorize chunks using SentenceTransformer (runs in executor)."""
-        import asyncio
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._vectorize_sync, config, content)
+        """Vectorize chunks using the process-wide model registry.
 
-    def _vectorize_sync(self, config: dict, content: list[str]) -> list[float]:
-        """Synchronous implementation of vectorization."""
+        Single-text calls (queries) go through the registry's micro-batching
+        queue so concurrent queries share one encode call.
+        """
         try:
-            # Embeddings Cache (RAG2) - integrado para queries únicas
-            use_cache = False
-            if len(content) == 1:
-                try:
-                    from verba_extensions.utils.embeddings_cache import (
-                        get_cached_embedding,
-                        get_cache_key
-                    )
-                    use_cache = True
-                except ImportError:
-                    pass
-            
             model_name = config.get("Model").value
-            
-            # Se cache disponível e apenas 1 item (query), usar cache
-            if use_cache:
-                text = content[0]
-                cache_key = get_cache_key(text=text, doc_uuid="", parent_type="query")
-                
-                def _embed_single(t: str) -> list[float]:
-                    model = SentenceTransformer(model_name)
-                    return model.encode([t])[0].tolist()
-                
-                embedding, was_cached = get_cached_embedding(
-                    text=text,
-                    cache_key=cache_key,
-                    embed_fn=_embed_single,
-                    enable_cache=True
-                )
-                return [embedding]
-            
-            # Para batches, processar normalmente
-            model = SentenceTransformer(model_name)
-            embeddings = model.encode(content).tolist()
-            return embeddings
+            registry = get_model_registry()
+            if len(content) == 1:
+                return [await registry.encode_query(model_name, content[0])]
+            return await registry.encode(model_name, content)
         except Exception as e:
             raise Exception(f"Failed to vectorize chunks: {str(e)}")
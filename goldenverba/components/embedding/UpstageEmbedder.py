@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 from typing import List
 import io
 
@@ -9,6 +10,7 @@ from wasabi import msg
 from goldenverba.components.interfaces import Embedding
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment, get_token
+from goldenverba.components.embedding.scheduler import retryable_from_client_error
 
 
 class UpstageEmbedder(Embedding):
@@ -72,36 +74,38 @@ class UpstageEmbedder(Embedding):
         payload_bytes = json.dumps(payload).encode("utf-8")
         payload_io = io.BytesIO(payload_bytes)
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"{base_url}/embeddings",
-                    headers=headers,
-                    data=payload_io,
-                    timeout=30,
-                ) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-
-                    if "data" not in data:
-                        raise ValueError(f"Unexpected API response: {data}")
-
-                    embeddings = [item["embedding"] for item in data["data"]]
-                    if len(embeddings) != len(content):
-                        raise ValueError(
-                            f"Mismatch in embedding count: got {len(embeddings)}, expected {len(content)}"
-                        )
-
-                    return embeddings
-
-            except aiohttp.ClientError as e:
-                if isinstance(e, aiohttp.ClientResponseError) and e.status == 429:
-                    raise Exception("Rate limit exceeded. Waiting before retrying...")
-                raise Exception(f"API request failed: {str(e)}")
-
-            except Exception as e:
-                msg.fail(f"Unexpected error: {type(e).__name__} - {str(e)}")
-                raise
+        session = self.get_session(base_url)
+        try:
+            async with session.post(
+                f"{base_url}/embeddings",
+                headers=headers,
+                data=payload_io,
+                timeout=30,
+            ) as response:
+                response.raise_for_status()
+                data = await response.json()
+
+                if "data" not in data:
+                    raise ValueError(f"Unexpected API response: {data}")
+
+                embeddings = [item["embedding"] for item in data["data"]]
+                if len(embeddings) != len(content):
+                    raise ValueError(
+                        f"Mismatch in embedding count: got {len(embeddings)}, expected {len(content)}"
+                    )
+
+                return embeddings
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            retryable = retryable_from_client_error(e)
+            if retryable is not None:
+                # Retried with backoff by the EmbeddingScheduler
+                raise retryable
+            raise Exception(f"API request failed: {str(e)}")
+
+        except Exception as e:
+            msg.fail(f"Unexpected error: {type(e).__name__} - {str(e)}")
+            raise
 
     @staticmethod
     def get_models(token: str, url: str) -> List[str]:
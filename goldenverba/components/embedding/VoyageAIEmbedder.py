@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 from typing import List
 import io
 
@@ -9,6 +10,7 @@ from wasabi import msg
 from goldenverba.components.interfaces import Embedding
 from goldenverba.components.types import InputConfig
 from goldenverba.components.util import get_environment
+from goldenverba.components.embedding.scheduler import retryable_from_client_error
 
 
 class VoyageAIEmbedder(Embedding):
@@ -17,6 +19,8 @@ class VoyageAIEmbedder(Embedding):
     def __init__(self):
         super().__init__()
         self.name = "VoyageAI"
+        # voyage-3 models accept at most 120k tokens per request
+        self.max_batch_tokens = 120000
         self.description = "Vectorizes documents and queries using VoyageAI"
 
         # Fetch available models
@@ -66,39 +70,41 @@ class VoyageAIEmbedder(Embedding):
         }
         payload = {"input": content, "model": model}
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    f"{base_url}/embeddings",
-                    headers=headers,
-                    json=payload,  # Use json parameter instead of data
-                    timeout=30,
-                ) as response:
-                    if response.status == 400:
-                        error_body = await response.text()
-                        raise ValueError(f"Bad Request: {error_body}")
-                    response.raise_for_status()
-                    data = await response.json()
-
-                    if "data" not in data:
-                        raise ValueError(f"Unexpected API response: {data}")
-
-                    embeddings = [item["embedding"] for item in data["data"]]
-                    if len(embeddings) != len(content):
-                        raise ValueError(
-                            f"Mismatch in embedding count: got {len(embeddings)}, expected {len(content)}"
-                        )
-
-                    return embeddings
-
-            except aiohttp.ClientError as e:
-                if isinstance(e, aiohttp.ClientResponseError) and e.status == 429:
-                    raise Exception("Rate limit exceeded. Waiting before retrying...")
-                raise Exception(f"API request failed: {str(e)}")
-
-            except Exception as e:
-                msg.fail(f"Unexpected error: {type(e).__name__} - {str(e)}")
-                raise
+        session = self.get_session(base_url)
+        try:
+            async with session.post(
+                f"{base_url}/embeddings",
+                headers=headers,
+                json=payload,  # Use json parameter instead of data
+                timeout=30,
+            ) as response:
+                if response.status == 400:
+                    error_body = await response.text()
+                    raise ValueError(f"Bad Request: {error_body}")
+                response.raise_for_status()
+                data = await response.json()
+
+                if "data" not in data:
+                    raise ValueError(f"Unexpected API response: {data}")
+
+                embeddings = [item["embedding"] for item in data["data"]]
+                if len(embeddings) != len(content):
+                    raise ValueError(
+                        f"Mismatch in embedding count: got {len(embeddings)}, expected {len(content)}"
+                    )
+
+                return embeddings
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            retryable = retryable_from_client_error(e)
+            if retryable is not None:
+                # Retried with backoff by the EmbeddingScheduler
+                raise retryable
+            raise Exception(f"API request failed: {str(e)}")
+
+        except Exception as e:
+            msg.fail(f"Unexpected error: {type(e).__name__} - {str(e)}")
+            raise
 
     @staticmethod
     def get_models(token: str, url: str) -> List[str]:
@@ -64,11 +64,11 @@ class WeaviateEmbedder(Embedding):
 
         data = {"is_search_query": False, "texts": content}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                base_url + path, json=data, headers={"Authorization": f"{api_key}"}
-            ) as response:
-                response.raise_for_status()
-                data = await response.json()
-                embeddings = data.get("embeddings", [])
-                return embeddings
+        session = self.get_session(base_url)
+        async with session.post(
+            base_url + path, json=data, headers={"Authorization": f"{api_key}"}
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+            embeddings = data.get("embeddings", [])
+            return embeddings
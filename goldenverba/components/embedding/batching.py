@@ -0,0 +1,94 @@
+"""
+Token-aware batching for embedding requests.
+
+Chunks vary from a few dozen to thousands of tokens, so splitting content
+by a fixed item count either overflows a provider's per-request token limit
+or sends half-empty requests. `plan_batches` packs texts greedily up to both
+an item ceiling (`Embedding.max_batch_size`) and a token ceiling
+(`Embedding.max_batch_tokens`). For local models (`Embedding.sort_by_length`)
+texts are sorted by length first so each batch pads to a similar length.
+Batches are returned as index lists so callers can restore the input order.
+
+Token counts come from tiktoken (cl100k_base) when its encoding is
+available, otherwise from a ~4 characters per token estimate.
+"""
+
+from typing import Optional
+
+from wasabi import msg
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed and tiktoken is not None:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # The BPE file is downloaded on first use; work offline too
+            _encoding_failed = True
+            msg.warn(f"tiktoken encoding unavailable, estimating tokens: {str(e)}")
+    return _encoding
+
+
+def estimate_token_counts(texts: list[str]) -> list[int]:
+    """Token count per text (tiktoken if available, else chars / 4)."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+    return [len(text) // 4 + 1 for text in texts]
+
+
+def plan_batches(
+    texts: list[str],
+    max_items: int,
+    max_tokens: Optional[int] = None,
+    sort_by_length: bool = False,
+    token_counts: Optional[list[int]] = None,
+) -> list[list[int]]:
+    """Groups text indices into batches within the item and token ceilings.
+
+    A text larger than `max_tokens` on its own gets a batch of its own.
+    """
+    if not texts:
+        return []
+    max_items = max(1, max_items)
+    if token_counts is None and (max_tokens or sort_by_length):
+        token_counts = estimate_token_counts(texts)
+
+    order = list(range(len(texts)))
+    if sort_by_length:
+        order.sort(key=lambda i: token_counts[i])
+
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+    for i in order:
+        tokens = token_counts[i] if token_counts is not None else 0
+        if current and (
+            len(current) >= max_items
+            or (max_tokens and current_tokens + tokens > max_tokens)
+        ):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def restore_order(batches: list[list[int]], results: list[list], total: int) -> list:
+    """Maps per-batch results back to the original text order."""
+    ordered = [None] * total
+    for indices, batch_result in zip(batches, results):
+        for i, item in zip(indices, batch_result):
+            ordered[i] = item
+    return ordered
@@ -0,0 +1,213 @@
+"""
+Process-wide registry for SentenceTransformer models.
+
+Loading a SentenceTransformer model costs hundreds of milliseconds and
+hundreds of MB of RAM. The registry keeps one instance per (model, device)
+for the whole process, evicts the least recently used model when the
+configured memory budget is exceeded, and exposes a micro-batching encode
+queue so concurrent single-query requests share one `model.encode` call.
+
+Environment variables:
+- SENTENCE_TRANSFORMERS_PRELOAD: comma-separated models loaded at startup
+- SENTENCE_TRANSFORMERS_DEVICE: device passed to SentenceTransformer (default: auto)
+- SENTENCE_TRANSFORMERS_MEMORY_MB: memory budget for loaded models (default: 2048)
+- SENTENCE_TRANSFORMERS_BATCH_WAIT_MS: max wait to coalesce queries (default: 5)
+"""
+
+import os
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from wasabi import msg
+
+try:
+    from sentence_transformers import SentenceTransformer
+except Exception:
+    SentenceTransformer = None
+
+
+def _estimate_model_bytes(model) -> int:
+    """Estimates the memory footprint of a model from its parameters."""
+    try:
+        return sum(p.numel() * p.element_size() for p in model.parameters())
+    except Exception:
+        return 0
+
+
+class EncodeBatcher:
+    """
+    Coalesces concurrent encode requests for one model into a single
+    `model.encode` call executed in the default thread pool.
+    """
+
+    def __init__(self, model, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.loop = asyncio.get_running_loop()
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.requests = 0
+
+    async def encode(self, text: str) -> list[float]:
+        future = self.loop.create_future()
+        self._pending.append((text, future))
+        self.requests += 1
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = self.loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        self.batches += 1
+        self.loop.create_task(self._run(pending))
+
+    async def _run(self, pending: list[tuple[str, asyncio.Future]]):
+        texts = [text for text, _ in pending]
+        try:
+            embeddings = await self.loop.run_in_executor(
+                None, lambda: self.model.encode(texts, batch_size=len(texts))
+            )
+            for (_, future), embedding in zip(pending, embeddings):
+                if not future.done():
+                    future.set_result(embedding.tolist())
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+
+
+class SentenceTransformerRegistry:
+    """Loads each (model, device) once and keeps it under an LRU memory budget."""
+
+    def __init__(self, memory_budget_mb: int = 2048, device: Optional[str] = None):
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.device = device
+        self._models: "OrderedDict[tuple[str, Optional[str]], dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict[tuple[str, Optional[str]], threading.Lock] = {}
+        self._batchers: dict[tuple[str, Optional[str]], EncodeBatcher] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def _key(self, model_name: str, device: Optional[str]):
+        return (model_name, device if device is not None else self.device)
+
+    def get(self, model_name: str, device: Optional[str] = None):
+        """Returns a loaded model, loading it on first use (thread-safe)."""
+        key = self._key(model_name, device)
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                return entry["model"]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given model, others wait for it
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    return entry["model"]
+
+            if SentenceTransformer is None:
+                raise Exception("sentence_transformers is not installed")
+
+            msg.info(f"Loading SentenceTransformer model {model_name} (device={key[1] or 'auto'})")
+            model = SentenceTransformer(model_name, device=key[1])
+            size = _estimate_model_bytes(model)
+
+            with self._lock:
+                self._models[key] = {"model": model, "bytes": size}
+                self.loads += 1
+                self._evict()
+            return model
+
+    def _evict(self):
+        """Drops least recently used models until the budget is respected."""
+        while len(self._models) > 1 and self.memory_bytes() > self.memory_budget:
+            key, _ = self._models.popitem(last=False)
+            self._batchers.pop(key, None)
+            self.evictions += 1
+            msg.info(f"Evicted SentenceTransformer model {key[0]} from registry")
+
+    def memory_bytes(self) -> int:
+        return sum(entry["bytes"] for entry in self._models.values())
+
+    def is_loaded(self, model_name: str, device: Optional[str] = None) -> bool:
+        return self._key(model_name, device) in self._models
+
+    async def preload(self, model_names: list[str], device: Optional[str] = None):
+        """Loads the given models in the thread pool without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        for model_name in model_names:
+            try:
+                await loop.run_in_executor(None, self.get, model_name, device)
+            except Exception as e:
+                msg.warn(f"Failed to preload SentenceTransformer model {model_name}: {str(e)}")
+
+    async def encode(self, model_name: str, texts: list[str], device: Optional[str] = None):
+        """Encodes a batch of texts in the thread pool."""
+        loop = asyncio.get_running_loop()
+        model = await loop.run_in_executor(None, self.get, model_name, device)
+        embeddings = await loop.run_in_executor(None, model.encode, texts)
+        return embeddings.tolist()
+
+    async def encode_query(self, model_name: str, text: str, device: Optional[str] = None):
+        """Encodes one text through the micro-batching queue of its model."""
+        key = self._key(model_name, device)
+        loop = asyncio.get_running_loop()
+        model = await loop.run_in_executor(None, self.get, model_name, device)
+        batcher = self._batchers.get(key)
+        if batcher is None or batcher.model is not model or batcher.loop is not loop:
+            batcher = EncodeBatcher(
+                model,
+                max_wait_ms=float(os.getenv("SENTENCE_TRANSFORMERS_BATCH_WAIT_MS", "5")),
+            )
+            self._batchers[key] = batcher
+        return await batcher.encode(text)
+
+    def get_stats(self) -> dict:
+        return {
+            "models": [
+                {"model": key[0], "device": key[1], "bytes": entry["bytes"]}
+                for key, entry in self._models.items()
+            ],
+            "memory_bytes": self.memory_bytes(),
+            "memory_budget_bytes": self.memory_budget,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "batched_requests": sum(b.requests for b in self._batchers.values()),
+            "encode_batches": sum(b.batches for b in self._batchers.values()),
+        }
+
+
+_registry: Optional[SentenceTransformerRegistry] = None
+
+
+def get_model_registry() -> SentenceTransformerRegistry:
+    """Returns the process-wide registry (singleton)."""
+    global _registry
+    if _registry is None:
+        _registry = SentenceTransformerRegistry(
+            memory_budget_mb=int(os.getenv("SENTENCE_TRANSFORMERS_MEMORY_MB", "2048")),
+            device=os.getenv("SENTENCE_TRANSFORMERS_DEVICE") or None,
+        )
+    return _registry
+
+
+def get_preload_models() -> list[str]:
+    """Models configured for preloading via SENTENCE_TRANSFORMERS_PRELOAD."""
+    models = os.getenv("SENTENCE_TRANSFORMERS_PRELOAD", "")
+    return [model.strip() for model in models.split(",") if model.strip()]
@@ -0,0 +1,275 @@
+"""
+Rate-limited, adaptive scheduler for embedding batches.
+
+`EmbeddingManager` used to fire every batch of a document at once with
+`asyncio.gather`, which trips provider rate limits on large files and fails
+the whole document on the first 429. Each embedder now gets one
+`EmbeddingScheduler` (shared by all documents being imported) that:
+
+- paces requests with token buckets for requests/min and tokens/min
+- limits in-flight requests with an AIMD window: +1 slot after a full
+  window of successes, halved on 429/5xx
+- retries failed batches with jittered exponential backoff, honouring
+  `Retry-After` when the provider sends one
+
+Environment variables (global defaults, embedders can override the
+`requests_per_minute` / `tokens_per_minute` / `max_concurrency` attributes):
+- VERBA_EMBEDDING_RPM: requests per minute, 0 = unlimited (default: 0)
+- VERBA_EMBEDDING_TPM: tokens per minute, 0 = unlimited (default: 0)
+- VERBA_EMBEDDING_MAX_CONCURRENCY: upper bound of the AIMD window (default: 16)
+- VERBA_EMBEDDING_MAX_RETRIES: retries per batch (default: 5)
+"""
+
+import os
+import asyncio
+import random
+from typing import Awaitable, Callable, Optional
+
+import aiohttp
+from wasabi import msg
+
+
+class RetryableEmbeddingError(Exception):
+    """Raised by embedders for throttling / transient provider errors."""
+
+    def __init__(
+        self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def retryable_from_response_error(
+    error: aiohttp.ClientResponseError,
+) -> Optional[RetryableEmbeddingError]:
+    """Converts a 429/5xx aiohttp error into a RetryableEmbeddingError."""
+    if error.status != 429 and error.status < 500:
+        return None
+    retry_after = None
+    if error.headers is not None:
+        try:
+            retry_after = float(error.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            retry_after = None
+    label = "Rate limit exceeded" if error.status == 429 else "Provider error"
+    return RetryableEmbeddingError(
+        f"{label} ({error.status}): {error.message}",
+        status=error.status,
+        retry_after=retry_after,
+    )
+
+
+
+def retryable_from_client_error(error: Exception) -> Optional[RetryableEmbeddingError]:
+    """Converts a 429/5xx response, a dropped connection or a timeout of an
+    aiohttp request into a RetryableEmbeddingError."""
+    if isinstance(error, aiohttp.ClientResponseError):
+        return retryable_from_response_error(error)
+    if isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError)):
+        return RetryableEmbeddingError(
+            f"Connection error: {type(error).__name__} {error}".rstrip()
+        )
+    return None
+
+def is_throttle(error: Exception) -> bool:
+    """True for errors that mean the provider is overloaded (429/5xx)."""
+    status = getattr(error, "status", None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, RetryableEmbeddingError):
+        return True
+    if isinstance(error, aiohttp.ClientResponseError):
+        return is_throttle(error)
+    return isinstance(
+        error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, ConnectionError)
+    )
+
+
+def estimate_tokens(texts: list[str]) -> int:
+    """Cheap token estimate (~4 characters per token) used for TPM pacing."""
+    return sum(len(text) // 4 + 1 for text in texts)
+
+
+class TokenBucket:
+    """Refills `rate_per_minute` units per minute, up to `capacity`."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = None
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        if self.updated is None:
+            self.updated = now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1):
+        # Requests larger than the bucket are allowed once it is full
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            while True:
+                self._refill(loop.time())
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class AIMDWindow:
+    """Concurrency limit with additive increase / multiplicative decrease."""
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit = float(max(self.minimum, min(initial, self.maximum)))
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, throttled: bool = False):
+        async with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit / 2)
+            else:
+                # +1 slot once a full window of requests succeeded
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class EmbeddingScheduler:
+    """Runs embedding batches for one embedder under rate and concurrency limits."""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 16,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        self.name = name
+        self.request_bucket = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.window = AIMDWindow(
+            initial=min(4, max_concurrency), maximum=max_concurrency
+        )
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self.throttled = 0
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after:
+            return min(self.max_delay, retry_after)
+        # Full jitter: uniform in [0, base * 2^attempt]
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    async def _run_one(self, batch: list[str], fn: Callable[[list[str]], Awaitable]):
+        attempt = 0
+        while True:
+            if self.request_bucket:
+                await self.request_bucket.acquire(1)
+            if self.token_bucket:
+                await self.token_bucket.acquire(estimate_tokens(batch))
+
+            await self.window.acquire()
+            throttled = False
+            try:
+                return await fn(batch)
+            except Exception as e:
+                throttled = is_throttle(e)
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                error = e
+            finally:
+                await self.window.release(throttled=throttled)
+
+            if throttled:
+                self.throttled += 1
+            self.retries += 1
+            delay = self._backoff(attempt, error)
+            attempt += 1
+            msg.warn(
+                f"[EMBEDDING_SCHEDULER] {self.name}: {type(error).__name__}: {str(error)} "
+                f"- retry {attempt}/{self.max_retries} in {delay:.1f}s "
+                f"(window={int(self.window.limit)})"
+            )
+            await asyncio.sleep(delay)
+
+    async def run(
+        self,
+        batches: list[list[str]],
+        fn: Callable[[list[str]], Awaitable],
+        on_done: Optional[Callable[[int], None]] = None,
+    ) -> list:
+        """Runs `fn` for every batch and returns the results in batch order.
+
+        Batches that still fail after retries are returned as exceptions
+        (like `asyncio.gather(..., return_exceptions=True)`).
+        """
+
+        async def run_batch(index: int, batch: list[str]):
+            try:
+                return await self._run_one(batch, fn)
+            finally:
+                if on_done:
+                    on_done(index)
+
+        results = await asyncio.gather(
+            *[run_batch(i, batch) for i, batch in enumerate(batches)],
+            return_exceptions=True,
+        )
+        return results
+
+    def get_stats(self) -> dict:
+        return {
+            "window": int(self.window.limit),
+            "in_flight": self.window.in_flight,
+            "retries": self.retries,
+            "throttled": self.throttled,
+        }
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def create_scheduler(name: str, embedder=None) -> EmbeddingScheduler:
+    """Builds a scheduler from embedder attributes and environment defaults."""
+    rpm = getattr(embedder, "requests_per_minute", None) or _env_float(
+        "VERBA_EMBEDDING_RPM", 0
+    )
+    tpm = getattr(embedder, "tokens_per_minute", None) or _env_float(
+        "VERBA_EMBEDDING_TPM", 0
+    )
+    max_concurrency = getattr(embedder, "max_concurrency", None) or int(
+        _env_float("VERBA_EMBEDDING_MAX_CONCURRENCY", 16)
+    )
+    return EmbeddingScheduler(
+        name,
+        requests_per_minute=rpm or None,
+        tokens_per_minute=tpm or None,
+        max_concurrency=max_concurrency,
+        max_retries=int(_env_float("VERBA_EMBEDDING_MAX_RETRIES", 5)),
+    )
@@ -0,0 +1,241 @@
+"""
+Fingerprints of ingested sources, to skip the work when nothing changed.
+
+Re-syncing a Git repository or a list of URLs downloaded, chunked, embedded
+and imported every item again. `FingerprintStore` keeps per source (a URL or
+a key like "github:owner/name@branch:path") the HTTP validators (ETag,
+Last-Modified), the revision (Git blob SHA) and the content hash of what was
+imported, with the title of the Verba document built from it:
+
+- Readers send conditional requests (`conditional_headers`) and skip Git
+  blobs whose SHA and import settings (`settings_hash`) did not change; a
+  source with no changes at all raises `SourceUnchanged`.
+- `VerbaManager.prepare_document` compares `document_hash` with the
+  `content_hash` saved in the meta of the stored document and raises
+  `DocumentUnchanged` instead of chunking, embedding and importing again.
+- Rows are written after a document was imported (`remember`) and dropped
+  when it is deleted (`forget_documents`), so a deleted document is imported
+  again on the next sync.
+- The store is local to the process and knows nothing about the Weaviate
+  deployment, so readers only trust the rows returned by
+  `stored_fingerprints`: the ones whose document the running import finds
+  in Weaviate (`verify_documents`). A switched deployment, a restored
+  backup or documents deleted elsewhere are imported again.
+
+Readers describe the source of a document in
+`document.meta["source_fingerprint"]` ({"source", "etag", "last_modified",
+"revision"}).
+
+Environment variables:
+- VERBA_FINGERPRINT_PATH: SQLite file ("memory" = not persisted)
+  (default: ~/.cache/verba/fingerprints.sqlite)
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional
+
+FIELDS = ("etag", "last_modified", "revision", "content_hash", "document_title")
+
+
+class DocumentUnchanged(Exception):
+    """The document and its import settings match the document already in Weaviate."""
+
+
+class SourceUnchanged(Exception):
+    """No item of the source changed since its last import."""
+
+
+def content_hash(data: str | bytes) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def settings_hash(fileConfig) -> str:
+    """Hash of the import settings of a file: labels, metadata and the
+    Chunker/Embedder configuration"""
+    settings = {}
+    for name in ("Chunker", "Embedder"):
+        component = fileConfig.rag_config.get(name)
+        if component is not None:
+            settings[name] = (
+                component.model_dump() if hasattr(component, "model_dump") else component
+            )
+    return content_hash(
+        json.dumps(
+            {"labels": fileConfig.labels, "metadata": fileConfig.metadata, "settings": settings},
+            sort_keys=True,
+            default=str,
+        )
+    )
+
+
+def document_hash(document, fileConfig) -> str:
+    """Hash of everything that determines the imported chunks: the content and
+    the import settings"""
+    return content_hash(document.content + "\0" + settings_hash(fileConfig))
+
+
+def stored_content_hash(properties: Optional[dict]) -> Optional[str]:
+    """`content_hash` from the meta of a stored document (as returned by get_document)"""
+    if not properties:
+        return None
+    try:
+        meta = json.loads(properties.get("meta") or "{}")
+    except (TypeError, ValueError):
+        return None
+    return meta.get("content_hash") if isinstance(meta, dict) else None
+
+
+def conditional_headers(fingerprint: Optional[dict]) -> dict:
+    """If-None-Match / If-Modified-Since headers for a previously fetched source"""
+    headers = {}
+    if fingerprint:
+        if fingerprint.get("etag"):
+            headers["If-None-Match"] = fingerprint["etag"]
+        if fingerprint.get("last_modified"):
+            headers["If-Modified-Since"] = fingerprint["last_modified"]
+    return headers
+
+
+def response_validators(headers) -> dict:
+    """ETag / Last-Modified of a response, from its headers mapping"""
+    return {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+
+
+class FingerprintStore:
+    """Source fingerprints in SQLite, one row per source."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        if path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "source TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, revision TEXT, "
+            "content_hash TEXT, document_title TEXT, updated_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS fingerprints_title ON fingerprints(document_title)"
+        )
+        self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> "FingerprintStore":
+        path = os.getenv("VERBA_FINGERPRINT_PATH", "~/.cache/verba/fingerprints.sqlite")
+        return cls(None if path == "memory" else os.path.expanduser(path))
+
+    def get(self, source: str) -> Optional[dict]:
+        return self.get_many([source]).get(source)
+
+    def get_many(self, sources: list[str]) -> dict[str, dict]:
+        found = {}
+        with self._lock:
+            for i in range(0, len(sources), 500):
+                part = sources[i : i + 500]
+                placeholders = ",".join("?" * len(part))
+                for row in self._db.execute(
+                    f"SELECT * FROM fingerprints WHERE source IN ({placeholders})", part
+                ):
+                    found[row["source"]] = dict(row)
+        return found
+
+    def record(self, source: str, **fields) -> None:
+        """Stores the fingerprint of a source, replacing the previous one"""
+        values = [fields.get(name) for name in FIELDS]
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO fingerprints (source, {', '.join(FIELDS)}, updated_at) "
+                f"VALUES (?, {', '.join('?' * len(FIELDS))}, ?)",
+                (source, *values, time.time()),
+            )
+            self._db.commit()
+
+    def remember(self, document) -> bool:
+        """Records the source of an imported document (no-op without `source_fingerprint`)"""
+        meta = getattr(document, "meta", None) or {}
+        fingerprint = meta.get("source_fingerprint")
+        if not isinstance(fingerprint, dict) or not fingerprint.get("source"):
+            return False
+        self.record(
+            fingerprint["source"],
+            etag=fingerprint.get("etag"),
+            last_modified=fingerprint.get("last_modified"),
+            revision=fingerprint.get("revision"),
+            content_hash=meta.get("content_hash"),
+            document_title=document.title,
+        )
+        return True
+
+    def forget_documents(self, titles: list[str]) -> int:
+        """Drops the fingerprints of deleted documents, so their sources are imported again"""
+        removed = 0
+        with self._lock:
+            for title in titles:
+                removed += self._db.execute(
+                    "DELETE FROM fingerprints WHERE document_title = ?", (title,)
+                ).rowcount
+            self._db.commit()
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM fingerprints")
+            self._db.commit()
+
+
+_store: Optional[FingerprintStore] = None
+
+# Set by the import around Reader.load (see `verify_documents`)
+_document_lookup: ContextVar[Optional[Callable[[list[str]], Awaitable[set[str]]]]] = (
+    ContextVar("fingerprint_document_lookup", default=None)
+)
+
+
+def get_fingerprint_store() -> FingerprintStore:
+    """Returns the process-wide fingerprint store (created on first use)."""
+    global _store
+    if _store is None:
+        _store = FingerprintStore.from_env()
+    return _store
+
+
+@contextmanager
+def verify_documents(lookup: Callable[[list[str]], Awaitable[set[str]]]):
+    """Within the block, `stored_fingerprints` keeps the sources whose document
+    title `lookup` returns (the titles stored in the Weaviate being imported to)"""
+    token = _document_lookup.set(lookup)
+    try:
+        yield
+    finally:
+        _document_lookup.reset(token)
+
+
+async def stored_fingerprints(sources: list[str]) -> dict[str, dict]:
+    """Fingerprints of `sources` whose document still exists in Weaviate.
+    Outside `verify_documents` nothing can be checked and none are returned."""
+    lookup = _document_lookup.get()
+    if lookup is None or not sources:
+        return {}
+    found = await asyncio.to_thread(get_fingerprint_store().get_many, sources)
+    titles = sorted({fp["document_title"] for fp in found.values() if fp.get("document_title")})
+    existing = await lookup(titles) if titles else set()
+    return {
+        source: fp for source, fp in found.items() if fp.get("document_title") in existing
+    }
@@ -122,42 +122,42 @@ class AnthropicGenerator(Generator):
             "max_tokens": 4096,
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                self.url,
-                json=data,
-                headers=headers,
-            ) as response:
-                if response.status != 200:
-                    error_json = await response.json()
-                    error_message = error_json.get("error", {}).get(
-                        "message", "Unknown error occurred"
-                    )
-                    yield {
-                        "message": f"Error: {error_message}",
-                        "finish_reason": "stop",
-                    }
-                    return
-
-                async for line in response.content:
-                    line = line.decode("utf-8").strip()
-                    if line.startswith("data: "):
-                        if line == "data: [DONE]":
-                            break
-                        json_line = json.loads(line[6:])
-                        if json_line["type"] == "content_block_delta":
-                            delta = json_line.get("delta", {})
-                            if delta.get("type") == "text_delta":
-                                text = delta.get("text", "")
-                                yield {
-                                    "message": text,
-                                    "finish_reason": None,
-                                }
-                        elif json_line.get("type") == "message_stop":
+        session = self.get_session(self.url)
+        async with session.post(
+            self.url,
+            json=data,
+            headers=headers,
+        ) as response:
+            if response.status != 200:
+                error_json = await response.json()
+                error_message = error_json.get("error", {}).get(
+                    "message", "Unknown error occurred"
+                )
+                yield {
+                    "message": f"Error: {error_message}",
+                    "finish_reason": "stop",
+                }
+                return
+
+            async for line in response.content:
+                line = line.decode("utf-8").strip()
+                if line.startswith("data: "):
+                    if line == "data: [DONE]":
+                        break
+                    json_line = json.loads(line[6:])
+                    if json_line["type"] == "content_block_delta":
+                        delta = json_line.get("delta", {})
+                        if delta.get("type") == "text_delta":
+                            text = delta.get("text", "")
                             yield {
-                                "message": "",
-                                "finish_reason": json_line.get("stop_reason", "stop"),
+                                "message": text,
+                                "finish_reason": None,
                             }
+                    elif json_line.get("type") == "message_stop":
+                        yield {
+                            "message": "",
+                            "finish_reason": json_line.get("stop_reason", "stop"),
+                        }
 
     def prepare_messages(
         self, query: str, context: str, conversation: list[dict]
@@ -74,19 +74,19 @@ class CohereGenerator(Generator):
         }
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.url + "/chat", json=data, headers=headers
-                ) as response:
-                    if response.status == 200:
-                        async for line in response.content:
-                            if line.strip():
-                                yield self._process_response(line)
-                    else:
-                        error_message = await response.text()
-                        yield self._error_response(
-                            f"HTTP Error {response.status}: {error_message}"
-                        )
+            session = self.get_session(self.url)
+            async with session.post(
+                self.url + "/chat", json=data, headers=headers
+            ) as response:
+                if response.status == 200:
+                    async for line in response.content:
+                        if line.strip():
+                            yield self._process_response(line)
+                else:
+                    error_message = await response.text()
+                    yield self._error_response(
+                        f"HTTP Error {response.status}: {error_message}"
+                    )
 
         except Exception as e:
             yield self._error_response(str(e))
@@ -67,40 +67,40 @@ class NovitaGenerator(Generator):
             "stream": True,
         }
 
-        async with aiohttp.ClientSession() as client:
-            async with client.post(
-                url=f"{novita_url}/chat/completions",
-                json=data,
-                headers=headers,
-                timeout=None,
-            ) as response:
-                if response.status == 200:
-                    async for line in response.content:
-                        if line.strip():
-                            line = line.decode("utf-8").strip()
-                            if line == "data: [DONE]":
-                                yield {"message": "", "finish_reason": "stop"}
-                            else:
-                                if line.startswith("data:"):
-                                    line = line[5:].strip()
-                                json_line = json.loads(line)
-                                choice = json_line.get("choices")[0]
-                                yield {
-                                    "message": choice.get("delta", {}).get(
-                                        "content", ""
-                                    ),
-                                    "finish_reason": (
-                                        "stop"
-                                        if choice.get("finish_reason", "") == "stop"
-                                        else ""
-                                    ),
-                                }
-                else:
-                    error_message = await response.text()
-                    yield {
-                        "message": f"HTTP Error {response.status}: {error_message}",
-                        "finish_reason": "stop",
-                    }
+        client = self.get_session(novita_url)
+        async with client.post(
+            url=f"{novita_url}/chat/completions",
+            json=data,
+            headers=headers,
+            timeout=None,
+        ) as response:
+            if response.status == 200:
+                async for line in response.content:
+                    if line.strip():
+                        line = line.decode("utf-8").strip()
+                        if line == "data: [DONE]":
+                            yield {"message": "", "finish_reason": "stop"}
+                        else:
+                            if line.startswith("data:"):
+                                line = line[5:].strip()
+                            json_line = json.loads(line)
+                            choice = json_line.get("choices")[0]
+                            yield {
+                                "message": choice.get("delta", {}).get(
+                                    "content", ""
+                                ),
+                                "finish_reason": (
+                                    "stop"
+                                    if choice.get("finish_reason", "") == "stop"
+                                    else ""
+                                ),
+                            }
+            else:
+                error_message = await response.text()
+                yield {
+                    "message": f"HTTP Error {response.status}: {error_message}",
+                    "finish_reason": "stop",
+                }
 
     def prepare_messages(
         self, query: str, context: str, conversation: list[dict], system_message: str
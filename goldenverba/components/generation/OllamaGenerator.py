@@ -46,13 +46,13 @@ class OllamaGenerator(Generator):
         data = {"model": model, "messages": messages}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(urljoin(self.url, "/api/chat"), json=data) as response:
-                    async for line in response.content:
-                        if line.strip():
-                            yield self._process_response(line)
-                        else:
-                            yield self._empty_response()
+            session = self.get_session(self.url)
+            async with session.post(urljoin(self.url, "/api/chat"), json=data) as response:
+                async for line in response.content:
+                    if line.strip():
+                        yield self._process_response(line)
+                    else:
+                        yield self._empty_response()
 
         except Exception as e:
             yield self._error_response(
@@ -81,31 +81,31 @@ class UpstageGenerator(Generator):
             "stream": True,
         }
 
-        async with httpx.AsyncClient() as client:
-            async with client.stream(
-                "POST",
-                f"{base_url}/chat/completions",
-                json=data,
-                headers=headers,
-                timeout=None,
-            ) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        if line.strip() == "data: [DONE]":
-                            break
-                        json_line = json.loads(line[6:])
-                        choice = json_line["choices"][0]
-                        if "delta" in choice and "content" in choice["delta"]:
-                            yield {
-                                "message": choice["delta"]["content"],
-                                "finish_reason": choice.get("finish_reason"),
-                            }
-                        elif "finish_reason" in choice:
-                            yield {
-                                "message": "",
-                                "finish_reason": choice["finish_reason"],
-                            }
+        client = self.get_http_client(base_url)
+        async with client.stream(
+            "POST",
+            f"{base_url}/chat/completions",
+            json=data,
+            headers=headers,
+            timeout=None,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    if line.strip() == "data: [DONE]":
+                        break
+                    json_line = json.loads(line[6:])
+                    choice = json_line["choices"][0]
+                    if "delta" in choice and "content" in choice["delta"]:
+                        yield {
+                            "message": choice["delta"]["content"],
+                            "finish_reason": choice.get("finish_reason"),
+                        }
+                    elif "finish_reason" in choice:
+                        yield {
+                            "message": "",
+                            "finish_reason": choice["finish_reason"],
+                        }
 
     def prepare_messages(
         self, query: str, context: str, conversation: list[dict], system_message: str
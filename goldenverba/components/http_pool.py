@@ -0,0 +1,228 @@
+"""
+Shared HTTP connection pool for Verba components.
+
+Every Reader, Embedder and Generator used to open a fresh
+`aiohttp.ClientSession()` per request, paying TCP + TLS handshakes on every
+embedding batch and chat turn. The pool keeps one session per base URL
+(scheme + host + port) with keep-alive, DNS caching and connection limits.
+Components get sessions through `VerbaComponent.get_session()` /
+`VerbaComponent.get_http_client()` and must not close them; the FastAPI
+lifespan closes the pool on shutdown.
+
+Environment variables:
+- VERBA_HTTP_POOL_LIMIT: max open connections per base URL (default: 100)
+- VERBA_HTTP_POOL_LIMIT_PER_HOST: max connections per host (default: 20)
+- VERBA_HTTP_KEEPALIVE: keep-alive timeout in seconds (default: 30)
+- VERBA_HTTP_DNS_TTL: DNS cache TTL in seconds (default: 300)
+"""
+
+import os
+import asyncio
+from typing import Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+import httpx
+from wasabi import msg
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def base_url_of(url: str) -> str:
+    """Returns scheme://host[:port] for a full URL."""
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url.rstrip("/")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class PoolStats:
+    """Counters for one base URL."""
+
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.queued = 0  # requests that waited for a free connection
+
+    def start(self):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def end(self):
+        self.in_flight = max(0, self.in_flight - 1)
+
+    def to_dict(self, limit: int) -> dict:
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "queued_for_connection": self.queued,
+            "saturation": round(self.in_flight / limit, 3) if limit else 0.0,
+        }
+
+
+class _CountingTransport(httpx.AsyncBaseTransport):
+    """Counts in-flight httpx requests, including the ones that fail or are cancelled."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: PoolStats):
+        self.transport = transport
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats.start()
+        try:
+            return await self.transport.handle_async_request(request)
+        finally:
+            self.stats.end()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class HTTPClientPool:
+    """One pooled aiohttp session (and httpx client) per base URL."""
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30,
+        dns_ttl: int = 300,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_ttl = dns_ttl
+        self._sessions: dict[str, aiohttp.ClientSession] = {}
+        self._httpx_clients: dict[str, httpx.AsyncClient] = {}
+        self._stats: dict[str, PoolStats] = {}
+
+    def _stats_for(self, base_url: str) -> PoolStats:
+        if base_url not in self._stats:
+            self._stats[base_url] = PoolStats()
+        return self._stats[base_url]
+
+    def _trace_config(self, stats: PoolStats) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            stats.start()
+
+        async def on_request_end(session, ctx, params):
+            stats.end()
+
+        async def on_request_exception(session, ctx, params):
+            stats.end()
+
+        async def on_connection_queued_start(session, ctx, params):
+            stats.queued += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            stats.connections_created += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            stats.connections_reused += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_queued_start.append(on_connection_queued_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace
+
+    def session(self, url: str) -> aiohttp.ClientSession:
+        """Returns the shared aiohttp session for the base URL of `url`."""
+        base_url = base_url_of(url)
+        session = self._sessions.get(base_url)
+        loop = asyncio.get_running_loop()
+        # Sessions are bound to the loop they were created on
+        if session is None or session.closed or session._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_ttl,
+                use_dns_cache=True,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector,
+                trace_configs=[self._trace_config(self._stats_for(base_url))],
+            )
+            self._sessions[base_url] = session
+        return session
+
+    def httpx_client(self, url: str) -> httpx.AsyncClient:
+        """Returns the shared httpx client (HTTP/2 when `h2` is installed)."""
+        base_url = base_url_of(url)
+        client = self._httpx_clients.get(base_url)
+        if client is None or client.is_closed:
+            transport = httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self.limit,
+                    max_keepalive_connections=self.limit_per_host,
+                    keepalive_expiry=self.keepalive_timeout,
+                ),
+            )
+            client = httpx.AsyncClient(
+                transport=_CountingTransport(transport, self._stats_for(base_url))
+            )
+            self._httpx_clients[base_url] = client
+        return client
+
+    def get_stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "http2": HTTP2_AVAILABLE,
+            "pools": {
+                base_url: stats.to_dict(self.limit_per_host)
+                for base_url, stats in self._stats.items()
+            },
+        }
+
+    async def close(self):
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        for client in self._httpx_clients.values():
+            if not client.is_closed:
+                await client.aclose()
+        self._sessions.clear()
+        self._httpx_clients.clear()
+        msg.info("HTTP connection pool closed")
+
+
+_pool: Optional[HTTPClientPool] = None
+
+
+def get_http_pool() -> HTTPClientPool:
+    """Returns the process-wide HTTP pool (created on first use)."""
+    global _pool
+    if _pool is None:
+        _pool = HTTPClientPool(
+            limit=int(os.getenv("VERBA_HTTP_POOL_LIMIT", "100")),
+            limit_per_host=int(os.getenv("VERBA_HTTP_POOL_LIMIT_PER_HOST", "20")),
+            keepalive_timeout=float(os.getenv("VERBA_HTTP_KEEPALIVE", "30")),
+            dns_ttl=int(os.getenv("VERBA_HTTP_DNS_TTL", "300")),
+        )
+    return _pool
+
+
+async def close_http_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -3,6 +3,7 @@ import os
 from goldenverba.components.document import Document
 from goldenverba.server.types import FileConfig
 from goldenverba.components.types import InputConfig
+from goldenverba.components.http_pool import get_http_pool
 
 from dotenv import load_dotenv
 
@@ -42,6 +43,16 @@ class VerbaComponent:
             "available": self.check_available(envs, libs),
         }
 
+    def get_session(self, url: str):
+        """Returns the pooled aiohttp session for the base URL of `url`.
+        The session is shared across components and must not be closed.
+        """
+        return get_http_pool().session(url)
+
+    def get_http_client(self, url: str):
+        """Returns the pooled httpx client for the base URL of `url` (must not be closed)."""
+        return get_http_pool().httpx_client(url)
+
     def check_available(self, envs, libs) -> bool:
         if self.requires_env:
             for _env in self.requires_env:
@@ -80,6 +91,14 @@ class Embedding(VerbaComponent):
     def __init__(self):
         super().__init__()
         self.max_batch_size = 128
+        # Per-request token ceiling (None = only max_batch_size applies)
+        self.max_batch_tokens = None
+        # Sort by length before batching to reduce padding (local models)
+        self.sort_by_length = False
+        # Provider limits used by the EmbeddingScheduler (None = env defaults)
+        self.requests_per_minute = None
+        self.tokens_per_minute = None
+        self.max_concurrency = None
 
     async def vectorize(self, config: dict, content: list[str]) -> list[float]:
         """Embed verba documents and its chunks to Weaviate
@@ -98,6 +117,8 @@ class Chunker(VerbaComponent):
     def __init__(self):
         super().__init__()
         self.config = {}
+        # True if the Chunker reads document.spacy_doc (parsed before chunking)
+        self.requires_spacy_doc = False
 
     async def chunk(
         self,
@@ -12,6 +12,7 @@ from weaviate.classes.query import Filter, Sort, MetadataQuery
 from weaviate.collections.classes.data import DataObject
 from weaviate.classes.aggregate import GroupByAggregate
 from weaviate.classes.init import AdditionalConfig, Timeout
+from weaviate.classes.config import Property, DataType, Tokenization
 
 import os
 import asyncio
@@ -26,10 +27,25 @@ from typing import Optional
 logging.getLogger("weaviate").setLevel(logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)  # HTTP requests também logam muito
 
-from sklearn.decomposition import PCA
-
-
-from goldenverba.components.document import Document
+from goldenverba.components.document import Document, aparse_documents
+from goldenverba.components.document_cache import DocumentMetadataCache
+from goldenverba.components.fingerprints import SourceUnchanged, get_fingerprint_store
+from goldenverba.components.collection_stats import CollectionStats
+from goldenverba.components.query_cache import (
+    QueryCache,
+    QUERY_CACHE_GENERATION_UUID,
+)
+from goldenverba.components.suggestions import SuggestionIndexes, SuggestionWriter
+from goldenverba.components.schema_cache import (
+    collection_exists,
+    invalidate_collection,
+    mark_collection_created,
+)
+from goldenverba.components.projection import (
+    ProjectionStore,
+    as_matrix,
+    get_projection_batch_size,
+)
 from goldenverba.components.interfaces import (
     Reader,
     Chunker,
@@ -71,6 +87,12 @@ from goldenverba.components.embedding.VoyageAIEmbedder import VoyageAIEmbedder
 from goldenverba.components.embedding.SentenceTransformersEmbedder import (
     SentenceTransformersEmbedder,
 )
+from goldenverba.components.embedding.batching import plan_batches, restore_order
+from goldenverba.components.weaviate_writer import ChunkWriter
+from goldenverba.components.embedding.scheduler import (
+    EmbeddingScheduler,
+    create_scheduler,
+)
 
 # Import Retrievers
 from goldenverba.components.retriever.WindowRetriever import WindowRetriever
@@ -89,6 +111,12 @@ try:
 except Exception:
     msg.warn("tiktoken not installed, your base installation might be corrupted.")
 
+# Shared embedding cache (optional extension)
+try:
+    from verba_extensions.utils.embeddings_cache import get_embedding_cache
+except ImportError:
+    get_embedding_cache = None
+
 ### Add new components here ###
 
 production = os.getenv("VERBA_PRODUCTION")
@@ -176,6 +204,13 @@ class WeaviateManager:
         self.config_collection_name = "VERBA_CONFIGURATION"
         self.suggestion_collection_name = "VERBA_SUGGESTIONS"
         self.embedding_table = {}
+        self.cache_table = {}
+        self.projections = ProjectionStore()
+        self.document_cache = DocumentMetadataCache.from_env()
+        self.query_cache = QueryCache.from_env()
+        self.suggestion_writer = SuggestionWriter.from_env(self.write_suggestions)
+        self.suggestion_indexes = SuggestionIndexes.from_env(self.load_suggestions)
+        self.collection_stats = CollectionStats.from_env(self.load_collection_stats)
 
     ### Connection Handling
 
@@ -599,53 +634,83 @@ class WeaviateManager:
     async def verify_collection(
         self, client: WeaviateAsyncClient, collection_name: str
     ):
-        if not await client.collections.exists(collection_name):
-            msg.info(
-                f"Collection: {collection_name} does not exist, creating new collection."
-            )
-            
-            # Se é uma collection de embedding, cria com schema ETL-aware completo
-            if "VERBA_Embedding" in collection_name:
-                try:
-                    # Tenta importar schema updater para criar com propriedades ETL
-                    from verba_extensions.integration.schema_updater import get_all_embedding_properties
-                    all_properties = get_all_embedding_properties()
-                    msg.info(f"🔧 Criando collection {collection_name} com schema ETL-aware completo ({len(all_properties)} propriedades)")
-                    returned_collection = await client.collections.create(
-                        name=collection_name,
-                        properties=all_properties
-                    )
-                    if returned_collection:
-                        msg.good(f"✅ Collection {collection_name} criada com schema ETL-aware completo!")
-                        return True
-                    else:
-                        return False
-                except ImportError:
-                    # Se schema updater não estiver disponível, cria collection padrão
-                    msg.warn(f"⚠️ Schema updater não disponível - criando collection padrão (sem propriedades ETL)")
-                    returned_collection = await client.collections.create(name=collection_name)
-                    if returned_collection:
-                        return True
-                    else:
-                        return False
-                except Exception as e:
-                    # Se falhar, tenta criar collection padrão como fallback
-                    msg.warn(f"⚠️ Erro ao criar collection com schema ETL-aware: {str(e)}")
-                    msg.warn(f"   💡 Tentando criar collection padrão como fallback...")
-                    returned_collection = await client.collections.create(name=collection_name)
-                    if returned_collection:
-                        return True
-                    else:
-                        return False
-            else:
-                # Para collections não-embedding, cria normalmente
+        # Existence is cached per client, so this is free on the hot path
+        if await collection_exists(client, collection_name):
+            return True
+        created = await self._create_collection(client, collection_name)
+        if created:
+            mark_collection_created(client, collection_name)
+        return created
+
+    async def _create_collection(
+        self, client: WeaviateAsyncClient, collection_name: str
+    ) -> bool:
+        msg.info(
+            f"Collection: {collection_name} does not exist, creating new collection."
+        )
+        
+        # Se é uma collection de embedding, cria com schema ETL-aware completo
+        if "VERBA_Embedding" in collection_name:
+            try:
+                # Tenta importar schema updater para criar com propriedades ETL
+                from verba_extensions.integration.schema_updater import get_all_embedding_properties
+                all_properties = get_all_embedding_properties()
+                msg.info(f"🔧 Criando collection {collection_name} com schema ETL-aware completo ({len(all_properties)} propriedades)")
+                returned_collection = await client.collections.create(
+                    name=collection_name,
+                    properties=all_properties
+                )
+                if returned_collection:
+                    msg.good(f"✅ Collection {collection_name} criada com schema ETL-aware completo!")
+                    return True
+                else:
+                    return False
+            except ImportError:
+                # Se schema updater não estiver disponível, cria collection padrão
+                msg.warn(f"⚠️ Schema updater não disponível - criando collection padrão (sem propriedades ETL)")
+                returned_collection = await client.collections.create(name=collection_name)
+                if returned_collection:
+                    return True
+                else:
+                    return False
+            except Exception as e:
+                # Se falhar, tenta criar collection padrão como fallback
+                msg.warn(f"⚠️ Erro ao criar collection com schema ETL-aware: {str(e)}")
+                msg.warn(f"   💡 Tentando criar collection padrão como fallback...")
                 returned_collection = await client.collections.create(name=collection_name)
                 if returned_collection:
                     return True
                 else:
                     return False
+        elif collection_name.startswith("VERBA_Cache_"):
+            # Semantic query cache: only scope and generation are filtered on
+            returned_collection = await client.collections.create(
+                name=collection_name,
+                properties=[
+                    Property(name="query", data_type=DataType.TEXT),
+                    Property(
+                        name="scope",
+                        data_type=DataType.TEXT,
+                        tokenization=Tokenization.FIELD,
+                        index_searchable=False,
+                    ),
+                    Property(name="generation", data_type=DataType.INT),
+                    Property(
+                        name="result",
+                        data_type=DataType.TEXT,
+                        index_filterable=False,
+                        index_searchable=False,
+                    ),
+                ],
+            )
+            return bool(returned_collection)
         else:
-            return True
+            # Para collections não-embedding, cria normalmente
+            returned_collection = await client.collections.create(name=collection_name)
+            if returned_collection:
+                return True
+            else:
+                return False
 
     def _normalize_embedder_name(self, embedder: str) -> str:
         """Normalize embedder name to create a valid collection name.
@@ -710,12 +775,10 @@ class WeaviateManager:
             return True
 
     async def verify_cache_collection(self, client: WeaviateAsyncClient, embedder):
-        if embedder not in self.embedding_table:
+        if embedder not in self.cache_table:
             normalized = self._normalize_embedder_name(embedder)
-            self.embedding_table[embedder] = "VERBA_Cache_" + normalized
-            return await self.verify_collection(client, self.embedding_table[embedder])
-        else:
-            return True
+            self.cache_table[embedder] = "VERBA_Cache_" + normalized
+        return await self.verify_collection(client, self.cache_table[embedder])
 
     async def verify_embedding_collections(
         self, client: WeaviateAsyncClient, environment_variables, libraries
@@ -794,8 +857,7 @@ class WeaviateManager:
             ### Import Document
             document_obj = Document.to_json(document)
             doc_uuid = await document_collection.data.insert(document_obj)
-
-            chunk_ids = []
+            self.document_cache.invalidate(doc_uuid)
 
             # Validate that document has chunks before attempting import
             if not document.chunks or len(document.chunks) == 0:
@@ -808,42 +870,46 @@ class WeaviateManager:
                 )
 
             try:
-                for chunk in document.chunks:
+                # Update the embedder's projection model and place chunks in its space
+                projected = await self.projections.fit_transform(
+                    client, self, embedder, [chunk.vector for chunk in document.chunks]
+                )
+                for chunk, pca in zip(document.chunks, projected.tolist()):
                     chunk.doc_uuid = doc_uuid
                     chunk.labels = document.labels
                     chunk.title = document.title
+                    chunk.pca = pca
 
-                chunk_response = await embedder_collection.data.insert_many(
-                    [
-                        DataObject(properties=chunk.to_json(), vector=chunk.vector)
-                        for chunk in document.chunks
-                    ]
+                # Stream chunks in bounded batches; counts come from the batch results
+                writer = ChunkWriter.from_env(embedder_collection)
+                result = await writer.write(
+                    DataObject(properties=chunk.to_json(), vector=chunk.vector)
+                    for chunk in document.chunks
                 )
-                chunk_ids = [
-                    chunk_response.uuids[uuid] for uuid in chunk_response.uuids
-                ]
 
-                if chunk_response.has_errors:
+                if result.errors:
                     raise Exception(
-                        f"Failed to ingest chunks into Weaviate: {chunk_response.errors}"
+                        f"Failed to ingest {len(result.errors)} chunks into Weaviate: {result.errors[:3]}"
                     )
-
-                if doc_uuid and chunk_response:
-                    response = await embedder_collection.aggregate.over_all(
-                        filters=Filter.by_property("doc_uuid").equal(doc_uuid),
-                        total_count=True,
+                if result.inserted != len(document.chunks):
+                    raise Exception(
+                        f"Chunk Mismatch detected after importing: Imported:{result.inserted} | Existing: {len(document.chunks)}"
                     )
-                    if response.total_count != len(document.chunks):
-                        await document_collection.data.delete_by_id(doc_uuid)
-                        for _id in chunk_ids:
-                            await embedder_collection.data.delete_by_id(_id)
-                        raise Exception(
-                            f"Chunk Mismatch detected after importing: Imported:{response.total_count} | Existing: {len(document.chunks)}"
-                        )
+                msg.info(
+                    f"[INGEST] Imported {result.inserted} chunks of '{document.title}' in {result.batches} batches ({result.retries} retries)"
+                )
+                self.collection_stats.add_document(
+                    client, embedder, doc_uuid, result.inserted
+                )
+                await self.bump_cache_generation(client)
+                return doc_uuid
 
             except Exception as e:
-                if doc_uuid:
-                    await self.delete_document(client, doc_uuid)
+                # Single filtered delete instead of one request per chunk
+                await embedder_collection.data.delete_many(
+                    where=Filter.by_property("doc_uuid").equal(doc_uuid)
+                )
+                await document_collection.data.delete_by_id(doc_uuid)
                 raise Exception(f"Chunk import failed with : {str(e)}")
 
     ### Document CRUD
@@ -864,10 +930,31 @@ class WeaviateManager:
 
             return None
 
+    async def existing_document_titles(
+        self, client: WeaviateAsyncClient, titles: list[str]
+    ) -> set[str]:
+        """Titles of `titles` that have a document in this deployment"""
+        if not titles or not await self.verify_collection(
+            client, self.document_collection_name
+        ):
+            return set()
+        document_collection = client.collections.get(self.document_collection_name)
+        documents = await document_collection.query.fetch_objects(
+            filters=Filter.by_property("title").contains_any(titles),
+            return_properties=["title"],
+            limit=len(titles),
+        )
+        return {document.properties["title"] for document in documents.objects}
+
     async def delete_document(self, client: WeaviateAsyncClient, uuid: str):
+        await self._delete_document(client, uuid)
+        await self.bump_cache_generation(client)
+
+    async def _delete_document(self, client: WeaviateAsyncClient, uuid: str):
         if await self.verify_collection(client, self.document_collection_name):
             document_collection = client.collections.get(self.document_collection_name)
 
+            self.document_cache.invalidate(uuid)
             if not await document_collection.data.exists(uuid):
                 return
 
@@ -885,24 +972,41 @@ class WeaviateManager:
                     await embedder_collection.data.delete_many(
                         where=Filter.by_property("doc_uuid").equal(uuid)
                     )
+                    self.collection_stats.remove_document(client, embedder, uuid)
+                    # The next sync of its source has to import it again
+                    await asyncio.to_thread(
+                        get_fingerprint_store().forget_documents,
+                        [document_obj.properties.get("title", "")],
+                    )
 
     async def delete_all_documents(self, client: WeaviateAsyncClient):
         if await self.verify_collection(client, self.document_collection_name):
             document_collection = client.collections.get(self.document_collection_name)
             async for item in document_collection.iterator():
-                await self.delete_document(client, item.uuid)
+                await self._delete_document(client, item.uuid)
+            self.document_cache.clear()
+            await self.bump_cache_generation(client)
 
     async def delete_all_configs(self, client: WeaviateAsyncClient):
         if await self.verify_collection(client, self.config_collection_name):
             config_collection = client.collections.get(self.config_collection_name)
             async for item in config_collection.iterator():
                 await config_collection.data.delete_by_id(item.uuid)
+            self.projections.reset()
 
     async def delete_all(self, client: WeaviateAsyncClient):
+        self.projections.reset()
+        get_fingerprint_store().clear()
+        self.document_cache.clear()
+        self.query_cache.clear()
+        self.suggestion_indexes.invalidate(client)
+        self.suggestion_writer.forget()
         node_payload, collection_payload = await self.get_metadata(client)
         for collection in collection_payload["collections"]:
             if "VERBA" in collection["name"]:
                 await client.collections.delete(collection["name"])
+        invalidate_collection(client)
+        self.collection_stats.invalidate(client)
 
     async def get_documents(
         self,
@@ -980,6 +1084,40 @@ class WeaviateManager:
                 # Silently return None to avoid log spam
                 return None
 
+    async def get_documents_metadata(
+        self, client: WeaviateAsyncClient, uuids: list[str]
+    ) -> dict[str, dict]:
+        """Title and metadata of several documents, from the cache or one filtered query
+        @returns dict - {doc_uuid: {"title", "metadata"}}, without documents that do not exist
+        """
+        documents = {}
+        missing = []
+        for uuid in dict.fromkeys(str(uuid) for uuid in uuids):
+            cached = self.document_cache.get(uuid)
+            if cached is not None:
+                documents[uuid] = cached
+            else:
+                missing.append(uuid)
+
+        if missing and await self.verify_collection(
+            client, self.document_collection_name
+        ):
+            document_collection = client.collections.get(self.document_collection_name)
+            response = await document_collection.query.fetch_objects(
+                filters=Filter.by_id().contains_any(missing),
+                limit=len(missing),
+                return_properties=["title", "metadata"],
+            )
+            for item in response.objects:
+                document = {
+                    "title": item.properties.get("title", ""),
+                    "metadata": item.properties.get("metadata", ""),
+                }
+                self.document_cache.set(str(item.uuid), document)
+                documents[str(item.uuid)] = document
+
+        return documents
+
     ### Labels
 
     async def get_labels(self, client: WeaviateAsyncClient) -> list[str]:
@@ -1052,6 +1190,7 @@ class WeaviateManager:
 
         if await self.verify_embedding_collection(client, embedder):
             embedder_collection = client.collections.get(self.embedding_table[embedder])
+            projection = await self.projections.get(client, self, embedder)
 
             if not showAll:
                 batch_size = 250
@@ -1083,14 +1222,26 @@ class WeaviateManager:
 
                 dimensions = len(all_chunks[0].vector["default"])
 
+                if (
+                    projection is not None
+                    and projection.fitted
+                    and projection.dimensions == dimensions
+                ):
+                    # Same space as the "show all" view, whenever the chunk was imported
+                    coordinates = projection.transform(
+                        [item.vector["default"] for item in all_chunks]
+                    ).tolist()
+                else:
+                    coordinates = [item.properties["pca"] for item in all_chunks]
+
                 chunks = [
                     {
                         "vector": {"x": pca[0], "y": pca[1], "z": pca[2]},
                         "uuid": str(item.uuid),
                         "chunk_id": item.properties["chunk_id"],
                     }
-                    for item in all_chunks
-                    if (pca := item.properties["pca"]) is not None
+                    for item, pca in zip(all_chunks, coordinates)
+                    if pca is not None
                 ]
                 return {
                     "embedder": embedder,
@@ -1098,74 +1249,103 @@ class WeaviateManager:
                     "groups": [{"name": document["title"], "chunks": chunks}],
                 }
 
-            # Generate PCA for all embeddings
+            # Project all embeddings in streamed batches
             else:
-                vector_map = {}
-                vector_list, vector_ids, vector_chunk_uuids, vector_chunk_ids = (
-                    [],
-                    [],
-                    [],
-                    [],
-                )
-                dimensions = 0
-
-                async for item in embedder_collection.iterator(include_vector=True):
-                    doc_uuid = item.properties["doc_uuid"]
-                    chunk_uuid = item.uuid
-                    if doc_uuid not in vector_map:
-                        _document = await self.get_document(client, doc_uuid)
-                        if _document:
-                            vector_map[doc_uuid] = {
-                                "name": _document["title"],
-                                "chunks": [],
-                            }
-                        else:
-                            continue
-                    vector_list.append(item.vector["default"])
-                    dimensions = len(item.vector["default"])
-                    vector_ids.append(doc_uuid)
-                    vector_chunk_uuids.append(chunk_uuid)
-                    vector_chunk_ids.append(item.properties["chunk_id"])
-
-                if len(vector_ids) > 3:
-                    pca = PCA(n_components=3)
-                    generated_pca_embeddings = pca.fit_transform(vector_list)
-                    pca_embeddings = [
-                        pca_.tolist() for pca_ in generated_pca_embeddings
-                    ]
-
-                    for pca_embedding, _uuid, _chunk_uuid, _chunk_id in zip(
-                        pca_embeddings,
-                        vector_ids,
-                        vector_chunk_uuids,
-                        vector_chunk_ids,
+                batch_size = get_projection_batch_size()
+
+                if projection is None or not projection.fitted:
+                    # Chunks imported before projections were stored: fit in a first pass
+                    async for vectors, _ in self._iterate_vector_batches(
+                        embedder_collection, batch_size
                     ):
-                        vector_map[_uuid]["chunks"].append(
-                            {
-                                "vector": {
-                                    "x": pca_embedding[0],
-                                    "y": pca_embedding[1],
-                                    "z": pca_embedding[2],
-                                },
-                                "uuid": str(_chunk_uuid),
-                                "chunk_id": _chunk_id,
-                            }
-                        )
+                        if projection is None:
+                            projection = await self.projections.get(
+                                client, self, embedder, vectors.shape[1]
+                            )
+                        projection.partial_fit(vectors)
+                    if projection is not None:
+                        await self.projections.save(client, self, embedder)
 
+                if projection is None:
                     return {
                         "embedder": embedder,
-                        "dimensions": dimensions,
-                        "groups": list(vector_map.values()),
-                    }
-                else:
-                    return {
-                        "embedder": embedder,
-                        "dimensions": dimensions,
+                        "dimensions": 0,
                         "groups": [],
                     }
 
+                vector_map = {}
+                missing_documents = set()
+
+                async for vectors, items in self._iterate_vector_batches(
+                    embedder_collection, batch_size
+                ):
+                    doc_uuids = [str(item.properties["doc_uuid"]) for item in items]
+                    unknown = {
+                        doc_uuid
+                        for doc_uuid in doc_uuids
+                        if doc_uuid not in vector_map
+                        and doc_uuid not in missing_documents
+                    }
+                    if unknown:
+                        titles = await self._get_document_titles(client, list(unknown))
+                        for doc_uuid in unknown:
+                            if doc_uuid in titles:
+                                vector_map[doc_uuid] = {
+                                    "name": titles[doc_uuid],
+                                    "chunks": [],
+                                }
+                            else:
+                                missing_documents.add(doc_uuid)
+
+                    for item, doc_uuid, pca in zip(
+                        items, doc_uuids, projection.transform(vectors).tolist()
+                    ):
+                        if doc_uuid not in vector_map:
+                            continue
+                        vector_map[doc_uuid]["chunks"].append(
+                            {
+                                "vector": {"x": pca[0], "y": pca[1], "z": pca[2]},
+                                "uuid": str(item.uuid),
+                                "chunk_id": item.properties["chunk_id"],
+                            }
+                        )
+
+                return {
+                    "embedder": embedder,
+                    "dimensions": projection.dimensions,
+                    "groups": list(vector_map.values()),
+                }
+
         return None
 
+    async def _iterate_vector_batches(self, collection, batch_size: int):
+        """Yields (float32 vector matrix, objects) batches over a whole embedding collection"""
+        items, vectors = [], []
+        async for item in collection.iterator(
+            include_vector=True,
+            return_properties=["doc_uuid", "chunk_id"],
+            cache_size=batch_size,
+        ):
+            vectors.append(item.vector["default"])
+            items.append(item)
+            if len(items) >= batch_size:
+                yield as_matrix(vectors), items
+                items, vectors = [], []
+        if items:
+            yield as_matrix(vectors), items
+
+    async def _get_document_titles(
+        self, client: WeaviateAsyncClient, uuids: list[str]
+    ) -> dict[str, str]:
+        """Resolves the titles of several documents in one request"""
+        document_collection = client.collections.get(self.document_collection_name)
+        response = await document_collection.query.fetch_objects(
+            filters=Filter.by_id().contains_any(uuids),
+            limit=len(uuids),
+            return_properties=["title"],
+        )
+        return {str(item.uuid): item.properties["title"] for item in response.objects}
+
     async def hybrid_chunks(
         self,
         client: WeaviateAsyncClient,
@@ -1339,31 +1519,121 @@ class WeaviateManager:
                 msg.fail(f"Failed to fetch chunks: {str(e)}")
                 raise e
 
+    async def get_chunks_by_doc_ids(
+        self, client: WeaviateAsyncClient, embedder: str, ids_by_doc: dict
+    ) -> dict[str, list]:
+        """Chunks of several documents in one OR-filtered query
+        @parameter: ids_by_doc : dict - {doc_uuid: chunk_ids}
+        @returns dict - {doc_uuid: chunks sorted by chunk_id}
+        """
+        ids_by_doc = {str(doc): list(ids) for doc, ids in ids_by_doc.items() if ids}
+        if not ids_by_doc:
+            return {}
+        if await self.verify_embedding_collection(client, embedder):
+            embedder_collection = client.collections.get(self.embedding_table[embedder])
+            try:
+                weaviate_chunks = await embedder_collection.query.fetch_objects(
+                    filters=Filter.any_of(
+                        [
+                            Filter.by_property("doc_uuid").equal(doc)
+                            & Filter.by_property("chunk_id").contains_any(ids)
+                            for doc, ids in ids_by_doc.items()
+                        ]
+                    ),
+                    limit=sum(len(ids) for ids in ids_by_doc.values()),
+                    sort=Sort.by_property("chunk_id", ascending=True),
+                )
+            except Exception as e:
+                msg.fail(f"Failed to fetch chunks: {str(e)}")
+                raise e
+            chunks_by_doc = {doc: [] for doc in ids_by_doc}
+            for chunk in weaviate_chunks.objects:
+                doc = str(chunk.properties.get("doc_uuid"))
+                if doc in chunks_by_doc:
+                    chunks_by_doc[doc].append(chunk)
+            return chunks_by_doc
+        return {}
+
     ### Suggestion Logic
 
     async def add_suggestion(self, client: WeaviateAsyncClient, query: str):
+        """Queues `query` for the background suggestion writer"""
+        self.suggestion_writer.record(client, query)
+
+    async def write_suggestions(
+        self, client: WeaviateAsyncClient, queries: list[str]
+    ) -> list[dict]:
+        """Inserts the queries that are not suggestions yet in one batch"""
+        if not await self.verify_collection(client, self.suggestion_collection_name):
+            return []
+        suggestion_collection = client.collections.get(self.suggestion_collection_name)
+        existing = await suggestion_collection.query.fetch_objects(
+            filters=Filter.any_of(
+                [Filter.by_property("query").equal(query) for query in queries]
+            ),
+            limit=len(queries) * 10,
+            return_properties=["query"],
+        )
+        existing_queries = {item.properties["query"] for item in existing.objects}
+
+        timestamp = datetime.now().isoformat()
+        objects = [
+            DataObject(properties={"query": query, "timestamp": timestamp})
+            for query in queries
+            if query not in existing_queries
+        ]
+        if not objects:
+            return []
+        response = await suggestion_collection.data.insert_many(objects)
+        written = [
+            {
+                "query": objects[index].properties["query"],
+                "timestamp": timestamp,
+                "uuid": str(uuid),
+            }
+            for index, uuid in response.uuids.items()
+        ]
+        trie = self.suggestion_indexes.peek(client)
+        if trie is not None:
+            for suggestion in written:
+                trie.add(suggestion)
+        return written
+
+    async def load_suggestions(
+        self, client: WeaviateAsyncClient, limit: int
+    ) -> list[dict]:
+        """Up to `limit` suggestions, to build the autocomplete index"""
+        suggestions = []
         if await self.verify_collection(client, self.suggestion_collection_name):
             suggestion_collection = client.collections.get(
                 self.suggestion_collection_name
             )
-            aggregation = await suggestion_collection.aggregate.over_all(
-                total_count=True
-            )
-            if aggregation.total_count > 0:
-                does_suggestion_exists = (
-                    await suggestion_collection.query.fetch_objects(
-                        filters=Filter.by_property("query").equal(query)
-                    )
+            async for suggestion in suggestion_collection.iterator(
+                return_properties=["query", "timestamp"]
+            ):
+                suggestions.append(
+                    {
+                        "query": suggestion.properties["query"],
+                        "timestamp": suggestion.properties["timestamp"],
+                        "uuid": str(suggestion.uuid),
+                    }
                 )
-                if len(does_suggestion_exists.objects) > 0:
-                    return
-            await suggestion_collection.data.insert(
-                {"query": query, "timestamp": datetime.now().isoformat()}
-            )
+                if len(suggestions) >= limit:
+                    break
+        return suggestions
 
     async def retrieve_suggestions(
         self, client: WeaviateAsyncClient, query: str, limit: int
     ):
+        # Served from the in-memory prefix index once it is built (in the background)
+        # and unless it could not hold every suggestion
+        try:
+            trie = self.suggestion_indexes.ready(client)
+            if trie is not None and len(trie) < self.suggestion_indexes.max_entries:
+                return trie.search(query, limit)
+        except Exception as e:
+            msg.warn(f"Suggestion index unavailable, using BM25: {str(e)}")
+
         if await self.verify_collection(client, self.suggestion_collection_name):
             suggestion_collection = client.collections.get(
                 self.suggestion_collection_name
@@ -1413,51 +1683,138 @@ class WeaviateManager:
                 self.suggestion_collection_name
             )
             await suggestion_collection.data.delete_by_id(uuid)
+            trie = self.suggestion_indexes.peek(client)
+            if trie is not None:
+                suggestion = trie.suggestions.get(str(uuid))
+                if suggestion is not None:
+                    self.suggestion_writer.forget(suggestion["query"])
+                trie.remove(str(uuid))
 
     async def delete_all_suggestions(self, client: WeaviateAsyncClient):
         if await self.verify_collection(client, self.suggestion_collection_name):
             await client.collections.delete(self.suggestion_collection_name)
+            invalidate_collection(client, self.suggestion_collection_name)
+            self.suggestion_indexes.invalidate(client)
+            self.suggestion_writer.forget()
 
     ### Cache Logic
 
-    # TODO: Implement Cache Logic
+    async def get_cache_generation(self, client: WeaviateAsyncClient) -> int:
+        """Current query cache generation, re-read from the config collection periodically"""
+        if self.query_cache.generation_stale():
+            state = await self.get_config(client, QUERY_CACHE_GENERATION_UUID)
+            self.query_cache.set_generation(int(state["generation"]) if state else 0)
+        return self.query_cache.generation
+
+    async def bump_cache_generation(self, client: WeaviateAsyncClient):
+        """Invalidates cached query results after the data changed"""
+        if not self.query_cache.enabled:
+            return
+        try:
+            state = await self.get_config(client, QUERY_CACHE_GENERATION_UUID)
+            generation = (int(state["generation"]) if state else 0) + 1
+            await self.set_config(
+                client, QUERY_CACHE_GENERATION_UUID, {"generation": generation}
+            )
+            self.query_cache.set_generation(generation)
+            for collection_name in self.cache_table.values():
+                if await collection_exists(client, collection_name):
+                    await client.collections.get(collection_name).data.delete_many(
+                        where=Filter.by_property("generation").less_than(generation)
+                    )
+        except Exception as e:
+            # Still drop local results; other processes catch up on their next refresh
+            self.query_cache.clear()
+            msg.warn(f"Failed to bump query cache generation: {str(e)}")
+
+    async def get_cached_query(
+        self,
+        client: WeaviateAsyncClient,
+        embedder: str,
+        vector: list[float],
+        scope: str,
+        generation: int,
+        min_similarity: float,
+    ) -> Optional[tuple[str, float]]:
+        """Closest cached query in the same scope and generation
+        @returns tuple - (encoded result, cosine similarity) or None below min_similarity
+        """
+        if await self.verify_cache_collection(client, embedder):
+            cache_collection = client.collections.get(self.cache_table[embedder])
+            response = await cache_collection.query.near_vector(
+                near_vector=vector,
+                limit=1,
+                filters=(
+                    Filter.by_property("scope").equal(scope)
+                    & Filter.by_property("generation").equal(generation)
+                ),
+                return_properties=["result"],
+                return_metadata=MetadataQuery(distance=True),
+            )
+            if response.objects:
+                similarity = 1 - response.objects[0].metadata.distance
+                if similarity >= min_similarity:
+                    return response.objects[0].properties["result"], similarity
+        return None
+
+    async def add_cached_query(
+        self,
+        client: WeaviateAsyncClient,
+        embedder: str,
+        query: str,
+        vector: list[float],
+        scope: str,
+        generation: int,
+        result: str,
+    ):
+        if await self.verify_cache_collection(client, embedder):
+            cache_collection = client.collections.get(self.cache_table[embedder])
+            await cache_collection.data.insert(
+                properties={
+                    "query": query,
+                    "scope": scope,
+                    "generation": generation,
+                    "result": result,
+                },
+                vector=vector,
+            )
 
     ### Metadata Retrieval
 
+    async def load_collection_stats(
+        self, client: WeaviateAsyncClient, embedder: str
+    ) -> dict[str, int]:
+        """Chunk count per document of the embedder's collection, in one aggregate"""
+        normalized = self._normalize_embedder_name(embedder)
+        if normalized == "unknown":
+            msg.warn(f"Invalid embedder name: {embedder}, returning 0")
+            return {}
+
+        if embedder not in self.embedding_table:
+            self.embedding_table[embedder] = "VERBA_Embedding_" + normalized
+        collection_name = self.embedding_table[embedder]
+
+        if not await collection_exists(client, collection_name):
+            return {}
+
+        embedder_collection = client.collections.get(collection_name)
+        response = await embedder_collection.aggregate.over_all(
+            group_by=GroupByAggregate(prop="doc_uuid"),
+            total_count=True,
+        )
+        return {
+            str(group.grouped_by.value): group.total_count
+            for group in response.groups
+        }
+
     async def get_datacount(
         self, client: WeaviateAsyncClient, embedder: str, document_uuids: list[str] = []
     ) -> int:
         try:
-            # Validate embedder name first
-            normalized = self._normalize_embedder_name(embedder)
-            if normalized == "unknown":
-                msg.warn(f"Invalid embedder name: {embedder}, returning 0")
-                return 0
-            
-            # Verify collection exists
-            if embedder not in self.embedding_table:
-                self.embedding_table[embedder] = "VERBA_Embedding_" + normalized
-            
-            collection_name = self.embedding_table[embedder]
-            
-            # Check if collection exists before querying
-            if not await client.collections.exists(collection_name):
-                msg.warn(f"Collection {collection_name} does not exist, returning 0")
-                return 0
-            
-            embedder_collection = client.collections.get(collection_name)
-
+            stats = await self.collection_stats.get(client, embedder)
             if document_uuids:
-                filters = Filter.by_property("doc_uuid").contains_any(document_uuids)
-            else:
-                filters = None
-            
-            response = await embedder_collection.aggregate.over_all(
-                filters=filters,
-                group_by=GroupByAggregate(prop="doc_uuid"),
-                total_count=True,
-            )
-            return len(response.groups)
+                return stats.count_documents(document_uuids)
+            return stats.document_count
         except Exception as e:
             msg.fail(f"Failed to retrieve data count: Query call with protocol GQL Aggregate failed with message {str(e)}")
             return 0
@@ -1465,6 +1822,11 @@ class WeaviateManager:
     async def get_chunk_count(
         self, client: WeaviateAsyncClient, embedder: str, doc_uuid: str
     ) -> int:
+        stats = await self.collection_stats.get(client, embedder)
+        if doc_uuid in stats.chunks_by_doc:
+            return stats.chunks_by_doc[doc_uuid]
+
+        # Imported by another process since the stats were loaded
         if await self.verify_embedding_collection(client, embedder):
             embedder_collection = client.collections.get(self.embedding_table[embedder])
             response = await embedder_collection.aggregate.over_all(
@@ -1473,7 +1835,9 @@ class WeaviateManager:
                 total_count=True,
             )
             if response.groups:
-                return response.groups[0].total_count
+                total_count = response.groups[0].total_count
+                self.collection_stats.add_document(client, embedder, doc_uuid, total_count)
+                return total_count
             else:
                 return 0
 
@@ -1519,6 +1883,8 @@ class ReaderManager:
             else:
                 raise Exception(f"{reader} Reader not found")
 
+        except SourceUnchanged:
+            raise
         except Exception as e:
             raise Exception(f"Reader {reader} failed with: {str(e)}")
 
@@ -1542,6 +1908,10 @@ class ChunkerManager:
             start_time = loop.time()
             if chunker in self.chunkers:
                 config = fileConfig.rag_config["Chunker"].components[chunker].config
+                if self.chunkers[chunker].requires_spacy_doc:
+                    # Batch parse (large inputs in a worker process) instead of
+                    # parsing lazily inside the Chunker on the event loop
+                    await aparse_documents(documents)
                 embedder_config = (
                     fileConfig.rag_config["Embedder"].components[embedder.name].config
                 )
@@ -1588,6 +1958,8 @@ class EmbeddingManager:
         self.embedders: dict[str, Embedding] = {
             embedder.name: embedder for embedder in embedders
         }
+        self.schedulers: dict[str, EmbeddingScheduler] = {}
+        self._scheduler_loops: dict[str, asyncio.AbstractEventLoop] = {}
 
     async def vectorize(
         self,
@@ -1613,38 +1985,38 @@ class EmbeddingManager:
 
             for doc_idx, document in enumerate(documents):
                 msg.info(f"[EMBEDDER] Processing document {doc_idx+1}/{len(documents)}: {document.title[:50]}...")
+                # Chunkers may already provide vectors (e.g. pooled sentence embeddings)
+                pending = [
+                    i for i, chunk in enumerate(document.chunks) if chunk.vector is None
+                ]
                 content = [
-                    document.metadata + "\n" + chunk.content
-                    for chunk in document.chunks
+                    document.metadata + "\n" + document.chunks[i].content
+                    for i in pending
                 ]
-                msg.info(f"[EMBEDDER] Document has {len(content)} chunks to vectorize")
+                msg.info(f"[EMBEDDER] Document has {len(content)} chunks to vectorize ({len(document.chunks) - len(pending)} already vectorized)")
                 
                 try:
                     # Pass logger and file_id to enable progress updates (keep-alive)
-                    embeddings = await self.batch_vectorize(
-                        embedder, config, content, logger, fileConfig.fileID
+                    new_embeddings = (
+                        await self.batch_vectorize(
+                            embedder, config, content, logger, fileConfig.fileID
+                        )
+                        if content
+                        else []
                     )
-                    msg.info(f"[EMBEDDER] Generated {len(embeddings)} embeddings for document {doc_idx+1}")
+                    embeddings = [chunk.vector for chunk in document.chunks]
+                    for i, embedding in zip(pending, new_embeddings):
+                        embeddings[i] = embedding
+                    msg.info(f"[EMBEDDER] Generated {len(new_embeddings)} embeddings for document {doc_idx+1}")
                 except Exception as e:
                     msg.fail(f"[EMBEDDER] Batch vectorize failed for document {doc_idx+1}: {type(e).__name__}: {str(e)}")
                     import traceback
                     msg.fail(f"[EMBEDDER] Traceback: {traceback.format_exc()}")
                     raise
 
-                if len(embeddings) >= 3:
-                    pca = PCA(n_components=3)
-                    generated_pca_embeddings = pca.fit_transform(embeddings)
-                    pca_embeddings = [
-                        pca_.tolist() for pca_ in generated_pca_embeddings
-                    ]
-                else:
-                    pca_embeddings = [embedding[0:3] for embedding in embeddings]
-
-                for vector, chunk, pca_ in zip(
-                    embeddings, document.chunks, pca_embeddings
-                ):
+                # 3D coordinates come from the embedder's projection model at import
+                for vector, chunk in zip(embeddings, document.chunks):
                     chunk.vector = vector
-                    chunk.pca = pca_
 
                 document.meta["Embedder"] = (
                     fileConfig.rag_config["Embedder"]
@@ -1679,17 +2051,54 @@ class EmbeddingManager:
             msg.fail(f"[EMBEDDER] Full traceback: {traceback.format_exc()}")
             raise
 
+    def get_scheduler(self, embedder: str) -> EmbeddingScheduler:
+        """One scheduler per embedder, shared by all documents being vectorized"""
+        loop = asyncio.get_running_loop()
+        scheduler = self.schedulers.get(embedder)
+        if scheduler is None or self._scheduler_loops.get(embedder) is not loop:
+            scheduler = create_scheduler(embedder, self.embedders.get(embedder))
+            self.schedulers[embedder] = scheduler
+            self._scheduler_loops[embedder] = loop
+        return scheduler
+
+    def _cache_model_name(self, config: dict) -> str:
+        model = config.get("Model") if config else None
+        return str(model.value) if model is not None else ""
+
     async def batch_vectorize(
         self, embedder: str, config: dict, content: list[str], logger: LoggerManager = None, file_id: str = None
+    ) -> list[list[float]]:
+        """Vectorize content, serving cached embeddings and sending only the misses to the provider"""
+        cache = get_embedding_cache() if get_embedding_cache else None
+        if cache is None:
+            return await self._vectorize_batches(embedder, config, content, logger, file_id)
+
+        embeddings = await cache.aget_or_compute_many(
+            embedder,
+            self._cache_model_name(config),
+            content,
+            lambda misses: self._vectorize_batches(embedder, config, misses, logger, file_id),
+        )
+        stats = cache.get_stats()
+        msg.info(f"[BATCH_VECTORIZE] Embedding cache: hit rate {stats['hit_rate']:.1f}% ({stats['memory_entries']} entries in memory)")
+        return embeddings
+
+    async def _vectorize_batches(
+        self, embedder: str, config: dict, content: list[str], logger: LoggerManager = None, file_id: str = None
     ) -> list[list[float]]:
         """Vectorize content in batches with progress updates to keep WebSocket alive"""
         try:
-            max_batch_size = self.embedders[embedder].max_batch_size
-            batches = [
-                content[i : i + max_batch_size]
-                for i in range(0, len(content), max_batch_size)
-            ]
-            msg.info(f"[BATCH_VECTORIZE] Vectorizing {len(content)} chunks in {len(batches)} batches (batch_size={max_batch_size})")
+            vectorizer = self.embedders[embedder]
+            max_batch_size = vectorizer.max_batch_size
+            # Pack chunks by token count up to the provider's item/token ceilings
+            batch_indices = plan_batches(
+                content,
+                max_items=max_batch_size,
+                max_tokens=vectorizer.max_batch_tokens,
+                sort_by_length=vectorizer.sort_by_length,
+            )
+            batches = [[content[i] for i in indices] for indices in batch_indices]
+            msg.info(f"[BATCH_VECTORIZE] Vectorizing {len(content)} chunks in {len(batches)} batches (batch_size={max_batch_size}, max_tokens={vectorizer.max_batch_tokens})")
             
             # Send initial progress update
             if logger and file_id:
@@ -1703,26 +2112,16 @@ class EmbeddingManager:
                 except Exception:
                     pass  # Ignore if WebSocket is closed
             
-            # Create tasks for parallel processing
-            tasks = [
-                self.embedders[embedder].vectorize(config, batch) for batch in batches
-            ]
-            msg.info(f"[BATCH_VECTORIZE] Created {len(tasks)} vectorization tasks")
-            
+            # Batches run through the embedder's scheduler (rate limits,
+            # adaptive concurrency and retries with backoff)
+            scheduler = self.get_scheduler(embedder)
+
             # Track progress with a shared counter
             completed_count = {"count": 0}
-            
-            # Wrap tasks to track completion
-            async def track_progress(task, batch_idx):
-                """Wrap task to track when it completes"""
-                try:
-                    result = await task
-                    completed_count["count"] += 1
-                    return result
-                except Exception as e:
-                    completed_count["count"] += 1
-                    raise e
-            
+
+            def track_progress(batch_idx):
+                completed_count["count"] += 1
+
             # Start progress monitoring task to keep WebSocket alive
             async def send_progress_updates():
                 """Send periodic progress updates during vectorization"""
@@ -1735,11 +2134,13 @@ class EmbeddingManager:
                     # Send update if progress changed OR every 3 seconds to keep connection alive
                     if (current > last_reported or (current == last_reported and current < total)) and logger and file_id:
                         progress = round((current / total) * 100, 1) if total > 0 else 0
+                        stats = scheduler.get_stats()
+                        retry_info = f", {stats['retries']} retries" if stats["retries"] else ""
                         try:
                             await logger.send_report(
                                 file_id,
                                 FileStatus.EMBEDDING,
-                                f"Vectorizing: {current}/{total} batches ({progress}%)",
+                                f"Vectorizing: {current}/{total} batches ({progress}%, concurrency {stats['window']}{retry_info})",
                                 took=0,
                             )
                             if current > last_reported:
@@ -1760,16 +2161,19 @@ class EmbeddingManager:
             # Start progress monitoring (will run until all tasks complete)
             progress_task = asyncio.create_task(send_progress_updates())
             
-            # Execute all tasks in parallel with progress tracking
-            wrapped_tasks = [track_progress(task, idx) for idx, task in enumerate(tasks)]
-            results = await asyncio.gather(*wrapped_tasks, return_exceptions=True)
-            
-            # Cancel progress monitoring
-            progress_task.cancel()
             try:
-                await progress_task
-            except asyncio.CancelledError:
-                pass
+                results = await scheduler.run(
+                    batches,
+                    lambda batch: vectorizer.vectorize(config, batch),
+                    on_done=track_progress,
+                )
+            finally:
+                # Cancel progress monitoring
+                progress_task.cancel()
+                try:
+                    await progress_task
+                except asyncio.CancelledError:
+                    pass
             
             # Send final progress update
             if logger and file_id:
@@ -1796,15 +2200,19 @@ class EmbeddingManager:
                     f"Vectorization failed for {len(errors)}/{len(results)} batches: {', '.join(error_messages[:3])}"
                 )
 
-            # Flatten the results
-            flattened_results = [item for sublist in results for item in sublist]
-            msg.info(f"[BATCH_VECTORIZE] Flattened results: {len(flattened_results)} vectors from {len(results)} batches")
+            # Restore the original chunk order (batches may be sorted by length)
+            vector_count = sum(len(result) for result in results)
+            flattened_results = restore_order(batch_indices, results, len(content))
+            msg.info(f"[BATCH_VECTORIZE] Flattened results: {vector_count} vectors from {len(results)} batches")
 
             # Verify the number of vectors matches the input content
-            if len(flattened_results) != len(content):
-                msg.fail(f"[BATCH_VECTORIZE] Mismatch: expected {len(content)} vectors, got {len(flattened_results)}")
+            if vector_count != len(content) or any(
+                len(result) != len(indices)
+                for result, indices in zip(results, batch_indices)
+            ):
+                msg.fail(f"[BATCH_VECTORIZE] Mismatch: expected {len(content)} vectors, got {vector_count}")
                 raise Exception(
-                    f"Mismatch in vectorization results: expected {len(content)} vectors, got {len(flattened_results)}"
+                    f"Mismatch in vectorization results: expected {len(content)} vectors, got {vector_count}"
                 )
 
             msg.info(f"[BATCH_VECTORIZE] Successfully vectorized {len(flattened_results)} chunks")
@@ -1821,8 +2229,17 @@ class EmbeddingManager:
         try:
             if embedder in self.embedders:
                 config = rag_config["Embedder"].components[embedder].config
-                embeddings = await self.embedders[embedder].vectorize(config, [content])
-                return embeddings[0]
+
+                async def _embed(text: str) -> list[float]:
+                    embeddings = await self.embedders[embedder].vectorize(config, [text])
+                    return embeddings[0]
+
+                cache = get_embedding_cache() if get_embedding_cache else None
+                if cache is not None:
+                    return await cache.aget_or_compute(
+                        embedder, self._cache_model_name(config), content, _embed
+                    )
+                return await _embed(content)
             else:
                 raise Exception(f"{embedder} Embedder not found")
         except Exception as e:
@@ -0,0 +1,190 @@
+"""
+Global 3D projection of chunk embeddings for the vector viewer.
+
+Chunk coordinates used to come from a `PCA` fitted per document during
+embedding, so documents were drawn in unrelated coordinate systems, and the
+"show all" view refitted PCA on every vector of the collection in memory.
+Instead, one `IncrementalPCA` per embedder is updated in mini-batches while
+documents are imported and persisted in the configuration collection, so:
+
+- chunks of every document are projected into the same space
+- the "show all" view streams float32 batches through the stored model
+  (fitting it first in a streaming pass for collections imported earlier)
+- memory is bounded by the batch size, not the collection size
+
+Until a model has seen enough vectors, a fixed random projection is used.
+
+Environment variables:
+- VERBA_PROJECTION_BATCH_SIZE: vectors per streamed batch (default: 1000)
+"""
+
+import os
+import asyncio
+import uuid as uuid_lib
+from typing import Optional
+
+import numpy as np
+from sklearn.decomposition import IncrementalPCA
+
+N_COMPONENTS = 3
+
+# IncrementalPCA attributes needed to transform and keep fitting after a reload
+_ARRAY_STATE = (
+    "components_",
+    "singular_values_",
+    "mean_",
+    "var_",
+    "explained_variance_",
+    "explained_variance_ratio_",
+)
+
+
+def get_projection_batch_size() -> int:
+    return max(N_COMPONENTS, int(os.getenv("VERBA_PROJECTION_BATCH_SIZE", "1000")))
+
+
+def projection_uuid(embedder: str) -> str:
+    """Configuration object UUID of the projection model of `embedder`"""
+    return str(uuid_lib.uuid5(uuid_lib.NAMESPACE_URL, f"verba/projection/{embedder}"))
+
+
+def as_matrix(vectors) -> np.ndarray:
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    return matrix
+
+
+class ProjectionModel:
+    """IncrementalPCA to 3 components, with a random projection until fitted"""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self.pca = IncrementalPCA(n_components=N_COMPONENTS)
+        self._pending: list[np.ndarray] = []
+        self._pending_rows = 0
+        self._random_basis: Optional[np.ndarray] = None
+        self.dirty = False
+
+    @property
+    def fitted(self) -> bool:
+        return hasattr(self.pca, "components_")
+
+    @property
+    def samples(self) -> int:
+        return int(getattr(self.pca, "n_samples_seen_", 0))
+
+    def partial_fit(self, vectors) -> None:
+        matrix = as_matrix(vectors)
+        if matrix.shape[1] != self.dimensions:
+            raise ValueError(
+                f"Projection expects {self.dimensions} dimensions, got {matrix.shape[1]}"
+            )
+        self._pending.append(matrix)
+        self._pending_rows += len(matrix)
+        # IncrementalPCA needs at least n_components rows per call
+        if self._pending_rows < N_COMPONENTS:
+            return
+        batch = np.concatenate(self._pending)
+        self._pending, self._pending_rows = [], 0
+        self.pca.partial_fit(batch)
+        self.dirty = True
+
+    def transform(self, vectors) -> np.ndarray:
+        matrix = as_matrix(vectors)
+        if self.fitted:
+            return self.pca.transform(matrix).astype(np.float32)
+        if self._random_basis is None:
+            rng = np.random.default_rng(self.dimensions)
+            self._random_basis = (
+                rng.standard_normal((self.dimensions, N_COMPONENTS)) / np.sqrt(N_COMPONENTS)
+            ).astype(np.float32)
+        return matrix @ self._random_basis
+
+    def to_dict(self) -> dict:
+        state = {"dimensions": self.dimensions, "n_samples_seen": self.samples}
+        if self.fitted:
+            for attr in _ARRAY_STATE:
+                state[attr] = getattr(self.pca, attr).tolist()
+            state["noise_variance_"] = float(self.pca.noise_variance_)
+        return state
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "ProjectionModel":
+        model = cls(int(state["dimensions"]))
+        if "components_" in state:
+            pca = model.pca
+            for attr in _ARRAY_STATE:
+                setattr(pca, attr, np.asarray(state[attr], dtype=np.float64))
+            pca.noise_variance_ = float(state["noise_variance_"])
+            pca.n_samples_seen_ = int(state["n_samples_seen"])
+            pca.n_components_ = N_COMPONENTS
+            pca.n_features_in_ = model.dimensions
+        return model
+
+
+class ProjectionStore:
+    """Projection models per embedder, cached in memory and persisted through
+    `WeaviateManager.get_config` / `set_config`"""
+
+    def __init__(self):
+        self.models: dict[str, ProjectionModel] = {}
+        self._locks: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Lock]] = {}
+
+    def _lock(self, embedder: str) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        entry = self._locks.get(embedder)
+        if entry is None or entry[0] is not loop:
+            entry = (loop, asyncio.Lock())
+            self._locks[embedder] = entry
+        return entry[1]
+
+    async def _load(
+        self, client, manager, embedder: str, dimensions: Optional[int]
+    ) -> Optional[ProjectionModel]:
+        model = self.models.get(embedder)
+        if model is None:
+            state = await manager.get_config(client, projection_uuid(embedder))
+            if state:
+                model = ProjectionModel.from_dict(state)
+        if model is not None and dimensions is not None and model.dimensions != dimensions:
+            # Embedder changed dimensions (e.g. collection recreated), start over
+            model = None
+        if model is None and dimensions is not None:
+            model = ProjectionModel(dimensions)
+        if model is not None:
+            self.models[embedder] = model
+        return model
+
+    async def get(
+        self, client, manager, embedder: str, dimensions: Optional[int] = None
+    ) -> Optional[ProjectionModel]:
+        async with self._lock(embedder):
+            return await self._load(client, manager, embedder, dimensions)
+
+    async def save(self, client, manager, embedder: str) -> None:
+        async with self._lock(embedder):
+            await self._save(client, manager, embedder)
+
+    async def _save(self, client, manager, embedder: str) -> None:
+        model = self.models.get(embedder)
+        if model is None or not model.dirty:
+            return
+        await manager.set_config(client, projection_uuid(embedder), model.to_dict())
+        model.dirty = False
+
+    async def fit_transform(self, client, manager, embedder: str, vectors) -> np.ndarray:
+        """Updates the embedder's model with `vectors` and returns their projection"""
+        matrix = as_matrix(vectors)
+        async with self._lock(embedder):
+            model = await self._load(client, manager, embedder, matrix.shape[1])
+            model.partial_fit(matrix)
+            projected = model.transform(matrix)
+            await self._save(client, manager, embedder)
+        return projected
+
+    def reset(self, embedder: Optional[str] = None) -> None:
+        if embedder is None:
+            self.models.clear()
+        else:
+            self.models.pop(embedder, None)
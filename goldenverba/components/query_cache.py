@@ -0,0 +1,154 @@
+"""
+Two-tier cache of retrieval results.
+
+Identical or near-identical questions used to re-run embedding, hybrid
+search, reranking and context assembly every time. `VerbaManager.retrieve_chunks`
+now checks:
+
+1. an in-process LRU keyed by the normalized query and its scope (RAG
+   config, labels and document filter), before the query is embedded
+2. a semantic tier in the `VERBA_Cache_<embedder>` collection, which stores
+   query vectors and serves a result when a query in the same scope has a
+   cosine similarity above `VERBA_QUERY_CACHE_SIMILARITY`
+
+Entries carry a generation number, persisted in the configuration
+collection and bumped by `WeaviateManager` on every import and delete, so
+results computed before the data changed are never served. Processes
+re-read the generation at most every `GENERATION_REFRESH` seconds.
+
+Environment variables:
+- VERBA_QUERY_CACHE: enables the cache (default: true)
+- VERBA_QUERY_CACHE_SIZE: in-process entries (default: 512)
+- VERBA_QUERY_CACHE_TTL: seconds an in-process entry stays valid (default: 3600)
+- VERBA_QUERY_CACHE_SIMILARITY: min cosine similarity for the semantic tier, 0 disables it (default: 0.98)
+"""
+
+import os
+import json
+import time
+import hashlib
+import uuid as uuid_lib
+from collections import OrderedDict
+from typing import Optional
+
+GENERATION_REFRESH = 30.0
+
+QUERY_CACHE_GENERATION_UUID = str(
+    uuid_lib.uuid5(uuid_lib.NAMESPACE_URL, "verba/query_cache/generation")
+)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def cache_scope(rag_config: dict, labels: list[str], document_uuids: list[str]) -> str:
+    """Hash of everything besides the query that changes retrieval results"""
+    config = {
+        name: component.model_dump() if hasattr(component, "model_dump") else component
+        for name, component in rag_config.items()
+    }
+    payload = json.dumps(
+        {
+            "config": config,
+            "labels": sorted(labels or []),
+            "documents": sorted(str(uuid) for uuid in document_uuids or []),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def encode_result(documents, context, debug_info: dict, latency: float) -> str:
+    return json.dumps(
+        {
+            "documents": documents,
+            "context": context,
+            "debug_info": debug_info,
+            "latency": latency,
+        },
+        default=str,
+    )
+
+
+def decode_result(payload: str) -> dict:
+    return json.loads(payload)
+
+
+class QueryCache:
+    """In-process tier and generation state of the retrieval cache"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 512,
+        ttl: float = 3600.0,
+        similarity: float = 0.98,
+    ):
+        self.enabled = enabled and max_entries > 0
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self.generation = 0
+        self._generation_loaded_at: Optional[float] = None
+        # key -> (timestamp, generation, encoded result)
+        self._entries: "OrderedDict[str, tuple[float, int, str]]" = OrderedDict()
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+
+    @classmethod
+    def from_env(cls) -> "QueryCache":
+        return cls(
+            enabled=os.getenv("VERBA_QUERY_CACHE", "true").lower() == "true",
+            max_entries=int(os.getenv("VERBA_QUERY_CACHE_SIZE", "512")),
+            ttl=float(os.getenv("VERBA_QUERY_CACHE_TTL", "3600")),
+            similarity=float(os.getenv("VERBA_QUERY_CACHE_SIMILARITY", "0.98")),
+        )
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.enabled and self.similarity > 0
+
+    def key(self, query: str, scope: str) -> str:
+        return hashlib.sha256(f"{scope}:{normalize_query(query)}".encode()).hexdigest()
+
+    def get(self, key: str, generation: int) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        timestamp, entry_generation, payload = entry
+        if entry_generation != generation or time.monotonic() - timestamp > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def set(self, key: str, payload: str, generation: int) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic(), generation, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def generation_stale(self) -> bool:
+        return (
+            self._generation_loaded_at is None
+            or time.monotonic() - self._generation_loaded_at > GENERATION_REFRESH
+        )
+
+    def set_generation(self, generation: int) -> None:
+        if generation != self.generation:
+            self._entries.clear()
+        self.generation = generation
+        self._generation_loaded_at = time.monotonic()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "generation": self.generation,
+            **self.stats,
+        }
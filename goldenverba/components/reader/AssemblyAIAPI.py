@@ -1,4 +1,3 @@
-import base64
 import io
 import os
 
@@ -10,6 +9,7 @@ import assemblyai as aai
 from goldenverba.components.document import Document, create_document
 from goldenverba.components.interfaces import Reader
 from goldenverba.server.types import FileConfig
+from goldenverba.server.uploads import read_file_bytes
 from goldenverba.components.util import get_environment
 from goldenverba.components.types import InputConfig
 
@@ -109,7 +109,7 @@ class AssemblyAIReader(Reader):
         msg.info(f"Loading {fileConfig.filename}")
 
         file_data = aiohttp.FormData()
-        file_bytes = io.BytesIO(base64.b64decode(fileConfig.content))
+        file_bytes = io.BytesIO(read_file_bytes(fileConfig))
         file_data.add_field(
             "files",
             file_bytes,
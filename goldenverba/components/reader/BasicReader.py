@@ -1,4 +1,3 @@
-import base64
 import json
 import io
 import csv
@@ -8,6 +7,7 @@ from wasabi import msg
 from goldenverba.components.document import Document, create_document
 from goldenverba.components.interfaces import Reader
 from goldenverba.server.types import FileConfig
+from goldenverba.server.uploads import read_file_bytes
 
 # Optional imports with error handling
 try:
@@ -102,11 +102,13 @@ class BasicReader(Reader):
         msg.info(f"Loading {fileConfig.filename} ({fileConfig.extension.lower()})")
 
         if fileConfig.extension != "":
-            decoded_bytes = base64.b64decode(fileConfig.content)
+            decoded_bytes = read_file_bytes(fileConfig)
 
         try:
-            if fileConfig.extension == "":
+            if fileConfig.extension == "" and fileConfig.content_path is None:
                 file_content = fileConfig.content
+            elif fileConfig.extension == "":
+                file_content = await self.load_text_file(read_file_bytes(fileConfig))
             elif fileConfig.extension.lower() == "json":
                 return await self.load_json_file(decoded_bytes, fileConfig)
             elif fileConfig.extension.lower() == "pdf":
@@ -139,17 +141,17 @@ class BasicReader(Reader):
     async def load_text_file(self, decoded_bytes: bytes) -> str:
         """Load and decode a text file."""
         try:
-            return decoded_bytes.decode("utf-8")
+            return str(decoded_bytes, "utf-8")
         except UnicodeDecodeError:
             # Fallback to latin-1 if UTF-8 fails
-            return decoded_bytes.decode("latin-1")
+            return str(decoded_bytes, "latin-1")
 
     async def load_json_file(
         self, decoded_bytes: bytes, fileConfig: FileConfig
     ) -> list[Document]:
         """Load and parse a JSON file."""
         try:
-            json_obj = json.loads(decoded_bytes.decode("utf-8"))
+            json_obj = json.loads(str(decoded_bytes, "utf-8"))
             document = Document.from_json(json_obj, self.nlp)
             return (
                 [document]
@@ -244,9 +246,9 @@ class BasicReader(Reader):
         try:
             # Try UTF-8 first, fallback to latin-1
             try:
-                text_content = decoded_bytes.decode("utf-8")
+                text_content = str(decoded_bytes, "utf-8")
             except UnicodeDecodeError:
-                text_content = decoded_bytes.decode("latin-1")
+                text_content = str(decoded_bytes, "latin-1")
 
             csv_reader = csv.reader(io.StringIO(text_content))
             rows = list(csv_reader)
@@ -112,22 +112,22 @@ class FirecrawlReader(Reader):
             "Authorization": f"Bearer {token}",
         }
 
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for url in urls:
-                request_data = {"url": url}
-                if mode == "Scrape":
-                    task = self.scrape_url(session, scrape_url, headers, request_data)
-                else:
-                    task = self.handle_crawl(session, crawl_url, headers, request_data)
-                tasks.append(task)
-
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for result in results:
-                if isinstance(result, Exception):
-                    msg.warn(f"Failed to process URL: {str(result)}")
-                else:
-                    documents.extend(result)
+        session = self.get_session(crawl_url)
+        tasks = []
+        for url in urls:
+            request_data = {"url": url}
+            if mode == "Scrape":
+                task = self.scrape_url(session, scrape_url, headers, request_data)
+            else:
+                task = self.handle_crawl(session, crawl_url, headers, request_data)
+            tasks.append(task)
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                msg.warn(f"Failed to process URL: {str(result)}")
+            else:
+                documents.extend(result)
 
         if not documents:
             raise Exception(
@@ -6,6 +6,11 @@ import base64
 from wasabi import msg
 
 from goldenverba.components.document import Document
+from goldenverba.components.fingerprints import (
+    SourceUnchanged,
+    settings_hash,
+    stored_fingerprints,
+)
 from goldenverba.components.interfaces import Reader
 from goldenverba.server.types import FileConfig
 from goldenverba.components.reader.BasicReader import BasicReader
@@ -92,7 +97,25 @@ class GitReader(Reader):
 
         msg.info(f"Fetched {len(docs)} document paths from {fetch_url}")
 
-        for _file in docs:
+        # Blobs imported before with the same SHA and settings, whose document
+        # is still in Weaviate, are neither downloaded nor imported again
+        settings = settings_hash(fileConfig)
+        sources = {
+            _file: f"{platform.lower()}:{owner}/{name}@{branch}:{_file}" for _file, _ in docs
+        }
+        fingerprints = await stored_fingerprints(list(sources.values()))
+        changed = [
+            (_file, sha)
+            for _file, sha in docs
+            if not sha
+            or fingerprints.get(sources[_file], {}).get("revision") != f"{sha}:{settings}"
+        ]
+        if docs and not changed:
+            raise SourceUnchanged(f"All {len(docs)} files are unchanged since the last sync")
+        if len(changed) < len(docs):
+            msg.info(f"Skipping {len(docs) - len(changed)} unchanged files, downloading {len(changed)}")
+
+        for _file, sha in changed:
             try:
                 if platform == "GitHub":
                     content, link, size, extension = await self.download_file_github(
@@ -116,10 +139,15 @@ class GitReader(Reader):
                         rag_config=fileConfig.rag_config,
                         file_size=size,
                         status=fileConfig.status,
+                        metadata=fileConfig.metadata,
                         status_report=fileConfig.status_report,
                     )
-                    document = await reader.load(config, new_file_config)
-                    documents.append(document[0])
+                    document = (await reader.load(config, new_file_config))[0]
+                    document.meta["source_fingerprint"] = {
+                        "source": sources[_file],
+                        "revision": f"{sha}:{settings}",
+                    }
+                    documents.append(document)
             except Exception as e:
                 raise Exception(f"Couldn't load retrieve {_file}: {str(e)}")
 
@@ -133,31 +161,35 @@ class GitReader(Reader):
 
     async def fetch_docs_github(
         self, url: str, folder: str, token: str, reader: Reader
-    ) -> list[str]:
+    ) -> list[tuple[str, str]]:
+        """Paths and blob SHAs of the files the reader can load"""
         headers = self.get_headers(token, "GitHub")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return [
-                    item["path"]
-                    for item in data["tree"]
-                    if item["path"].startswith(folder)
-                    and any(item["path"].endswith(ext) for ext in reader.extension)
-                ]
-
-    async def fetch_docs_gitlab(self, url: str, token: str, reader: Reader) -> list:
+        session = self.get_session(url)
+        async with session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            data = await response.json()
+            return [
+                (item["path"], item.get("sha", ""))
+                for item in data["tree"]
+                if item["path"].startswith(folder)
+                and any(item["path"].endswith(ext) for ext in reader.extension)
+            ]
+
+    async def fetch_docs_gitlab(
+        self, url: str, token: str, reader: Reader
+    ) -> list[tuple[str, str]]:
+        """Paths and blob SHAs of the files the reader can load"""
         headers = self.get_headers(token, "GitLab")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return [
-                    item["path"]
-                    for item in data
-                    if item["type"] == "blob"
-                    and any(item["path"].endswith(ext) for ext in reader.extension)
-                ]
+        session = self.get_session(url)
+        async with session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            data = await response.json()
+            return [
+                (item["path"], item.get("id", ""))
+                for item in data
+                if item["type"] == "blob"
+                and any(item["path"].endswith(ext) for ext in reader.extension)
+            ]
 
     async def download_file_github(
         self, owner: str, name: str, path: str, branch: str, token: str
@@ -166,15 +198,15 @@ class GitReader(Reader):
             f"https://api.github.com/repos/{owner}/{name}/contents/{path}?ref={branch}"
         )
         headers = self.get_headers(token, "GitHub")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                response.raise_for_status()
-                data = await response.json()
-                content_b64 = data["content"]
-                link = data["html_url"]
-                size = data["size"]
-                extension = os.path.splitext(path)[1][1:]
-                return content_b64, link, size, extension
+        session = self.get_session(url)
+        async with session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            data = await response.json()
+            content_b64 = data["content"]
+            link = data["html_url"]
+            size = data["size"]
+            extension = os.path.splitext(path)[1][1:]
+            return content_b64, link, size, extension
 
     async def download_file_gitlab(
         self, owner: str, name: str, file_path: str, branch: str, token: str
@@ -183,21 +215,21 @@ class GitReader(Reader):
         url = f"https://gitlab.com/api/v4/projects/{project_id}/repository/files/{urllib.parse.quote(file_path, safe='')}/raw?ref={branch}"
         headers = {"PRIVATE-TOKEN": token}
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    content = await response.read()
-                    content_b64 = base64.b64encode(content).decode("utf-8")
-                    size = len(content)
-                    extension = os.path.splitext(file_path)[1][1:]
-                    link = (
-                        f"https://gitlab.com/{owner}/{name}/-/blob/{branch}/{file_path}"
-                    )
-                    return content_b64, link, size, extension
-                else:
-                    raise Exception(
-                        f"Failed to download file: {response.status} {await response.text()}"
-                    )
+        session = self.get_session(url)
+        async with session.get(url, headers=headers) as response:
+            if response.status == 200:
+                content = await response.read()
+                content_b64 = base64.b64encode(content).decode("utf-8")
+                size = len(content)
+                extension = os.path.splitext(file_path)[1][1:]
+                link = (
+                    f"https://gitlab.com/{owner}/{name}/-/blob/{branch}/{file_path}"
+                )
+                return content_b64, link, size, extension
+            else:
+                raise Exception(
+                    f"Failed to download file: {response.status} {await response.text()}"
+                )
 
     def get_headers(self, token: str, platform: str) -> dict:
         if platform == "GitHub":
@@ -69,23 +69,22 @@ class HTMLReader(Reader):
         documents = []
         processed_urls = set()
 
-        async with aiohttp.ClientSession() as session:
-            for url in urls:
-                try:
-                    await self.process_url(
-                        url,
-                        to_markdown,
-                        recursive,
-                        max_depth,
-                        0,
-                        session,
-                        reader,
-                        fileConfig,
-                        documents,
-                        processed_urls,
-                    )
-                except Exception as e:
-                    msg.warn(f"Failed to process URL {url}: {str(e)}")
+        for url in urls:
+            try:
+                await self.process_url(
+                    url,
+                    to_markdown,
+                    recursive,
+                    max_depth,
+                    0,
+                    self.get_session(url),
+                    reader,
+                    fileConfig,
+                    documents,
+                    processed_urls,
+                )
+            except Exception as e:
+                msg.warn(f"Failed to process URL {url}: {str(e)}")
 
         return documents
 
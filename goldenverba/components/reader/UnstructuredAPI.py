@@ -1,4 +1,3 @@
-import base64
 import io
 import os
 
@@ -9,6 +8,7 @@ import aiohttp
 from goldenverba.components.document import Document, create_document
 from goldenverba.components.interfaces import Reader
 from goldenverba.server.types import FileConfig
+from goldenverba.server.uploads import read_file_bytes
 from goldenverba.components.util import get_environment
 from goldenverba.components.types import InputConfig
 
@@ -81,7 +81,7 @@ class UnstructuredReader(Reader):
 
         file_data = aiohttp.FormData()
         file_data.add_field("strategy", strategy)
-        file_bytes = io.BytesIO(base64.b64decode(fileConfig.content))
+        file_bytes = io.BytesIO(read_file_bytes(fileConfig))
         file_data.add_field(
             "files",
             file_bytes,
@@ -89,21 +89,21 @@ class UnstructuredReader(Reader):
         )
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    api_url, headers=headers, data=file_data
-                ) as response:
-                    response.raise_for_status()  # Raise an exception for bad status codes
-                    json_response = await response.json()
+            session = self.get_session(api_url)
+            async with session.post(
+                api_url, headers=headers, data=file_data
+            ) as response:
+                response.raise_for_status()  # Raise an exception for bad status codes
+                json_response = await response.json()
 
-                    if "detail" in json_response:
-                        raise ValueError(f"API error: {json_response['detail']}")
+                if "detail" in json_response:
+                    raise ValueError(f"API error: {json_response['detail']}")
 
-                    file_content = "".join(
-                        chunk.get("text", "") for chunk in json_response
-                    )
+                file_content = "".join(
+                    chunk.get("text", "") for chunk in json_response
+                )
 
-                    return [create_document(file_content, fileConfig)]
+                return [create_document(file_content, fileConfig)]
 
         except requests.RequestException as e:
             raise Exception(
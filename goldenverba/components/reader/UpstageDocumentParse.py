@@ -1,4 +1,3 @@
-import base64
 import io
 import os
 
@@ -9,6 +8,7 @@ import aiohttp
 from goldenverba.components.document import Document, create_document
 from goldenverba.components.interfaces import Reader
 from goldenverba.server.types import FileConfig
+from goldenverba.server.uploads import read_file_bytes
 from goldenverba.components.util import get_environment
 from goldenverba.components.types import InputConfig
 
@@ -64,7 +64,7 @@ class UpstageDocumentParseReader(Reader):
         msg.info(f"Loading {fileConfig.filename}")
 
         file_data = aiohttp.FormData()
-        file_bytes = io.BytesIO(base64.b64decode(fileConfig.content))
+        file_bytes = io.BytesIO(read_file_bytes(fileConfig))
         file_data.add_field(
             "document",
             file_bytes,
@@ -72,21 +72,21 @@ class UpstageDocumentParseReader(Reader):
         )
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    api_url, headers=headers, data=file_data
-                ) as response:
-                    response.raise_for_status()
-                    json_response = await response.json()
+            session = self.get_session(api_url)
+            async with session.post(
+                api_url, headers=headers, data=file_data
+            ) as response:
+                response.raise_for_status()
+                json_response = await response.json()
 
-                    if "content" not in json_response:
-                        raise ValueError(f"API error: Invalid response format")
+                if "content" not in json_response:
+                    raise ValueError(f"API error: Invalid response format")
 
-                    # Extract text content from HTML
-                    html_content = json_response["content"]["html"]
-                    # You might want to add HTML to text conversion here
-                    # For now, we'll use the HTML content directly
-                    return [create_document(html_content, fileConfig)]
+                # Extract text content from HTML
+                html_content = json_response["content"]["html"]
+                # You might want to add HTML to text conversion here
+                # For now, we'll use the HTML content directly
+                return [create_document(html_content, fileConfig)]
 
         except aiohttp.ClientError as e:
             raise Exception(
@@ -93,14 +93,17 @@ class WindowRetriever(Retriever):
         if len(chunks) == 0:
             return ([], "We couldn't find any chunks to the query")
 
+        # Resolve the titles and metadata of all documents in one request
+        documents_metadata = await weaviate_manager.get_documents_metadata(
+            client, [chunk.properties["doc_uuid"] for chunk in chunks]
+        )
+
         # Group Chunks by document and sum score
         doc_map = {}
         scores = [0]
         for chunk in chunks:
             if chunk.properties["doc_uuid"] not in doc_map:
-                document = await weaviate_manager.get_document(
-                    client, chunk.properties["doc_uuid"]
-                )
+                document = documents_metadata.get(str(chunk.properties["doc_uuid"]))
                 if document is None:
                     continue
                 doc_map[chunk.properties["doc_uuid"]] = {
@@ -132,9 +135,8 @@ class WindowRetriever(Retriever):
             # Create a range of values around the given value, excluding the original value
             return [i for i in range(value - window, value + window + 1) if i != value]
 
-        documents = []
-        context_documents = []
-
+        # Window chunk ids per document, fetched for all documents in one query
+        window_ids = {}
         for doc in doc_map:
             additional_chunk_ids = []
             chunks_above_threshold = 0
@@ -147,12 +149,18 @@ class WindowRetriever(Retriever):
                     additional_chunk_ids += generate_window_list(
                         chunk["chunk_id"], window
                     )
-            unique_chunk_ids = set(additional_chunk_ids)
+            window_ids[doc] = set(additional_chunk_ids)
 
-            if len(unique_chunk_ids) > 0:
-                additional_chunks = await weaviate_manager.get_chunk_by_ids(
-                    client, embedder, doc, unique_chunk_ids
-                )
+        additional_chunks_by_doc = await weaviate_manager.get_chunks_by_doc_ids(
+            client, embedder, window_ids
+        )
+
+        documents = []
+        context_documents = []
+
+        for doc in doc_map:
+            additional_chunks = additional_chunks_by_doc.get(str(doc), [])
+            if len(additional_chunks) > 0:
                 existing_chunk_ids = set(
                     chunk["chunk_id"] for chunk in doc_map[doc]["chunks"]
                 )
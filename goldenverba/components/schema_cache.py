@@ -0,0 +1,139 @@
+"""
+Per-client cache of collection existence and configuration.
+
+Almost every `WeaviateManager` method starts with `verify_collection`, which
+used to send a `collections.exists` request on every call, and the schema
+helpers in `verba_extensions` fetched `collection.config.get()` to read the
+property list before every import. This cache remembers, per client, which
+collections exist and their configuration, so the steady-state query path
+does no schema round-trips:
+
+- positive existence results and configs are kept for a TTL, then revalidated
+- missing collections are not cached (another process may create them)
+- `mark_collection_created` / `invalidate_collection` are called on
+  create and delete operations
+
+Environment variables:
+- VERBA_SCHEMA_CACHE_TTL: seconds before a cached entry is revalidated, 0 disables (default: 300)
+"""
+
+import os
+import time
+import weakref
+from typing import Optional
+
+
+class CollectionStateCache:
+    """Collection existence and configs, keyed by client and collection name"""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._exists: "weakref.WeakKeyDictionary[object, dict[str, float]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._configs: "weakref.WeakKeyDictionary[object, dict[str, tuple[float, object]]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def _fresh(self, timestamp: float) -> bool:
+        return time.monotonic() - timestamp <= self.ttl
+
+    def exists(self, client, name: str) -> bool:
+        """True if `name` is known to exist (False means unknown)"""
+        timestamp = self._exists.get(client, {}).get(name)
+        if timestamp is not None and self._fresh(timestamp):
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def set_exists(self, client, name: str) -> None:
+        if self.ttl > 0:
+            self._exists.setdefault(client, {})[name] = time.monotonic()
+
+    def get_config(self, client, name: str):
+        entry = self._configs.get(client, {}).get(name)
+        if entry is not None and self._fresh(entry[0]):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def set_config(self, client, name: str, config) -> None:
+        if self.ttl > 0:
+            self._configs.setdefault(client, {})[name] = (time.monotonic(), config)
+
+    def invalidate(self, client=None, name: Optional[str] = None) -> None:
+        if client is None:
+            self._exists.clear()
+            self._configs.clear()
+            return
+        if name is None:
+            self._exists.pop(client, None)
+            self._configs.pop(client, None)
+            return
+        self._exists.get(client, {}).pop(name, None)
+        self._configs.get(client, {}).pop(name, None)
+
+    def get_stats(self) -> dict:
+        return {
+            "clients": len(self._exists),
+            "collections": sum(len(names) for names in self._exists.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_cache: Optional[CollectionStateCache] = None
+
+
+def get_collection_state_cache() -> CollectionStateCache:
+    global _cache
+    if _cache is None:
+        _cache = CollectionStateCache(
+            ttl=float(os.getenv("VERBA_SCHEMA_CACHE_TTL", "300"))
+        )
+    return _cache
+
+
+async def collection_exists(client, name: str) -> bool:
+    cache = get_collection_state_cache()
+    if cache.exists(client, name):
+        return True
+    exists = await client.collections.exists(name)
+    if exists:
+        cache.set_exists(client, name)
+    return exists
+
+
+async def get_collection_config(client, name: str):
+    """`collection.config.get()` of `name`, or None if the collection does not exist"""
+    cache = get_collection_state_cache()
+    config = cache.get_config(client, name)
+    if config is not None:
+        return config
+    if not await collection_exists(client, name):
+        return None
+    config = await client.collections.get(name).config.get()
+    cache.set_config(client, name, config)
+    return config
+
+
+async def get_collection_properties(client, name: str) -> list[str]:
+    """Property names of `name`, empty if the collection does not exist"""
+    config = await get_collection_config(client, name)
+    if config is None:
+        return []
+    return [prop.name for prop in config.properties]
+
+
+def mark_collection_created(client, name: str) -> None:
+    cache = get_collection_state_cache()
+    cache.invalidate(client, name)
+    cache.set_exists(client, name)
+
+
+def invalidate_collection(client=None, name: Optional[str] = None) -> None:
+    get_collection_state_cache().invalidate(client, name)
@@ -0,0 +1,277 @@
+"""
+Process-wide registry for spaCy pipelines.
+
+Document parsing, query parsing, query entity extraction, the A2 ETL and the
+framework detector each used to load their own copy of `pt_core_news_sm` /
+`en_core_web_sm`, lazily on the first request that needed it. The registry
+loads every model once per process and hands out per-caller views keyed by
+(language, components):
+
+- `components=("ner",)` runs the tokenizer, the NER and the tok2vec layers
+  it listens to; tagger, parser, lemmatizer etc. are disabled for the call
+- `components=("sentencizer",)` is a blank pipeline with a sentencizer
+  (what Document parsing needs, no trained model required)
+- `components=None` runs the full model pipeline
+
+Views share the loaded model, so asking for several component sets of the
+same language costs one model in memory. Missing models fall back to
+Portuguese like the previous loaders did, and failed loads are remembered so
+they are not retried on every query.
+
+Environment variables:
+- SPACY_MODEL: model used for its language (default: pt_core_news_sm), also
+  the default language when a caller doesn't pass one
+- VERBA_SPACY_PRELOAD: comma-separated `language[:component+component]`
+  entries loaded at startup (default: the SPACY_MODEL language, e.g. "pt")
+- VERBA_SPACY_N_PROCESS: default `n_process` for `pipe()` (default: 1)
+- VERBA_SPACY_BATCH_SIZE: default `batch_size` for `pipe()` (default: 64)
+"""
+
+import os
+import asyncio
+import threading
+from typing import Iterable, Iterator, Optional, Sequence
+
+from wasabi import msg
+
+MODEL_MAP = {
+    "pt": "pt_core_news_sm",
+    "en": "en_core_web_sm",
+}
+FALLBACK_LANGUAGE = "pt"
+
+# Languages with a blank spaCy tokenizer used for sentence splitting
+BLANK_LANGUAGES = {"en", "zh", "zh-hant", "fr", "de", "nl"}
+
+NER = ("ner",)
+SENTENCIZER = ("sentencizer",)
+
+
+def _normalize_components(components: Optional[Iterable[str]]) -> Optional[tuple]:
+    if components is None:
+        return None
+    return tuple(sorted(set(components)))
+
+
+def language_of_model(model_name: str) -> str:
+    """Infers the language of a spaCy model from its name (pt_core_news_sm -> pt)"""
+    prefix = model_name.split("_", 1)[0]
+    return prefix if prefix in MODEL_MAP else FALLBACK_LANGUAGE
+
+
+def load_blank_pipeline(language: str):
+    """Blank pipeline with a sentencizer (unsupported languages use English)"""
+    import spacy
+
+    nlp = spacy.blank(language if language in BLANK_LANGUAGES else "en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+class SpacyPipeline:
+    """A view over a shared spaCy model that only runs the selected pipes."""
+
+    def __init__(self, nlp, disabled: Sequence[str], registry: "SpacyRegistry"):
+        self.nlp = nlp
+        self.disabled = list(disabled)
+        self.registry = registry
+
+    @property
+    def pipe_names(self) -> list[str]:
+        return [name for name in self.nlp.pipe_names if name not in self.disabled]
+
+    def __call__(self, text: str):
+        return self.nlp(text, disable=self.disabled)
+
+    def pipe(
+        self,
+        texts: Iterable[str],
+        n_process: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> Iterator:
+        """Processes texts in batches, optionally across `n_process` workers."""
+        return self.nlp.pipe(
+            texts,
+            disable=self.disabled,
+            n_process=n_process or self.registry.n_process,
+            batch_size=batch_size or self.registry.batch_size,
+        )
+
+    def __getattr__(self, name):
+        # meta, vocab, lang... come from the underlying model
+        return getattr(self.nlp, name)
+
+
+class SpacyRegistry:
+    """Loads each spaCy model once and caches views per (language, components)."""
+
+    def __init__(
+        self,
+        default_model: str = MODEL_MAP[FALLBACK_LANGUAGE],
+        n_process: int = 1,
+        batch_size: int = 64,
+    ):
+        self.default_model = default_model
+        self.default_language = language_of_model(default_model)
+        self.n_process = max(1, n_process)
+        self.batch_size = max(1, batch_size)
+        self._models: dict[str, object] = {}
+        self._views: dict[tuple, Optional[SpacyPipeline]] = {}
+        self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
+        self.loads = 0
+
+    @classmethod
+    def from_env(cls) -> "SpacyRegistry":
+        return cls(
+            default_model=os.getenv("SPACY_MODEL", MODEL_MAP[FALLBACK_LANGUAGE]),
+            n_process=int(os.getenv("VERBA_SPACY_N_PROCESS", "1")),
+            batch_size=int(os.getenv("VERBA_SPACY_BATCH_SIZE", "64")),
+        )
+
+    def model_for(self, language: str) -> str:
+        """spaCy model name for a language (SPACY_MODEL wins for its own language)"""
+        if language == self.default_language:
+            return self.default_model
+        return MODEL_MAP.get(language, MODEL_MAP[FALLBACK_LANGUAGE])
+
+    ### Loading
+
+    def _load(self, key: str, loader):
+        """Loads a base pipeline once; returns None (and remembers it) on failure"""
+        if key in self._models:
+            return self._models[key]
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given model, others wait for it
+        with load_lock:
+            if key in self._models:
+                return self._models[key]
+            try:
+                nlp = loader()
+                self.loads += 1
+            except OSError:
+                msg.warn(f"spaCy model '{key}' not found, install it with: python -m spacy download {key}")
+                nlp = None
+            except Exception as e:
+                msg.warn(f"Failed to load spaCy model '{key}': {str(e)}")
+                nlp = None
+            self._models[key] = nlp
+            return nlp
+
+    def _load_model(self, model_name: str):
+        def loader():
+            import spacy
+
+            msg.info(f"Loading spaCy model {model_name}")
+            return spacy.load(model_name)
+
+        return self._load(model_name, loader)
+
+    def _disabled_pipes(self, nlp, components: Optional[tuple]) -> list[str]:
+        if components is None:
+            return []
+        keep = set(components)
+        # Keep shared tok2vec/transformer layers the requested pipes listen to
+        for name, pipe in nlp.pipeline:
+            listeners = getattr(pipe, "listening_components", None) or []
+            if keep.intersection(listeners):
+                keep.add(name)
+        return [name for name in nlp.pipe_names if name not in keep]
+
+    def _build_view(self, language: str, components: Optional[tuple]) -> Optional[SpacyPipeline]:
+        if components == SENTENCIZER:
+            blank = language if language in BLANK_LANGUAGES else "en"
+            nlp = self._load(f"blank:{blank}", lambda: load_blank_pipeline(blank))
+            return SpacyPipeline(nlp, [], self) if nlp is not None else None
+
+        nlp = self._load_model(self.model_for(language))
+        if nlp is None and language != FALLBACK_LANGUAGE:
+            msg.info(f"Falling back to spaCy model for '{FALLBACK_LANGUAGE}'")
+            nlp = self._load_model(self.model_for(FALLBACK_LANGUAGE))
+        if nlp is None:
+            return None
+        return SpacyPipeline(nlp, self._disabled_pipes(nlp, components), self)
+
+    def get(
+        self,
+        language: Optional[str] = None,
+        components: Optional[Iterable[str]] = None,
+    ) -> Optional[SpacyPipeline]:
+        """Returns the pipeline for (language, components), or None if unavailable."""
+        key = (language or self.default_language, _normalize_components(components))
+        if key in self._views:
+            return self._views[key]
+        view = self._build_view(*key)
+        with self._lock:
+            return self._views.setdefault(key, view)
+
+    def pipe(
+        self,
+        texts: Iterable[str],
+        language: Optional[str] = None,
+        components: Optional[Iterable[str]] = None,
+        n_process: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> Iterator:
+        """Batch-processes texts with the (language, components) pipeline."""
+        view = self.get(language, components)
+        if view is None:
+            return iter(())
+        return view.pipe(texts, n_process=n_process, batch_size=batch_size)
+
+    def is_loaded(self, language: Optional[str] = None) -> bool:
+        return self._models.get(self.model_for(language or self.default_language)) is not None
+
+    async def preload(self, specs: list[tuple[str, Optional[tuple]]]):
+        """Loads the given (language, components) pipelines in the thread pool."""
+        loop = asyncio.get_running_loop()
+        for language, components in specs:
+            await loop.run_in_executor(None, self.get, language, components)
+
+    def get_stats(self) -> dict:
+        return {
+            "models": [key for key, nlp in self._models.items() if nlp is not None],
+            "missing": [key for key, nlp in self._models.items() if nlp is None],
+            "views": [
+                {"language": language, "components": list(components or [])}
+                for (language, components), view in self._views.items()
+                if view is not None
+            ],
+            "loads": self.loads,
+        }
+
+
+_registry: Optional[SpacyRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_spacy_registry() -> SpacyRegistry:
+    """Returns the process-wide registry (singleton)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = SpacyRegistry.from_env()
+    return _registry
+
+
+def get_preload_pipelines() -> list[tuple[str, Optional[tuple]]]:
+    """Pipelines configured for preloading via VERBA_SPACY_PRELOAD."""
+    default = language_of_model(os.getenv("SPACY_MODEL", MODEL_MAP[FALLBACK_LANGUAGE]))
+    specs = []
+    for entry in os.getenv("VERBA_SPACY_PRELOAD", default).split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        language, _, components = entry.partition(":")
+        specs.append(
+            (
+                language.strip(),
+                _normalize_components(c.strip() for c in components.split("+") if c.strip())
+                if components
+                else None,
+            )
+        )
+    return specs
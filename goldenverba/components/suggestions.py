@@ -0,0 +1,294 @@
+"""
+Background suggestion recording and in-memory autocomplete.
+
+Recording a query as a suggestion used to cost an aggregate, a dedupe
+`fetch_objects` and an `insert` before every query was embedded.
+`SuggestionWriter` takes that off the query path: queries are deduplicated
+in a bounded in-memory set, queued, and written periodically with one
+dedupe query and one `insert_many` per client. The queue is bounded (new
+queries are dropped when full) and flushed on shutdown.
+
+Autocomplete reads are served from a `SuggestionTrie` per client, built from
+the suggestion collection in the background (BM25 serves the requests until
+it is ready) and refreshed once it is older than `VERBA_SUGGESTION_INDEX_TTL`. Queries match at the start of the
+suggestion or of any word in it.
+
+Environment variables:
+- VERBA_SUGGESTION_FLUSH_INTERVAL: seconds between writes (default: 2.0)
+- VERBA_SUGGESTION_QUEUE_SIZE: max queued suggestions (default: 10000)
+- VERBA_SUGGESTION_INDEX_TTL: seconds before the autocomplete index is refreshed (default: 60)
+- VERBA_SUGGESTION_INDEX_MAX: max suggestions kept in the index (default: 50000)
+"""
+
+import os
+import time
+import asyncio
+import weakref
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from wasabi import msg
+
+_END = "\0"
+MAX_KEY_LENGTH = 48
+
+
+def normalize_suggestion(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SuggestionTrie:
+    """Prefix index over suggestions, keyed at every word start"""
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self.root: dict = {}
+        self.suggestions: dict[str, dict] = {}
+        self.queries: dict[str, str] = {}
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.suggestions)
+
+    def __contains__(self, query: str) -> bool:
+        return normalize_suggestion(query) in self.queries
+
+    def _keys(self, text: str):
+        for i, char in enumerate(text):
+            if i == 0 or (text[i - 1] == " " and char != " "):
+                yield i, text[i : i + MAX_KEY_LENGTH]
+
+    def add(self, suggestion: dict) -> None:
+        text = normalize_suggestion(suggestion["query"])
+        if not text or text in self.queries or len(self.suggestions) >= self.max_entries:
+            return
+        uuid = suggestion["uuid"]
+        self.suggestions[uuid] = suggestion
+        self.queries[text] = uuid
+        for start, key in self._keys(text):
+            node = self.root
+            for char in key:
+                node = node.setdefault(char, {})
+            # Matches at the start of the suggestion rank first
+            node.setdefault(_END, {})[uuid] = start == 0
+
+    def remove(self, uuid: str) -> None:
+        suggestion = self.suggestions.pop(uuid, None)
+        if suggestion is None:
+            return
+        text = normalize_suggestion(suggestion["query"])
+        self.queries.pop(text, None)
+        for _, key in self._keys(text):
+            node = self.root
+            for char in key:
+                node = node.get(char)
+                if node is None:
+                    break
+            else:
+                node.get(_END, {}).pop(uuid, None)
+
+    def search(self, query: str, limit: int) -> list[dict]:
+        prefix = normalize_suggestion(query)[:MAX_KEY_LENGTH]
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        # Collect a bounded number of matches, then rank them
+        matches: dict[str, bool] = {}
+        stack = [node]
+        while stack and len(matches) < limit * 20:
+            current = stack.pop()
+            for key, child in current.items():
+                if key == _END:
+                    for uuid, at_start in child.items():
+                        matches[uuid] = matches.get(uuid, False) or at_start
+                else:
+                    stack.append(child)
+
+        ranked = sorted(
+            matches.items(),
+            key=lambda item: (item[1], self.suggestions[item[0]]["timestamp"]),
+            reverse=True,
+        )
+        return [self.suggestions[uuid] for uuid, _ in ranked[:limit]]
+
+
+class SuggestionWriter:
+    """Queues suggestions and writes them in batches off the query path"""
+
+    def __init__(
+        self,
+        write: Callable[[object, list[str]], Awaitable[list[dict]]],
+        flush_interval: float = 2.0,
+        max_pending: int = 10000,
+        max_seen: int = 100000,
+    ):
+        self.write = write
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_seen = max_seen
+        self._pending: "OrderedDict[tuple[int, str], tuple[object, str]]" = OrderedDict()
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"queued": 0, "duplicates": 0, "dropped": 0, "written": 0, "failed": 0}
+
+    @classmethod
+    def from_env(cls, write) -> "SuggestionWriter":
+        return cls(
+            write,
+            flush_interval=float(os.getenv("VERBA_SUGGESTION_FLUSH_INTERVAL", "2.0")),
+            max_pending=int(os.getenv("VERBA_SUGGESTION_QUEUE_SIZE", "10000")),
+        )
+
+    def record(self, client, query: str) -> bool:
+        """Queues `query` for `client`; returns False if it was skipped"""
+        text = normalize_suggestion(query)
+        if not text:
+            return False
+        if text in self._seen:
+            self._seen.move_to_end(text)
+            self.stats["duplicates"] += 1
+            return False
+        if len(self._pending) >= self.max_pending:
+            self.stats["dropped"] += 1
+            return False
+        self.mark_seen(text)
+        self._pending[(id(client), text)] = (client, query)
+        self.stats["queued"] += 1
+        self._ensure_task()
+        return True
+
+    def mark_seen(self, query: str) -> None:
+        self._seen[normalize_suggestion(query)] = None
+        while len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+
+    def forget(self, query: Optional[str] = None) -> None:
+        if query is None:
+            self._seen.clear()
+        else:
+            self._seen.pop(normalize_suggestion(query), None)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _ensure_task(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Writes every queued suggestion, one batch per client"""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, OrderedDict()
+        by_client: dict[int, tuple[object, list[str]]] = {}
+        for client, query in pending.values():
+            by_client.setdefault(id(client), (client, []))[1].append(query)
+
+        written = 0
+        for client, queries in by_client.values():
+            try:
+                written += len(await self.write(client, queries))
+            except Exception as e:
+                # Let them be recorded again by a later query
+                for query in queries:
+                    self.forget(query)
+                self.stats["failed"] += len(queries)
+                msg.warn(f"Failed to write {len(queries)} suggestions: {str(e)}")
+        self.stats["written"] += written
+        return written
+
+    async def close(self) -> None:
+        """Stops the background task and writes what is still queued"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+        await self.flush()
+
+
+class SuggestionIndexes:
+    """Autocomplete tries per client, refreshed in the background when stale"""
+
+    def __init__(
+        self,
+        load: Callable[[object, int], Awaitable[list[dict]]],
+        ttl: float = 60.0,
+        max_entries: int = 50000,
+    ):
+        self.load = load
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._tries: "weakref.WeakKeyDictionary[object, SuggestionTrie]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._refreshing: "weakref.WeakKeyDictionary[object, asyncio.Task]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @classmethod
+    def from_env(cls, load) -> "SuggestionIndexes":
+        return cls(
+            load,
+            ttl=float(os.getenv("VERBA_SUGGESTION_INDEX_TTL", "60")),
+            max_entries=int(os.getenv("VERBA_SUGGESTION_INDEX_MAX", "50000")),
+        )
+
+    async def _build(self, client) -> SuggestionTrie:
+        trie = SuggestionTrie(self.max_entries)
+        for suggestion in await self.load(client, self.max_entries):
+            trie.add(suggestion)
+        self._tries[client] = trie
+        return trie
+
+    async def get(self, client) -> SuggestionTrie:
+        trie = self._tries.get(client)
+        if trie is None:
+            return await self._build(client)
+        return self.ready(client)
+
+    def ready(self, client) -> Optional[SuggestionTrie]:
+        """The index of `client` if it was built, else None; a missing or stale
+        index is (re)built in the background"""
+        trie = self._tries.get(client)
+        if trie is None or time.monotonic() - trie.built_at > self.ttl:
+            task = self._refreshing.get(client)
+            if task is None or task.done():
+                self._refreshing[client] = asyncio.create_task(self._refresh(client))
+        return trie
+
+    async def _refresh(self, client) -> None:
+        try:
+            await self._build(client)
+        except Exception as e:
+            msg.warn(f"Failed to refresh suggestion index: {str(e)}")
+
+    def peek(self, client) -> Optional[SuggestionTrie]:
+        return self._tries.get(client)
+
+    def invalidate(self, client=None) -> None:
+        if client is None:
+            tasks = list(self._refreshing.values())
+            self._tries.clear()
+            self._refreshing.clear()
+        else:
+            tasks = [self._refreshing.pop(client, None)]
+            self._tries.pop(client, None)
+        # A build that started before the invalidation would store stale suggestions
+        for task in tasks:
+            if task is not None and not task.done():
+                task.cancel()
@@ -0,0 +1,175 @@
+"""
+Streaming chunk writer for Weaviate.
+
+`WeaviateManager.import_document` used to send every chunk of a document in
+one `insert_many` call, count them again with an aggregate query and roll
+back one `delete_by_id` per chunk. `ChunkWriter` instead:
+
+- streams `DataObject`s in batches bounded by object count and payload size
+- keeps several batches in flight, with an AIMD window driven by Weaviate
+  response latency (slow responses halve the window, the producer waits)
+- retries only the failed objects of a partially failed batch, and whole
+  batches on transport errors (UUIDs are assigned up front, so a retried
+  batch overwrites instead of duplicating)
+- reports the inserted UUIDs, so callers verify counts without querying
+
+Environment variables:
+- VERBA_INGEST_BATCH_SIZE: max objects per request (default: 200)
+- VERBA_INGEST_BATCH_MB: max estimated payload per request (default: 8)
+- VERBA_INGEST_CONCURRENCY: max requests in flight (default: 4)
+- VERBA_INGEST_TARGET_LATENCY: seconds above which a request counts as slow (default: 2.0)
+- VERBA_INGEST_MAX_RETRIES: retries per batch / failed object (default: 3)
+"""
+
+import os
+import json
+import random
+import asyncio
+import uuid as uuid_lib
+from typing import Iterable, Iterator
+
+from wasabi import msg
+from weaviate.collections.classes.data import DataObject
+
+from goldenverba.components.embedding.scheduler import AIMDWindow
+
+
+def estimate_object_bytes(data_object: DataObject) -> int:
+    """Rough request size of one object: JSON properties + float32 vector."""
+    try:
+        size = len(json.dumps(data_object.properties, default=str))
+    except (TypeError, ValueError):
+        size = 1024
+    vector = data_object.vector
+    if isinstance(vector, dict):
+        size += sum(4 * len(v) for v in vector.values())
+    elif vector is not None:
+        size += 4 * len(vector)
+    return size
+
+
+class WriteResult:
+    def __init__(self):
+        self.uuids: list[str] = []
+        self.errors: list[str] = []
+        self.batches = 0
+        self.retries = 0
+
+    @property
+    def inserted(self) -> int:
+        return len(self.uuids)
+
+
+class ChunkWriter:
+    """Writes DataObjects to one collection in bounded, concurrent batches."""
+
+    def __init__(
+        self,
+        collection,
+        batch_size: int = 200,
+        max_batch_bytes: int = 8 * 1024 * 1024,
+        max_concurrency: int = 4,
+        target_latency: float = 2.0,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+    ):
+        self.collection = collection
+        self.batch_size = max(1, batch_size)
+        self.max_batch_bytes = max_batch_bytes
+        self.window = AIMDWindow(initial=min(2, max_concurrency), maximum=max_concurrency)
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+
+    @classmethod
+    def from_env(cls, collection) -> "ChunkWriter":
+        return cls(
+            collection,
+            batch_size=int(os.getenv("VERBA_INGEST_BATCH_SIZE", "200")),
+            max_batch_bytes=int(float(os.getenv("VERBA_INGEST_BATCH_MB", "8")) * 1024 * 1024),
+            max_concurrency=int(os.getenv("VERBA_INGEST_CONCURRENCY", "4")),
+            target_latency=float(os.getenv("VERBA_INGEST_TARGET_LATENCY", "2.0")),
+            max_retries=int(os.getenv("VERBA_INGEST_MAX_RETRIES", "3")),
+        )
+
+    def _batches(self, objects: Iterable[DataObject]) -> Iterator[list[DataObject]]:
+        batch, batch_bytes = [], 0
+        for data_object in objects:
+            if data_object.uuid is None:
+                data_object.uuid = uuid_lib.uuid4()
+            size = estimate_object_bytes(data_object)
+            if batch and (
+                len(batch) >= self.batch_size or batch_bytes + size > self.max_batch_bytes
+            ):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(data_object)
+            batch_bytes += size
+        if batch:
+            yield batch
+
+    async def _backoff(self, attempt: int):
+        await asyncio.sleep(random.uniform(0, self.base_delay * 2**attempt))
+
+    async def _insert(self, batch: list[DataObject], result: WriteResult):
+        """Inserts one batch, retrying failed objects (and failed requests)."""
+        loop = asyncio.get_running_loop()
+        pending = batch
+        attempt = 0
+        while pending:
+            started = loop.time()
+            slow = False
+            try:
+                response = await self.collection.data.insert_many(pending)
+                slow = loop.time() - started > self.target_latency
+            except Exception as e:
+                slow = True
+                if attempt >= self.max_retries:
+                    result.errors.append(f"{type(e).__name__}: {str(e)}")
+                    return
+                response = None
+                error = e
+            finally:
+                await self.window.release(throttled=slow)
+
+            if response is not None:
+                result.uuids.extend(str(uuid) for uuid in response.uuids.values())
+                if not response.has_errors:
+                    return
+                failed = [pending[index] for index in sorted(response.errors)]
+                if attempt >= self.max_retries:
+                    result.errors.extend(
+                        error.message for error in response.errors.values()
+                    )
+                    return
+                msg.warn(
+                    f"[INGEST] {len(failed)}/{len(pending)} objects failed, retrying them "
+                    f"({attempt + 1}/{self.max_retries})"
+                )
+                pending = failed
+            else:
+                msg.warn(
+                    f"[INGEST] Batch of {len(pending)} objects failed ({type(error).__name__}: {str(error)}), "
+                    f"retrying ({attempt + 1}/{self.max_retries})"
+                )
+
+            result.retries += 1
+            await self._backoff(attempt)
+            attempt += 1
+            await self.window.acquire()
+
+    async def write(self, objects: Iterable[DataObject]) -> WriteResult:
+        """Streams `objects` into the collection and returns what was inserted."""
+        result = WriteResult()
+        tasks = []
+        try:
+            for batch in self._batches(objects):
+                # Back-pressure: wait for a free slot before building more requests
+                await self.window.acquire()
+                result.batches += 1
+                tasks.append(asyncio.create_task(self._insert(batch, result)))
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return result
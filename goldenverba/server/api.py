@@ -16,7 +16,9 @@ warnings.filterwarnings("ignore", message=".*websockets.legacy.*")
 warnings.filterwarnings("ignore", message=".*remove second argument of ws_handler.*")
 warnings.filterwarnings("ignore", message=".*WebSocketServerProtocol.*")
 
-from goldenverba.server.helpers import LoggerManager, BatchManager
+from goldenverba.server.helpers import LoggerManager, BatchManager, parse_file_config
+from goldenverba.server.uploads import UploadError, UploadOffsetMismatch, get_upload_store
+from goldenverba.components.http_pool import get_http_pool, close_http_pool
 from weaviate.client import WeaviateAsyncClient
 
 import os
@@ -56,8 +58,14 @@ from goldenverba.server.types import (
     GetVectorPayload,
     DataBatchPayload,
     ChunksPayload,
+    ImportBulkPayload,
+    UploadInitPayload,
+    UploadImportPayload,
     FileStatus,
 )
+from pydantic import ValidationError
+from starlette.requests import ClientDisconnect
+from goldenverba.bulk_import import BulkImportPipeline
 
 load_dotenv()
 
@@ -103,8 +111,62 @@ client_manager = verba_manager.ClientManager()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Preload configured SentenceTransformer models so the first query
+    # doesn't pay the model load latency
+    try:
+        from goldenverba.components.embedding.model_registry import (
+            get_model_registry,
+            get_preload_models,
+        )
+
+        preload_models = get_preload_models()
+        if preload_models:
+            msg.info(f"Preloading SentenceTransformer models: {preload_models}")
+            await get_model_registry().preload(preload_models)
+    except Exception as e:
+        msg.warn(f"SentenceTransformer preload skipped: {str(e)}")
+
+    # Same for the spaCy pipelines shared by document parsing, query parsing and the ETL
+    try:
+        from goldenverba.components.spacy_registry import (
+            get_preload_pipelines,
+            get_spacy_registry,
+        )
+
+        preload_pipelines = get_preload_pipelines()
+        if preload_pipelines:
+            msg.info(f"Preloading spaCy pipelines: {preload_pipelines}")
+            await get_spacy_registry().preload(preload_pipelines)
+    except Exception as e:
+        msg.warn(f"spaCy preload skipped: {str(e)}")
+
+    # NER workers of the ETL (pre-chunking and post-import), loaded before the first import
+    try:
+        from verba_extensions.utils.ner_pool import get_ner_pool
+
+        ner_pool = get_ner_pool()
+        if ner_pool.languages:
+            await ner_pool.start()
+            msg.info(f"NER pool ready (processes={ner_pool.processes}, languages={ner_pool.languages})")
+    except Exception as e:
+        msg.warn(f"NER pool start skipped: {str(e)}")
+
+    # Shared HTTP connection pool used by all Readers, Embedders and Generators
+    http_pool = get_http_pool()
+    msg.info(
+        f"HTTP pool ready (limit={http_pool.limit}, limit_per_host={http_pool.limit_per_host})"
+    )
     yield
+    # Write queued suggestions while the clients are still connected
+    await manager.weaviate_manager.suggestion_writer.close()
     await client_manager.disconnect()
+    await close_http_pool()
+    try:
+        from verba_extensions.utils.ner_pool import close_ner_pool
+
+        close_ner_pool()
+    except ImportError:
+        pass
 
 
 # FastAPI App
@@ -383,10 +445,16 @@ async def websocket_import_files(websocket: WebSocket):
             data = await websocket.receive_text()
             # Drastically reduce logging to avoid Railway rate limit (500 logs/sec)
             # Only log first chunk, every 500th chunk, or last chunk
+            upload_data = None
             try:
-                batch_data = DataBatchPayload.model_validate_json(data)
+                try:
+                    batch_data = DataBatchPayload.model_validate_json(data)
+                except ValidationError:
+                    # Files sent through /api/upload only need the import request here
+                    upload_data = UploadImportPayload.model_validate_json(data)
+                    batch_data = None
                 # Log only first chunk, every 500th chunk, or last chunk (reduced from 100 to 500)
-                if batch_data.order == 0 or batch_data.order % 500 == 0 or batch_data.isLastChunk:
+                if batch_data is not None and (batch_data.order == 0 or batch_data.order % 500 == 0 or batch_data.isLastChunk):
                     msg.info(f"[WEBSOCKET] Chunk {batch_data.order + 1}/{batch_data.total} for {batch_data.fileID[:50]}...")
             except Exception as e:
                 import traceback
@@ -395,20 +463,33 @@ async def websocket_import_files(websocket: WebSocket):
                 msg.fail(f"[WEBSOCKET] Traceback: {traceback.format_exc()}")
                 raise
             
-            fileConfig = batcher.add_batch(batch_data)
-            
-            # Log detalhado sobre status do batch
-            if batch_data.isLastChunk:
-                msg.info(f"[WEBSOCKET] Last chunk received (order {batch_data.order}, total {batch_data.total})")
-                # Verifica se todos os chunks foram recebidos
-                if batch_data.order + 1 != batch_data.total:
-                    msg.warn(f"[WEBSOCKET] ⚠️ Last chunk order ({batch_data.order + 1}) doesn't match total ({batch_data.total})")
+            if upload_data is not None:
+                credentials = upload_data.credentials
+                try:
+                    fileConfig = await get_upload_store().finalize(upload_data.uploadID)
+                except UploadError as e:
+                    msg.fail(f"[UPLOAD] Cannot import upload {upload_data.uploadID}: {str(e)}")
+                    await logger.send_report(
+                        upload_data.uploadID, status=FileStatus.ERROR, message=str(e), took=0
+                    )
+                    continue
+            else:
+                credentials = batch_data.credentials
+                fileConfig = batcher.add_batch(batch_data)
+
+                # Log detalhado sobre status do batch
+                if batch_data.isLastChunk:
+                    msg.info(f"[WEBSOCKET] Last chunk received (order {batch_data.order}, total {batch_data.total})")
+                    # Verifica se todos os chunks foram recebidos
+                    if batch_data.order + 1 != batch_data.total:
+                        msg.warn(f"[WEBSOCKET] ⚠️ Last chunk order ({batch_data.order + 1}) doesn't match total ({batch_data.total})")
             
             if fileConfig is not None:
                 # CRITICAL: Create a local copy of fileConfig to prevent race conditions
                 # when multiple files are processed simultaneously. Each async task needs
                 # its own copy to avoid None reference errors.
                 local_fileConfig = copy.deepcopy(fileConfig)
+                local_upload_id = upload_data.uploadID if upload_data is not None else None
                 
                 # Validate fileConfig before proceeding
                 if local_fileConfig is None or not hasattr(local_fileConfig, 'fileID') or not hasattr(local_fileConfig, 'filename'):
@@ -434,14 +515,14 @@ async def websocket_import_files(websocket: WebSocket):
                     msg.warn(f"[IMPORT] Failed to send STARTING status (WebSocket may be closed): {str(e)}")
                 
                 # Get client and ensure it's connected
-                client = await client_manager.connect(batch_data.credentials)
+                client = await client_manager.connect(credentials)
                 if client is None:
                     raise Exception("Failed to connect to Weaviate")
                 
                 # Verify client is ready before import
                 if not await client.is_ready():
                     msg.warn("Client not ready, reconnecting...")
-                    client = await client_manager.connect(batch_data.credentials)
+                    client = await client_manager.connect(credentials)
                     if client is None or not await client.is_ready():
                         raise Exception("Failed to reconnect to Weaviate")
                 
@@ -512,6 +593,7 @@ async def websocket_import_files(websocket: WebSocket):
                     import time
                     # Use local_fileConfig from outer scope (captured by closure)
                     current_fileConfig = local_fileConfig
+                    current_upload_id = local_upload_id
                     
                     # SEMÁFORO: Aguarda que não haja outro import em progresso
                     # Isso evita race conditions quando múltiplos arquivos são enviados rapidamente
@@ -570,6 +652,8 @@ async def websocket_import_files(websocket: WebSocket):
                                 await keep_alive
                             except asyncio.CancelledError:
                                 pass
+                            if current_upload_id is not None:
+                                get_upload_store().release(current_upload_id)
                 
                 # Start import in background - continue loop to receive more batches
                 asyncio.create_task(import_with_cleanup())
@@ -763,6 +847,21 @@ async def check_slo(threshold_ms: float = 350.0):
         )
 
 
+@app.get("/api/telemetry/http_pool")
+async def get_http_pool_stats():
+    """Retorna métricas do pool HTTP compartilhado (saturação, reuso de conexões)"""
+    try:
+        return JSONResponse(
+            status_code=200,
+            content={"stats": get_http_pool().get_stats(), "error": ""}
+        )
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={"stats": {}, "error": f"Erro ao obter stats: {str(e)}"}
+        )
+
+
 @app.post("/api/set_user_config")
 async def update_user_config(payload: SetUserConfigPayload):
     if production == "Demo":
@@ -876,32 +975,27 @@ async def query(payload: QueryPayload):
         client = await client_manager.connect(payload.credentials)
         documents_uuid = [document.uuid for document in payload.documentFilter] if payload.documentFilter else []
         
-        # Verificar se há chunks disponíveis antes de processar query
+        # Served from the in-memory collection stats, no aggregate per query
         try:
-            embedder = payload.RAG.get("Embedder", {}).get("selected", "")
-            if embedder:
-                from goldenverba.components.managers import WeaviateManager
-                weaviate_manager = WeaviateManager()
-                normalized = weaviate_manager._normalize_embedder_name(embedder)
-                collection_name = weaviate_manager.embedding_table.get(embedder, f"VERBA_Embedding_{normalized}")
-                
-                if await weaviate_manager.verify_embedding_collection(client, embedder):
-                    embedder_collection = client.collections.get(collection_name)
-                    # Verifica se há chunks na collection
-                    total_count = await embedder_collection.aggregate.over_all(total_count=True)
-                    if total_count.total_count == 0:
-                        msg.warn("No chunks available in database - cannot process query")
-                        return JSONResponse(
-                            content={
-                                "error": "No documents or chunks available in the database. Please import documents first.",
-                                "documents": [],
-                                "context": ""
-                            }
-                        )
+            embedder = payload.RAG["Embedder"].selected
+            embedder_model = (
+                payload.RAG["Embedder"].components[embedder].config["Model"].value
+            )
+            if not await manager.weaviate_manager.collection_stats.has_chunks(
+                client, embedder_model
+            ):
+                msg.warn("No chunks available in database - cannot process query")
+                return JSONResponse(
+                    content={
+                        "error": "No documents or chunks available in the database. Please import documents first.",
+                        "documents": [],
+                        "context": ""
+                    }
+                )
         except Exception as check_error:
             # Não falha a query se a verificação der erro, apenas loga
             msg.warn(f"Could not verify chunks availability: {str(check_error)}")
-        
+
         result = await manager.retrieve_chunks(
             client, payload.query, payload.RAG, payload.labels, documents_uuid
         )
@@ -1014,7 +1108,7 @@ async def execute_validated_query(payload: QueryPayload):
         # Se query_plan fornecido, usar filtros customizados
         # (Isso pode ser expandido no futuro)
         
-        documents, context = await manager.retrieve_chunks(
+        documents, context, *_ = await manager.retrieve_chunks(
             client, payload.query, payload.RAG, payload.labels, documents_uuid
         )
 
@@ -1380,6 +1474,87 @@ async def delete_document(payload: GetDocumentPayload):
         return JSONResponse(status_code=400, content={})
 
 
+# Import many files through the pipelined read/chunk/embed/ingest stages
+@app.post("/api/import_bulk")
+async def import_bulk(payload: ImportBulkPayload):
+    if production == "Demo":
+        msg.warn("Can't import documents when in Production Mode")
+        return JSONResponse(status_code=200, content={})
+
+    try:
+        client = await client_manager.connect(payload.credentials)
+        pipeline = BulkImportPipeline.from_env(
+            manager,
+            read_workers=payload.read_workers,
+            chunk_workers=payload.chunk_workers,
+            embed_workers=payload.embed_workers,
+            ingest_workers=payload.ingest_workers,
+            queue_size=payload.queue_size,
+            chunk_processes=payload.chunk_processes,
+        )
+        # Shares the import semaphore with the websocket import
+        async with _import_semaphore:
+            report = await pipeline.run(client, payload.files)
+        return JSONResponse(status_code=200, content={**report, "error": ""})
+
+    except Exception as e:
+        msg.fail(f"Bulk import failed: {str(e)}")
+        return JSONResponse(
+            status_code=400,
+            content={"files": {}, "stages": {}, "took": 0, "error": f"Bulk import failed: {str(e)}"},
+        )
+
+
+# Resumable binary uploads: metadata first, then the raw bytes in one or more
+# PUTs; the import itself is started on /ws/import_files with the uploadID
+@app.post("/api/upload")
+async def create_upload(payload: UploadInitPayload):
+    if production == "Demo":
+        msg.warn("Can't import documents when in Production Mode")
+        return JSONResponse(status_code=200, content={})
+
+    try:
+        session = get_upload_store().create(
+            parse_file_config(payload.fileConfig), payload.size, payload.sha256
+        )
+        return JSONResponse(status_code=200, content={**session.to_dict(), "error": ""})
+    except UploadError as e:
+        return JSONResponse(status_code=e.status_code, content={"error": str(e)})
+    except Exception as e:
+        msg.fail(f"Upload could not be created: {str(e)}")
+        return JSONResponse(status_code=400, content={"error": f"Upload could not be created: {str(e)}"})
+
+
+@app.put("/api/upload/{upload_id}")
+async def write_upload(upload_id: str, request: Request, offset: int = 0):
+    store = get_upload_store()
+    try:
+        session = await store.write(upload_id, offset, request.stream())
+        return JSONResponse(status_code=200, content={**session.to_dict(), "error": ""})
+    except UploadOffsetMismatch as e:
+        return JSONResponse(status_code=e.status_code, content={"offset": e.offset, "error": str(e)})
+    except UploadError as e:
+        return JSONResponse(status_code=e.status_code, content={"error": str(e)})
+    except ClientDisconnect:
+        # Received bytes are kept; the client resumes from GET /api/upload/{upload_id}
+        msg.info(f"[UPLOAD] Client disconnected during upload {upload_id}")
+        return JSONResponse(status_code=400, content={"error": "Client disconnected"})
+
+
+@app.get("/api/upload/{upload_id}")
+async def get_upload(upload_id: str):
+    try:
+        return JSONResponse(status_code=200, content={**get_upload_store().get(upload_id).to_dict(), "error": ""})
+    except UploadError as e:
+        return JSONResponse(status_code=e.status_code, content={"error": str(e)})
+
+
+@app.delete("/api/upload/{upload_id}")
+async def delete_upload(upload_id: str):
+    get_upload_store().release(upload_id)
+    return JSONResponse(status_code=200, content={"error": ""})
+
+
 ### ADMIN
 
 
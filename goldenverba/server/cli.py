@@ -23,6 +23,28 @@ from goldenverba.server.types import Credentials
 load_dotenv()
 
 
+async def connect_client(manager, url, api_key, deployment):
+    """Connects to Weaviate with the credentials given on the command line."""
+    if url is not None and api_key is not None:
+        if deployment == "" or deployment == "Weaviate":
+            return await manager.connect(
+                Credentials(deployment="Weaviate", url=url, key=api_key)
+            )
+        elif deployment == "Docker":
+            return await manager.connect(
+                Credentials(deployment="Docker", url=url, key=api_key)
+            )
+        else:
+            raise ValueError("Invalid deployment")
+    else:
+        if deployment == "" or deployment == "Local":
+            return await manager.connect(
+                Credentials(deployment="Local", url="", key="")
+            )
+        else:
+            raise ValueError("Invalid deployment")
+
+
 @click.group()
 def cli():
     """Main command group for verba."""
@@ -93,24 +115,7 @@ def reset(url, api_key, deployment, full_reset):
     manager = verba_manager.VerbaManager()
 
     async def async_reset():
-        if url is not None and api_key is not None:
-            if deployment == "" or deployment == "Weaviate":
-                client = await manager.connect(
-                    Credentials(deployment="Weaviate", url=url, key=api_key)
-                )
-            elif deployment == "Docker":
-                client = await manager.connect(
-                    Credentials(deployment="Docker", url=url, key=api_key)
-                )
-            else:
-                raise ValueError("Invalid deployment")
-        else:
-            if deployment == "" or deployment == "Local":
-                client = await manager.connect(
-                    Credentials(deployment="Local", url="", key="")
-                )
-            else:
-                raise ValueError("Invalid deployment")
+        client = await connect_client(manager, url, api_key, deployment)
 
         if not full_reset:
             await manager.reset_rag_config(client)
@@ -124,5 +129,102 @@ def reset(url, api_key, deployment, full_reset):
     asyncio.run(async_reset())
 
 
+@cli.command(name="import-bulk")
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option(
+    "--url",
+    default=os.getenv("WEAVIATE_URL_VERBA"),
+    help="Weaviate URL",
+)
+@click.option(
+    "--api_key",
+    default=os.getenv("WEAVIATE_API_KEY_VERBA"),
+    help="Weaviate API Key",
+)
+@click.option(
+    "--deployment",
+    default="",
+    help="Deployment (Local, Weaviate, Docker)",
+)
+@click.option("--overwrite/--no-overwrite", default=False, help="Overwrite existing documents")
+@click.option("--label", "labels", multiple=True, help="Label added to every document")
+@click.option("--read_workers", type=int, default=None, help="Reader stage workers")
+@click.option("--chunk_workers", type=int, default=None, help="Chunker stage workers")
+@click.option("--embed_workers", type=int, default=None, help="Embedder stage workers")
+@click.option("--ingest_workers", type=int, default=None, help="Weaviate ingest stage workers")
+@click.option("--queue_size", type=int, default=None, help="Max items waiting between stages")
+@click.option("--chunk_processes", type=int, default=None, help="Chunker processes (0 = in event loop)")
+def import_bulk(
+    paths,
+    url,
+    api_key,
+    deployment,
+    overwrite,
+    labels,
+    read_workers,
+    chunk_workers,
+    embed_workers,
+    ingest_workers,
+    queue_size,
+    chunk_processes,
+):
+    """
+    Import files (or directories) with the pipelined bulk importer.
+    """
+    import asyncio
+    import json
+    from pathlib import Path
+
+    from goldenverba.bulk_import import BulkImportPipeline
+    from goldenverba.server.types import FileConfig, FileStatus
+
+    files = []
+    for path in paths:
+        path = Path(path)
+        files.extend(sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path])
+
+    manager = verba_manager.VerbaManager()
+
+    async def async_import():
+        client = await connect_client(manager, url, api_key, deployment)
+        rag_config = await manager.load_rag_config(client)
+        fileConfigs = []
+        for file in files:
+            fileConfig = FileConfig(
+                fileID=str(file),
+                filename=file.name,
+                isURL=False,
+                overwrite=overwrite,
+                extension=file.suffix.lstrip("."),
+                source=str(file.resolve()),
+                content="",
+                labels=list(labels) or ["Document"],
+                rag_config=rag_config,
+                file_size=file.stat().st_size,
+                status=FileStatus.READY,
+                metadata="",
+                status_report={},
+            )
+            # Readers memory-map the file when it is read instead of holding
+            # every file base64-encoded in memory for the whole import
+            fileConfig._content_path = str(file.resolve())
+            fileConfigs.append(fileConfig)
+        pipeline = BulkImportPipeline.from_env(
+            manager,
+            read_workers=read_workers,
+            chunk_workers=chunk_workers,
+            embed_workers=embed_workers,
+            ingest_workers=ingest_workers,
+            queue_size=queue_size,
+            chunk_processes=chunk_processes,
+        )
+        report = await pipeline.run(client, fileConfigs)
+        await client.close()
+        return report
+
+    report = asyncio.run(async_import())
+    click.echo(json.dumps(report, indent=2))
+
+
 if __name__ == "__main__":
     cli()
@@ -1,5 +1,5 @@
 from typing import Literal
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from enum import Enum
 
 
@@ -47,6 +47,17 @@ class DataBatchPayload(BaseModel):
     credentials: Credentials
 
 
+class UploadInitPayload(BaseModel):
+    fileConfig: dict
+    size: int
+    sha256: str | None = None
+
+
+class UploadImportPayload(BaseModel):
+    uploadID: str
+    credentials: Credentials
+
+
 class LoadPayload(BaseModel):
     reader: str
     chunker: str
@@ -150,11 +161,30 @@ class FileConfig(BaseModel):
     metadata: str
     status_report: dict
 
+    # Spool file of a binary upload (see goldenverba/server/uploads.py). Set
+    # server-side only, so it is never parsed from or serialized to a request.
+    _content_path: str | None = PrivateAttr(default=None)
+
+    @property
+    def content_path(self) -> str | None:
+        return self._content_path
+
 
 class ImportStreamPayload(BaseModel):
     fileMap: dict[str, FileConfig]
 
 
+class ImportBulkPayload(BaseModel):
+    credentials: Credentials
+    files: list[FileConfig]
+    read_workers: int | None = None
+    chunk_workers: int | None = None
+    embed_workers: int | None = None
+    ingest_workers: int | None = None
+    queue_size: int | None = None
+    chunk_processes: int | None = None
+
+
 class VerbaConfig(BaseModel):
     RAG: dict[str, RAGComponentClass]
     SETTING: dict
@@ -0,0 +1,293 @@
+"""
+Resumable binary uploads spooled to disk.
+
+The websocket import sends each file as base64 inside a JSON FileConfig,
+split into text frames that are joined and parsed before the Reader decodes
+them again: several full copies of every file in memory, at 1.33x its size.
+Binary uploads send the FileConfig metadata once (`POST /api/upload`), then
+the raw bytes through `PUT /api/upload/{uploadID}?offset=N`, which are
+appended to a spool file and hashed as they arrive. An interrupted upload
+resumes from the offset reported by `GET /api/upload/{uploadID}`, also
+after a server restart. The import is started on `/ws/import_files` with
+`{"uploadID", "credentials"}`; Readers get the bytes with
+`read_file_bytes(fileConfig)`, a memoryview over the memory-mapped spool file.
+
+Environment variables:
+- VERBA_UPLOAD_DIR: spool directory (default: <tmp>/verba_uploads)
+- VERBA_UPLOAD_MAX_MB: max size of one upload in MB (default: 2048)
+- VERBA_UPLOAD_TTL: seconds before an unfinished upload is removed (default: 86400)
+"""
+
+import os
+import json
+import time
+import mmap
+import uuid
+import base64
+import asyncio
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from wasabi import msg
+
+from goldenverba.server.types import FileConfig
+
+READ_BLOCK = 1024 * 1024
+
+
+class UploadError(Exception):
+    status_code = 400
+
+
+class UploadNotFound(UploadError):
+    status_code = 404
+
+
+class UploadOffsetMismatch(UploadError):
+    """The client sent bytes for an offset other than the one already received."""
+
+    status_code = 409
+
+    def __init__(self, offset: int):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+class UploadSession:
+    def __init__(
+        self,
+        upload_id: str,
+        file_config: FileConfig,
+        size: int,
+        sha256: Optional[str],
+        path: Path,
+        received: int = 0,
+    ):
+        self.upload_id = upload_id
+        self.file_config = file_config
+        self.size = size
+        self.sha256 = sha256.lower() if sha256 else None
+        self.path = path
+        self.received = received
+        self.complete = False
+        self.lock = asyncio.Lock()
+        # Incremental hash of the first `hashed` bytes of the spool file
+        self.hasher = hashlib.sha256()
+        self.hashed = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "uploadID": self.upload_id,
+            "fileID": self.file_config.fileID,
+            "offset": self.received,
+            "size": self.size,
+            "complete": self.complete,
+        }
+
+
+class UploadStore:
+    """Spool files and metadata of in-flight uploads, one pair per upload."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = 2048 * 1024 * 1024,
+        ttl: float = 86400,
+    ):
+        self.directory = Path(directory or Path(tempfile.gettempdir()) / "verba_uploads")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sessions: dict[str, UploadSession] = {}
+
+    @classmethod
+    def from_env(cls) -> "UploadStore":
+        return cls(
+            directory=os.getenv("VERBA_UPLOAD_DIR") or None,
+            max_bytes=int(float(os.getenv("VERBA_UPLOAD_MAX_MB", "2048")) * 1024 * 1024),
+            ttl=float(os.getenv("VERBA_UPLOAD_TTL", "86400")),
+        )
+
+    def _data_path(self, upload_id: str) -> Path:
+        return self.directory / f"{upload_id}.part"
+
+    def _meta_path(self, upload_id: str) -> Path:
+        return self.directory / f"{upload_id}.json"
+
+    def create(self, file_config: FileConfig, size: int, sha256: Optional[str] = None) -> UploadSession:
+        """Starts an upload, or returns the unfinished one for the same file, size and hash."""
+        if size < 0 or size > self.max_bytes:
+            raise UploadError(f"Upload size {size} exceeds the limit of {self.max_bytes} bytes")
+        self.cleanup_expired()
+
+        for upload_id in self._stored_ids():
+            session = self._load(upload_id)
+            if (
+                session is not None
+                and not session.complete
+                and session.file_config.fileID == file_config.fileID
+                and session.size == size
+                and session.sha256 == (sha256.lower() if sha256 else None)
+            ):
+                msg.info(f"[UPLOAD] Resuming {file_config.filename[:50]} at {session.received}/{size} bytes")
+                return session
+
+        upload_id = uuid.uuid4().hex
+        session = UploadSession(upload_id, file_config, size, sha256, self._data_path(upload_id))
+        session.path.touch()
+        meta = {"fileConfig": file_config.model_dump(mode="json"), "size": size, "sha256": session.sha256}
+        self._meta_path(upload_id).write_text(json.dumps(meta), encoding="utf-8")
+        self.sessions[upload_id] = session
+        return session
+
+    def get(self, upload_id: str) -> UploadSession:
+        session = self._load(upload_id)
+        if session is None:
+            raise UploadNotFound(f"Upload {upload_id} not found")
+        return session
+
+    def _stored_ids(self) -> list[str]:
+        return [path.stem for path in self.directory.glob("*.json")]
+
+    def _load(self, upload_id: str) -> Optional[UploadSession]:
+        session = self.sessions.get(upload_id)
+        if session is not None:
+            return session
+        # Unknown to this process: pick up an upload started before a restart
+        meta_path, data_path = self._meta_path(upload_id), self._data_path(upload_id)
+        if not upload_id.isalnum() or not meta_path.exists() or not data_path.exists():
+            return None
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            file_config = FileConfig.model_validate(meta["fileConfig"])
+        except Exception as e:
+            msg.warn(f"[UPLOAD] Invalid metadata for upload {upload_id}: {str(e)}")
+            return None
+        session = UploadSession(
+            upload_id, file_config, meta["size"], meta["sha256"], data_path, data_path.stat().st_size
+        )
+        self.sessions[upload_id] = session
+        return session
+
+    def _sync_hasher(self, session: UploadSession) -> None:
+        """Hashes what is already on disk when the session did not receive it itself."""
+        if session.hashed == session.received:
+            return
+        session.hasher = hashlib.sha256()
+        with open(session.path, "rb") as f:
+            for block in iter(lambda: f.read(READ_BLOCK), b""):
+                session.hasher.update(block)
+        session.hashed = session.received
+
+    async def write(self, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> UploadSession:
+        """
+        Appends the bytes of `chunks` at `offset`, which must equal the bytes
+        already received. Bytes written before a disconnect are kept, so the
+        client can resume from the offset reported by `get(upload_id)`.
+        """
+        session = self.get(upload_id)
+        async with session.lock:
+            if session.complete:
+                raise UploadError(f"Upload {upload_id} is already complete")
+            if offset != session.received:
+                raise UploadOffsetMismatch(session.received)
+            # Disk writes and hashing run in a thread, in blocks of READ_BLOCK
+            # bytes, so a large upload does not stall the event loop
+            await asyncio.to_thread(self._sync_hasher, session)
+            f = await asyncio.to_thread(open, session.path, "ab")
+            pending = bytearray()
+            try:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if session.received + len(pending) + len(chunk) > session.size:
+                        raise UploadError(f"Upload {upload_id} exceeds its declared size of {session.size} bytes")
+                    pending += chunk
+                    if len(pending) >= READ_BLOCK:
+                        data, pending = pending, bytearray()
+                        await asyncio.to_thread(self._append, session, f, data)
+            finally:
+                try:
+                    # Keep what arrived before a disconnect, so the client can resume after it
+                    if pending:
+                        await asyncio.to_thread(self._append, session, f, pending)
+                finally:
+                    await asyncio.to_thread(f.close)
+        return session
+
+    @staticmethod
+    def _append(session: UploadSession, f, data: bytes | bytearray) -> None:
+        f.write(data)
+        session.hasher.update(data)
+        session.received += len(data)
+        session.hashed = session.received
+
+    async def finalize(self, upload_id: str) -> FileConfig:
+        """Checks size and hash and returns the FileConfig pointing at the spool file."""
+        session = self.get(upload_id)
+        if session.received != session.size:
+            raise UploadError(f"Upload {upload_id} is incomplete ({session.received}/{session.size} bytes)")
+        await asyncio.to_thread(self._sync_hasher, session)
+        if session.sha256 and session.hasher.hexdigest() != session.sha256:
+            raise UploadError(f"Upload {upload_id} failed the sha256 check")
+        session.complete = True
+        file_config = session.file_config.model_copy(update={"content": "", "file_size": session.size})
+        file_config._content_path = str(session.path)
+        return file_config
+
+    def release(self, upload_id: str) -> None:
+        """Removes the spool file and metadata (after the import, or to abort)."""
+        if not upload_id.isalnum():
+            return
+        self.sessions.pop(upload_id, None)
+        for path in (self._data_path(upload_id), self._meta_path(upload_id)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def cleanup_expired(self) -> int:
+        """Removes uploads that were not touched for `ttl` seconds."""
+        removed = 0
+        cutoff = time.time() - self.ttl
+        for upload_id in self._stored_ids():
+            session = self.sessions.get(upload_id)
+            if session is not None and (session.lock.locked() or session.complete):
+                continue
+            data_path = self._data_path(upload_id)
+            try:
+                touched = max(data_path.stat().st_mtime, self._meta_path(upload_id).stat().st_mtime)
+            except FileNotFoundError:
+                touched = 0
+            if touched < cutoff:
+                self.release(upload_id)
+                removed += 1
+        return removed
+
+
+_store: Optional[UploadStore] = None
+
+
+def get_upload_store() -> UploadStore:
+    """Returns the process-wide upload store (created on first use)."""
+    global _store
+    if _store is None:
+        _store = UploadStore.from_env()
+    return _store
+
+
+def read_file_bytes(fileConfig: FileConfig) -> bytes | memoryview:
+    """
+    The raw bytes of a file to import: a read-only memoryview over the
+    memory-mapped spool file of a binary upload, or the decoded base64
+    content of a websocket/bulk import.
+    """
+    if fileConfig.content_path is None:
+        return base64.b64decode(fileConfig.content)
+    with open(fileConfig.content_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        # The mapping stays valid after the file is closed (or removed)
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
@@ -97,3 +97,34 @@ def test_arabic_in_content():
     assert doc.content == content
     assert doc.spacy_doc.text == content
     assert doc.spacy_doc.sents is not None
+
+
+def test_document_is_parsed_lazily():
+    """spaCy parsing only happens when spacy_doc is accessed"""
+    doc = Document(content="First sentence. Second sentence.")
+    assert not doc.is_parsed
+
+    sentences = list(doc.spacy_doc.sents)
+    assert len(sentences) == 2
+    assert doc.is_parsed
+    assert doc.ensure_parsed() is doc.spacy_doc
+
+
+def test_parse_documents_batches_unparsed_documents():
+    """parse_documents parses every pending document once"""
+    from goldenverba.components.document import parse_documents
+
+    docs = [Document(content=f"Sentence {i}. Another one.") for i in range(5)]
+    already_parsed = docs[0].spacy_doc
+    parse_documents(docs)
+
+    assert all(doc.is_parsed for doc in docs)
+    assert docs[0].spacy_doc is already_parsed
+    assert len(list(docs[3].spacy_doc.sents)) == 2
+
+
+def test_nlp_pipeline_is_cached_per_language():
+    from goldenverba.components.document import get_nlp_for_language
+
+    assert get_nlp_for_language("en") is get_nlp_for_language("en")
+    assert get_nlp_for_language("en") is not get_nlp_for_language("de")
@@ -0,0 +1,184 @@
+import asyncio
+import base64
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from goldenverba.components import fingerprints as fingerprints_module
+from goldenverba.components.document import Document
+from goldenverba.components.fingerprints import (
+    DocumentUnchanged,
+    FingerprintStore,
+    SourceUnchanged,
+    conditional_headers,
+    document_hash,
+    verify_documents,
+)
+from goldenverba.components.reader.GitReader import GitReader
+from goldenverba.server.types import (
+    ConfigSetting,
+    FileConfig,
+    RAGComponentClass,
+    RAGComponentConfig,
+)
+from goldenverba.verba_manager import VerbaManager
+
+
+def make_chunker(chunk_size):
+    setting = ConfigSetting(type="number", value=chunk_size, description="", values=[])
+    token = RAGComponentConfig(
+        name="Token",
+        variables=[],
+        library=[],
+        description="",
+        config={"Tokens": setting},
+        type="",
+        available=True,
+    )
+    return RAGComponentClass(selected="Token", components={"Token": token})
+
+
+def make_file_config(chunk_size=200, labels=None):
+    return FileConfig.model_construct(
+        fileID="file-0",
+        filename="repo",
+        isURL=False,
+        overwrite=True,
+        labels=labels or ["Document"],
+        metadata="",
+        rag_config={"Chunker": make_chunker(chunk_size)},
+        file_size=0,
+        status="READY",
+        status_report={},
+    )
+
+
+def test_store_remembers_and_forgets_sources(tmp_path):
+    store = FingerprintStore(str(tmp_path / "fingerprints.sqlite"))
+    document = Document(
+        title="page",
+        content="text",
+        meta={
+            "content_hash": "abc",
+            "source_fingerprint": {"source": "https://a.com/page", "etag": '"v1"'},
+        },
+    )
+
+    assert store.remember(document)
+    assert not store.remember(Document(title="upload", content="text"))
+    row = FingerprintStore(store.path).get("https://a.com/page")
+    assert (row["etag"], row["content_hash"], row["document_title"]) == ('"v1"', "abc", "page")
+    assert conditional_headers(row) == {"If-None-Match": '"v1"'}
+
+    assert store.forget_documents(["page"]) == 1
+    assert store.get_many(["https://a.com/page"]) == {}
+
+
+def test_document_hash_covers_content_and_settings():
+    document = Document(title="a", content="same content")
+    base = document_hash(document, make_file_config())
+
+    assert document_hash(Document(title="b", content="same content"), make_file_config()) == base
+    assert document_hash(document, make_file_config(chunk_size=400)) != base
+    assert document_hash(document, make_file_config(labels=["Other"])) != base
+    assert document_hash(Document(title="a", content="new content"), make_file_config()) != base
+
+
+def test_prepare_document_skips_unchanged_document():
+    fileConfig = make_file_config()
+    stored_hash = document_hash(Document(content="body"), fileConfig)
+    deleted = []
+
+    async def exist_document_name(client, name):
+        return "uuid-1"
+
+    async def get_document(client, uuid, properties=None):
+        return {"meta": json.dumps({"content_hash": stored_hash})}
+
+    async def delete_document(client, uuid):
+        deleted.append(uuid)
+
+    manager = VerbaManager.__new__(VerbaManager)
+    manager.weaviate_manager = SimpleNamespace(
+        exist_document_name=exist_document_name,
+        get_document=get_document,
+        delete_document=delete_document,
+    )
+
+    with pytest.raises(DocumentUnchanged):
+        asyncio.run(manager.prepare_document(None, Document(title="doc", content="body"), fileConfig))
+    assert deleted == []
+
+    changed = asyncio.run(
+        manager.prepare_document(None, Document(title="doc", content="new body"), fileConfig)
+    )
+    assert deleted == ["uuid-1"]
+    assert changed.meta["content_hash"] != stored_hash
+
+
+def test_git_reader_downloads_only_changed_blobs(tmp_path, monkeypatch):
+    store = FingerprintStore(str(tmp_path / "fingerprints.sqlite"))
+    monkeypatch.setattr(fingerprints_module, "get_fingerprint_store", lambda: store)
+    tree = {"docs/a.md": "sha-a", "docs/b.md": "sha-b"}
+    downloads = []
+    in_weaviate = set()
+
+    async def existing_document_titles(titles):
+        return in_weaviate & set(titles)
+
+    reader = GitReader()
+
+    async def fetch_docs_github(url, folder, token, basic_reader):
+        return list(tree.items())
+
+    async def download_file_github(owner, name, path, branch, token):
+        downloads.append(path)
+        content = base64.b64encode(f"# {path}".encode()).decode()
+        return content, f"https://github.com/{path}", 10, "md"
+
+    monkeypatch.setattr(reader, "fetch_docs_github", fetch_docs_github)
+    monkeypatch.setattr(reader, "download_file_github", download_file_github)
+    config = {
+        "Platform": SimpleNamespace(value="GitHub"),
+        "Owner": SimpleNamespace(value="owner"),
+        "Name": SimpleNamespace(value="repo"),
+        "Branch": SimpleNamespace(value="main"),
+        "Path": SimpleNamespace(value="docs"),
+        "Git Token": SimpleNamespace(value="token"),
+    }
+
+    async def load(fileConfig):
+        with verify_documents(existing_document_titles):
+            documents = await reader.load(config, fileConfig)
+        for document in documents:
+            store.remember(document)
+            in_weaviate.add(document.title)
+        return documents
+
+    documents = asyncio.run(load(make_file_config()))
+    assert sorted(downloads) == ["docs/a.md", "docs/b.md"]
+
+    tree["docs/b.md"] = "sha-b2"
+    downloads.clear()
+    documents = asyncio.run(load(make_file_config()))
+    assert downloads == ["docs/b.md"]
+    assert documents[0].meta["source_fingerprint"]["source"] == "github:owner/repo@main:docs/b.md"
+
+    with pytest.raises(SourceUnchanged):
+        asyncio.run(load(make_file_config()))
+
+    # A document missing from Weaviate (other deployment, deleted elsewhere)
+    # is downloaded again, as is everything outside an import
+    in_weaviate.discard("docs/a.md")
+    downloads.clear()
+    asyncio.run(load(make_file_config()))
+    assert downloads == ["docs/a.md"]
+    downloads.clear()
+    asyncio.run(reader.load(config, make_file_config()))
+    assert sorted(downloads) == ["docs/a.md", "docs/b.md"]
+
+    # A different chunker setting re-imports every file
+    downloads.clear()
+    asyncio.run(load(make_file_config(chunk_size=400)))
+    assert sorted(downloads) == ["docs/a.md", "docs/b.md"]
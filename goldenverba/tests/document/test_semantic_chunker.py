@@ -0,0 +1,106 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from goldenverba.components.chunking.SemanticChunker import SemanticChunker
+from goldenverba.components.document import Document
+from goldenverba.components.interfaces import Embedding
+from goldenverba.components.managers import EmbeddingManager
+from goldenverba.server.types import FileConfig
+
+
+class FakeEmbedder(Embedding):
+    def __init__(self, dim=8):
+        super().__init__()
+        self.name = "Fake"
+        self.dim = dim
+
+    async def vectorize(self, config, content):
+        return [
+            np.random.default_rng(abs(hash(text)) % 2**32).standard_normal(self.dim).tolist()
+            for text in content
+        ]
+
+
+class RecordingLogger:
+    async def send_report(self, file_id, status, message, took):
+        pass
+
+
+def make_document():
+    content = " ".join(f"Sentence {i} is about topic {i % 4}." for i in range(30))
+    document = Document(title="doc", content=content)
+    document.ensure_parsed()
+    return document
+
+
+def chunk(reuse):
+    chunker = SemanticChunker()
+    config = {key: value.model_copy() for key, value in chunker.config.items()}
+    config["Reuse Sentence Embeddings"].value = reuse
+    config["Max Sentences Per Chunk"].value = 5
+    document = make_document()
+    asyncio.run(chunker.chunk(config, [document], FakeEmbedder(), {}))
+    return document
+
+
+def test_distances_match_pairwise_cosine():
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((12, 16))
+    sentences = [{"sentence": str(i)} for i in range(12)]
+    distances, sentences = SemanticChunker().calculate_cosine_distances(
+        sentences, embeddings
+    )
+    expected = [
+        1 - cosine_similarity([embeddings[i]], [embeddings[i + 1]])[0][0]
+        for i in range(11)
+    ]
+    assert np.allclose(distances, expected, atol=1e-5)
+    assert sentences[0]["distance_to_next"] == distances[0]
+    assert "distance_to_next" not in sentences[-1]
+
+
+def test_combine_sentences_windows():
+    sentences = [{"sentence": s} for s in ["a", "b", "c"]]
+    combined = SemanticChunker().combine_sentences(sentences)
+    assert [s["combined_sentence"] for s in combined] == ["a b", "a b c", "b c"]
+
+
+def test_reuse_sets_chunk_vectors_and_keeps_chunks():
+    plain = chunk(reuse=False)
+    reused = chunk(reuse=True)
+    assert [c.content for c in plain.chunks] == [c.content for c in reused.chunks]
+    assert all(c.vector is None for c in plain.chunks)
+    assert all(len(c.vector) == 8 for c in reused.chunks)
+
+
+def test_vectorize_only_embeds_chunks_without_vector():
+    document = chunk(reuse=True)
+    document.chunks[1].vector = None
+    pooled = document.chunks[0].vector
+
+    manager = EmbeddingManager()
+    manager.embedders = {"Fake": FakeEmbedder()}
+    requested = []
+
+    async def batch_vectorize(embedder, config, content, logger=None, file_id=None):
+        requested.extend(content)
+        return [[1.0] * 8 for _ in content]
+
+    manager.batch_vectorize = batch_vectorize
+    fileConfig = FileConfig.model_construct(
+        fileID="file",
+        rag_config={
+            "Embedder": SimpleNamespace(
+                components={"Fake": SimpleNamespace(config={}, model_dump=lambda: {})}
+            )
+        },
+    )
+    asyncio.run(manager.vectorize("Fake", fileConfig, [document], RecordingLogger()))
+
+    assert len(requested) == 1
+    assert requested[0].endswith(document.chunks[1].content)
+    assert document.chunks[0].vector == pooled
+    assert document.chunks[1].vector == [1.0] * 8
@@ -0,0 +1,92 @@
+import spacy
+
+from goldenverba.components.spacy_registry import (
+    NER,
+    SENTENCIZER,
+    SpacyRegistry,
+    get_preload_pipelines,
+)
+
+
+def fake_model(name):
+    """Blank pipeline standing in for a trained model: 'parser' splits sentences, 'ner' tags Apple"""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer", name="parser")
+    ruler = nlp.add_pipe("entity_ruler", name="ner")
+    ruler.add_patterns([{"label": "ORG", "pattern": "Apple"}])
+    nlp.meta["name"] = name
+    return nlp
+
+
+def patch_load(monkeypatch, installed):
+    calls = []
+
+    def load(name):
+        calls.append(name)
+        if name not in installed:
+            raise OSError(f"[E050] Can't find model '{name}'")
+        return fake_model(name)
+
+    monkeypatch.setattr(spacy, "load", load)
+    return calls
+
+
+def test_views_share_one_model_and_disable_unused_pipes(monkeypatch):
+    calls = patch_load(monkeypatch, {"pt_core_news_sm"})
+    registry = SpacyRegistry()
+
+    ner = registry.get("pt", NER)
+    full = registry.get("pt")
+
+    assert calls == ["pt_core_news_sm"]
+    assert ner.nlp is full.nlp
+    assert ner is registry.get("pt", ["ner"])
+    assert ner.pipe_names == ["ner"]
+
+    doc = ner("Apple lançou. Outro produto.")
+    assert [e.text for e in doc.ents] == ["Apple"]
+    assert not doc.has_annotation("SENT_START")
+    assert full("Apple lançou. Outro produto.").has_annotation("SENT_START")
+    assert ner.meta["name"] == "pt_core_news_sm"
+
+
+def test_missing_model_falls_back_to_portuguese_once(monkeypatch):
+    calls = patch_load(monkeypatch, {"pt_core_news_sm"})
+    registry = SpacyRegistry()
+
+    assert registry.get("en", NER).meta["name"] == "pt_core_news_sm"
+    assert registry.get("en").meta["name"] == "pt_core_news_sm"
+    assert calls == ["en_core_web_sm", "pt_core_news_sm"]
+    assert registry.get_stats()["missing"] == ["en_core_web_sm"]
+
+
+def test_unavailable_returns_none(monkeypatch):
+    patch_load(monkeypatch, set())
+    registry = SpacyRegistry()
+
+    assert registry.get("pt", NER) is None
+    assert list(registry.pipe(["texto"], "pt", NER)) == []
+
+
+def test_sentencizer_pipeline_needs_no_model(monkeypatch):
+    calls = patch_load(monkeypatch, set())
+    registry = SpacyRegistry()
+
+    docs = list(registry.pipe(["One. Two.", "Three."], "de", SENTENCIZER, batch_size=1))
+
+    assert calls == []
+    assert [len(list(doc.sents)) for doc in docs] == [2, 1]
+    assert registry.get("xx", SENTENCIZER).nlp.lang == "en"
+
+
+def test_preload_spec_from_env(monkeypatch):
+    monkeypatch.setenv("VERBA_SPACY_PRELOAD", "pt, en:ner, en:sentencizer+ner")
+    assert get_preload_pipelines() == [
+        ("pt", None),
+        ("en", ("ner",)),
+        ("en", ("ner", "sentencizer")),
+    ]
+
+    monkeypatch.delenv("VERBA_SPACY_PRELOAD")
+    monkeypatch.setenv("SPACY_MODEL", "en_core_web_md")
+    assert get_preload_pipelines() == [("en", None)]
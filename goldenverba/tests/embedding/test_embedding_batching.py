@@ -0,0 +1,31 @@
+from goldenverba.components.embedding.batching import plan_batches, restore_order
+
+
+def test_respects_item_ceiling_in_original_order():
+    texts = [f"t{i}" for i in range(7)]
+    batches = plan_batches(texts, max_items=3, token_counts=[1] * 7)
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_respects_token_ceiling():
+    counts = [10, 80, 30, 50, 200, 5]
+    batches = plan_batches(["x"] * 6, max_items=10, max_tokens=100, token_counts=counts)
+    for batch in batches:
+        assert sum(counts[i] for i in batch) <= 100 or len(batch) == 1
+    assert sorted(i for batch in batches for i in batch) == list(range(6))
+    # The oversized text is sent on its own
+    assert [4] in batches
+
+
+def test_sort_by_length_groups_similar_sizes_and_restores_order():
+    texts = ["a" * 400, "b", "c" * 8, "d" * 390, "e" * 4]
+    counts = [100, 1, 2, 98, 1]
+    batches = plan_batches(texts, max_items=2, sort_by_length=True, token_counts=counts)
+    assert batches == [[1, 4], [2, 3], [0]]
+
+    results = [[text[0] for text in (texts[i] for i in batch)] for batch in batches]
+    assert restore_order(batches, results, len(texts)) == ["a", "b", "c", "d", "e"]
+
+
+def test_empty_input():
+    assert plan_batches([], max_items=10) == []
@@ -0,0 +1,132 @@
+import asyncio
+
+import aiohttp
+import pytest
+
+from goldenverba.components.embedding.scheduler import (
+    AIMDWindow,
+    EmbeddingScheduler,
+    RetryableEmbeddingError,
+    TokenBucket,
+    retryable_from_client_error,
+)
+from goldenverba.components.interfaces import Embedding
+from goldenverba.components.managers import EmbeddingManager
+
+
+def test_retries_throttled_batch_and_keeps_order():
+    attempts = {}
+
+    async def fn(batch):
+        key = batch[0]
+        attempts[key] = attempts.get(key, 0) + 1
+        if key == "b" and attempts[key] < 3:
+            raise RetryableEmbeddingError("rate limited", status=429)
+        return [[float(ord(text))] for text in batch]
+
+    async def run():
+        scheduler = EmbeddingScheduler("test", max_retries=5, base_delay=0.001)
+        results = await scheduler.run([["a"], ["b"], ["c"]], fn)
+        return scheduler, results
+
+    scheduler, results = asyncio.run(run())
+    assert results == [[[97.0]], [[98.0]], [[99.0]]]
+    assert attempts["b"] == 3
+    assert scheduler.retries == 2
+    assert scheduler.throttled == 2
+
+
+def test_non_retryable_error_is_returned_without_retry():
+    calls = []
+
+    async def fn(batch):
+        calls.append(batch)
+        raise ValueError("bad request")
+
+    async def run():
+        scheduler = EmbeddingScheduler("test", base_delay=0.001)
+        return await scheduler.run([["a"]], fn)
+
+    results = asyncio.run(run())
+    assert isinstance(results[0], ValueError)
+    assert len(calls) == 1
+
+
+def test_aimd_window_halves_on_throttle_and_grows_on_success():
+    async def run():
+        window = AIMDWindow(initial=8, maximum=16)
+        await window.acquire()
+        await window.release(throttled=True)
+        assert int(window.limit) == 4
+        for _ in range(8):
+            await window.acquire()
+            await window.release()
+        assert int(window.limit) >= 5
+
+    asyncio.run(run())
+
+
+def test_concurrency_never_exceeds_window():
+    peak = {"now": 0, "max": 0}
+
+    async def fn(batch):
+        peak["now"] += 1
+        peak["max"] = max(peak["max"], peak["now"])
+        await asyncio.sleep(0.001)
+        peak["now"] -= 1
+        return [[0.0]]
+
+    async def run():
+        scheduler = EmbeddingScheduler("test", max_concurrency=3)
+        await scheduler.run([["x"]] * 30, fn)
+
+    asyncio.run(run())
+    assert peak["max"] <= 3
+
+
+def test_token_bucket_paces_requests():
+    async def run():
+        bucket = TokenBucket(rate_per_minute=600, capacity=1)  # 10/s
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            await bucket.acquire()
+        return loop.time() - start
+
+    elapsed = asyncio.run(run())
+    assert elapsed == pytest.approx(0.2, abs=0.1)
+
+
+class FlakyEmbedder(Embedding):
+    def __init__(self):
+        super().__init__()
+        self.name = "Flaky"
+        self.max_batch_size = 2
+        self.calls = 0
+
+    async def vectorize(self, config, content):
+        self.calls += 1
+        if self.calls == 1:
+            raise RetryableEmbeddingError("Rate limit exceeded (429)", status=429, retry_after=0.001)
+        return [[float(len(text))] for text in content]
+
+
+def test_manager_retries_instead_of_failing_document(monkeypatch):
+    monkeypatch.setattr(
+        "goldenverba.components.managers.get_embedding_cache", None
+    )
+    manager = EmbeddingManager()
+    manager.embedders = {"Flaky": FlakyEmbedder()}
+    content = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    embeddings = asyncio.run(manager.batch_vectorize("Flaky", {}, content))
+    assert embeddings == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+    assert manager.embedders["Flaky"].calls == 4
+
+
+def test_connection_errors_and_timeouts_are_retryable():
+    dropped = retryable_from_client_error(aiohttp.ServerDisconnectedError())
+    timeout = retryable_from_client_error(asyncio.TimeoutError())
+    assert isinstance(dropped, RetryableEmbeddingError) and dropped.status is None
+    assert isinstance(timeout, RetryableEmbeddingError)
+    assert retryable_from_client_error(aiohttp.InvalidURL("x")) is None
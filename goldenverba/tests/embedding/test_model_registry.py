@@ -0,0 +1,76 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from goldenverba.components.embedding import model_registry
+from goldenverba.components.embedding.model_registry import SentenceTransformerRegistry
+
+
+class FakeParameter:
+    def __init__(self, size):
+        self.size = size
+
+    def numel(self):
+        return self.size
+
+    def element_size(self):
+        return 4
+
+
+class FakeModel:
+    instances = 0
+
+    def __init__(self, model_name, device=None):
+        FakeModel.instances += 1
+        self.model_name = model_name
+        self.encode_calls = []
+
+    def parameters(self):
+        return [FakeParameter(256 * 1024)]  # 1MB
+
+    def encode(self, texts, batch_size=32):
+        self.encode_calls.append(list(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+
+@pytest.fixture(autouse=True)
+def fake_sentence_transformer(monkeypatch):
+    FakeModel.instances = 0
+    monkeypatch.setattr(model_registry, "SentenceTransformer", FakeModel)
+
+
+def test_model_loaded_once():
+    registry = SentenceTransformerRegistry()
+    first = registry.get("model-a")
+    second = registry.get("model-a")
+    assert first is second
+    assert FakeModel.instances == 1
+    assert registry.get_stats()["loads"] == 1
+
+
+def test_lru_eviction_under_memory_budget():
+    registry = SentenceTransformerRegistry(memory_budget_mb=2)
+    registry.get("model-a")
+    registry.get("model-b")
+    registry.get("model-a")  # model-b is now least recently used
+    registry.get("model-c")
+    assert registry.is_loaded("model-a")
+    assert not registry.is_loaded("model-b")
+    assert registry.is_loaded("model-c")
+    assert registry.evictions == 1
+
+
+def test_concurrent_queries_coalesce_into_one_encode():
+    registry = SentenceTransformerRegistry()
+
+    async def run():
+        return await asyncio.gather(
+            *[registry.encode_query("model-a", "q" * i) for i in range(1, 6)]
+        )
+
+    results = asyncio.run(run())
+    assert [result[0] for result in results] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    model = registry.get("model-a")
+    assert len(model.encode_calls) == 1
+    assert len(model.encode_calls[0]) == 5
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import numpy as np
+from sklearn.decomposition import PCA
+
+from goldenverba.components.projection import (
+    ProjectionModel,
+    ProjectionStore,
+    projection_uuid,
+)
+
+
+class FakeConfigManager:
+    """get_config / set_config backed by a dict, JSON round-tripped like Weaviate"""
+
+    def __init__(self):
+        self.configs = {}
+        self.writes = 0
+
+    async def get_config(self, client, uuid):
+        config = self.configs.get(uuid)
+        return json.loads(config) if config is not None else None
+
+    async def set_config(self, client, uuid, config):
+        self.writes += 1
+        self.configs[uuid] = json.dumps(config)
+
+
+def sample(n, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    # Most variance in the first three directions
+    scales = np.array([10, 6, 3] + [0.1] * (dim - 3))
+    return (rng.standard_normal((n, dim)) * scales).astype(np.float32)
+
+
+def test_incremental_fit_matches_full_pca_subspace():
+    data = sample(2000)
+    model = ProjectionModel(16)
+    for start in range(0, len(data), 250):
+        model.partial_fit(data[start : start + 250])
+
+    full = PCA(n_components=3).fit(data)
+    overlap = np.abs(model.pca.components_ @ full.components_.T)
+    assert np.allclose(np.diag(overlap), 1, atol=1e-2)
+    assert model.transform(data[:5]).shape == (5, 3)
+
+
+def test_small_batches_are_buffered_until_fittable():
+    model = ProjectionModel(16)
+    model.partial_fit(sample(2))
+    assert not model.fitted
+    # Random projection until fitted
+    assert model.transform(sample(2)).shape == (2, 3)
+    model.partial_fit(sample(1, seed=1))
+    assert model.fitted and model.samples == 3
+
+
+def test_state_round_trip_keeps_fitting():
+    data = sample(600)
+    model = ProjectionModel(16)
+    model.partial_fit(data[:300])
+    restored = ProjectionModel.from_dict(json.loads(json.dumps(model.to_dict())))
+    assert np.allclose(restored.transform(data[:10]), model.transform(data[:10]), atol=1e-4)
+
+    model.partial_fit(data[300:])
+    restored.partial_fit(data[300:])
+    assert restored.samples == 600
+    assert np.allclose(restored.pca.mean_, model.pca.mean_, atol=1e-4)
+
+
+def test_store_persists_and_reloads_per_embedder():
+    manager = FakeConfigManager()
+    store = ProjectionStore()
+    data = sample(100)
+
+    projected = asyncio.run(store.fit_transform(None, manager, "model-a", data[:50]))
+    assert projected.shape == (50, 3)
+    asyncio.run(store.fit_transform(None, manager, "model-a", data[50:]))
+    assert manager.writes == 2
+    assert projection_uuid("model-a") in manager.configs
+
+    reloaded = asyncio.run(ProjectionStore().get(None, manager, "model-a"))
+    assert reloaded.samples == 100
+    assert np.allclose(
+        reloaded.transform(data[:5]),
+        store.models["model-a"].transform(data[:5]),
+        atol=1e-4,
+    )
+    assert asyncio.run(ProjectionStore().get(None, manager, "model-b")) is None
@@ -0,0 +1,185 @@
+import asyncio
+from types import SimpleNamespace
+
+from goldenverba.bulk_import import BulkImportPipeline
+from goldenverba.server.types import FileConfig
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.reports = []
+
+    async def send_report(self, file_id, status, message, took):
+        self.reports.append((file_id, status, message))
+
+
+class FakeManager:
+    """Stage methods with fixed delays; records when each stage runs."""
+
+    def __init__(self, fail_chunk_for=None):
+        self.events = []
+        self.fail_chunk_for = fail_chunk_for
+        self.weaviate_manager = SimpleNamespace(
+            exist_document_name=self._no_duplicate,
+            existing_document_titles=self._no_titles,
+            delete_document=None,
+        )
+        self.reader_manager = SimpleNamespace(load=self._load)
+
+    async def _no_duplicate(self, client, name):
+        return None
+
+    async def _no_titles(self, client, titles):
+        return set()
+
+    async def _load(self, reader, fileConfig, logger):
+        await self._stage("read", fileConfig.filename)
+        return [SimpleNamespace(title=fileConfig.filename)]
+
+    async def _stage(self, name, title):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.sleep(0.02)
+        self.events.append((name, title, start, loop.time()))
+
+    async def prepare_file_config(self, document, fileConfig, logger):
+        return fileConfig
+
+    async def prepare_document(self, client, document, fileConfig):
+        return document
+
+    async def chunk_document(self, document, fileConfig, logger, executor=None):
+        if document.title == self.fail_chunk_for:
+            raise Exception("chunking exploded")
+        await self._stage("chunk", document.title)
+        return [document]
+
+    async def embed_documents(self, documents, fileConfig, logger):
+        await self._stage("embed", documents[0].title)
+        return documents
+
+    async def ingest_documents(self, client, documents, fileConfig, logger):
+        await self._stage("ingest", documents[0].title)
+        return client
+
+
+def make_files(n):
+    return [
+        FileConfig.model_construct(
+            fileID=f"file-{i}",
+            filename=f"file-{i}.txt",
+            overwrite=False,
+            rag_config={"Reader": SimpleNamespace(selected="Fake")},
+        )
+        for i in range(n)
+    ]
+
+
+def test_stages_overlap_across_files():
+    manager = FakeManager()
+    pipeline = BulkImportPipeline(manager, 1, 1, 1, 1, queue_size=2)
+    report = asyncio.run(pipeline.run(None, make_files(4), RecordingLogger()))
+
+    assert all(not result["error"] for result in report["files"].values())
+    assert report["stages"]["ingest"]["items"] == 4
+    # Sequential execution would take 4 files x 4 stages x 20ms
+    assert report["took"] < 0.3
+
+    events = {(name, title): (start, end) for name, title, start, end in manager.events}
+    embed_0 = events[("embed", "file-0.txt")]
+    read_1 = events[("read", "file-1.txt")]
+    assert read_1[0] < embed_0[1]
+
+
+def test_failed_file_does_not_stop_others():
+    manager = FakeManager(fail_chunk_for="file-1.txt")
+    logger = RecordingLogger()
+    pipeline = BulkImportPipeline(manager, 2, 2, 2, 2)
+    report = asyncio.run(pipeline.run(None, make_files(3), logger))
+
+    assert "chunk" in report["files"]["file-1"]["error"]
+    assert report["files"]["file-0"]["documents"] == 1
+    assert report["files"]["file-2"]["documents"] == 1
+    assert report["stages"]["chunk"]["errors"] == 1
+    statuses = {(file_id, status) for file_id, status, _ in logger.reports}
+    assert ("file-1", "ERROR") in statuses
+    assert ("file-2", "DONE") in statuses
+
+
+def test_real_manager_stages_run_end_to_end(monkeypatch):
+    """Runs VerbaManager's own chunk/embed/ingest stages with stubbed component managers."""
+    from goldenverba import verba_manager as verba_manager_module
+    from goldenverba.components.chunk import Chunk
+    from goldenverba.components.document import Document
+    from goldenverba.components.fingerprints import FingerprintStore
+    from goldenverba.verba_manager import VerbaManager
+
+    store = FingerprintStore(None)
+    monkeypatch.setattr(verba_manager_module, "get_fingerprint_store", lambda: store)
+    monkeypatch.setattr(verba_manager_module, "PLUGINS_AVAILABLE", False)
+    imported = []
+    text = "The quarterly report describes steady growth across every region of the company."
+
+    async def no_duplicate(client, name):
+        return None
+
+    async def no_titles(client, titles):
+        return set()
+
+    async def is_ready():
+        return True
+
+    async def load(reader, fileConfig, logger):
+        return [Document(title=fileConfig.filename, content=text, meta={})]
+
+    async def chunk(chunker, fileConfig, documents, embedder, logger):
+        for document in documents:
+            document.chunks = [Chunk(content=text, chunk_id=str(i)) for i in range(3)]
+        return documents
+
+    async def vectorize(embedder, fileConfig, documents, logger):
+        for document in documents:
+            for chunk in document.chunks:
+                chunk.vector = [0.1, 0.2]
+        return documents
+
+    async def import_document(client, document, embedder_model):
+        imported.append((document.title, len(document.chunks), embedder_model))
+
+    manager = VerbaManager.__new__(VerbaManager)
+    manager.reader_manager = SimpleNamespace(load=load)
+    manager.chunker_manager = SimpleNamespace(chunk=chunk)
+    manager.embedder_manager = SimpleNamespace(embedders={"Fake": object()}, vectorize=vectorize)
+    manager.weaviate_manager = SimpleNamespace(
+        exist_document_name=no_duplicate,
+        existing_document_titles=no_titles,
+        import_document=import_document,
+    )
+    embedder = SimpleNamespace(
+        selected="Fake",
+        components={"Fake": SimpleNamespace(config={"Model": SimpleNamespace(value="fake-model")})},
+    )
+    fileConfigs = [
+        FileConfig.model_construct(
+            fileID=f"file-{i}",
+            filename=f"file-{i}.txt",
+            isURL=False,
+            overwrite=False,
+            labels=["Document"],
+            metadata="",
+            rag_config={
+                "Reader": SimpleNamespace(selected="Fake"),
+                "Chunker": SimpleNamespace(selected="Fake"),
+                "Embedder": embedder,
+            },
+        )
+        for i in range(2)
+    ]
+
+    logger = RecordingLogger()
+    client = SimpleNamespace(is_ready=is_ready)
+    report = asyncio.run(BulkImportPipeline(manager).run(client, fileConfigs, logger))
+
+    assert all(not result["error"] for result in report["files"].values())
+    assert sorted(imported) == [("file-0.txt", 3, "fake-model"), ("file-1.txt", 3, "fake-model")]
+    assert ("file-0", "DONE") in {(file_id, status) for file_id, status, _ in logger.reports}
@@ -0,0 +1,58 @@
+import asyncio
+
+import httpx
+
+from goldenverba.components.http_pool import HTTPClientPool, base_url_of
+
+
+def test_base_url_of_strips_path_and_query():
+    assert base_url_of("https://API.openai.com/v1/embeddings?x=1") == "https://api.openai.com"
+    assert base_url_of("http://localhost:11434/api/embed") == "http://localhost:11434"
+    assert base_url_of("localhost") == "localhost"
+
+
+def test_session_is_shared_per_base_url():
+    async def run():
+        pool = HTTPClientPool(limit=10, limit_per_host=5)
+        first = pool.session("https://api.cohere.com/v1/embed")
+        second = pool.session("https://api.cohere.com/v1/chat")
+        other = pool.session("https://api.voyageai.com/v1/embeddings")
+        assert first is second
+        assert first is not other
+        await pool.close()
+        assert first.closed and other.closed
+        assert pool.session("https://api.cohere.com/v1/embed") is not first
+        await pool.close()
+
+    asyncio.run(run())
+
+
+def test_session_recreated_on_new_event_loop():
+    pool = HTTPClientPool()
+
+    async def get():
+        return pool.session("http://localhost:8080/v1")
+
+    first = asyncio.run(get())
+    second = asyncio.run(get())
+    assert first is not second
+    asyncio.run(pool.close())
+
+
+def test_httpx_in_flight_recovers_from_failed_requests():
+    async def run():
+        pool = HTTPClientPool()
+        url = "http://127.0.0.1:1/v1/embed"
+        client = pool.httpx_client(url)
+        for _ in range(3):
+            try:
+                await client.get(url, timeout=2)
+            except httpx.TransportError:
+                pass
+        stats = pool.get_stats()["pools"]["http://127.0.0.1:1"]
+        await pool.close()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats["requests"] == 3
+    assert stats["in_flight"] == 0 and stats["saturation"] == 0.0
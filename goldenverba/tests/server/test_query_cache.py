@@ -0,0 +1,120 @@
+import asyncio
+from types import SimpleNamespace
+
+from goldenverba.components.query_cache import QueryCache, cache_scope
+from goldenverba.verba_manager import VerbaManager
+
+
+def component(selected, config=None):
+    value = {"selected": selected, "config": config or {}}
+    return SimpleNamespace(
+        selected=selected,
+        components={
+            selected: SimpleNamespace(
+                config={"Model": SimpleNamespace(value=f"{selected}-model")}
+            )
+        },
+        model_dump=lambda: value,
+    )
+
+
+def rag_config(alpha=0.5):
+    return {
+        "Retriever": component("Advanced", {"alpha": alpha}),
+        "Embedder": component("Fake"),
+    }
+
+
+class FakeWeaviateManager:
+    def __init__(self, cache, semantic_hit=None):
+        self.query_cache = cache
+        self.semantic_hit = semantic_hit
+        self.stored = []
+
+    async def add_suggestion(self, client, query):
+        pass
+
+    async def get_cache_generation(self, client):
+        return self.query_cache.generation
+
+    async def get_cached_query(self, client, embedder, vector, scope, generation, similarity):
+        return self.semantic_hit
+
+    async def add_cached_query(self, client, embedder, query, vector, scope, generation, payload):
+        self.stored.append((embedder, query, generation, payload))
+
+
+class FakeEmbedderManager:
+    def __init__(self):
+        self.calls = 0
+
+    async def vectorize_query(self, embedder, query, rag_config):
+        self.calls += 1
+        return [0.1, 0.2]
+
+
+class FakeRetrieverManager:
+    def __init__(self):
+        self.calls = 0
+
+    async def retrieve(self, client, retriever, query, vector, rag_config, weaviate_manager, labels, document_uuids):
+        self.calls += 1
+        return ([{"title": query, "chunks": []}], f"context for {query}")
+
+
+def make_manager(cache, semantic_hit=None):
+    manager = VerbaManager.__new__(VerbaManager)
+    manager.weaviate_manager = FakeWeaviateManager(cache, semantic_hit)
+    manager.embedder_manager = FakeEmbedderManager()
+    manager.retriever_manager = FakeRetrieverManager()
+    return manager
+
+
+def test_scope_depends_on_config_labels_and_documents():
+    base = cache_scope(rag_config(), ["a"], ["d1", "d2"])
+    assert base == cache_scope(rag_config(), ["a"], ["d2", "d1"])
+    assert base != cache_scope(rag_config(alpha=0.7), ["a"], ["d1", "d2"])
+    assert base != cache_scope(rag_config(), [], ["d1", "d2"])
+
+
+def test_exact_hit_skips_embedding_and_retrieval():
+    manager = make_manager(QueryCache(similarity=0))
+
+    async def run():
+        first = await manager.retrieve_chunks(None, "What is Verba?", rag_config())
+        second = await manager.retrieve_chunks(None, "  what is   VERBA? ", rag_config())
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert manager.embedder_manager.calls == 1
+    assert manager.retriever_manager.calls == 1
+    assert first[2]["cache"]["hit"] is None
+    assert second[2]["cache"]["hit"] == "exact"
+    assert second[:2] == first[:2]
+
+
+def test_generation_change_invalidates():
+    cache = QueryCache(similarity=0)
+    manager = make_manager(cache)
+    asyncio.run(manager.retrieve_chunks(None, "q", rag_config()))
+    cache.set_generation(cache.generation + 1)
+    result = asyncio.run(manager.retrieve_chunks(None, "q", rag_config()))
+    assert result[2]["cache"]["hit"] is None
+    assert manager.retriever_manager.calls == 2
+
+
+def test_semantic_hit_and_store():
+    cache = QueryCache(similarity=0.9)
+    manager = make_manager(cache)
+    miss = asyncio.run(manager.retrieve_chunks(None, "first question", rag_config()))
+    assert len(manager.weaviate_manager.stored) == 1
+    assert manager.weaviate_manager.stored[0][0] == "Fake-model"
+
+    payload = manager.weaviate_manager.stored[0][3]
+    manager.weaviate_manager.semantic_hit = (payload, 0.95)
+    hit = asyncio.run(manager.retrieve_chunks(None, "first question?!", rag_config()))
+    assert manager.retriever_manager.calls == 1
+    assert hit[2]["cache"]["hit"] == "semantic"
+    assert hit[2]["cache"]["similarity"] == 0.95
+    assert hit[:2] == miss[:2]
+    assert cache.stats == {"exact_hits": 0, "semantic_hits": 1, "misses": 1}
@@ -0,0 +1,137 @@
+import asyncio
+
+from goldenverba.components.suggestions import (
+    SuggestionIndexes,
+    SuggestionTrie,
+    SuggestionWriter,
+)
+
+
+def suggestion(uuid, query, timestamp):
+    return {"uuid": uuid, "query": query, "timestamp": timestamp}
+
+
+def test_trie_matches_word_starts_and_ranks_leading_matches_first():
+    trie = SuggestionTrie()
+    trie.add(suggestion("1", "How does Verba chunk documents?", "2024-01-01"))
+    trie.add(suggestion("2", "Verba setup guide", "2024-01-02"))
+    trie.add(suggestion("3", "verba pricing", "2024-01-03"))
+    trie.add(suggestion("4", "weaviate backup", "2024-01-04"))
+    trie.add(suggestion("5", "VERBA   pricing", "2024-01-05"))
+
+    assert [s["uuid"] for s in trie.search("verb", 10)] == ["3", "2", "1"]
+    assert [s["uuid"] for s in trie.search("chunk doc", 10)] == ["1"]
+    assert trie.search("verba", 1)[0]["uuid"] == "3"
+    assert trie.search("missing", 10) == []
+
+    trie.remove("3")
+    assert [s["uuid"] for s in trie.search("verba p", 10)] == []
+    assert len(trie) == 3
+
+
+def test_writer_dedupes_and_batches_per_client():
+    writes = []
+
+    async def write(client, queries):
+        writes.append((client, list(queries)))
+        return [{"query": query} for query in queries]
+
+    async def run():
+        writer = SuggestionWriter(write, flush_interval=60)
+        assert writer.record("client-a", "What is Verba?")
+        assert not writer.record("client-a", "what is  verba?")
+        writer.record("client-a", "second question")
+        writer.record("client-b", "other client")
+        assert writes == []
+        await writer.close()
+        return writer
+
+    writer = asyncio.run(run())
+    assert writes == [
+        ("client-a", ["What is Verba?", "second question"]),
+        ("client-b", ["other client"]),
+    ]
+    assert writer.stats["written"] == 3
+    assert writer.stats["duplicates"] == 1
+
+
+def test_writer_bounds_queue_and_retries_failed_queries_later():
+    async def failing(client, queries):
+        raise RuntimeError("weaviate down")
+
+    async def run():
+        writer = SuggestionWriter(failing, flush_interval=60, max_pending=2)
+        writer.record("c", "one")
+        writer.record("c", "two")
+        assert not writer.record("c", "three")
+        await writer.close()
+        # Failed queries can be queued again
+        assert writer.record("c", "one")
+        await writer.close()
+        return writer
+
+    writer = asyncio.run(run())
+    assert writer.stats["dropped"] == 1
+    assert writer.stats["failed"] == 3
+
+
+def test_writer_flushes_in_background():
+    written = []
+
+    async def write(client, queries):
+        written.extend(queries)
+        return queries
+
+    async def run():
+        writer = SuggestionWriter(write, flush_interval=0.01)
+        writer.record("c", "background")
+        await asyncio.sleep(0.05)
+        assert writer.pending == 0
+
+    asyncio.run(run())
+    assert written == ["background"]
+
+
+def test_indexes_build_once_and_serve_from_memory():
+    loads = []
+
+    class Client:
+        pass
+
+    async def load(client, limit):
+        loads.append(limit)
+        return [suggestion("1", "verba docs", "2024-01-01")]
+
+    async def run():
+        indexes = SuggestionIndexes(load, ttl=60, max_entries=100)
+        client = Client()
+        first = await indexes.get(client)
+        second = await indexes.get(client)
+        assert first is second
+        return first.search("docs", 5)
+
+    assert [s["uuid"] for s in asyncio.run(run())] == ["1"]
+    assert loads == [100]
+
+
+def test_indexes_build_in_background_without_blocking_reads():
+    release = asyncio.Event()
+
+    class Client:
+        pass
+
+    async def load(client, limit):
+        await release.wait()
+        return [suggestion("1", "verba docs", "2024-01-01")]
+
+    async def run():
+        indexes = SuggestionIndexes(load, ttl=60, max_entries=100)
+        client = Client()
+        assert indexes.ready(client) is None
+        assert indexes.ready(client) is None
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        return indexes.ready(client).search("verba", 5)
+
+    assert [s["uuid"] for s in asyncio.run(run())] == ["1"]
@@ -0,0 +1,113 @@
+import asyncio
+import base64
+import hashlib
+
+import pytest
+
+from goldenverba.components.reader.BasicReader import BasicReader
+from goldenverba.server.types import FileConfig
+from goldenverba.server.uploads import (
+    UploadError,
+    UploadOffsetMismatch,
+    UploadStore,
+    read_file_bytes,
+)
+
+DATA = "Olá, mundo!\n".encode("utf-8") * 1000
+
+
+def make_config(**kwargs):
+    fields = dict(
+        fileID="file-0",
+        filename="notes.txt",
+        isURL=False,
+        overwrite=False,
+        extension="txt",
+        source="",
+        content="",
+        labels=[],
+        rag_config={},
+        file_size=0,
+        status="READY",
+        metadata="",
+        status_report={},
+    )
+    fields.update(kwargs)
+    return FileConfig.model_validate(fields)
+
+
+async def stream(data, size=4096, fail_after=None):
+    for i, start in enumerate(range(0, len(data), size)):
+        if fail_after is not None and i >= fail_after:
+            raise ConnectionError("client went away")
+        yield data[start : start + size]
+
+
+def test_upload_round_trip_reads_memoryview(tmp_path):
+    store = UploadStore(directory=str(tmp_path))
+    session = store.create(make_config(), len(DATA), hashlib.sha256(DATA).hexdigest())
+
+    asyncio.run(store.write(session.upload_id, 0, stream(DATA)))
+    config = asyncio.run(store.finalize(session.upload_id))
+
+    assert config.content == "" and config.file_size == len(DATA)
+    content = read_file_bytes(config)
+    assert isinstance(content, memoryview) and content == DATA
+    documents = asyncio.run(BasicReader().load({}, config))
+    assert documents[0].content == DATA.decode("utf-8")
+
+    store.release(session.upload_id)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_interrupted_upload_resumes_after_restart(tmp_path):
+    store = UploadStore(directory=str(tmp_path))
+    session = store.create(make_config(), len(DATA), hashlib.sha256(DATA).hexdigest())
+    with pytest.raises(ConnectionError):
+        asyncio.run(store.write(session.upload_id, 0, stream(DATA, fail_after=2)))
+    assert store.get(session.upload_id).received == 8192
+
+    # A new process finds the upload again for the same file and continues at its offset
+    restarted = UploadStore(directory=str(tmp_path))
+    resumed = restarted.create(make_config(), len(DATA), hashlib.sha256(DATA).hexdigest())
+    assert resumed.upload_id == session.upload_id
+    with pytest.raises(UploadOffsetMismatch) as mismatch:
+        asyncio.run(restarted.write(resumed.upload_id, 0, stream(DATA)))
+    assert mismatch.value.offset == 8192
+
+    asyncio.run(restarted.write(resumed.upload_id, 8192, stream(DATA[8192:])))
+    assert bytes(read_file_bytes(asyncio.run(restarted.finalize(resumed.upload_id)))) == DATA
+
+
+def test_hash_and_size_are_checked(tmp_path):
+    store = UploadStore(directory=str(tmp_path), max_bytes=len(DATA))
+    with pytest.raises(UploadError):
+        store.create(make_config(), len(DATA) + 1)
+
+    session = store.create(make_config(), len(DATA), "0" * 64)
+    with pytest.raises(UploadError):
+        asyncio.run(store.finalize(session.upload_id))
+    asyncio.run(store.write(session.upload_id, 0, stream(DATA)))
+    with pytest.raises(UploadError, match="sha256"):
+        asyncio.run(store.finalize(session.upload_id))
+    with pytest.raises(UploadError, match="exceeds"):
+        asyncio.run(store.write(session.upload_id, len(DATA), stream(b"x")))
+
+
+def test_content_path_is_not_read_from_requests():
+    config = make_config(content=base64.b64encode(b"abc").decode(), content_path="/etc/passwd")
+    assert config.content_path is None
+    assert "content_path" not in config.model_dump()
+    assert read_file_bytes(config) == b"abc"
+
+
+def test_reader_maps_local_files(tmp_path):
+    # `verba import` points FileConfigs at the files instead of base64 content
+    for name, extension in (("notes.txt", "txt"), ("README", "")):
+        path = tmp_path / name
+        path.write_bytes(DATA)
+        config = make_config(filename=name, extension=extension, file_size=len(DATA))
+        config._content_path = str(path)
+
+        documents = asyncio.run(BasicReader().load({}, config))
+        assert documents[0].content == DATA.decode("utf-8")
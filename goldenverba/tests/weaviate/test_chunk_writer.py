@@ -0,0 +1,85 @@
+import asyncio
+from types import SimpleNamespace
+
+from weaviate.collections.classes.batch import BatchObjectReturn, ErrorObject
+from weaviate.collections.classes.data import DataObject
+
+from goldenverba.components.weaviate_writer import ChunkWriter
+
+
+class FakeData:
+    def __init__(self, fail_once=(), latency=0.0):
+        self.calls = []
+        self.stored = {}
+        self.fail_once = set(fail_once)
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def insert_many(self, objects):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.calls.append(len(objects))
+        await asyncio.sleep(self.latency)
+        response = BatchObjectReturn()
+        for index, data_object in enumerate(objects):
+            key = data_object.properties["i"]
+            if key in self.fail_once:
+                self.fail_once.discard(key)
+                response.errors[index] = ErrorObject(message=f"failed {key}", object_=None)
+            else:
+                self.stored[data_object.uuid] = key
+                response.uuids[index] = data_object.uuid
+        response.has_errors = bool(response.errors)
+        self.in_flight -= 1
+        return response
+
+
+def objects(n):
+    return (DataObject(properties={"i": i}, vector=[0.1] * 4) for i in range(n))
+
+
+def test_batches_by_count_and_reports_uuids():
+    data = FakeData()
+    writer = ChunkWriter(SimpleNamespace(data=data), batch_size=10)
+    result = asyncio.run(writer.write(objects(25)))
+
+    assert sorted(data.calls) == [5, 10, 10]
+    assert result.inserted == 25
+    assert result.batches == 3
+    assert sorted(data.stored.values()) == list(range(25))
+
+
+def test_batches_by_payload_size():
+    data = FakeData()
+    writer = ChunkWriter(SimpleNamespace(data=data), batch_size=100, max_batch_bytes=100)
+    asyncio.run(writer.write(objects(6)))
+    assert len(data.calls) > 1
+
+
+def test_retries_only_failed_objects():
+    data = FakeData(fail_once={3, 7})
+    writer = ChunkWriter(SimpleNamespace(data=data), batch_size=10, base_delay=0.001)
+    result = asyncio.run(writer.write(objects(10)))
+
+    assert data.calls == [10, 2]
+    assert result.inserted == 10
+    assert result.retries == 1
+    assert not result.errors
+
+
+def test_in_flight_requests_are_bounded():
+    data = FakeData(latency=0.005)
+    writer = ChunkWriter(SimpleNamespace(data=data), batch_size=1, max_concurrency=3)
+    result = asyncio.run(writer.write(objects(20)))
+    assert result.inserted == 20
+    assert data.max_in_flight <= 3
+
+
+def test_slow_responses_shrink_the_window():
+    data = FakeData(latency=0.01)
+    writer = ChunkWriter(
+        SimpleNamespace(data=data), batch_size=1, max_concurrency=4, target_latency=0.001
+    )
+    asyncio.run(writer.write(objects(8)))
+    assert int(writer.window.limit) == 1
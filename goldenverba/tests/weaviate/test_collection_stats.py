@@ -0,0 +1,108 @@
+import asyncio
+
+from goldenverba.components import collection_stats
+from goldenverba.components.collection_stats import CollectionStats
+
+
+class Client:
+    pass
+
+
+def counting_loader(counts):
+    calls = []
+
+    async def load(client, embedder):
+        calls.append(embedder)
+        return dict(counts)
+
+    return load, calls
+
+
+def test_counts_are_loaded_once_and_updated_incrementally():
+    load, calls = counting_loader({"d1": 3, "d2": 2})
+    stats = CollectionStats(load, ttl=60)
+    client = Client()
+
+    async def run():
+        first = await stats.get(client, "model")
+        assert (first.document_count, first.chunk_count) == (2, 5)
+
+        stats.add_document(client, "model", "d3", 4)
+        stats.remove_document(client, "model", "d1")
+        second = await stats.get(client, "model")
+        assert second is first
+        assert (second.document_count, second.chunk_count) == (2, 6)
+        assert second.count_documents(["d1", "d2", "d3", "d3"]) == 2
+        assert await stats.has_chunks(client, "model")
+
+    asyncio.run(run())
+    assert calls == ["model"]
+
+
+def test_concurrent_first_reads_share_one_load():
+    load, calls = counting_loader({"d1": 1})
+    stats = CollectionStats(load, ttl=60)
+    client = Client()
+
+    async def run():
+        return await asyncio.gather(*(stats.get(client, "model") for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_stale_counts_refresh_in_background():
+    counts = {"d1": 1}
+    load, calls = counting_loader(counts)
+    stats = CollectionStats(load, ttl=0)
+    client = Client()
+
+    async def run():
+        await stats.get(client, "model")
+        counts["d2"] = 2
+        stale = await stats.get(client, "model")
+        assert stale.document_count == 1
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+    assert stats.peek(client, "model").document_count == 2
+
+
+def test_refresh_overlapping_an_import_is_discarded():
+    client = Client()
+    stats = None
+
+    async def load(client, embedder):
+        if stats.peek(client, embedder) is not None:
+            # An import lands while the refresh is reading the collection
+            stats.add_document(client, embedder, "new", 7)
+        return {"old": 1}
+
+    stats = CollectionStats(load, ttl=60)
+
+    async def run():
+        await stats.get(client, "model")
+        await stats._load_task(client, "model")
+        return stats.peek(client, "model")
+
+    result = asyncio.run(run())
+    assert result.chunks_by_doc == {"old": 1, "new": 7}
+
+
+def test_empty_collection_is_rechecked_before_refusing(monkeypatch):
+    monkeypatch.setattr(collection_stats, "EMPTY_RECHECK", 0.0)
+    counts = {}
+    load, calls = counting_loader(counts)
+    stats = CollectionStats(load, ttl=60)
+    client = Client()
+
+    async def run():
+        assert not await stats.has_chunks(client, "model")
+        counts["d1"] = 2
+        assert await stats.has_chunks(client, "model")
+
+    asyncio.run(run())
+    assert len(calls) == 3
@@ -0,0 +1,126 @@
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+from goldenverba.components.document_cache import DocumentMetadataCache
+from goldenverba.components.managers import WeaviateManager
+from goldenverba.components.retriever.WindowRetriever import WindowRetriever
+
+
+class FakeDocumentQuery:
+    def __init__(self, documents):
+        self.documents = documents
+        self.calls = []
+
+    async def fetch_objects(self, filters, limit, return_properties):
+        ids = list(filters.value)
+        self.calls.append(ids)
+        return SimpleNamespace(
+            objects=[
+                SimpleNamespace(uuid=uuid, properties=self.documents[uuid])
+                for uuid in ids
+                if uuid in self.documents
+            ]
+        )
+
+
+def make_manager(documents):
+    manager = WeaviateManager()
+    query = FakeDocumentQuery(documents)
+    client = SimpleNamespace(
+        collections=SimpleNamespace(get=lambda name: SimpleNamespace(query=query))
+    )
+
+    async def verify_collection(client, name):
+        return True
+
+    manager.verify_collection = verify_collection
+    return manager, client, query
+
+
+def test_cache_expires_and_evicts_least_recently_used():
+    cache = DocumentMetadataCache(max_entries=2, ttl=0.05)
+    cache.set("a", {"title": "A"})
+    cache.set("b", {"title": "B"})
+    assert cache.get("a") == {"title": "A"}
+    cache.set("c", {"title": "C"})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    time.sleep(0.06)
+    assert cache.get("a") is None
+
+
+def test_metadata_resolved_in_one_query_then_cached():
+    doc = [str(uuid.uuid5(uuid.NAMESPACE_URL, f"doc-{i}")) for i in range(4)]
+    documents = {
+        doc[i]: {"title": f"Doc {i}", "metadata": f"meta {i}"} for i in range(3)
+    }
+    manager, client, query = make_manager(documents)
+
+    resolved = asyncio.run(
+        manager.get_documents_metadata(client, [doc[0], doc[1], doc[0], doc[3]])
+    )
+    assert resolved == {
+        doc[0]: {"title": "Doc 0", "metadata": "meta 0"},
+        doc[1]: {"title": "Doc 1", "metadata": "meta 1"},
+    }
+    assert query.calls == [[doc[0], doc[1], doc[3]]]
+
+    asyncio.run(manager.get_documents_metadata(client, [doc[0], doc[2]]))
+    assert query.calls[-1] == [doc[2]]
+
+    manager.document_cache.invalidate(doc[0])
+    asyncio.run(manager.get_documents_metadata(client, [doc[0]]))
+    assert query.calls[-1] == [doc[0]]
+
+
+class FakeWeaviateManager:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = []
+
+    async def hybrid_chunks(self, *args):
+        return self.chunks
+
+    async def get_documents_metadata(self, client, uuids):
+        self.calls.append(("metadata", sorted(set(uuids))))
+        return {uuid: {"title": uuid.upper(), "metadata": ""} for uuid in set(uuids)}
+
+    async def get_chunks_by_doc_ids(self, client, embedder, ids_by_doc):
+        self.calls.append(("chunks", {doc: sorted(ids) for doc, ids in ids_by_doc.items()}))
+        return {
+            doc: [
+                SimpleNamespace(
+                    uuid=f"{doc}-{i}",
+                    properties={"chunk_id": i, "content": f"{doc} window {i}", "doc_uuid": doc},
+                )
+                for i in sorted(ids)
+                if i >= 0
+            ]
+            for doc, ids in ids_by_doc.items()
+        }
+
+
+def chunk(doc, chunk_id, score):
+    return SimpleNamespace(
+        uuid=f"{doc}-{chunk_id}",
+        properties={"doc_uuid": doc, "chunk_id": chunk_id, "content": f"{doc} hit {chunk_id}"},
+        metadata=SimpleNamespace(score=score),
+    )
+
+
+def test_window_retriever_batches_document_and_window_lookups():
+    retriever = WindowRetriever()
+    manager = FakeWeaviateManager([chunk("a", 3, 0.9), chunk("b", 0, 0.8), chunk("a", 7, 0.1)])
+
+    documents, context = asyncio.run(
+        retriever.retrieve(None, "q", [0.1], retriever.config, manager, "emb", [], [])
+    )
+
+    assert [call[0] for call in manager.calls] == ["metadata", "chunks"]
+    assert manager.calls[0][1] == ["a", "b"]
+    assert manager.calls[1][1] == {"a": [2, 4], "b": [-1, 1]}
+    assert [document["title"] for document in documents] == ["A", "B"]
+    assert [c["chunk_id"] for c in documents[0]["chunks"]] == [2, 3, 4, 7]
+    assert "b window 1" in context
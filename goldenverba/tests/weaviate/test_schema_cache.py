@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+
+from goldenverba.components import schema_cache
+from goldenverba.components.managers import WeaviateManager
+from goldenverba.components.schema_cache import (
+    CollectionStateCache,
+    get_collection_properties,
+)
+
+
+class FakeCollections:
+    def __init__(self, existing=()):
+        self.existing = set(existing)
+        self.exists_calls = 0
+        self.config_calls = 0
+        self.created = []
+
+    async def exists(self, name):
+        self.exists_calls += 1
+        return name in self.existing
+
+    async def create(self, name, properties=None):
+        self.created.append(name)
+        self.existing.add(name)
+        return SimpleNamespace(name=name)
+
+    async def delete(self, name):
+        self.existing.discard(name)
+
+    def get(self, name):
+        async def get_config():
+            self.config_calls += 1
+            return SimpleNamespace(properties=[SimpleNamespace(name="content")])
+
+        return SimpleNamespace(config=SimpleNamespace(get=get_config))
+
+
+class FakeClient:
+    def __init__(self, existing=()):
+        self.collections = FakeCollections(existing)
+
+
+def fresh_cache(monkeypatch, ttl=300.0):
+    cache = CollectionStateCache(ttl=ttl)
+    monkeypatch.setattr(schema_cache, "_cache", cache)
+    return cache
+
+
+def test_verify_collection_checks_existence_once(monkeypatch):
+    fresh_cache(monkeypatch)
+    client = FakeClient(existing={"VERBA_DOCUMENTS"})
+    manager = WeaviateManager()
+
+    async def run():
+        for _ in range(5):
+            assert await manager.verify_collection(client, "VERBA_DOCUMENTS")
+
+    asyncio.run(run())
+    assert client.collections.exists_calls == 1
+
+
+def test_created_collection_is_cached_and_delete_invalidates(monkeypatch):
+    fresh_cache(monkeypatch)
+    client = FakeClient()
+    manager = WeaviateManager()
+
+    asyncio.run(manager.verify_collection(client, "VERBA_SUGGESTIONS"))
+    asyncio.run(manager.verify_collection(client, "VERBA_SUGGESTIONS"))
+    assert client.collections.created == ["VERBA_SUGGESTIONS"]
+    assert client.collections.exists_calls == 1
+
+    asyncio.run(manager.delete_all_suggestions(client))
+    asyncio.run(manager.verify_collection(client, "VERBA_SUGGESTIONS"))
+    assert client.collections.created == ["VERBA_SUGGESTIONS", "VERBA_SUGGESTIONS"]
+
+
+def test_entries_are_per_client_and_revalidated(monkeypatch):
+    fresh_cache(monkeypatch, ttl=0.0)
+    first, second = FakeClient(existing={"A"}), FakeClient()
+
+    async def run():
+        assert await get_collection_properties(first, "A") == ["content"]
+        assert await get_collection_properties(second, "A") == []
+        # ttl=0 disables caching, every call revalidates
+        await get_collection_properties(first, "A")
+
+    asyncio.run(run())
+    assert first.collections.config_calls == 2
+    assert second.collections.config_calls == 0
+
+
+def test_properties_are_cached(monkeypatch):
+    fresh_cache(monkeypatch)
+    client = FakeClient(existing={"A"})
+
+    async def run():
+        for _ in range(3):
+            await get_collection_properties(client, "A")
+
+    asyncio.run(run())
+    assert client.collections.config_calls == 1
+    assert client.collections.exists_calls == 1
@@ -14,12 +14,26 @@ if not hasattr(msg, 'debug'):
 import asyncio
 
 from copy import deepcopy
+from functools import partial
 import hashlib
 
 from goldenverba.server.helpers import LoggerManager
 from weaviate.client import WeaviateAsyncClient
 
 from goldenverba.components.document import Document
+from goldenverba.components.fingerprints import (
+    DocumentUnchanged,
+    SourceUnchanged,
+    document_hash,
+    get_fingerprint_store,
+    stored_content_hash,
+    verify_documents,
+)
+from goldenverba.components.query_cache import (
+    cache_scope,
+    encode_result,
+    decode_result,
+)
 from goldenverba.server.types import (
     FileConfig,
     FileStatus,
@@ -148,7 +162,10 @@ class VerbaManager:
             if duplicate_uuid is not None and not fileConfig.overwrite:
                 raise Exception(f"{fileConfig.filename} already exists in Verba")
             elif duplicate_uuid is not None and fileConfig.overwrite:
-                await self.weaviate_manager.delete_document(client, duplicate_uuid)
+                # Files are replaced in prepare_document, which first checks
+                # whether their content changed at all
+                if fileConfig.isURL:
+                    await self.weaviate_manager.delete_document(client, duplicate_uuid)
                 await logger.send_report(
                     fileConfig.fileID,
                     status=FileStatus.STARTING,
@@ -169,10 +186,22 @@ class VerbaManager:
                 reader_name = fileConfig.rag_config["Reader"].selected
             msg.info(f"[IMPORT] Loading file '{fileConfig.filename}' with reader '{reader_name}'")
             try:
-                documents = await self.reader_manager.load(
-                    reader_name, fileConfig, logger
-                )
+                with verify_documents(
+                    partial(self.weaviate_manager.existing_document_titles, client)
+                ):
+                    documents = await self.reader_manager.load(
+                        reader_name, fileConfig, logger
+                    )
                 msg.good(f"[IMPORT] Successfully loaded {len(documents)} document(s) from '{fileConfig.filename}'")
+            except SourceUnchanged as e:
+                msg.info(f"[IMPORT] Skipping '{fileConfig.filename}': {str(e)}")
+                await logger.send_report(
+                    fileConfig.fileID,
+                    status=FileStatus.DONE,
+                    message=str(e),
+                    took=round(loop.time() - start_time, 2),
+                )
+                return
             except Exception as e:
                 import traceback
                 msg.fail(f"[IMPORT] Failed to load file '{fileConfig.filename}' with reader '{reader_name}': {type(e).__name__}: {str(e)}")
@@ -271,6 +300,60 @@ class VerbaManager:
         loop = asyncio.get_running_loop()
         start_time = loop.time()
 
+        currentFileConfig = await self.prepare_file_config(document, fileConfig, logger)
+
+        try:
+            try:
+                document = await self.prepare_document(
+                    client, document, currentFileConfig
+                )
+            except DocumentUnchanged as e:
+                await asyncio.to_thread(get_fingerprint_store().remember, document)
+                await logger.send_report(
+                    currentFileConfig.fileID,
+                    status=FileStatus.DONE,
+                    message=str(e),
+                    took=round(loop.time() - start_time, 2),
+                )
+                return
+            chunked_documents = await self.chunk_document(
+                document, currentFileConfig, logger
+            )
+            vectorized_documents = await self.embed_documents(
+                chunked_documents, currentFileConfig, logger
+            )
+            client = await self.ingest_documents(
+                client, vectorized_documents, currentFileConfig, logger
+            )
+
+            await logger.send_report(
+                currentFileConfig.fileID,
+                status=FileStatus.INGESTING,
+                message=f"Imported {currentFileConfig.filename} into Weaviate",
+                took=round(loop.time() - start_time, 2),
+            )
+
+            await logger.send_report(
+                currentFileConfig.fileID,
+                status=FileStatus.DONE,
+                message=f"Import for {currentFileConfig.filename} completed successfully",
+                took=round(loop.time() - start_time, 2),
+            )
+        except Exception as e:
+            await logger.send_report(
+                currentFileConfig.fileID,
+                status=FileStatus.ERROR,
+                message=f"Import for {fileConfig.filename} failed: {str(e)}",
+                took=round(loop.time() - start_time, 2),
+            )
+            raise Exception(f"Import for {fileConfig.filename} failed: {str(e)}")
+
+    # Import stages (used by process_single_document and the bulk import pipeline)
+
+    async def prepare_file_config(
+        self, document: Document, fileConfig: FileConfig, logger: LoggerManager
+    ) -> FileConfig:
+        """URL imports get one FileConfig (and frontend entry) per fetched document"""
         if fileConfig.isURL:
             currentFileConfig = deepcopy(fileConfig)
             currentFileConfig.fileID = fileConfig.fileID + document.title
@@ -283,59 +366,98 @@ class VerbaManager:
             )
         else:
             currentFileConfig = fileConfig
+        return currentFileConfig
 
-        try:
-            duplicate_uuid = await self.weaviate_manager.exist_document_name(
-                client, document.title
+    async def prepare_document(
+        self, client, document: Document, currentFileConfig: FileConfig
+    ) -> Document:
+        """Handles duplicates/overwrite and ETL pre-chunking for one document
+        @raises DocumentUnchanged : The stored document has the same content and settings
+        """
+        document.meta["content_hash"] = document_hash(document, currentFileConfig)
+        duplicate_uuid = await self.weaviate_manager.exist_document_name(
+            client, document.title
+        )
+        if duplicate_uuid is not None:
+            stored = await self.weaviate_manager.get_document(
+                client, duplicate_uuid, properties=["meta"]
             )
-            if duplicate_uuid is not None and not currentFileConfig.overwrite:
-                raise Exception(f"{document.title} already exists in Verba")
-            elif duplicate_uuid is not None and currentFileConfig.overwrite:
-                await self.weaviate_manager.delete_document(client, duplicate_uuid)
-
-            # Check if ETL is enabled BEFORE chunking
-            enable_etl = document.meta.get("enable_etl", False) if hasattr(document, 'meta') and document.meta else False
-            msg.info(f"[ETL-PRE-CHECK] Verificando ETL para documento '{document.title}': enable_etl={enable_etl}, meta={document.meta if hasattr(document, 'meta') else 'None'}")
-            
-            # FASE 1: ETL Pré-Chunking (extrai entidades do documento completo)
-            # Entity-aware chunking é essencial para o sistema
-            # Otimização: usa binary search para filtragem eficiente de entidades
-            enable_etl_pre_chunking = True  # HABILITADO - otimizado com binary search
-            
-            if enable_etl and enable_etl_pre_chunking:
-                msg.info(f"[ETL-PRE] ETL habilitado detectado - iniciando extração de entidades pré-chunking")
-                try:
-                    from verba_extensions.integration.chunking_hook import apply_etl_pre_chunking
-                    msg.info(f"[ETL-PRE] Hook importado com sucesso - aplicando ETL pré-chunking")
-                    document = apply_etl_pre_chunking(document, enable_etl=True)
-                    msg.good(f"[ETL-PRE] ✅ Entidades extraídas antes do chunking - chunking será entity-aware")
-                except ImportError as import_err:
-                    msg.warn(f"[ETL-PRE] Hook de ETL pré-chunking não disponível (continuando sem): {str(import_err)}")
-                except Exception as e:
-                    import traceback
-                    msg.warn(f"[ETL-PRE] Erro no ETL pré-chunking (não crítico, continuando): {type(e).__name__}: {str(e)}")
-                    msg.warn(f"[ETL-PRE] Traceback: {traceback.format_exc()}")
-            else:
-                msg.info(f"[ETL-PRE] Pré-chunking desabilitado (performance)")
-            
-            if enable_etl:
-                msg.info(f"[ETL] ETL A2 habilitado - será executado APÓS chunking e embedding também")
-            else:
-                msg.info(f"[ETL] ETL A2 não habilitado para este documento (enable_etl=False)")
-            
-            msg.info(f"[CHUNKING] Iniciando chunking para '{document.title}' (ETL={'enabled' if enable_etl else 'disabled'})")
-            
-            # Envia status de início do chunking
+            if stored_content_hash(stored) == document.meta["content_hash"]:
+                raise DocumentUnchanged(f"{document.title} is unchanged, skipped")
+        if duplicate_uuid is not None and not currentFileConfig.overwrite:
+            raise Exception(f"{document.title} already exists in Verba")
+        elif duplicate_uuid is not None and currentFileConfig.overwrite:
+            await self.weaviate_manager.delete_document(client, duplicate_uuid)
+
+        # Check if ETL is enabled BEFORE chunking
+        enable_etl = document.meta.get("enable_etl", False) if hasattr(document, 'meta') and document.meta else False
+        msg.info(f"[ETL-PRE-CHECK] Verificando ETL para documento '{document.title}': enable_etl={enable_etl}, meta={document.meta if hasattr(document, 'meta') else 'None'}")
+        
+        # FASE 1: ETL Pré-Chunking (extrai entidades do documento completo)
+        # Entity-aware chunking é essencial para o sistema
+        # Otimização: usa binary search para filtragem eficiente de entidades
+        enable_etl_pre_chunking = True  # HABILITADO - otimizado com binary search
+        
+        if enable_etl and enable_etl_pre_chunking:
+            msg.info(f"[ETL-PRE] ETL habilitado detectado - iniciando extração de entidades pré-chunking")
             try:
-                await logger.send_report(
-                    currentFileConfig.fileID,
-                    status=FileStatus.CHUNKING,
-                    message=f"Chunking {document.title}...",
-                    took=0,
-                )
-            except Exception:
-                pass  # Não falha se WebSocket fechar
-            
+                from verba_extensions.integration.chunking_hook import aapply_etl_pre_chunking
+                msg.info(f"[ETL-PRE] Hook importado com sucesso - aplicando ETL pré-chunking")
+                # NER no pool de processos: o event loop segue atendendo outras requests
+                document = await aapply_etl_pre_chunking(document, enable_etl=True)
+                msg.good(f"[ETL-PRE] ✅ Entidades extraídas antes do chunking - chunking será entity-aware")
+            except ImportError as import_err:
+                msg.warn(f"[ETL-PRE] Hook de ETL pré-chunking não disponível (continuando sem): {str(import_err)}")
+            except Exception as e:
+                import traceback
+                msg.warn(f"[ETL-PRE] Erro no ETL pré-chunking (não crítico, continuando): {type(e).__name__}: {str(e)}")
+                msg.warn(f"[ETL-PRE] Traceback: {traceback.format_exc()}")
+        else:
+            msg.info(f"[ETL-PRE] Pré-chunking desabilitado (performance)")
+        
+        if enable_etl:
+            msg.info(f"[ETL] ETL A2 habilitado - será executado APÓS chunking e embedding também")
+        else:
+            msg.info(f"[ETL] ETL A2 não habilitado para este documento (enable_etl=False)")
+        return document
+
+    async def chunk_document(
+        self,
+        document: Document,
+        currentFileConfig: FileConfig,
+        logger: LoggerManager,
+        executor=None,
+    ) -> list[Document]:
+        """Chunks one document, detects chunk languages, filters low quality chunks and applies plugins
+        @parameter: executor : Optional process pool that runs the Chunker outside the event loop
+        """
+        enable_etl = document.meta.get("enable_etl", False) if hasattr(document, 'meta') and document.meta else False
+        msg.info(f"[CHUNKING] Iniciando chunking para '{document.title}' (ETL={'enabled' if enable_etl else 'disabled'})")
+        
+        # Envia status de início do chunking
+        try:
+            await logger.send_report(
+                currentFileConfig.fileID,
+                status=FileStatus.CHUNKING,
+                message=f"Chunking {document.title}...",
+                took=0,
+            )
+        except Exception:
+            pass  # Não falha se WebSocket fechar
+        
+        if executor is not None:
+            # CPU-bound chunking in a worker process (bulk import)
+            from goldenverba.bulk_import import chunk_in_worker, strip_private_meta
+
+            chunked_documents = await asyncio.get_running_loop().run_in_executor(
+                executor,
+                chunk_in_worker,
+                currentFileConfig.rag_config["Chunker"].selected,
+                currentFileConfig.rag_config["Embedder"].selected,
+                currentFileConfig,
+                strip_private_meta(document),
+            )
+        else:
             chunk_task = asyncio.create_task(
                 self.chunker_manager.chunk(
                     currentFileConfig.rag_config["Chunker"].selected,
@@ -348,294 +470,292 @@ class VerbaManager:
                 )
             )
             chunked_documents = await chunk_task
+        
+        # Remove logger de document.meta para evitar problemas de serialização JSON
+        for doc in chunked_documents:
+            if hasattr(doc, 'meta') and doc.meta:
+                doc.meta.pop('_temp_logger', None)
+        
+        total_chunks = sum(len(doc.chunks) for doc in chunked_documents)
+        msg.info(f"[CHUNKING] Chunking concluído: {total_chunks} chunks criados (ETL será executado após import)")
+
+        # Add chunk_lang to chunks (language detection) + Quality Scoring (RAG2)
+        from goldenverba.components.document import detect_language
+        for doc in chunked_documents:
+            initial_chunk_count = len(doc.chunks)
+            msg.info(f"[QUALITY] Processando {initial_chunk_count} chunks para documento '{doc.title}'")
+            
+            # Quality Scoring (RAG2) - filtrar chunks de baixa qualidade
+            try:
+                from verba_extensions.utils.quality import compute_quality_score
+                from verba_extensions.utils.telemetry import get_telemetry
+                use_quality_filter = True
+                quality_threshold = 0.3  # Configurável via env se necessário
+            except ImportError:
+                use_quality_filter = False
             
-            # Remove logger de document.meta para evitar problemas de serialização JSON
-            for doc in chunked_documents:
-                if hasattr(doc, 'meta') and doc.meta:
-                    doc.meta.pop('_temp_logger', None)
+            filtered_chunks = []
+            quality_filtered_count = 0
+            chunk_scores = []  # Para diagnóstico
             
-            total_chunks = sum(len(doc.chunks) for doc in chunked_documents)
-            msg.info(f"[CHUNKING] Chunking concluído: {total_chunks} chunks criados (ETL será executado após import)")
-
-            # Add chunk_lang to chunks (language detection) + Quality Scoring (RAG2)
-            from goldenverba.components.document import detect_language
-            for doc in chunked_documents:
-                initial_chunk_count = len(doc.chunks)
-                msg.info(f"[QUALITY] Processando {initial_chunk_count} chunks para documento '{doc.title}'")
+            for chunk in doc.chunks:
+                # Language detection
+                if not chunk.chunk_lang:
+                    # Detect language from chunk content
+                    detected_lang = detect_language(chunk.content)
+                    # Normalize to pt/en for bilingual filtering
+                    if detected_lang in ["pt", "pt-br", "pt-BR"]:
+                        chunk.chunk_lang = "pt"
+                    elif detected_lang in ["en", "en-US", "en-GB"]:
+                        chunk.chunk_lang = "en"
+                    else:
+                        # Default to document language or empty
+                        chunk.chunk_lang = detected_lang if detected_lang != "unknown" else ""
                 
                 # Quality Scoring (RAG2) - filtrar chunks de baixa qualidade
-                try:
-                    from verba_extensions.utils.quality import compute_quality_score
-                    from verba_extensions.utils.telemetry import get_telemetry
-                    use_quality_filter = True
-                    quality_threshold = 0.3  # Configurável via env se necessário
-                except ImportError:
-                    use_quality_filter = False
-                
-                filtered_chunks = []
-                quality_filtered_count = 0
-                chunk_scores = []  # Para diagnóstico
-                
-                for chunk in doc.chunks:
-                    # Language detection
-                    if not chunk.chunk_lang:
-                        # Detect language from chunk content
-                        detected_lang = detect_language(chunk.content)
-                        # Normalize to pt/en for bilingual filtering
-                        if detected_lang in ["pt", "pt-br", "pt-BR"]:
-                            chunk.chunk_lang = "pt"
-                        elif detected_lang in ["en", "en-US", "en-GB"]:
-                            chunk.chunk_lang = "en"
-                        else:
-                            # Default to document language or empty
-                            chunk.chunk_lang = detected_lang if detected_lang != "unknown" else ""
+                if use_quality_filter:
+                    parent_type = chunk.meta.get("parent_type") if hasattr(chunk, 'meta') and chunk.meta else None
+                    is_summary = chunk.meta.get("is_summary", False) if hasattr(chunk, 'meta') and chunk.meta else False
                     
-                    # Quality Scoring (RAG2) - filtrar chunks de baixa qualidade
-                    if use_quality_filter:
-                        parent_type = chunk.meta.get("parent_type") if hasattr(chunk, 'meta') and chunk.meta else None
-                        is_summary = chunk.meta.get("is_summary", False) if hasattr(chunk, 'meta') and chunk.meta else False
-                        
-                        score, reason = compute_quality_score(
-                            text=chunk.content,
-                            parent_type=parent_type,
-                            is_summary=is_summary
-                        )
-                        
-                        chunk_scores.append({
-                            "score": score,
-                            "reason": reason,
-                            "length": len(chunk.content),
-                            "chunk_id": chunk.chunk_id
-                        })
-                        
-                        # Filtrar chunks de baixa qualidade
-                        if score < quality_threshold:
-                            quality_filtered_count += 1
-                            try:
-                                telemetry = get_telemetry()
-                                telemetry.record_chunk_filtered_by_quality(
-                                    parent_type=parent_type or "unknown",
-                                    score=score,
-                                    reason=reason
-                                )
-                            except:
-                                pass  # Telemetria opcional
-                            continue  # Pula chunk de baixa qualidade
+                    score, reason = compute_quality_score(
+                        text=chunk.content,
+                        parent_type=parent_type,
+                        is_summary=is_summary
+                    )
                     
-                    filtered_chunks.append(chunk)
-                
-                # PROTEÇÃO: Se TODOS os chunks foram filtrados, manter pelo menos o melhor
-                if use_quality_filter and len(filtered_chunks) == 0 and initial_chunk_count > 0:
-                    msg.warn(f"[QUALITY] ⚠️ TODOS os {initial_chunk_count} chunks foram filtrados pelo quality filter!")
-                    msg.warn(f"[QUALITY] Mantendo o chunk com maior score para evitar documento sem chunks")
+                    chunk_scores.append({
+                        "score": score,
+                        "reason": reason,
+                        "length": len(chunk.content),
+                        "chunk_id": chunk.chunk_id
+                    })
                     
-                    # Encontra o chunk com maior score
-                    if chunk_scores:
-                        best_chunk_idx = max(range(len(chunk_scores)), key=lambda i: chunk_scores[i]["score"])
-                        best_chunk = doc.chunks[best_chunk_idx]
-                        best_score = chunk_scores[best_chunk_idx]["score"]
-                        
-                        msg.warn(f"[QUALITY] Mantendo chunk {best_chunk.chunk_id} (score: {best_score:.3f}, reason: {chunk_scores[best_chunk_idx]['reason']})")
-                        filtered_chunks = [best_chunk]
+                    # Filtrar chunks de baixa qualidade
+                    if score < quality_threshold:
+                        quality_filtered_count += 1
+                        try:
+                            telemetry = get_telemetry()
+                            telemetry.record_chunk_filtered_by_quality(
+                                parent_type=parent_type or "unknown",
+                                score=score,
+                                reason=reason
+                            )
+                        except:
+                            pass  # Telemetria opcional
+                        continue  # Pula chunk de baixa qualidade
+                
+                filtered_chunks.append(chunk)
+            
+            # PROTEÇÃO: Se TODOS os chunks foram filtrados, manter pelo menos o melhor
+            if use_quality_filter and len(filtered_chunks) == 0 and initial_chunk_count > 0:
+                msg.warn(f"[QUALITY] ⚠️ TODOS os {initial_chunk_count} chunks foram filtrados pelo quality filter!")
+                msg.warn(f"[QUALITY] Mantendo o chunk com maior score para evitar documento sem chunks")
                 
-                # Atualizar chunks do documento (remover os filtrados)
-                if use_quality_filter and quality_filtered_count > 0:
-                    doc.chunks = filtered_chunks
-                    final_count = len(doc.chunks)
-                    msg.info(f"[QUALITY] Filtrados {quality_filtered_count}/{initial_chunk_count} chunks de baixa qualidade (threshold: {quality_threshold})")
-                    msg.info(f"[QUALITY] Chunks restantes: {final_count}")
+                # Encontra o chunk com maior score
+                if chunk_scores:
+                    best_chunk_idx = max(range(len(chunk_scores)), key=lambda i: chunk_scores[i]["score"])
+                    best_chunk = doc.chunks[best_chunk_idx]
+                    best_score = chunk_scores[best_chunk_idx]["score"]
                     
-                    # Log detalhado se muitos foram filtrados
-                    if quality_filtered_count > initial_chunk_count * 0.5:
-                        msg.warn(f"[QUALITY] ⚠️ Mais de 50% dos chunks foram filtrados! ({quality_filtered_count}/{initial_chunk_count})")
-                        if chunk_scores:
-                            avg_score = sum(s["score"] for s in chunk_scores) / len(chunk_scores)
-                            min_score = min(s["score"] for s in chunk_scores)
-                            max_score = max(s["score"] for s in chunk_scores)
-                            msg.warn(f"[QUALITY] Scores: min={min_score:.3f}, avg={avg_score:.3f}, max={max_score:.3f}")
+                    msg.warn(f"[QUALITY] Mantendo chunk {best_chunk.chunk_id} (score: {best_score:.3f}, reason: {chunk_scores[best_chunk_idx]['reason']})")
+                    filtered_chunks = [best_chunk]
             
-            # Apply plugin enrichment (e.g., LLMMetadataExtractor)
-            if PLUGINS_AVAILABLE:
-                try:
-                    plugin_manager = get_plugin_manager()
-                    if plugin_manager.plugins:
-                        msg.info(f"Applying {len(plugin_manager.plugins)} plugin(s) to enrich chunks")
-                        enriched_documents = []
-                        for doc in chunked_documents:
-                            enriched_doc = await plugin_manager.process_document_chunks(doc)
-                            enriched_documents.append(enriched_doc)
-                        chunked_documents = enriched_documents
-                        msg.good(f"Chunks enriched with {plugin_manager.get_enabled_plugins()}")
-                except Exception as e:
-                    msg.warn(f"Plugin processing failed (non-critical): {str(e)}")
-                    # Continue without enrichment if plugins fail
+            # Atualizar chunks do documento (remover os filtrados)
+            if use_quality_filter and quality_filtered_count > 0:
+                doc.chunks = filtered_chunks
+                final_count = len(doc.chunks)
+                msg.info(f"[QUALITY] Filtrados {quality_filtered_count}/{initial_chunk_count} chunks de baixa qualidade (threshold: {quality_threshold})")
+                msg.info(f"[QUALITY] Chunks restantes: {final_count}")
+                
+                # Log detalhado se muitos foram filtrados
+                if quality_filtered_count > initial_chunk_count * 0.5:
+                    msg.warn(f"[QUALITY] ⚠️ Mais de 50% dos chunks foram filtrados! ({quality_filtered_count}/{initial_chunk_count})")
+                    if chunk_scores:
+                        avg_score = sum(s["score"] for s in chunk_scores) / len(chunk_scores)
+                        min_score = min(s["score"] for s in chunk_scores)
+                        max_score = max(s["score"] for s in chunk_scores)
+                        msg.warn(f"[QUALITY] Scores: min={min_score:.3f}, avg={avg_score:.3f}, max={max_score:.3f}")
+        
+        # Apply plugin enrichment (e.g., LLMMetadataExtractor)
+        if PLUGINS_AVAILABLE:
+            try:
+                plugin_manager = get_plugin_manager()
+                if plugin_manager.plugins:
+                    msg.info(f"Applying {len(plugin_manager.plugins)} plugin(s) to enrich chunks")
+                    enriched_documents = []
+                    for doc in chunked_documents:
+                        enriched_doc = await plugin_manager.process_document_chunks(doc)
+                        enriched_documents.append(enriched_doc)
+                    chunked_documents = enriched_documents
+                    msg.good(f"Chunks enriched with {plugin_manager.get_enabled_plugins()}")
+            except Exception as e:
+                msg.warn(f"Plugin processing failed (non-critical): {str(e)}")
+                # Continue without enrichment if plugins fail
 
-            # Log embedding start
-            embedder_name = currentFileConfig.rag_config["Embedder"].selected
-            total_chunks = sum(len(doc.chunks) for doc in chunked_documents)
-            
-            # Validate that we have chunks before proceeding
-            if total_chunks == 0:
-                error_msg = f"No chunks created for document '{document.title}'. This may be due to: (1) empty or very short document content, (2) all chunks filtered out by quality threshold, or (3) chunking configuration issue."
-                msg.fail(f"[CHUNKING] ❌ {error_msg}")
-                try:
-                    await logger.send_report(
-                        currentFileConfig.fileID,
-                        status=FileStatus.ERROR,
-                        message=error_msg,
-                        took=0,
-                    )
-                except Exception:
-                    pass
-                raise Exception(error_msg)
-            
-            msg.info(f"[EMBEDDING] Starting vectorization: embedder={embedder_name}, chunks={total_chunks}, docs={len(chunked_documents)}")
-            
-            # Envia status de início do embedding
+        total_chunks = sum(len(doc.chunks) for doc in chunked_documents)
+        
+        # Validate that we have chunks before proceeding
+        if total_chunks == 0:
+            error_msg = f"No chunks created for document '{document.title}'. This may be due to: (1) empty or very short document content, (2) all chunks filtered out by quality threshold, or (3) chunking configuration issue."
+            msg.fail(f"[CHUNKING] ❌ {error_msg}")
             try:
                 await logger.send_report(
                     currentFileConfig.fileID,
-                    status=FileStatus.EMBEDDING,
-                    message=f"Vectorizando {total_chunks} chunks...",
+                    status=FileStatus.ERROR,
+                    message=error_msg,
                     took=0,
                 )
             except Exception:
-                pass  # Não falha se WebSocket fechar
+                pass
+            raise Exception(error_msg)
+        return chunked_documents
+
+    async def embed_documents(
+        self,
+        chunked_documents: list[Document],
+        currentFileConfig: FileConfig,
+        logger: LoggerManager,
+    ) -> list[Document]:
+        """Vectorizes the chunks of the given documents"""
+        embedder_name = currentFileConfig.rag_config["Embedder"].selected
+        total_chunks = sum(len(d.chunks) for d in chunked_documents)
+        msg.info(f"[EMBEDDING] Starting vectorization: embedder={embedder_name}, chunks={total_chunks}, docs={len(chunked_documents)}")
+        
+        # Envia status de início do embedding
+        try:
+            await logger.send_report(
+                currentFileConfig.fileID,
+                status=FileStatus.EMBEDDING,
+                message=f"Vectorizando {total_chunks} chunks...",
+                took=0,
+            )
+        except Exception:
+            pass  # Não falha se WebSocket fechar
+        
+        try:
+            embedding_task = asyncio.create_task(
+                self.embedder_manager.vectorize(
+                    embedder_name,
+                    currentFileConfig,
+                    chunked_documents,
+                    logger,
+                )
+            )
+            vectorized_documents = await embedding_task
+            msg.info(f"[EMBEDDING] Vectorization completed successfully: {len(vectorized_documents)} documents")
             
+            # Envia status de conclusão do embedding
             try:
-                embedding_task = asyncio.create_task(
-                    self.embedder_manager.vectorize(
-                        embedder_name,
-                        currentFileConfig,
-                        chunked_documents,
-                        logger,
-                    )
-                )
-                vectorized_documents = await embedding_task
-                msg.info(f"[EMBEDDING] Vectorization completed successfully: {len(vectorized_documents)} documents")
-                
-                # Envia status de conclusão do embedding
-                try:
-                    await logger.send_report(
-                        currentFileConfig.fileID,
-                        status=FileStatus.INGESTING,
-                        message=f"Vectorização concluída - importando no Weaviate...",
-                        took=0,
-                    )
-                except Exception:
-                    pass  # Não falha se WebSocket fechar
-            except Exception as e:
-                msg.fail(f"[EMBEDDING] Vectorization failed: {type(e).__name__}: {str(e)}")
-                import traceback
-                msg.fail(f"[EMBEDDING] Traceback: {traceback.format_exc()}")
-                # Send error report to client
                 await logger.send_report(
                     currentFileConfig.fileID,
-                    status=FileStatus.ERROR,
-                    message=f"Embedding failed: {str(e)}",
+                    status=FileStatus.INGESTING,
+                    message=f"Vectorização concluída - importando no Weaviate...",
                     took=0,
                 )
-                raise
+            except Exception:
+                pass  # Não falha se WebSocket fechar
+        except Exception as e:
+            msg.fail(f"[EMBEDDING] Vectorization failed: {type(e).__name__}: {str(e)}")
+            import traceback
+            msg.fail(f"[EMBEDDING] Traceback: {traceback.format_exc()}")
+            # Send error report to client
+            await logger.send_report(
+                currentFileConfig.fileID,
+                status=FileStatus.ERROR,
+                message=f"Embedding failed: {str(e)}",
+                took=0,
+            )
+            raise
+        return vectorized_documents
 
-            for document in vectorized_documents:
-                # Garantir conexão com o Weaviate antes do import
+    async def ingest_documents(
+        self,
+        client,
+        vectorized_documents: list[Document],
+        currentFileConfig: FileConfig,
+        logger: LoggerManager,
+    ):
+        """Imports vectorized documents into Weaviate (reconnecting if needed) and returns the client in use"""
+        for document in vectorized_documents:
+            # Garantir conexão com o Weaviate antes do import
+            try:
+                is_ready = False
                 try:
+                    is_ready = await client.is_ready()
+                except Exception:
                     is_ready = False
+
+                if not is_ready:
+                    msg.warn("Client disconnected during import, reconnecting...")
+                    # Tenta reconectar o cliente existente
                     try:
-                        is_ready = await client.is_ready()
-                    except Exception:
+                        if hasattr(client, "connect"):
+                            await client.connect()
+                            is_ready = await client.is_ready()
+                    except Exception as ce:
+                        msg.warn(f"Reconnect attempt failed: {str(ce)}")
                         is_ready = False
 
-                    if not is_ready:
-                        msg.warn("Client disconnected during import, reconnecting...")
-                        # Tenta reconectar o cliente existente
-                        try:
-                            if hasattr(client, "connect"):
-                                await client.connect()
-                                is_ready = await client.is_ready()
-                        except Exception as ce:
-                            msg.warn(f"Reconnect attempt failed: {str(ce)}")
-                            is_ready = False
-
-                    # Fallback: criar um novo cliente a partir das variáveis de ambiente
-                    if not is_ready:
-                        try:
-                            http_host = os.getenv("WEAVIATE_HTTP_HOST")
-                            url = os.getenv("WEAVIATE_URL_VERBA")
-                            key = os.getenv("WEAVIATE_API_KEY_VERBA", "")
-                            if http_host:
-                                # Custom (Railway/private network) com portas separadas
-                                port = os.getenv("WEAVIATE_HTTP_PORT", "8080")
-                                new_client = await self.weaviate_manager.connect_to_custom(http_host, key, port)
-                            elif url:
-                                # Cluster/WCS
-                                new_client = await self.weaviate_manager.connect_to_cluster(url, key)
-                            else:
-                                new_client = None
-
-                            if new_client is not None:
-                                try:
-                                    if hasattr(new_client, "connect"):
-                                        await new_client.connect()
-                                    if await new_client.is_ready():
-                                        client = new_client
-                                        msg.good("Reconnected to Weaviate successfully")
-                                        is_ready = True
-                                except Exception as ne:
-                                    msg.warn(f"New client not ready after reconnect: {str(ne)}")
-                        except Exception as rec_e:
-                            msg.warn(f"Failed to create a new Weaviate client: {str(rec_e)}")
-
-                    if not is_ready:
-                        # Não aborta aqui; deixa o import tentar e o hook lidar com ETL/graceful handling
-                        msg.warn("Weaviate client still not ready; attempting import may fail")
-                except Exception:
-                    # Em caso de erro inesperado, continua para tentar importar e reportar erro exato do cliente
-                    pass
-                
-                # Armazena logger e file_id temporariamente no document.meta para uso no hook ETL
-                if not hasattr(document, 'meta') or document.meta is None:
-                    document.meta = {}
-                document.meta['_temp_logger'] = logger
-                document.meta['file_id'] = currentFileConfig.fileID
-                
-                embedder_model = (
-                    currentFileConfig.rag_config["Embedder"]
-                    .components[fileConfig.rag_config["Embedder"].selected]
-                    .config["Model"]
-                    .value
-                )
-                
-                ingesting_task = asyncio.create_task(
-                    self.weaviate_manager.import_document(
-                        client,
-                        document,
-                        embedder_model,
-                    )
-                )
-                await ingesting_task
+                # Fallback: criar um novo cliente a partir das variáveis de ambiente
+                if not is_ready:
+                    try:
+                        http_host = os.getenv("WEAVIATE_HTTP_HOST")
+                        url = os.getenv("WEAVIATE_URL_VERBA")
+                        key = os.getenv("WEAVIATE_API_KEY_VERBA", "")
+                        if http_host:
+                            # Custom (Railway/private network) com portas separadas
+                            port = os.getenv("WEAVIATE_HTTP_PORT", "8080")
+                            new_client = await self.weaviate_manager.connect_to_custom(http_host, key, port)
+                        elif url:
+                            # Cluster/WCS
+                            new_client = await self.weaviate_manager.connect_to_cluster(url, key)
+                        else:
+                            new_client = None
 
-            await logger.send_report(
-                currentFileConfig.fileID,
-                status=FileStatus.INGESTING,
-                message=f"Imported {currentFileConfig.filename} into Weaviate",
-                took=round(loop.time() - start_time, 2),
-            )
+                        if new_client is not None:
+                            try:
+                                if hasattr(new_client, "connect"):
+                                    await new_client.connect()
+                                if await new_client.is_ready():
+                                    client = new_client
+                                    msg.good("Reconnected to Weaviate successfully")
+                                    is_ready = True
+                            except Exception as ne:
+                                msg.warn(f"New client not ready after reconnect: {str(ne)}")
+                    except Exception as rec_e:
+                        msg.warn(f"Failed to create a new Weaviate client: {str(rec_e)}")
 
-            await logger.send_report(
-                currentFileConfig.fileID,
-                status=FileStatus.DONE,
-                message=f"Import for {currentFileConfig.filename} completed successfully",
-                took=round(loop.time() - start_time, 2),
+                if not is_ready:
+                    # Não aborta aqui; deixa o import tentar e o hook lidar com ETL/graceful handling
+                    msg.warn("Weaviate client still not ready; attempting import may fail")
+            except Exception:
+                # Em caso de erro inesperado, continua para tentar importar e reportar erro exato do cliente
+                pass
+            
+            # Armazena logger e file_id temporariamente no document.meta para uso no hook ETL
+            if not hasattr(document, 'meta') or document.meta is None:
+                document.meta = {}
+            document.meta['_temp_logger'] = logger
+            document.meta['file_id'] = currentFileConfig.fileID
+            
+            embedder_model = (
+                currentFileConfig.rag_config["Embedder"]
+                .components[currentFileConfig.rag_config["Embedder"].selected]
+                .config["Model"]
+                .value
             )
-        except Exception as e:
-            await logger.send_report(
-                currentFileConfig.fileID,
-                status=FileStatus.ERROR,
-                message=f"Import for {fileConfig.filename} failed: {str(e)}",
-                took=round(loop.time() - start_time, 2),
+            
+            ingesting_task = asyncio.create_task(
+                self.weaviate_manager.import_document(
+                    client,
+                    document,
+                    embedder_model,
+                )
             )
-            raise Exception(f"Import for {fileConfig.filename} failed: {str(e)}")
+            await ingesting_task
+            await asyncio.to_thread(get_fingerprint_store().remember, document)
+        return client
+
 
     # Configuration
 
@@ -1179,11 +1299,47 @@ class VerbaManager:
         retriever = rag_config["Retriever"].selected
         embedder = rag_config["Embedder"].selected
 
+        # Only queued here; written in batches by the background suggestion writer
         await self.weaviate_manager.add_suggestion(client, query)
 
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        cache = self.weaviate_manager.query_cache
+
+        # Tier 1: exact query in the same scope, before embedding the query
+        if cache.enabled:
+            scope = cache_scope(rag_config, labels, document_uuids)
+            key = cache.key(query, scope)
+            generation = await self.weaviate_manager.get_cache_generation(client)
+            payload = cache.get(key, generation)
+            if payload is not None:
+                cache.stats["exact_hits"] += 1
+                return self._cached_retrieval(payload, "exact", start_time, generation)
+
         vector = await self.embedder_manager.vectorize_query(
             embedder, query, rag_config
         )
+
+        # Tier 2: semantically close query in the same scope
+        embedder_model = (
+            rag_config["Embedder"].components[embedder].config["Model"].value
+        )
+        if cache.semantic_enabled:
+            try:
+                hit = await self.weaviate_manager.get_cached_query(
+                    client, embedder_model, vector, scope, generation, cache.similarity
+                )
+            except Exception as e:
+                msg.warn(f"Semantic query cache lookup failed: {str(e)}")
+                hit = None
+            if hit is not None:
+                payload, similarity = hit
+                cache.stats["semantic_hits"] += 1
+                cache.set(key, payload, generation)
+                return self._cached_retrieval(
+                    payload, "semantic", start_time, generation, similarity
+                )
+
         result = await self.retriever_manager.retrieve(
             client,
             retriever,
@@ -1194,14 +1350,55 @@ class VerbaManager:
             labels,
             document_uuids,
         )
-        
+
         # Lidar com retorno de 2 ou 3 elementos (compatibilidade)
         if len(result) == 3:
             documents, context, debug_info = result
-            return (documents, context, debug_info)
+            debug_info = dict(debug_info or {})
         else:
             documents, context = result
-            return (documents, context)
+            debug_info = {}
+
+        if cache.enabled:
+            latency = loop.time() - start_time
+            cache.stats["misses"] += 1
+            payload = encode_result(documents, context, debug_info, latency)
+            cache.set(key, payload, generation)
+            if cache.semantic_enabled:
+                try:
+                    await self.weaviate_manager.add_cached_query(
+                        client, embedder_model, query, vector, scope, generation, payload
+                    )
+                except Exception as e:
+                    msg.warn(f"Failed to store query in semantic cache: {str(e)}")
+            debug_info["cache"] = {
+                "hit": None,
+                "latency_ms": round(latency * 1000, 1),
+                "generation": generation,
+            }
+
+        return (documents, context, debug_info)
+
+    def _cached_retrieval(
+        self,
+        payload: str,
+        tier: str,
+        start_time: float,
+        generation: int,
+        similarity: float = None,
+    ):
+        cached = decode_result(payload)
+        latency = asyncio.get_running_loop().time() - start_time
+        debug_info = cached["debug_info"]
+        debug_info["cache"] = {
+            "hit": tier,
+            "latency_ms": round(latency * 1000, 1),
+            "saved_ms": round(max(0.0, cached["latency"] - latency) * 1000, 1),
+            "generation": generation,
+        }
+        if similarity is not None:
+            debug_info["cache"]["similarity"] = round(similarity, 4)
+        return (cached["documents"], cached["context"], debug_info)
 
     async def generate_stream_answer(
         self,
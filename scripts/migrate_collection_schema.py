@@ -90,7 +90,7 @@ async def migrate_collection_schema(
             backup_dir_path.mkdir(parents=True, exist_ok=True)
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = backup_dir_path / f"{collection_name}_backup_{timestamp}.json"
+            backup_file = backup_dir_path / f"{collection_name}_backup_{timestamp}"
             
             msg.info(f"📦 Fazendo backup de '{collection_name}'...")
             backup_result = await backup_collection(
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark de batching de embeddings em um corpus com chunks de tamanhos variados.
+
+Compara:
+- ANTES: batches fixos de `max_batch_size` itens (ordem original)
+- DEPOIS: `plan_batches` (limite de itens + limite de tokens, ordenação por tamanho)
+
+O provider é simulado para o benchmark rodar sem chaves de API:
+- provider remoto: custo fixo por request + custo por token; requests acima
+  do limite de tokens falham (contadas como violações e refeitas em duas metades)
+- modelo local: custo proporcional a itens x maior chunk do batch (padding)
+
+Uso:
+    python scripts/performance_tests/benchmark_embedding_batching.py --chunks 5000 --mode remote
+    python scripts/performance_tests/benchmark_embedding_batching.py --chunks 5000 --mode local
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from goldenverba.components.embedding.batching import (
+    estimate_token_counts,
+    plan_batches,
+    restore_order,
+)
+
+
+def build_corpus(n: int, seed: int = 42) -> list[str]:
+    """Chunks entre ~20 e ~2000 tokens (distribuição com cauda longa)."""
+    rng = random.Random(seed)
+    words = ["contrato", "cliente", "embedding", "verba", "weaviate", "análise", "dados", "relatório"]
+    corpus = []
+    for i in range(n):
+        tokens = int(min(2000, max(20, rng.lognormvariate(5.0, 0.9))))
+        corpus.append(f"chunk {i} " + " ".join(rng.choice(words) for _ in range(tokens)))
+    return corpus
+
+
+class SimulatedProvider:
+    def __init__(self, mode: str, max_tokens: int, request_ms: float, token_us: float):
+        self.mode = mode
+        self.max_tokens = max_tokens
+        self.request_s = request_ms / 1000
+        self.token_s = token_us / 1_000_000
+        self.requests = 0
+        self.violations = 0
+        self.padded_tokens = 0
+
+    async def embed(self, texts: list[str], counts: list[int]) -> list[list[float]]:
+        self.requests += 1
+        if self.mode == "remote":
+            if sum(counts) > self.max_tokens and len(texts) > 1:
+                self.violations += 1
+                await asyncio.sleep(self.request_s)
+                half = len(texts) // 2
+                return await self.embed(texts[:half], counts[:half]) + await self.embed(
+                    texts[half:], counts[half:]
+                )
+            cost = sum(counts)
+        else:
+            cost = max(counts) * len(texts)
+            self.padded_tokens += cost - sum(counts)
+        await asyncio.sleep(self.request_s + cost * self.token_s)
+        return [[float(len(text))] for text in texts]
+
+
+async def run(label, corpus, counts, batches, provider, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(indices):
+        async with semaphore:
+            return await provider.embed(
+                [corpus[i] for i in indices], [counts[i] for i in indices]
+            )
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[one(indices) for indices in batches])
+    wall = time.perf_counter() - start
+    vectors = restore_order(batches, results, len(corpus))
+    assert vectors == [[float(len(text))] for text in corpus], "ordem não preservada"
+    extra = (
+        f"violações={provider.violations}"
+        if provider.mode == "remote"
+        else f"tokens de padding={provider.padded_tokens}"
+    )
+    print(
+        f"{label:7} batches={len(batches):5}  requests={provider.requests:5}  "
+        f"wall={wall:6.2f}s  {extra}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--mode", choices=["remote", "local"], default="remote")
+    parser.add_argument("--max-items", type=int, default=128)
+    parser.add_argument("--max-tokens", type=int, default=20000)
+    parser.add_argument("--request-ms", type=float, default=40.0)
+    parser.add_argument("--token-us", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.chunks)
+    counts = estimate_token_counts(corpus)
+    print(
+        f"Corpus: {len(corpus)} chunks, {sum(counts)} tokens "
+        f"(min={min(counts)}, max={max(counts)}), modo={args.mode}"
+    )
+
+    fixed = [
+        list(range(i, min(i + args.max_items, len(corpus))))
+        for i in range(0, len(corpus), args.max_items)
+    ]
+    planned = plan_batches(
+        corpus,
+        max_items=args.max_items,
+        max_tokens=args.max_tokens if args.mode == "remote" else None,
+        sort_by_length=args.mode == "local",
+        token_counts=counts,
+    )
+
+    for label, batches in (("antes", fixed), ("depois", planned)):
+        provider = SimulatedProvider(
+            args.mode, args.max_tokens, args.request_ms, args.token_us
+        )
+        asyncio.run(run(label, corpus, counts, batches, provider, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark do travamento do event loop pelo NER do ETL durante o import.
+
+Um "heartbeat" (asyncio.sleep de 5ms em loop) roda junto com o ETL e mede
+quanto cada tick atrasou: é o tempo em que o servidor não responde a nada
+(/api/health, streaming de respostas, outros imports).
+
+Compara:
+- ANTES: ETL pré-chunking com `nlp(documento)` e ETL pós-import com
+  `extract_entities_intelligent(chunk)` chunk a chunk, no event loop
+- DEPOIS: `aextract_entities_pre_chunking` e
+  `extract_entities_intelligent_batch`, no pool de NER (processos)
+
+Sem SPACY_MODEL instalado, usa um modelo sintético (spacy.blank("pt") com
+entity_ruler no lugar do "ner"), salvo em um diretório temporário.
+
+Uso:
+    python scripts/performance_tests/benchmark_ner_event_loop.py --paragraphs 3000 --processes 2
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+NAMES = {
+    "ORG": ["Apple", "Microsoft", "Petrobras", "Banco do Brasil", "Vale", "Google"],
+    "PER": ["Maria Silva", "João Souza", "Ana Costa", "Tim Cook", "Satya Nadella"],
+}
+WORDS = "o a de que em para com uma relatório mercado anual resultado crescimento empresa parceria".split()
+
+
+def ensure_model(directory: str) -> str:
+    """SPACY_MODEL se carregável; senão, um modelo sintético com entity_ruler"""
+    import spacy
+
+    model = os.getenv("SPACY_MODEL", "pt_core_news_sm")
+    try:
+        spacy.load(model)
+        return model
+    except OSError:
+        pass
+    nlp = spacy.blank("pt")
+    ruler = nlp.add_pipe("entity_ruler", name="ner")
+    ruler.add_patterns([
+        {"label": label, "pattern": name} for label, names in NAMES.items() for name in names
+    ])
+    path = os.path.join(directory, "pt_bench")
+    nlp.to_disk(path)
+    return path
+
+
+def make_document(paragraphs: int) -> str:
+    rng = random.Random(0)
+    all_names = [name for names in NAMES.values() for name in names]
+    return "\n\n".join(
+        " ".join(rng.choice(WORDS) for _ in range(60)) + f" {rng.choice(all_names)} "
+        + " ".join(rng.choice(WORDS) for _ in range(60)) + "."
+        for _ in range(paragraphs)
+    )
+
+
+def make_chunks(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+async def heartbeat(stop: asyncio.Event, interval: float = 0.005) -> list[float]:
+    loop = asyncio.get_running_loop()
+    lags = []
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - started - interval))
+    return lags
+
+
+async def measure(work) -> tuple[float, list[float]]:
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(stop))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    await work()
+    took = time.perf_counter() - started
+    stop.set()
+    return took, await beat
+
+
+def report(name: str, took: float, lags: list[float]):
+    print(
+        f"{name:7} tempo={took * 1000:9.1f}ms  maior travamento={max(lags) * 1000:9.1f}ms  "
+        f"travamento total={sum(lags) * 1000:9.1f}ms  ticks={len(lags)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paragraphs", type=int, default=3000)
+    parser.add_argument("--chunk-chars", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=2)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="verba_ner_bench_")
+    # Antes de criar o registry e o pool: os workers herdam estas variáveis
+    os.environ["SPACY_MODEL"] = ensure_model(workdir)
+    os.environ["VERBA_SPACY_PRELOAD"] = "pt:ner"
+    os.environ["VERBA_NER_PROCESSES"] = str(args.processes)
+
+    from verba_extensions.etl import etl_a2_intelligent
+    from verba_extensions.integration import chunking_hook
+    from verba_extensions.utils.ner_pool import close_ner_pool, get_ner_pool
+
+    text = make_document(args.paragraphs)
+    chunks = make_chunks(text, args.chunk_chars)
+    document = SimpleNamespace(content=text, meta={})
+    print(f"Modelo: {os.environ['SPACY_MODEL']}")
+    print(f"Documento: {len(text)} caracteres, {len(chunks)} chunks, pool com {args.processes} processo(s)")
+
+    async def before():
+        pre = chunking_hook.extract_entities_pre_chunking(document)
+        post = []
+        for chunk in chunks:
+            post.append(etl_a2_intelligent.extract_entities_intelligent(chunk))
+            await asyncio.sleep(0)  # o patch antigo aguardava um update por chunk
+        return pre, post
+
+    async def after():
+        pre = await chunking_hook.aextract_entities_pre_chunking(document)
+        post = await etl_a2_intelligent.extract_entities_intelligent_batch(chunks)
+        return pre, post
+
+    async def run():
+        # Modelos carregados fora da medição (como no preload do startup)
+        chunking_hook.extract_entities_pre_chunking(SimpleNamespace(content="Apple", meta={}))
+        await get_ner_pool().start()
+        report("ANTES", *await measure(before))
+        report("DEPOIS", *await measure(after))
+
+    try:
+        asyncio.run(run())
+    finally:
+        close_ner_pool()
+
+
+if __name__ == "__main__":
+    main()
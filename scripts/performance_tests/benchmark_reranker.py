@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Benchmark do RerankerPlugin para 50/100/200 candidatos.
+
+Compara:
+- ANTES: o scoring original do plugin (commit 076d7bf), copiado abaixo em
+  `baseline_relevance_score`: um await por chunk com keywords, tamanho e
+  metadata calculados chunk a chunk
+- DEPOIS: `process_chunks` atual (`_score_candidates`): mesmos scores por
+  chunk, com o cross-encoder em uma única chamada em lote
+
+Com `--cross-encoder` (requer transformers + onnxruntime/torch) também mede
+o cross-encoder: pares pontuados um por um vs. um único scoring em lote com
+micro-batches ordenados por tamanho, e a segunda chamada servida do cache.
+
+Uso:
+    python scripts/performance_tests/benchmark_reranker.py --sizes 50 100 200 --runs 20
+    python scripts/performance_tests/benchmark_reranker.py --cross-encoder
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from goldenverba.components.chunk import Chunk
+from verba_extensions.plugins.reranker import RerankerPlugin
+from verba_extensions.utils.cross_encoder import CrossEncoderEngine
+
+WORDS = (
+    "apple microsoft google inovação estratégia mercado varejo banco energia "
+    "inteligência artificial cloud crescimento receita margem de da para com "
+    "transformação digital clientes produto plataforma investimento"
+).split()
+
+QUERY = "estratégia de inovação da Apple em inteligência artificial"
+
+
+def make_chunks(n: int, seed: int = 0) -> list[Chunk]:
+    rng = random.Random(seed)
+    chunks = []
+    for i in range(n):
+        content = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 300)))
+        chunk = Chunk(content=content, chunk_id=str(i), content_without_overlap=content)
+        chunk.uuid = f"uuid-{seed}-{i}"
+        if rng.random() < 0.5:
+            chunk.meta = {
+                "enriched": {
+                    "companies": rng.sample(["Apple", "Microsoft", "Google"], 2),
+                    "key_topics": rng.sample(["inovação", "cloud", "margem"], 2),
+                    "keywords": rng.sample(WORDS, 5),
+                    "confidence_score": rng.random(),
+                }
+            }
+        else:
+            chunk.meta = {}
+        chunks.append(chunk)
+    return chunks
+
+
+# --- Scoring original (076d7bf), sem cross-encoder nem LLM -------------------
+
+def baseline_score_by_metadata(chunk, query: str) -> float:
+    if not chunk.meta or "enriched" not in chunk.meta:
+        return 0.5
+    enriched = chunk.meta.get("enriched", {})
+    query_lower = query.lower()
+    score = 0.0
+    for company in enriched.get("companies", []):
+        if company.lower() in query_lower:
+            score += 0.3
+    for topic in enriched.get("key_topics", []):
+        if topic.lower() in query_lower:
+            score += 0.2
+    keywords = enriched.get("keywords", [])
+    matched_keywords = sum(1 for kw in keywords if kw.lower() in query_lower)
+    if keywords:
+        score += (matched_keywords / len(keywords)) * 0.2
+    score += enriched.get("confidence_score", 0.8) * 0.3
+    return min(score, 1.0)
+
+
+def baseline_score_by_keywords(content: str, query: str) -> float:
+    if not content or not query:
+        return 0.0
+    content_lower = content.lower()
+    query_words = query.lower().split()
+    stopwords = {'a', 'o', 'e', 'de', 'da', 'do', 'em', 'para', 'com', 'que', 'é', 'um', 'uma'}
+    query_words = [w for w in query_words if w not in stopwords]
+    if not query_words:
+        return 0.5
+    matches = sum(1 for word in query_words if word in content_lower)
+    return min(matches / len(query_words), 1.0)
+
+
+def baseline_score_by_length(length: int) -> float:
+    ideal_min = 500
+    ideal_max = 1500
+    if ideal_min <= length <= ideal_max:
+        return 1.0
+    elif length < ideal_min:
+        return length / ideal_min * 0.5
+    else:
+        if length > ideal_max * 2:
+            return 0.3
+        return 1.0 - ((length - ideal_max) / ideal_max) * 0.5
+
+
+async def baseline_relevance_score(chunk, query: str) -> float:
+    scores = []
+    if chunk.meta:
+        scores.append(baseline_score_by_metadata(chunk, query) * 0.4)
+    scores.append(baseline_score_by_keywords(chunk.content, query) * 0.3)
+    scores.append(baseline_score_by_length(len(chunk.content)) * 0.1)
+    return sum(scores) / len(scores)
+
+
+async def rerank_baseline(chunks, query: str, top_k: int):
+    scored = []
+    for chunk in chunks:
+        scored.append((await baseline_relevance_score(chunk, query), chunk))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [chunk for _, chunk in scored[:top_k]]
+
+
+def timed(runs: int, fn) -> tuple[float, float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def bench_scoring(sizes, runs):
+    plugin = RerankerPlugin()
+    plugin.use_cross_encoder = False
+    print("Keyword + metadata + tamanho (sem cross-encoder)")
+    print(f"{'candidatos':>10} | {'antes p50':>10} | {'antes p95':>10} | {'depois p50':>10} | {'depois p95':>10} | speedup")
+    for n in sizes:
+        chunks = make_chunks(n)
+        expected = [c.chunk_id for c in asyncio.run(rerank_baseline(chunks, QUERY, 5))]
+        actual = [c.chunk_id for c in asyncio.run(plugin.process_chunks(chunks, QUERY, {"top_k": 5}))]
+        assert actual == expected, "top-5 diferente do scoring original"
+        before = timed(runs, lambda: asyncio.run(rerank_baseline(chunks, QUERY, 5)))
+        after = timed(runs, lambda: asyncio.run(plugin.process_chunks(chunks, QUERY, {"top_k": 5})))
+        print(
+            f"{n:>10} | {before[0]:>8.2f}ms | {before[1]:>8.2f}ms | "
+            f"{after[0]:>8.2f}ms | {after[1]:>8.2f}ms | {before[0] / after[0]:.1f}x"
+        )
+
+
+def bench_cross_encoder(sizes, runs):
+    engine = CrossEncoderEngine.from_env()
+    if not engine.available():
+        print("\nCross-encoder indisponível (instale transformers + optimum[onnxruntime] ou torch)")
+        return
+
+    print(f"\nCross-encoder {engine.model_name} (backend={engine.backend}, int8={engine.quantize})")
+    start = time.perf_counter()
+    engine.score("aquecimento", ["carrega o modelo"])
+    print(f"  carga do modelo: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    print(f"{'candidatos':>10} | {'1 a 1':>10} | {'lote p50':>10} | {'lote p95':>10} | {'cache':>10}")
+    for n in sizes:
+        chunks = make_chunks(n, seed=n)
+        texts = [chunk.content for chunk in chunks]
+
+        engine.clear_cache()
+        start = time.perf_counter()
+        for text in texts:
+            engine.score(QUERY, [text])
+        one_by_one = (time.perf_counter() - start) * 1000
+
+        def batched():
+            engine.clear_cache()
+            engine.score(QUERY, texts, [chunk.uuid for chunk in chunks])
+
+        p50, p95 = timed(max(1, runs // 4), batched)
+        cached = timed(runs, lambda: engine.score(QUERY, texts, [chunk.uuid for chunk in chunks]))
+        print(f"{n:>10} | {one_by_one:>8.1f}ms | {p50:>8.1f}ms | {p95:>8.1f}ms | {cached[0]:>8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--cross-encoder", action="store_true")
+    args = parser.parse_args()
+
+    bench_scoring(args.sizes, args.runs)
+    if args.cross_encoder:
+        bench_cross_encoder(args.sizes, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark do SemanticChunker em um documento de 10k sentenças.
+
+Compara:
+- ANTES: combine_sentences com concatenação de strings + cosine_similarity
+  do sklearn chamado uma vez por par de sentenças adjacentes
+- DEPOIS: janelas por slicing de índices + distâncias em uma operação
+  matricial NumPy (normalização + produto linha a linha)
+
+Também mede o chunking completo com um embedder falso (vetores aleatórios)
+e quantos chunks deixam de ser re-vetorizados com "Reuse Sentence Embeddings".
+
+Uso:
+    python scripts/performance_tests/benchmark_semantic_chunker.py --sentences 10000 --dim 384
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+from goldenverba.components.chunking.SemanticChunker import SemanticChunker
+from goldenverba.components.document import Document
+from goldenverba.components.interfaces import Embedding
+
+
+def old_combine_sentences(sentences, buffer_size=1):
+    for i in range(len(sentences)):
+        combined_sentence = ""
+        for j in range(i - buffer_size, i):
+            if j >= 0:
+                combined_sentence += sentences[j]["sentence"] + " "
+        combined_sentence += sentences[i]["sentence"]
+        for j in range(i + 1, i + 1 + buffer_size):
+            if j < len(sentences):
+                combined_sentence += " " + sentences[j]["sentence"]
+        sentences[i]["combined_sentence"] = combined_sentence
+    return sentences
+
+
+def old_cosine_distances(sentences):
+    distances = []
+    for i in range(len(sentences) - 1):
+        similarity = cosine_similarity(
+            [sentences[i]["combined_sentence_embedding"]],
+            [sentences[i + 1]["combined_sentence_embedding"]],
+        )[0][0]
+        distances.append(1 - similarity)
+    return distances
+
+
+class RandomEmbedder(Embedding):
+    def __init__(self, dim: int):
+        super().__init__()
+        self.name = "Random"
+        self.dim = dim
+        self.calls = 0
+        self.texts = 0
+
+    async def vectorize(self, config, content):
+        self.calls += 1
+        self.texts += len(content)
+        rng = np.random.default_rng(len(content))
+        return rng.standard_normal((len(content), self.dim)).tolist()
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    texts = [f"Sentence number {i} talks about topic {i % 13}." for i in range(args.sentences)]
+    embeddings = rng.standard_normal((args.sentences, args.dim)).astype(np.float32)
+    chunker = SemanticChunker()
+
+    sentences = [{"sentence": t, "index": i} for i, t in enumerate(texts)]
+    _, t_old_combine = timed(lambda: old_combine_sentences([dict(s) for s in sentences]))
+    _, t_new_combine = timed(lambda: chunker.combine_sentences([dict(s) for s in sentences]))
+
+    with_embeddings = [
+        dict(s, combined_sentence_embedding=embeddings[i].tolist())
+        for i, s in enumerate(sentences)
+    ]
+    old_distances, t_old_dist = timed(lambda: old_cosine_distances(with_embeddings))
+    (new_distances, _), t_new_dist = timed(
+        lambda: chunker.calculate_cosine_distances([dict(s) for s in sentences], embeddings)
+    )
+    assert np.allclose(old_distances, new_distances, atol=1e-4)
+
+    print(f"Sentenças: {args.sentences}, dimensão: {args.dim}")
+    print(f"combine_sentences   antes={t_old_combine * 1000:9.1f}ms  depois={t_new_combine * 1000:9.1f}ms")
+    print(f"distâncias cosseno  antes={t_old_dist * 1000:9.1f}ms  depois={t_new_dist * 1000:9.1f}ms  ({t_old_dist / t_new_dist:.0f}x)")
+
+    content = " ".join(texts)
+    for reuse in (False, True):
+        config = {key: value.model_copy() for key, value in chunker.config.items()}
+        config["Reuse Sentence Embeddings"].value = reuse
+        document = Document(title="bench", content=content)
+        document.ensure_parsed()
+        embedder = RandomEmbedder(args.dim)
+        _, took = timed(
+            lambda: asyncio.run(chunker.chunk(config, [document], embedder, {}))
+        )
+        reused = sum(1 for chunk in document.chunks if chunk.vector is not None)
+        print(
+            f"chunk (reuse={str(reuse):5}) {took * 1000:9.1f}ms  chunks={len(document.chunks)}  "
+            f"chunks sem re-embedding={reused}"
+        )
+
+
+if __name__ == "__main__":
+    main()
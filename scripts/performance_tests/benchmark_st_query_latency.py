@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark de latência de embedding de queries com SentenceTransformers.
+
+Compara:
+- ANTES: um SentenceTransformer(model_name) novo a cada query (comportamento antigo)
+- DEPOIS: registry global + fila de micro-batching (queries concorrentes)
+
+Uso:
+    python scripts/performance_tests/benchmark_st_query_latency.py --model all-MiniLM-L6-v2 --queries 200 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from sentence_transformers import SentenceTransformer
+
+from goldenverba.components.embedding.model_registry import SentenceTransformerRegistry
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(label: str, latencies: list[float], wall: float):
+    print(
+        f"{label:8} n={len(latencies):4}  p50={percentile(latencies, 50) * 1000:8.1f}ms  "
+        f"p99={percentile(latencies, 99) * 1000:8.1f}ms  "
+        f"mean={statistics.mean(latencies) * 1000:8.1f}ms  wall={wall:6.2f}s"
+    )
+
+
+def run_before(model_name: str, queries: list[str]):
+    latencies = []
+    start = time.perf_counter()
+    for query in queries:
+        t0 = time.perf_counter()
+        model = SentenceTransformer(model_name)
+        model.encode([query])[0].tolist()
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - start
+
+
+async def run_after(model_name: str, queries: list[str], concurrency: int):
+    registry = SentenceTransformerRegistry()
+    await registry.preload([model_name])
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(query: str):
+        async with semaphore:
+            t0 = time.perf_counter()
+            await registry.encode_query(model_name, query)
+            latencies.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(query) for query in queries])
+    wall = time.perf_counter() - start
+    return latencies, wall, registry.get_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--before-queries", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    queries = [f"what does document {i} say about topic {i % 7}?" for i in range(args.queries)]
+
+    print(f"Model: {args.model}")
+    latencies, wall = run_before(args.model, queries[: args.before_queries])
+    report("before", latencies, wall)
+
+    latencies, wall, stats = asyncio.run(
+        run_after(args.model, queries, args.concurrency)
+    )
+    report("after", latencies, wall)
+    print(
+        f"encode batches: {stats['encode_batches']} for {stats['batched_requests']} queries "
+        f"(model loads: {stats['loads']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
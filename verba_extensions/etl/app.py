@@ -11,8 +11,12 @@ from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
+from weaviate.classes.data import DataObject
+from weaviate.util import generate_uuid5
+
 from .deps import get_weaviate
-from .fetcher import fetch_url_to_text
+from .fetcher import FetchError, extract_text, fetch_html, new_client
+from .jobs import HostThrottle, IngestWorkers, JobStore, RetryableError
 from .chunker import split_into_passages
 from .etl_a2 import run_etl_patch_for_passage_uuids
 from .utils import url_host, sha1
@@ -30,8 +34,11 @@ if templates_dir.exists():
 else:
     templates = None
 
-# Estado simples (em produção, use Redis ou similar)
-STATE = {"jobs": [], "last": None, "queue": []}
+# Último job/ingestão concluído (os jobs ficam na fila SQLite, ver jobs.py)
+STATE = {"last": None}
+
+# Fila de ingestão, workers e clientes compartilhados (criados no startup)
+INGEST: Dict[str, Any] = {"store": None, "workers": None, "http": None, "throttle": None, "client": None}
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
@@ -54,98 +61,175 @@ async def index(request: Request):
 
 @app.get("/status")
 async def status():
+    queue = await asyncio.to_thread(INGEST["store"].get_stats)
     return {
         "tenant": TENANT_DEFAULT,
         "weaviate_url": WEAVIATE_URL,
         "etl_on_ingest": ETL_ON_INGEST,
-        "jobs": STATE["jobs"][-20:],
+        "jobs": await asyncio.to_thread(INGEST["store"].list_jobs, 20),
         "last": STATE["last"],
-        "queue_size": len(STATE["queue"])
+        "queue_size": queue.get("pending", 0) + queue.get("running", 0),
+        "workers": INGEST["workers"].get_stats(),
     }
 
-@app.post("/ingest/urls")
-async def ingest_urls(payload: Dict[str, Any]):
-    """Ingere URLs diretamente no Weaviate"""
-    urls: List[str] = payload.get("urls") or []
-    tenant = payload.get("tenant") or TENANT_DEFAULT
-    run_etl = bool(payload.get("run_etl", ETL_ON_INGEST))
-    language_hint = payload.get("language_hint") or "und"
-    batch_tag = payload.get("batch_tag") or f"batch_{datetime.datetime.utcnow().isoformat()}"
-    
-    client = get_weaviate()
-    art_coll = client.collections.get("Article")
-    pas_coll = client.collections.get("Passage")
-    
-    created_articles, created_passages, passage_uuids = 0, 0, []
-    
-    for url in urls:
-        try:
-            text, meta = await fetch_url_to_text(url)
-            if not text:
-                text = f"(Stub) conteúdo não extraído; URL: {url}"
-            
-            aid = sha1(url)
-            art_props = {
-                "article_id": aid,
-                "url_final": url,
-                "source_domain": url_host(url),
-                "title": meta.get("title") or "",
-                "language": meta.get("language") or language_hint,
-                "published_at": meta.get("published_at") or "",
-                "batch_tag": batch_tag
-            }
-            
-            art_uuid = art_coll.data.insert(properties=art_props, tenant=tenant)
-            created_articles += 1
-            
-            for section_title, section_first_para, chunk in split_into_passages(text):
-                props = {
-                    "text": chunk,
-                    "language": art_props["language"],
-                    "meta_tenant": tenant,
-                    "etl_version": "seed_v0",
-                    "text_hash": sha1(chunk),
-                    "section_title": section_title or "",
-                    "section_first_para": section_first_para or "",
-                    "batch_tag": batch_tag
-                }
-                
-                res = pas_coll.data.insert(
-                    properties=props,
-                    references={"article_ref": [{"from": "Passage", "to": art_uuid}]},
-                    tenant=tenant
-                )
-                passage_uuids.append(res.uuid)
-                created_passages += 1
-        except Exception as e:
-            return JSONResponse(
-                status_code=500,
-                content={"error": f"Erro ao processar URL {url}: {str(e)}"}
-            )
-    
-    # Roda ETL A2 se solicitado
-    if run_etl and passage_uuids:
+def ingest_client():
+    """Cliente Weaviate dos workers (um só, criado no primeiro uso)"""
+    if INGEST["client"] is None:
+        INGEST["client"] = get_weaviate()
+    return INGEST["client"]
+
+def write_article(tenant: str, art_uuid: str, art_props: Dict[str, Any], passages: List[DataObject]):
+    """Grava artigo e passages em batch; UUIDs determinísticos fazem disso um upsert"""
+    client = ingest_client()
+    art_coll = client.collections.get("Article").with_tenant(tenant)
+    pas_coll = client.collections.get("Passage").with_tenant(tenant)
+    for coll, objects in ((art_coll, [DataObject(uuid=art_uuid, properties=art_props)]), (pas_coll, passages)):
+        if not objects:
+            continue
+        res = coll.data.insert_many(objects)
+        if res.has_errors:
+            raise RuntimeError(next(iter(res.errors.values())).message)
+
+async def ingest_url_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Handler dos workers: busca, divide e grava uma URL de um job"""
+    url = item["url"]
+    options = item["options"]
+    throttle = INGEST["throttle"]
+    store = INGEST["store"]
+
+    # Fingerprint da última gravação: requisição condicional e comparação do texto
+    previous = None
+    if not options.get("force"):
+        previous = await asyncio.to_thread(store.get_source, options["tenant"], url)
+
+    async with throttle.slot(url):
         try:
-            await run_etl_patch_for_passage_uuids(get_weaviate, passage_uuids, tenant)
-        except Exception as e:
-            # Log mas não falha a ingestão
-            print(f"Erro no ETL (não crítico): {str(e)}")
-    
+            html, validators = await fetch_html(INGEST["http"], url, previous)
+        except FetchError as e:
+            if e.retry_after:
+                throttle.defer(url, e.retry_after)
+            if e.retryable:
+                raise RetryableError(str(e), e.retry_after) from e
+            raise
+
+    if html is None:
+        await asyncio.to_thread(
+            store.record_source, options["tenant"], url,
+            content_hash=previous["content_hash"], **validators,
+        )
+        return {"unchanged": True, "passage_uuids": []}
+
+    text, meta = await asyncio.to_thread(extract_text, html)
+    if not text:
+        text = f"(Stub) conteúdo não extraído; URL: {url}"
+
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    if previous and previous["content_hash"] == text_hash:
+        await asyncio.to_thread(
+            store.record_source, options["tenant"], url, content_hash=text_hash, **validators
+        )
+        return {"unchanged": True, "passage_uuids": []}
+
+    aid = sha1(url)
+    art_uuid = generate_uuid5(aid)
+    art_props = {
+        "article_id": aid,
+        "url_final": url,
+        "source_domain": url_host(url),
+        "title": meta.get("title") or "",
+        "language": meta.get("language") or options["language_hint"],
+        "published_at": meta.get("published_at") or "",
+        "batch_tag": options["batch_tag"]
+    }
+
+    passages = []
+    sections = await asyncio.to_thread(split_into_passages, text)
+    for index, (section_title, section_first_para, chunk) in enumerate(sections):
+        props = {
+            "text": chunk,
+            "language": art_props["language"],
+            "meta_tenant": options["tenant"],
+            "etl_version": "seed_v0",
+            "text_hash": sha1(chunk),
+            "section_title": section_title or "",
+            "section_first_para": section_first_para or "",
+            "batch_tag": options["batch_tag"]
+        }
+        passages.append(DataObject(
+            uuid=generate_uuid5(f"{aid}:{index}"),
+            properties=props,
+            references={"article_ref": art_uuid},
+        ))
+
+    try:
+        await asyncio.to_thread(write_article, options["tenant"], art_uuid, art_props, passages)
+    except Exception as e:
+        raise RetryableError(f"Erro ao gravar no Weaviate: {str(e)}") from e
+
+    await asyncio.to_thread(
+        store.record_source, options["tenant"], url, content_hash=text_hash, **validators
+    )
+    return {"article_uuid": art_uuid, "passage_uuids": [str(p.uuid) for p in passages]}
+
+async def finish_ingest_job(job: Dict[str, Any], passage_uuids: List[str]):
+    """Roda o ETL A2 uma vez por job, depois que todas as URLs terminaram"""
+    options = job["options"]
+    run_etl = bool(options.get("run_etl")) and bool(passage_uuids)
+    if run_etl:
+        await run_etl_patch_for_passage_uuids(get_weaviate, passage_uuids, options["tenant"])
+
     STATE["last"] = {
-        "articles": created_articles,
-        "passages": created_passages,
+        "job_id": job["job_id"],
+        "articles": job["done"],
+        "passages": len(passage_uuids),
+        "failed": job["failed"],
         "etl": run_etl,
         "timestamp": datetime.datetime.utcnow().isoformat()
     }
-    
-    return {
-        "ok": True,
-        "articles": created_articles,
-        "passages": created_passages,
-        "etl_run": run_etl,
-        "passage_uuids_count": len(passage_uuids)
+
+@app.post("/ingest/urls")
+async def ingest_urls(payload: Dict[str, Any]):
+    """Enfileira URLs para ingestão; acompanhe o job em GET /jobs/{job_id}"""
+    urls: List[str] = payload.get("urls") or []
+    options = {
+        "tenant": payload.get("tenant") or TENANT_DEFAULT,
+        "run_etl": bool(payload.get("run_etl", ETL_ON_INGEST)),
+        "language_hint": payload.get("language_hint") or "und",
+        "batch_tag": payload.get("batch_tag") or f"batch_{datetime.datetime.utcnow().isoformat()}",
+        # Regrava mesmo URLs que não mudaram desde a última ingestão
+        "force": bool(payload.get("force", False)),
     }
 
+    store = INGEST["store"]
+    job_id = await asyncio.to_thread(store.create_job, urls, options)
+    INGEST["workers"].notify()
+    job = await asyncio.to_thread(store.get_job, job_id)
+
+    return JSONResponse(status_code=202, content={
+        "ok": True,
+        "job_id": job_id,
+        "queued": job["total"],
+        "status_url": f"/jobs/{job_id}"
+    })
+
+@app.get("/jobs")
+async def list_jobs(limit: int = 20):
+    return {"jobs": await asyncio.to_thread(INGEST["store"].list_jobs, limit)}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await asyncio.to_thread(INGEST["store"].get_job, job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": f"Job {job_id} não encontrado"})
+    return job
+
+@app.post("/jobs/{job_id}/retry")
+async def retry_job(job_id: str):
+    """Recoloca na fila as URLs do job que falharam"""
+    requeued = await asyncio.to_thread(INGEST["store"].retry_failed, job_id)
+    INGEST["workers"].notify()
+    return {"ok": True, "job_id": job_id, "requeued": requeued}
+
 @app.post("/ingest/results")
 async def ingest_results(payload: Dict[str, Any]):
     """Ingere resultados já processados (content já extraído)"""
@@ -253,7 +337,18 @@ async def etl_patch(payload: Dict[str, Any]):
 
 @app.on_event("startup")
 async def startup():
-    """Verifica conexão com Weaviate no startup"""
+    """Sobe a fila de ingestão e verifica conexão com Weaviate no startup"""
+    store = JobStore.from_env()
+    INGEST["store"] = store
+    INGEST["throttle"] = HostThrottle(
+        concurrency=int(os.getenv("INGEST_HOST_CONCURRENCY", "2")),
+        delay=float(os.getenv("INGEST_HOST_DELAY", "1.0")),
+    )
+    INGEST["workers"] = IngestWorkers.from_env(store, ingest_url_item, finish_ingest_job)
+    INGEST["http"] = new_client(max_connections=INGEST["workers"].workers * 2)
+    await INGEST["workers"].start()
+    print(f"✅ Fila de ingestão: {store.path} ({INGEST['workers'].workers} workers)")
+
     try:
         client = get_weaviate()
         if await client.is_ready():
@@ -263,6 +358,18 @@ async def startup():
     except Exception as e:
         print(f"⚠️ Erro ao conectar Weaviate: {str(e)}")
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Para os workers (itens em andamento são retomados no próximo startup)"""
+    if INGEST["workers"] is not None:
+        await INGEST["workers"].stop()
+    if INGEST["http"] is not None:
+        await INGEST["http"].aclose()
+    if INGEST["client"] is not None:
+        INGEST["client"].close()
+    if INGEST["store"] is not None:
+        INGEST["store"].close()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -3,48 +3,24 @@
 import os
 import time
 from typing import List, Callable, Dict
-import spacy
 
-# Modelo spaCy configurável
-SPACY_MODEL = os.getenv("SPACY_MODEL", "pt_core_news_sm")
-_nlp = None
+from goldenverba.components.spacy_registry import NER, get_spacy_registry
+from verba_extensions.utils.gazetteer_index import index_for, load_gazetteer_file
 
 def nlp():
-    """Lazy load do modelo spaCy"""
-    global _nlp
-    if _nlp is None:
-        try:
-            _nlp = spacy.load(SPACY_MODEL)
-        except OSError:
-            print(f"⚠️ Modelo {SPACY_MODEL} não encontrado. Instale: python -m spacy download {SPACY_MODEL}")
-            _nlp = None
-    return _nlp
+    """spaCy (somente NER) do registry compartilhado, no idioma de SPACY_MODEL"""
+    return get_spacy_registry().get(components=NER)
 
 def load_gazetteer(path: str = "verba_extensions/etl/resources/gazetteer.json") -> Dict:
-    """Carrega gazetteer de entidades"""
-    import json
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            raw = json.load(f)
-        return {item["entity_id"]: item["aliases"] for item in raw}
-    except:
-        return {}
+    """Carrega gazetteer de entidades (em cache, recarregado quando o arquivo muda)"""
+    return load_gazetteer_file(path)
 
 def match_aliases(text: str, gaz: Dict) -> List[str]:
     """Encontra entity_ids que correspondem a aliases no texto"""
     if not text or not gaz:
         return []
     
-    t_lower = text.lower()
-    hits = []
-    
-    for eid, aliases in gaz.items():
-        for alias in aliases:
-            if alias.lower() in t_lower:
-                hits.append(eid)
-                break
-    
-    return sorted(set(hits))
+    return sorted(index_for(gaz).find_ids(text))
 
 def _ner_mentions(text: str) -> List[Dict]:
     """Extrai entidades NER usando spaCy"""
@@ -64,14 +40,7 @@ def _normalize_mentions(mentions: List[Dict], gaz: Dict) -> List[str]:
     if not mentions or not gaz:
         return []
     
-    text_mentions = {m["text"].lower() for m in mentions}
-    ids = []
-    
-    for eid, aliases in gaz.items():
-        if any(a.lower() in text_mentions for a in aliases):
-            ids.append(eid)
-    
-    return sorted(set(ids))
+    return sorted(index_for(gaz).ids_for_mentions(m["text"] for m in mentions))
 
 async def run_etl_patch_for_passage_uuids(
     get_weaviate: Callable,
@@ -3,31 +3,123 @@
 import httpx
 import trafilatura
 import re
-from typing import Tuple, Dict
+import datetime
+from email.utils import parsedate_to_datetime
+from typing import Optional, Tuple, Dict
 
-async def fetch_url_to_text(url: str) -> Tuple[str, Dict]:
-    """Baixa URL e extrai texto usando Trafilatura"""
+from goldenverba.components.fingerprints import conditional_headers, response_validators
+
+USER_AGENT = "Verba-A2-Ingestor/1.0"
+
+# Status HTTP que valem nova tentativa
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """Falha ao baixar uma URL; `retryable` indica falha transitória (rede, 429, 5xx)"""
+
+    def __init__(self, message: str, retryable: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Segundos do header Retry-After (número ou data HTTP)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.datetime.now(when.tzinfo)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def new_client(timeout: float = 20, max_connections: int = 100) -> httpx.AsyncClient:
+    """Cliente HTTP compartilhado pelos workers de ingestão"""
+    return httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=timeout,
+        headers={"User-Agent": USER_AGENT},
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections // 2),
+    )
+
+
+async def fetch_html(
+    client: httpx.AsyncClient, url: str, fingerprint: Optional[Dict] = None
+) -> Tuple[Optional[str], Dict[str, Optional[str]]]:
+    """Baixa o HTML de uma URL; levanta FetchError em erro de rede ou status de erro.
+
+    Com `fingerprint` (etag/last_modified da última busca) a requisição é
+    condicional: em 304 retorna (None, validadores).
+    """
+    try:
+        r = await client.get(url, headers=conditional_headers(fingerprint))
+    except httpx.TransportError as e:
+        raise FetchError(f"{type(e).__name__}: {str(e)}", retryable=True) from e
+    if r.status_code >= 400:
+        raise FetchError(
+            f"HTTP {r.status_code}",
+            retryable=r.status_code in RETRYABLE_STATUS,
+            retry_after=parse_retry_after(r.headers.get("Retry-After")),
+        )
+    validators = response_validators(r.headers)
+    if r.status_code == 304:
+        return None, {
+            "etag": validators["etag"] or (fingerprint or {}).get("etag"),
+            "last_modified": validators["last_modified"] or (fingerprint or {}).get("last_modified"),
+        }
+    return r.text, validators
+
+
+def extract_text(html: str) -> Tuple[str, Dict]:
+    """Extrai texto e metadados (título, idioma) do HTML usando Trafilatura"""
     meta = {"title": "", "language": "und", "published_at": ""}
-    
+
+    # Extrai título
+    title_match = re.search(r"<title>(.*?)</title>", html, re.I | re.S)
+    if title_match:
+        meta["title"] = re.sub(r"\s+", " ", title_match.group(1)).strip()
+
+    # Extrai texto com Trafilatura
+    text = trafilatura.extract(html, include_comments=False, favor_recall=True) or ""
+
+    # Detecta idioma
+    lang_match = re.search(r'lang=["\']([a-zA-Z-]+)["\']', html)
+    if lang_match:
+        meta["language"] = lang_match.group(1).lower()
+
+    return text, meta
+
+
+async def fetch_url_to_text(url: str, fingerprint: Optional[Dict] = None) -> Tuple[str, Dict]:
+    """Baixa URL e extrai texto usando Trafilatura.
+
+    `meta` traz "etag"/"last_modified" da resposta; com `fingerprint` a
+    requisição é condicional e, em 304, retorna ("", meta) com
+    meta["not_modified"] = True.
+    """
+    meta = {"title": "", "language": "und", "published_at": ""}
+
     try:
         async with httpx.AsyncClient(follow_redirects=True, timeout=20) as client:
-            r = await client.get(url, headers={"User-Agent": "Verba-A2-Ingestor/1.0"})
-            html = r.text
-        
-        # Extrai título
-        title_match = re.search(r"<title>(.*?)</title>", html, re.I | re.S)
-        if title_match:
-            meta["title"] = re.sub(r"\s+", " ", title_match.group(1)).strip()
-        
-        # Extrai texto com Trafilatura
-        text = trafilatura.extract(html, include_comments=False, favor_recall=True) or ""
-        
-        # Detecta idioma
-        lang_match = re.search(r'lang=["\']([a-zA-Z-]+)["\']', html)
-        if lang_match:
-            meta["language"] = lang_match.group(1).lower()
-        
+            r = await client.get(
+                url, headers={"User-Agent": USER_AGENT, **conditional_headers(fingerprint)}
+            )
+        validators = response_validators(r.headers)
+        if r.status_code == 304:
+            meta.update(
+                etag=validators["etag"] or fingerprint.get("etag"),
+                last_modified=validators["last_modified"] or fingerprint.get("last_modified"),
+                not_modified=True,
+            )
+            return "", meta
+        text, meta = extract_text(r.text)
+        meta.update(validators)
         return text, meta
     except Exception as e:
         return f"Erro ao buscar {url}: {str(e)}", meta
-
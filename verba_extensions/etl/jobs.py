@@ -0,0 +1,509 @@
+"""
+Fila de jobs de ingestão do A2 Ingestor, persistida em SQLite.
+
+`/ingest/urls` buscava, dividia e inseria as URLs uma a uma dentro do
+request (e rodava o ETL no final): o handler ficava preso por minutos e um
+restart perdia o lote inteiro. Agora o request só grava o job em `JobStore`
+(uma linha por URL) e responde com o `job_id`; `IngestWorkers` roda N
+workers async que pegam URLs pendentes e as processam com o handler do app
+(fetch com limites por host via `HostThrottle`, chunking e gravação com
+UUIDs determinísticos). Falhas transitórias (`RetryableError`: rede, 429,
+5xx) voltam para a fila com backoff exponencial; quando todos os itens de
+um job terminam, `on_job_done` roda uma única vez (o ETL dos passages).
+
+Retomada após restart: itens "running" voltam para "pending" e jobs que
+ficaram no meio do ETL rodam o ETL de novo. Reprocessar uma URL sobrescreve
+os mesmos objetos, então a retomada é idempotente. A fila é de um processo
+só (uma conexão SQLite protegida por lock).
+
+Re-ingestão: `sources` guarda por tenant e URL o ETag, o Last-Modified e
+o hash do texto gravado. O handler manda requisição condicional e não
+regrava (nem roda ETL) quando a resposta é 304 ou o texto não mudou; o
+job aceita "force" para ignorar isso.
+
+Estados: job "queued" -> "running" -> "etl" -> "done"; item "pending" ->
+"running" -> "done" | "failed".
+
+Variáveis de ambiente:
+- INGEST_DB_PATH: arquivo SQLite da fila (default: ~/.cache/verba/ingestor_jobs.sqlite)
+- INGEST_WORKERS: workers simultâneos (default: 8)
+- INGEST_HOST_CONCURRENCY: requisições simultâneas por host (default: 2)
+- INGEST_HOST_DELAY: segundos entre requisições ao mesmo host (default: 1.0)
+- INGEST_MAX_ATTEMPTS: tentativas por URL (default: 4)
+- INGEST_RETRY_BASE: espera da primeira nova tentativa em segundos, dobra a cada falha (default: 5)
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .utils import url_host
+
+# Espera máxima entre tentativas de uma URL
+MAX_RETRY_DELAY = 600.0
+
+
+class RetryableError(Exception):
+    """Falha transitória: o item volta para a fila (após `retry_after`, se informado)"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class JobStore:
+    """Jobs e itens (URLs) de ingestão em SQLite"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, options TEXT NOT NULL, "
+            "total INTEGER NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL, error TEXT)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "job_id TEXT NOT NULL, position INTEGER NOT NULL, url TEXT NOT NULL, "
+            "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+            "next_attempt_at REAL NOT NULL DEFAULT 0, error TEXT, result TEXT, "
+            "updated_at REAL NOT NULL, PRIMARY KEY (job_id, position))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS items_due ON items(status, next_attempt_at)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "tenant TEXT NOT NULL, url TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+            "content_hash TEXT, updated_at REAL NOT NULL, PRIMARY KEY (tenant, url))"
+        )
+        self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> "JobStore":
+        return cls(
+            os.path.expanduser(
+                os.getenv("INGEST_DB_PATH", "~/.cache/verba/ingestor_jobs.sqlite")
+            )
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # --- Jobs ---------------------------------------------------------------
+
+    def create_job(self, urls: List[str], options: Dict[str, Any]) -> str:
+        """Grava um job com uma linha por URL (URLs repetidas entram uma vez)"""
+        urls = list(dict.fromkeys(url for url in urls if url))
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (job_id, status, options, total, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, "queued" if urls else "done", json.dumps(options), len(urls), now, now),
+            )
+            self._db.executemany(
+                "INSERT INTO items (job_id, position, url, status, updated_at) VALUES (?, ?, ?, 'pending', ?)",
+                [(job_id, position, url, now) for position, url in enumerate(urls)],
+            )
+            self._db.commit()
+        return job_id
+
+    def _counts(self, job_id: str) -> Dict[str, int]:
+        rows = self._db.execute(
+            "SELECT status, COUNT(*) FROM items WHERE job_id = ? GROUP BY status", (job_id,)
+        ).fetchall()
+        return {status: count for status, count in rows}
+
+    def _job_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        counts = self._counts(row["job_id"])
+        return {
+            "job_id": row["job_id"],
+            "status": row["status"],
+            "options": json.loads(row["options"]),
+            "total": row["total"],
+            "pending": counts.get("pending", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+            "error": row["error"],
+        }
+
+    def get_job(self, job_id: str, failures: int = 20) -> Optional[Dict[str, Any]]:
+        """Job com contagem por estado e os erros das primeiras URLs que falharam"""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            job = self._job_dict(row)
+            job["failures"] = [
+                {"url": url, "attempts": attempts, "error": error}
+                for url, attempts, error in self._db.execute(
+                    "SELECT url, attempts, error FROM items WHERE job_id = ? AND status = 'failed' "
+                    "ORDER BY position LIMIT ?",
+                    (job_id, failures),
+                )
+            ]
+        return job
+
+    def list_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+            return [self._job_dict(row) for row in rows]
+
+    def set_job_status(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (status, error, time.time(), job_id),
+            )
+            self._db.commit()
+
+    def _finish_if_done(self, job_id: str) -> bool:
+        open_items = self._db.execute(
+            "SELECT COUNT(*) FROM items WHERE job_id = ? AND status IN ('pending', 'running')", (job_id,)
+        ).fetchone()[0]
+        if open_items:
+            return False
+        cursor = self._db.execute(
+            "UPDATE jobs SET status = 'etl', updated_at = ? WHERE job_id = ? AND status IN ('queued', 'running')",
+            (time.time(), job_id),
+        )
+        return cursor.rowcount == 1
+
+    def finish_if_done(self, job_id: str) -> bool:
+        """
+        Passa o job para "etl" quando não há mais itens abertos. Só uma chamada
+        devolve True, então o ETL do job roda uma vez.
+        """
+        with self._lock:
+            finished = self._finish_if_done(job_id)
+            self._db.commit()
+        return finished
+
+    def passage_uuids(self, job_id: str) -> List[str]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT result FROM items WHERE job_id = ? AND status = 'done' ORDER BY position", (job_id,)
+            ).fetchall()
+        return [passage for (result,) in rows for passage in json.loads(result or "{}").get("passage_uuids", [])]
+
+    def retry_failed(self, job_id: str) -> int:
+        """Recoloca as URLs que falharam na fila, com as tentativas zeradas"""
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE items SET status = 'pending', attempts = 0, next_attempt_at = 0, error = NULL, updated_at = ? "
+                "WHERE job_id = ? AND status = 'failed'",
+                (now, job_id),
+            )
+            if cursor.rowcount:
+                self._db.execute(
+                    "UPDATE jobs SET status = 'running', error = NULL, updated_at = ? WHERE job_id = ?",
+                    (now, job_id),
+                )
+            self._db.commit()
+        return cursor.rowcount
+
+    def recover(self) -> List[str]:
+        """
+        Retomada após restart: itens "running" voltam para a fila. Devolve os
+        jobs que precisam do ETL (interrompidos no ETL ou sem itens abertos).
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE items SET status = 'pending', next_attempt_at = 0 WHERE status = 'running'"
+            )
+            ready = [
+                job_id
+                for (job_id,) in self._db.execute(
+                    "SELECT job_id FROM jobs WHERE status IN ('queued', 'running')"
+                ).fetchall()
+                if self._finish_if_done(job_id)
+            ]
+            ready += [
+                job_id
+                for (job_id,) in self._db.execute("SELECT job_id FROM jobs WHERE status = 'etl'").fetchall()
+                if job_id not in ready
+            ]
+            self._db.commit()
+        return ready
+
+    # --- Itens --------------------------------------------------------------
+
+    def claim(self, limit: int = 1) -> List[Dict[str, Any]]:
+        """Marca como "running" e devolve os próximos itens pendentes (FIFO)"""
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT items.job_id, items.position, items.url, items.attempts, jobs.options "
+                "FROM items JOIN jobs ON jobs.job_id = items.job_id "
+                "WHERE items.status = 'pending' AND items.next_attempt_at <= ? "
+                "ORDER BY items.rowid LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            if not rows:
+                return []
+            self._db.executemany(
+                "UPDATE items SET status = 'running', attempts = attempts + 1, updated_at = ? "
+                "WHERE job_id = ? AND position = ?",
+                [(now, row["job_id"], row["position"]) for row in rows],
+            )
+            self._db.executemany(
+                "UPDATE jobs SET status = 'running', updated_at = ? WHERE job_id = ? AND status = 'queued'",
+                [(now, job_id) for job_id in {row["job_id"] for row in rows}],
+            )
+            self._db.commit()
+        return [
+            {
+                "job_id": row["job_id"],
+                "position": row["position"],
+                "url": row["url"],
+                "attempts": row["attempts"] + 1,
+                "options": json.loads(row["options"]),
+            }
+            for row in rows
+        ]
+
+    def _update_item(self, item: Dict[str, Any], **fields) -> None:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(
+                f"UPDATE items SET {assignments} WHERE job_id = ? AND position = ?",
+                (*fields.values(), item["job_id"], item["position"]),
+            )
+            self._db.commit()
+
+    def complete(self, item: Dict[str, Any], result: Dict[str, Any]) -> None:
+        self._update_item(item, status="done", error=None, result=json.dumps(result))
+
+    def retry_later(self, item: Dict[str, Any], error: str, delay: float) -> None:
+        self._update_item(item, status="pending", error=error, next_attempt_at=time.time() + delay)
+
+    def fail(self, item: Dict[str, Any], error: str) -> None:
+        self._update_item(item, status="failed", error=error)
+
+    def fail_if_running(self, item: Dict[str, Any], error: str) -> bool:
+        """Marca como "failed" um item que ficou em "running" por erro fora do handler"""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE items SET status = 'failed', error = ?, updated_at = ? "
+                "WHERE job_id = ? AND position = ? AND status = 'running'",
+                (error, time.time(), item["job_id"], item["position"]),
+            )
+            self._db.commit()
+        return cursor.rowcount > 0
+
+    def next_due(self) -> Optional[float]:
+        """Quando o próximo item pendente pode rodar (None = fila vazia)"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT MIN(next_attempt_at) FROM items WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    # --- Fontes (fingerprints das URLs já gravadas) -------------------------
+
+    def get_source(self, tenant: str, url: str) -> Optional[Dict[str, Any]]:
+        """ETag, Last-Modified e hash do texto da última gravação da URL no tenant"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, content_hash FROM sources WHERE tenant = ? AND url = ?",
+                (tenant, url),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def record_source(
+        self,
+        tenant: str,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sources (tenant, url, etag, last_modified, content_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (tenant, url, etag, last_modified, content_hash, time.time()),
+            )
+            self._db.commit()
+
+
+class HostThrottle:
+    """Politeness por host: no máximo `concurrency` requisições simultâneas e `delay` segundos entre inícios"""
+
+    def __init__(self, concurrency: int = 2, delay: float = 1.0):
+        self.concurrency = max(1, concurrency)
+        self.delay = max(0.0, delay)
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Adia as próximas requisições ao host (ex.: Retry-After de um 429)"""
+        host = url_host(url)
+        self._next_start[host] = max(self._next_start.get(host, 0.0), time.monotonic() + seconds)
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = url_host(url)
+        slots = self._slots.setdefault(host, asyncio.Semaphore(self.concurrency))
+        async with slots:
+            async with self._locks.setdefault(host, asyncio.Lock()):
+                wait = self._next_start.get(host, 0.0) - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._next_start[host] = time.monotonic() + self.delay
+            yield
+
+
+class IngestWorkers:
+    """Pool de workers async que consome a fila de `JobStore`"""
+
+    def __init__(
+        self,
+        store: JobStore,
+        handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        on_job_done: Optional[Callable[[Dict[str, Any], List[str]], Awaitable[Any]]] = None,
+        workers: int = 8,
+        max_attempts: int = 4,
+        retry_base: float = 5.0,
+        poll_interval: float = 1.0,
+    ):
+        self.store = store
+        self.handler = handler
+        self.on_job_done = on_job_done
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base = retry_base
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self.processed = 0
+
+    @classmethod
+    def from_env(cls, store: JobStore, handler, on_job_done=None) -> "IngestWorkers":
+        return cls(
+            store,
+            handler,
+            on_job_done,
+            workers=int(os.getenv("INGEST_WORKERS", "8")),
+            max_attempts=int(os.getenv("INGEST_MAX_ATTEMPTS", "4")),
+            retry_base=float(os.getenv("INGEST_RETRY_BASE", "5")),
+        )
+
+    async def start(self) -> None:
+        """Retoma o que ficou pela metade e sobe os workers"""
+        for job_id in await asyncio.to_thread(self.store.recover):
+            self._tasks.append(asyncio.create_task(self._finish_job(job_id)))
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancela os workers; itens em andamento são retomados no próximo start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Acorda os workers ociosos (novo job na fila)"""
+        self._wakeup.set()
+
+    async def _wait(self) -> None:
+        due = await asyncio.to_thread(self.store.next_due)
+        timeout = self.poll_interval
+        if due is not None:
+            timeout = min(timeout, max(0.05, due - time.time()))
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _worker(self) -> None:
+        # Um erro fora do handler (ex.: SQLite) não pode encerrar o worker:
+        # registra, falha o item pego e segue após uma pausa
+        while True:
+            item = None
+            try:
+                items = await asyncio.to_thread(self.store.claim, 1)
+                if not items:
+                    await self._wait()
+                    continue
+                item = items[0]
+                await self._process(item)
+            except Exception as e:
+                error = f"{type(e).__name__}: {str(e)[:300]}"
+                print(f"⚠️ Erro no worker de ingestão ({item['url'] if item else 'fila'}): {error}")
+                if item is not None:
+                    await self._abandon(item, f"worker: {error}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _abandon(self, item: Dict[str, Any], error: str) -> None:
+        try:
+            await asyncio.to_thread(self.store.fail_if_running, item, error)
+            if await asyncio.to_thread(self.store.finish_if_done, item["job_id"]):
+                await self._finish_job(item["job_id"])
+        except Exception as e:
+            # O item fica em "running" e volta para a fila no próximo start (recover)
+            print(f"⚠️ Não foi possível marcar {item['url']} como falha: {type(e).__name__}: {str(e)[:300]}")
+
+    async def _process(self, item: Dict[str, Any]) -> None:
+        try:
+            result = await self.handler(item)
+        except RetryableError as e:
+            error = f"{type(e).__name__}: {str(e)[:300]}"
+            if item["attempts"] < self.max_attempts:
+                delay = e.retry_after or self.retry_base * 2 ** (item["attempts"] - 1)
+                await asyncio.to_thread(self.store.retry_later, item, error, min(delay, MAX_RETRY_DELAY))
+                return
+            await asyncio.to_thread(self.store.fail, item, error)
+        except Exception as e:
+            await asyncio.to_thread(self.store.fail, item, f"{type(e).__name__}: {str(e)[:300]}")
+        else:
+            await asyncio.to_thread(self.store.complete, item, result or {})
+            self.processed += 1
+
+        if await asyncio.to_thread(self.store.finish_if_done, item["job_id"]):
+            await self._finish_job(item["job_id"])
+
+    async def _finish_job(self, job_id: str) -> None:
+        error = None
+        if self.on_job_done is not None:
+            job = await asyncio.to_thread(self.store.get_job, job_id)
+            passages = await asyncio.to_thread(self.store.passage_uuids, job_id)
+            try:
+                await self.on_job_done(job, passages)
+            except Exception as e:
+                # ETL não é crítico: o job termina com o erro registrado
+                error = f"on_job_done: {type(e).__name__}: {str(e)[:300]}"
+        await asyncio.to_thread(self.store.set_job_status, job_id, "done", error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": any(not task.done() for task in self._tasks),
+            "processed": self.processed,
+        }
@@ -28,10 +28,70 @@ def normalize_entity_label(label: str) -> str:
     }
     return label_mapping.get(label, label)
 
+EMPTY_PRE_CHUNKING = {"entities": [], "entity_ids": [], "entity_spans": []}
+
+
+def _pre_chunking_result(spans: List[Dict]) -> Dict:
+    """Monta menções, spans e entity_ids a partir dos spans do NER ({text, label, start, end})"""
+    from verba_extensions.plugins.a2_etl_hook import normalize_entities, load_gazetteer
+    from verba_extensions.utils.gazetteer_index import index_for
+
+    mentions = []
+    entity_spans = []
+    seen_spans = set()  # Deduplica entidades por posição para evitar O(n) complexity
+
+    for ent in spans:
+        # Filtra por tipo relevante (ORG, PERSON/PER são mais críticos para entity-aware)
+        # Excluir GPE/LOC/MISC para reduzir de 370 para ~50 entidades e melhorar performance
+        # NOTA: Modelos PT usam "PER", modelos EN usam "PERSON" - normalizamos depois
+        if ent["label"] not in ("ORG", "PERSON", "PER"):
+            continue
+        mentions.append({"text": ent["text"], "label": ent["label"]})
+        # Deduplica por span de caracteres (evita múltiplas ocorrências da mesma entidade)
+        span_key = (ent["start"], ent["end"], ent["text"].lower())
+        if span_key not in seen_spans:
+            seen_spans.add(span_key)
+            # Normaliza label (PER -> PERSON) para compatibilidade entre modelos
+            normalized_label = normalize_entity_label(ent["label"])
+            entity_spans.append({
+                "text": ent["text"],
+                "start": ent["start"],
+                "end": ent["end"],
+                "label": normalized_label,  # Normalizado para PERSON
+                "entity_id": None  # Será preenchido depois se normalizado
+            })
+
+    if not mentions:
+        return dict(EMPTY_PRE_CHUNKING)
+
+    # Normaliza para entity_ids via gazetteer
+    gaz = load_gazetteer()
+    entity_ids = normalize_entities(mentions, gaz)
+
+    # Mapeia spans para entity_ids quando possível (lookup O(1) por alias)
+    if gaz:
+        index = index_for(gaz)
+        for span in entity_spans:
+            span["entity_id"] = index.lookup(span["text"])
+
+    msg.info(f"[ETL-PRE] Extraídas {len(mentions)} entidades do documento completo")
+    if entity_ids:
+        msg.info(f"[ETL-PRE] {len(entity_ids)} entidades normalizadas: {entity_ids[:5]}...")
+
+    return {
+        "entities": mentions,
+        "entity_ids": entity_ids,
+        "entity_spans": entity_spans
+    }
+
+
 def extract_entities_pre_chunking(document) -> Dict:
     """
     Extrai entidades do documento completo ANTES do chunking
     
+    Roda o NER no thread atual; no import use `aextract_entities_pre_chunking`,
+    que roda no pool de NER sem bloquear o event loop.
+    
     Retorna:
     {
         "entities": [{"text": "Apple", "label": "ORG", "start": 0, "end": 5}],
@@ -40,92 +100,51 @@ def extract_entities_pre_chunking(document) -> Dict:
     }
     """
     try:
-        from verba_extensions.plugins.a2_etl_hook import (
-            extract_entities_nlp,
-            normalize_entities,
-            load_gazetteer,
-            get_nlp
-        )
+        from verba_extensions.plugins.a2_etl_hook import get_nlp
+        from verba_extensions.utils.ner_pool import doc_spans
         
         text = document.content if hasattr(document, 'content') else ""
         if not text:
-            return {"entities": [], "entity_ids": [], "entity_spans": []}
-        
-        # Extrai entidades via spaCy
-        mentions = extract_entities_nlp(text)
-        if not mentions:
-            return {"entities": [], "entity_ids": [], "entity_spans": []}
-        
-        # Normaliza para entity_ids via gazetteer
-        gaz = load_gazetteer()
-        entity_ids = normalize_entities(mentions, gaz)
+            return dict(EMPTY_PRE_CHUNKING)
         
-        # Extrai spans (posições) para o chunker usar
         nlp_model = get_nlp()
-        entity_spans = []
-        seen_spans = set()  # Deduplica entidades por posição para evitar O(n) complexity
+        if not nlp_model:
+            return dict(EMPTY_PRE_CHUNKING)
         
-        if nlp_model:
-            doc = nlp_model(text)
-            for ent in doc.ents:
-                # Filtra por tipo relevante (ORG, PERSON/PER são mais críticos para entity-aware)
-                # Excluir GPE/LOC/MISC para reduzir de 370 para ~50 entidades e melhorar performance
-                # NOTA: Modelos PT usam "PER", modelos EN usam "PERSON" - normalizamos depois
-                if ent.label_ in ("ORG", "PERSON", "PER"):
-                    # Deduplica por span de caracteres (evita múltiplas ocorrências da mesma entidade)
-                    span_key = (ent.start_char, ent.end_char, ent.text.lower())
-                    if span_key not in seen_spans:
-                        seen_spans.add(span_key)
-                        # Normaliza label (PER -> PERSON) para compatibilidade entre modelos
-                        normalized_label = normalize_entity_label(ent.label_)
-                        entity_spans.append({
-                            "text": ent.text,
-                            "start": ent.start_char,
-                            "end": ent.end_char,
-                            "label": normalized_label,  # Normalizado para PERSON
-                            "entity_id": None  # Será preenchido depois se normalizado
-                        })
+        # Uma única passada do NER: menções e spans saem do mesmo Doc
+        return _pre_chunking_result(doc_spans(nlp_model(text)))
         
-        # Mapeia spans para entity_ids quando possível
-        for span in entity_spans:
-            text_lower = span["text"].lower()
-            for eid, aliases in gaz.items():
-                if any(alias.lower() == text_lower for alias in aliases):
-                    span["entity_id"] = eid
-                    break
+    except Exception as e:
+        msg.warn(f"[ETL-PRE] Erro ao extrair entidades pré-chunking (não crítico): {str(e)}")
+        return dict(EMPTY_PRE_CHUNKING)
+
+
+async def aextract_entities_pre_chunking(document) -> Dict:
+    """Como `extract_entities_pre_chunking`, com o NER no pool de processos"""
+    try:
+        from verba_extensions.utils.ner_pool import get_ner_pool
         
-        msg.info(f"[ETL-PRE] Extraídas {len(mentions)} entidades do documento completo")
-        if entity_ids:
-            msg.info(f"[ETL-PRE] {len(entity_ids)} entidades normalizadas: {entity_ids[:5]}...")
+        text = document.content if hasattr(document, 'content') else ""
+        if not text:
+            return dict(EMPTY_PRE_CHUNKING)
         
-        return {
-            "entities": mentions,
-            "entity_ids": entity_ids,
-            "entity_spans": entity_spans
-        }
+        spans = await get_ner_pool().extract_document(text)
+        return _pre_chunking_result(spans)
         
     except Exception as e:
         msg.warn(f"[ETL-PRE] Erro ao extrair entidades pré-chunking (não crítico): {str(e)}")
-        return {"entities": [], "entity_ids": [], "entity_spans": []}
+        return dict(EMPTY_PRE_CHUNKING)
 
 
-def apply_etl_pre_chunking(document, enable_etl: bool = True):
-    """
-    Aplica ETL pré-chunking ao documento
-    
-    Armazena entidades em document.meta para chunker usar
-    """
-    if not enable_etl:
-        return document
-    
+def _has_pre_chunking(document) -> bool:
     # Verifica se já tem entidades (evita reprocessar)
     if hasattr(document, 'meta') and document.meta and document.meta.get("entities_pre_chunking"):
         msg.info(f"[ETL-PRE] Documento já tem entidades pré-extraídas, reutilizando")
-        return document
-    
-    # Extrai entidades
-    etl_data = extract_entities_pre_chunking(document)
-    
+        return True
+    return False
+
+
+def _store_pre_chunking(document, etl_data: Dict):
     # Armazena no documento
     if not hasattr(document, 'meta') or document.meta is None:
         document.meta = {}
@@ -139,3 +158,22 @@ def apply_etl_pre_chunking(document, enable_etl: bool = True):
     
     return document
 
+
+def apply_etl_pre_chunking(document, enable_etl: bool = True):
+    """
+    Aplica ETL pré-chunking ao documento
+    
+    Armazena entidades em document.meta para chunker usar
+    """
+    if not enable_etl or _has_pre_chunking(document):
+        return document
+    
+    return _store_pre_chunking(document, extract_entities_pre_chunking(document))
+
+
+async def aapply_etl_pre_chunking(document, enable_etl: bool = True):
+    """`apply_etl_pre_chunking` para o import: NER no pool, sem travar o event loop"""
+    if not enable_etl or _has_pre_chunking(document):
+        return document
+    
+    return _store_pre_chunking(document, await aextract_entities_pre_chunking(document))
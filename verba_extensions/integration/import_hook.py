@@ -239,10 +239,10 @@ def patch_weaviate_manager():
                     from verba_extensions.integration.schema_validator import collection_has_framework_properties
                     has_framework_props = await collection_has_framework_properties(client, embedder_collection_name)
                     
-                    # Verifica se collection tem named vectors
+                    # Verifica se collection tem named vectors (config em cache por client)
                     try:
-                        collection = client.collections.get(embedder_collection_name)
-                        config = await collection.config.get()
+                        from goldenverba.components.schema_cache import get_collection_config
+                        config = await get_collection_config(client, embedder_collection_name)
                         has_named_vectors = hasattr(config, 'vector_config') and config.vector_config is not None
                     except:
                         pass
@@ -335,11 +335,12 @@ def patch_weaviate_manager():
                         msg.debug(f"[Named-Vectors] Erro ao extrair textos especializados (não crítico): {str(e)}")
                 
                 try:
-                    await original_import(self, client, document, embedder)
+                    # Versões novas do import_document retornam o doc_uuid
+                    imported_uuid = await original_import(self, client, document, embedder)
                 finally:
                     # Restaura método original
                     DataObject.__init__ = original_data_object_init
-                # Método original não retorna doc_uuid, então buscamos pelo título
+                # Fallback: se o import não retornou doc_uuid, busca pelo título
                 if Filter is not None:
                     try:
                         import asyncio
@@ -356,9 +357,11 @@ def patch_weaviate_manager():
                         if _is_client_connected(client):
                             # Tenta buscar doc_uuid com retry (pode levar um pouco para o Weaviate commit)
                             document_collection = client.collections.get(self.document_collection_name)
-                            doc_uuid = None
+                            doc_uuid = str(imported_uuid) if imported_uuid else None
                             max_retries = 3
                             for attempt in range(max_retries):
+                                if doc_uuid:
+                                    break  # Já retornado pelo import, sem query por título
                                 if attempt > 0:
                                     await asyncio.sleep(0.2)  # Delay entre tentativas
                                 
@@ -484,7 +487,7 @@ def patch_weaviate_manager():
                                             try:
                                                 # Passa logger via kwargs para o hook poder notificar conclusão
                                                 etl_logger = _logger_registry.get(doc_uuid)
-                                                await global_hooks.execute_hook_async(
+                                                etl_result = await global_hooks.execute_hook_async(
                                                     'import.after',
                                                     hook_client,
                                                     doc_uuid,
@@ -496,6 +499,9 @@ def patch_weaviate_manager():
                                                     file_id=file_id  # Para notificação
                                                 )
                                                 msg.good(f"[ETL] ✅ ETL A2 concluído para {len(passage_uuids)} chunks")
+                                                # Chunks alterados pelo ETL: resultados em cache ficaram desatualizados
+                                                if isinstance(etl_result, dict) and etl_result.get("patched"):
+                                                    await self.bump_cache_generation(hook_client)
                                             except Exception as etl_error:
                                                 error_str = str(etl_error).lower()
                                                 # Categoriza erros para logging apropriado
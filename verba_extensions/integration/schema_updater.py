@@ -7,6 +7,12 @@ import os
 from typing import Optional, Dict, Any
 from wasabi import msg
 
+from goldenverba.components.schema_cache import (
+    collection_exists,
+    get_collection_properties,
+    mark_collection_created,
+)
+
 def get_verba_standard_properties():
     """
     Retorna lista de propriedades padrão do Verba (baseadas em chunk.to_json())
@@ -297,15 +303,13 @@ async def check_collection_has_etl_properties(client, collection_name: str) -> b
         True se collection tem propriedades de ETL
     """
     try:
-        if not await client.collections.exists(collection_name):
+        # Propriedades em cache por client (sem round-trip no caminho de import)
+        existing_props = await get_collection_properties(client, collection_name)
+        if not existing_props:
             return False
         
-        collection = client.collections.get(collection_name)
-        config = await collection.config.get()
-        
         # Verifica se tem pelo menos uma propriedade de ETL
         etl_prop_names = [p.name for p in get_etl_properties()]
-        existing_props = [p.name for p in config.properties]
         
         return any(prop_name in existing_props for prop_name in etl_prop_names)
         
@@ -383,7 +387,7 @@ def patch_weaviate_manager_verify_collection():
             etl_collections = ["VERBA_DOCUMENTS"]  # Documentos podem ter metadados ETL agregados
             
             # Se collection já existe, verifica se tem propriedades de ETL
-            if await client.collections.exists(collection_name):
+            if await collection_exists(client, collection_name):
                 # Para collections de configuração, não verifica schema ETL (não precisam)
                 if collection_name in config_only_collections:
                     # Usa método original sem verificar ETL
@@ -527,6 +531,7 @@ def patch_weaviate_manager_verify_collection():
                         )
                     
                     if collection:
+                        mark_collection_created(client, collection_name)
                         msg.good(f"✅ Collection {collection_name} criada com schema ETL-aware!")
                         if enable_named_vectors:
                             msg.good(f"   🎯 Named vectors habilitados!")
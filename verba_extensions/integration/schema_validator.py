@@ -11,6 +11,12 @@ Funcionalidades:
 from typing import List, Dict, Optional, Set
 from wasabi import msg
 
+from goldenverba.components.schema_cache import (
+    collection_exists,
+    get_collection_config,
+    get_collection_properties as get_cached_collection_properties,
+)
+
 
 async def validate_collection_schema(
     client, 
@@ -41,17 +47,14 @@ async def validate_collection_schema(
     }
     
     try:
-        # Verifica se collection existe
-        if not await client.collections.exists(collection_name):
+        # Verifica se collection existe (config em cache por client)
+        config = await get_collection_config(client, collection_name)
+        if config is None:
             result["warnings"].append(f"Collection '{collection_name}' não existe")
             return result
         
         result["collection_exists"] = True
         
-        # Obtém configuração da collection
-        collection = client.collections.get(collection_name)
-        config = await collection.config.get()
-        
         # Lista propriedades existentes
         existing_props = [prop.name for prop in config.properties]
         result["existing"] = existing_props
@@ -93,13 +96,10 @@ async def collection_has_properties(
         True se collection tem todas as propriedades
     """
     try:
-        if not await client.collections.exists(collection_name):
+        existing_props = set(await get_cached_collection_properties(client, collection_name))
+        if not existing_props:
             return False
         
-        collection = client.collections.get(collection_name)
-        config = await collection.config.get()
-        existing_props = {prop.name for prop in config.properties}
-        
         return all(prop_name in existing_props for prop_name in property_names)
         
     except Exception as e:
@@ -134,12 +134,7 @@ async def get_collection_properties(client, collection_name: str) -> List[str]:
         Lista de nomes de propriedades
     """
     try:
-        if not await client.collections.exists(collection_name):
-            return []
-        
-        collection = client.collections.get(collection_name)
-        config = await collection.config.get()
-        return [prop.name for prop in config.properties]
+        return await get_cached_collection_properties(client, collection_name)
         
     except Exception as e:
         msg.warn(f"Erro ao obter propriedades: {str(e)}")
@@ -192,7 +187,7 @@ async def get_schema_compatibility_report(
     }
     
     try:
-        if not await client.collections.exists(collection_name):
+        if not await collection_exists(client, collection_name):
             report["recommendations"].append("Collection não existe - será criada com schema completo na próxima ingestão")
             return report
         
@@ -154,8 +154,12 @@ def patch_basic_reader_with_tika_fallback():
                         msg.warn(f"[TIKA-FALLBACK] Tika não disponível em {tika_server}")
                         raise e
                     
-                    # Decodifica conteúdo
-                    decoded_bytes = fileConfig.content if isinstance(fileConfig.content, bytes) else fileConfig.content.encode()
+                    # Decodifica conteúdo (uploads binários já chegam em arquivo)
+                    if getattr(fileConfig, "content_path", None):
+                        from goldenverba.server.uploads import read_file_bytes
+                        decoded_bytes = read_file_bytes(fileConfig)
+                    else:
+                        decoded_bytes = fileConfig.content if isinstance(fileConfig.content, bytes) else fileConfig.content.encode()
                     
                     # Extrai com Tika
                     text, metadata = _extract_with_tika(decoded_bytes, tika_server, extract_metadata=True)
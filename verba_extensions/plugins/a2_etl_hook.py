@@ -8,9 +8,13 @@ import os
 from typing import List, Dict, Any, Callable
 from wasabi import msg
 
+from goldenverba.components.spacy_registry import NER, get_spacy_registry
+from verba_extensions.utils.gazetteer_index import index_for
+from verba_extensions.utils.etl_patcher import ETLPatcher
+from verba_extensions.utils.ner_pool import doc_spans, get_ner_pool
+
 # Importações do ETL inteligente
 _etl_module = None
-_nlp = None  # Cache global para modelo spaCy
 
 def get_etl_module():
     """Carrega módulo ETL inteligente com lazy import"""
@@ -28,7 +32,9 @@ def get_etl_module():
         
         # Tentar importar ETL inteligente
         try:
-            from etl_a2_intelligent import (
+            # Pelo caminho do pacote: as funções enviadas ao pool de NER precisam
+            # ser importáveis nos workers
+            from verba_extensions.etl.etl_a2_intelligent import (
                 extract_entities_intelligent,
                 extract_entities_with_gazetteer,
                 run_etl_patch_for_passage_uuids,
@@ -66,35 +72,15 @@ def load_gazetteer(path: str = None) -> Dict:
     return {}
 
 def get_nlp():
-    """Lazy load spaCy"""
-    global _nlp
-    if _nlp is not None:
-        return _nlp
-    
-    model = os.getenv("SPACY_MODEL", "pt_core_news_sm")
-    try:
-        import spacy
-        _nlp = spacy.load(model)
-        return _nlp
-    except Exception as e:
-        msg.warn(f"spaCy não disponível para ETL: {str(e)}")
-        return None
+    """spaCy (somente NER) do registry compartilhado, no idioma de SPACY_MODEL"""
+    return get_spacy_registry().get(components=NER)
 
 def match_aliases(text: str, gaz: Dict) -> List[str]:
     """Encontra entity_ids no texto"""
     if not text or not gaz:
         return []
     
-    t_lower = text.lower()
-    hits = []
-    
-    for eid, aliases in gaz.items():
-        for alias in aliases:
-            if alias.lower() in t_lower:
-                hits.append(eid)
-                break
-    
-    return sorted(set(hits))
+    return sorted(index_for(gaz).find_ids(text))
 
 def extract_entities_nlp(text: str) -> List[Dict]:
     """Extrai entidades via spaCy NER
@@ -106,11 +92,14 @@ def extract_entities_nlp(text: str) -> List[Dict]:
     if not nlp_model:
         return []
     
-    doc = nlp_model(text or "")
+    return filter_entity_spans(doc_spans(nlp_model(text or "")))
+
+def filter_entity_spans(spans: List[Dict]) -> List[Dict]:
+    """Menções {text, label} de PERSON/ORG a partir dos spans do NER"""
     return [
-        {"text": e.text, "label": e.label_}
-        for e in doc.ents
-        if e.label_ in ("ORG", "PERSON", "PER")  # PER para modelos PT, PERSON para EN
+        {"text": e["text"], "label": e["label"]}
+        for e in spans
+        if e["label"] in ("ORG", "PERSON", "PER")  # PER para modelos PT, PERSON para EN
     ]
 
 def normalize_entities(mentions: List[Dict], gaz: Dict) -> List[str]:
@@ -118,14 +107,7 @@ def normalize_entities(mentions: List[Dict], gaz: Dict) -> List[str]:
     if not mentions or not gaz:
         return []
     
-    text_mentions = {m["text"].lower() for m in mentions}
-    ids = []
-    
-    for eid, aliases in gaz.items():
-        if any(a.lower() in text_mentions for a in aliases):
-            ids.append(eid)
-    
-    return sorted(set(ids))
+    return sorted(index_for(gaz).ids_for_mentions(m["text"] for m in mentions))
 
 
 async def run_etl_on_passages(
@@ -159,7 +141,7 @@ async def run_etl_on_passages(
         try:
             msg.info(f"📊 Executando ETL inteligente (multi-idioma) em {len(passage_uuids)} chunks...")
             # ETL inteligente do ingestor
-            from etl_a2_intelligent import run_etl_patch_for_passage_uuids as run_etl_intelligent
+            from verba_extensions.etl.etl_a2_intelligent import run_etl_patch_for_passage_uuids as run_etl_intelligent
             result = await run_etl_intelligent(
                 lambda: client,
                 passage_uuids,
@@ -207,40 +189,17 @@ async def run_etl_on_passages(
         if not WEAVIATE_V4 or not coll:
             msg.warn("ETL A2 requer Weaviate v4 (collections API)")
             return {"patched": 0, "error": "ETL A2 requer Weaviate v4"}
-        
-        changed = 0
-        
-        # Busca objetos pelos UUIDs específicos
-        try:
-            # Busca objetos por UUID usando filtro "containsAny" para UUIDs
-            # Weaviate v4 suporta buscar múltiplos UUIDs
-            from weaviate.classes.query import Filter
-            
-            # Busca todos os objetos que correspondem aos UUIDs
-            # Limita a busca ao número de UUIDs (mais eficiente)
-            fetch_kwargs = {
-                "limit": len(passage_uuids),
-            }
-            if tenant:
-                fetch_kwargs["tenant"] = tenant
-            
-            # Busca todos e filtra pelos UUIDs desejados
-            res = await coll.query.fetch_objects(**fetch_kwargs)
-            objs = {str(o.uuid): o for o in res.objects if str(o.uuid) in passage_uuids}
-            
-            # Se não encontrou todos, avisa (mas continua)
-            if len(objs) < len(passage_uuids):
-                msg.warn(f"[ETL] Apenas {len(objs)}/{len(passage_uuids)} chunks encontrados na collection")
-        except Exception as e:
-            msg.warn(f"Erro ao buscar passages para ETL: {str(e)}")
-            return {"patched": 0, "error": str(e)}
+        if tenant:
+            coll = coll.with_tenant(tenant)
         
         # Verifica schema UMA VEZ no início para garantir que tem propriedades ETL
         # Collections criadas pelo Verba agora sempre têm schema ETL-aware completo
         existing_prop_names = set()
+        has_references = False
         try:
             collection_config = await coll.config.get()
             existing_prop_names = {p.name for p in collection_config.properties}
+            has_references = bool(getattr(collection_config, "references", None))
             msg.info(f"[ETL] Schema verificado: {len(existing_prop_names)} propriedades encontradas")
             
             # Verifica se tem propriedades ETL (para collections antigas que podem não ter)
@@ -262,124 +221,103 @@ async def run_etl_on_passages(
             msg.warn(f"[ETL] 💡 ETL não será executado - verifique se a collection existe e está acessível")
             return {"patched": 0, "total": len(passage_uuids), "error": f"Erro ao verificar schema: {str(schema_error)[:100]}"}
         
-        for uid_str in passage_uuids:
-            # Tenta encontrar objeto
-            obj = None
-            for o in objs.values():
-                if str(o.uuid) == uid_str:
-                    obj = o
-                    break
-            
-            if not obj:
-                continue
-            
+        def safe_get(p, prop_name, default=""):
+            """Safely get property value, handling both dict and object access"""
             try:
-                p = obj.properties
-                # Safely access properties that may not exist in the schema
-                # Handle both dict-like and object-like properties
-                def safe_get(prop_name, default=""):
-                    """Safely get property value, handling both dict and object access"""
+                if isinstance(p, dict):
+                    return p.get(prop_name, default)
+                else:
+                    # Object with attributes - use getattr with default
+                    return getattr(p, prop_name, default)
+            except (AttributeError, KeyError, TypeError):
+                return default
+
+        def chunk_text(p) -> str:
+            return safe_get(p, "text") or safe_get(p, "chunk_text") or ""
+
+        def compute_one(p, mentions: List[Dict]) -> Dict:
+            # Safely access properties that may not exist in the schema
+            # Handle both dict-like and object-like properties
+            text = chunk_text(p)
+            sect_title = safe_get(p, "section_title") or ""
+            first_para = safe_get(p, "section_first_para") or ""
+            parent_ents = safe_get(p, "parent_entities") or []
+
+            # Handle case where parent_ents might be a string or other type
+            if not isinstance(parent_ents, list):
+                if isinstance(parent_ents, str):
+                    # Try to parse as JSON if it's a string
                     try:
-                        if isinstance(p, dict):
-                            return p.get(prop_name, default)
-                        else:
-                            # Object with attributes - use getattr with default
-                            return getattr(p, prop_name, default)
-                    except (AttributeError, KeyError, TypeError):
-                        return default
-                
-                # Safely access properties
-                text = safe_get("text") or safe_get("chunk_text") or ""
-                sect_title = safe_get("section_title") or ""
-                first_para = safe_get("section_first_para") or ""
-                parent_ents = safe_get("parent_entities") or []
-                
-                # Handle case where parent_ents might be a string or other type
-                if not isinstance(parent_ents, list):
-                    if isinstance(parent_ents, str):
-                        # Try to parse as JSON if it's a string
-                        try:
-                            import json
-                            parent_ents = json.loads(parent_ents) if parent_ents else []
-                        except (json.JSONDecodeError, TypeError):
-                            parent_ents = []
-                    else:
+                        import json
+                        parent_ents = json.loads(parent_ents) if parent_ents else []
+                    except (json.JSONDecodeError, TypeError):
                         parent_ents = []
-                
-                # If text is empty, skip this chunk (no content to process)
-                if not text:
-                    continue
-                
-                # NER + normalização
-                mentions = extract_entities_nlp(text)
-                local_ids = normalize_entities(mentions, gaz)
-                
-                # SectionScope
-                sect_ids = []
-                scope_conf = 0.0
-                
-                h_hits = match_aliases(sect_title, gaz)
-                fp_hits = match_aliases(first_para, gaz)
-                
-                if h_hits:
-                    sect_ids, scope_conf = h_hits, 0.9
-                elif fp_hits:
-                    sect_ids, scope_conf = fp_hits, 0.7
-                elif parent_ents:
-                    sect_ids, scope_conf = parent_ents, 0.6
-                
-                # Primary entity + focus
-                primary = local_ids[0] if local_ids else (sect_ids[0] if sect_ids else None)
-                focus = 1.0 if primary and primary in local_ids else (0.7 if primary else 0.0)
-                
-                # Constrói props apenas com propriedades que existem no schema (já verificamos acima)
-                props = {}
-                etl_properties = {
-                    "entities_local_ids": local_ids,
-                    "section_entity_ids": sect_ids,
-                    "section_scope_confidence": scope_conf,
-                    "primary_entity_id": primary or "",
-                    "entity_focus_score": focus,
-                    "etl_version": "entity_scope_v1"
-                }
-                
-                # Adiciona apenas propriedades que existem no schema
-                for prop_name, prop_value in etl_properties.items():
-                    if prop_name in existing_prop_names:
-                        props[prop_name] = prop_value
-                    # Se propriedade não existe, simplesmente não adiciona (não é erro)
-                
-                # Se não há propriedades para atualizar, pula este chunk
-                if not props:
-                    # Isso não deveria acontecer se verificamos acima, mas é uma segurança extra
-                    continue
-                
-                update_kwargs = {"uuid": obj.uuid, "properties": props}
-                if tenant:
-                    update_kwargs["tenant"] = tenant
-                
-                try:
-                    await coll.data.update(**update_kwargs)
-                    changed += 1
-                    if changed % 100 == 0:
-                        msg.info(f"[ETL] Progresso: {changed}/{len(passage_uuids)} chunks atualizados...")
-                except Exception as update_error:
-                    error_str = str(update_error).lower()
-                    # Log erros reais (não de schema, pois já filtramos)
-                    if changed % 100 == 0:  # Only log periodically to avoid spam
-                        msg.warn(f"[ETL] Erro ao atualizar chunk: {type(update_error).__name__}: {str(update_error)[:100]}")
-                    # Continua mesmo se falhar
-                
-            except Exception as e:
-                error_str = str(e).lower()
-                # Only log non-schema errors to avoid spam
-                if not any(keyword in error_str for keyword in [
-                    "property", "schema", "field", "missing", "not found",
-                    "does not exist", "unknown property", "attributeerror"
-                ]):
-                    msg.warn(f"[ETL] Erro ao processar passage {uid_str[:20]}...: {type(e).__name__}: {str(e)[:100]}")
-                continue
-        
+                else:
+                    parent_ents = []
+
+            # If text is empty, skip this chunk (no content to process)
+            if not text:
+                return {}
+
+            # Normalização das menções do NER
+            local_ids = normalize_entities(mentions, gaz)
+
+            # SectionScope
+            sect_ids = []
+            scope_conf = 0.0
+
+            h_hits = match_aliases(sect_title, gaz)
+            fp_hits = match_aliases(first_para, gaz)
+
+            if h_hits:
+                sect_ids, scope_conf = h_hits, 0.9
+            elif fp_hits:
+                sect_ids, scope_conf = fp_hits, 0.7
+            elif parent_ents:
+                sect_ids, scope_conf = parent_ents, 0.6
+
+            # Primary entity + focus
+            primary = local_ids[0] if local_ids else (sect_ids[0] if sect_ids else None)
+            focus = 1.0 if primary and primary in local_ids else (0.7 if primary else 0.0)
+
+            etl_properties = {
+                "entities_local_ids": local_ids,
+                "section_entity_ids": sect_ids,
+                "section_scope_confidence": scope_conf,
+                "primary_entity_id": primary or "",
+                "entity_focus_score": focus,
+                "etl_version": "entity_scope_v1"
+            }
+
+            # Apenas propriedades que existem no schema (já verificamos acima)
+            return {
+                prop_name: prop_value
+                for prop_name, prop_value in etl_properties.items()
+                if prop_name in existing_prop_names
+            }
+
+        async def compute(batch: List[Dict]) -> List[Dict]:
+            # NER do batch inteiro no pool de processos (fora do event loop)
+            texts = [chunk_text(p) for p in batch]
+            spans = await get_ner_pool().extract(texts)
+            return [
+                compute_one(p, filter_entity_spans(text_spans))
+                for p, text_spans in zip(batch, spans)
+            ]
+
+        # Busca por UUID em batches (Filter.by_id) e grava em lote; collections
+        # com referências usam data.update por objeto
+        patcher = ETLPatcher.from_env(coll, upsert=not has_references)
+        result = await patcher.run(
+            passage_uuids,
+            compute,
+            read_properties=[
+                prop for prop in ("text", "chunk_text", "section_title", "section_first_para", "parent_entities")
+                if prop in existing_prop_names
+            ],
+        )
+        changed = result["patched"]
+
         if changed > 0:
             msg.good(f"ETL A2: {changed} passages atualizados")
         
@@ -441,6 +379,9 @@ def register_hooks():
             except Exception as notify_error:
                 # Não falha o ETL se notificação falhar
                 msg.warn(f"[ETL] Erro ao enviar notificação de conclusão: {str(notify_error)}")
+        
+        # Quem dispara o hook usa o resultado para invalidar o cache de queries
+        return result
     
     # Registra hook (precisa ser chamado após o plugin ser carregado)
     global_hooks.register_hook('import.after', after_import_document, priority=100)
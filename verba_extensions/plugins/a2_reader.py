@@ -13,6 +13,12 @@ import re
 from urllib.parse import urlparse
 
 from goldenverba.components.document import Document
+from goldenverba.components.fingerprints import (
+    SourceUnchanged,
+    conditional_headers,
+    response_validators,
+    stored_fingerprints,
+)
 from goldenverba.components.interfaces import Reader
 from goldenverba.server.types import FileConfig
 from goldenverba.components.types import InputConfig
@@ -29,15 +35,23 @@ def url_host(u: str) -> str:
     except:
         return ""
 
-async def fetch_url_to_text(url: str):
-    """Baixa URL e extrai texto"""
+async def fetch_url_to_text(url: str, fingerprint: dict = None):
+    """Baixa URL e extrai texto; com `fingerprint` a requisição é condicional
+    (em 304 retorna "" e meta["not_modified"] = True)"""
     meta = {"title": "", "language": "und", "published_at": ""}
     
     try:
         async with httpx.AsyncClient(follow_redirects=True, timeout=20) as client:
-            r = await client.get(url, headers={"User-Agent": "Verba-A2/1.0"})
+            r = await client.get(
+                url, headers={"User-Agent": "Verba-A2/1.0", **conditional_headers(fingerprint)}
+            )
             html = r.text
         
+        meta.update(response_validators(r.headers))
+        if r.status_code == 304:
+            meta["not_modified"] = True
+            return "", meta
+        
         title_match = re.search(r"<title>(.*?)</title>", html, re.I | re.S)
         if title_match:
             meta["title"] = re.sub(r"\s+", " ", title_match.group(1)).strip()
@@ -92,10 +106,18 @@ class A2URLReader(Reader):
         enable_etl = config.get("Enable ETL", {}).value if hasattr(config.get("Enable ETL", {}), 'value') else True
         
         documents = []
+        # URLs já importadas (e cujo documento ainda está no Weaviate):
+        # requisição condicional, 304 = não muda nada
+        fingerprints = await stored_fingerprints(urls)
+        unchanged = 0
         
         for url in urls:
             try:
-                text, meta = await fetch_url_to_text(url)
+                text, meta = await fetch_url_to_text(url, fingerprints.get(url))
+                if meta.get("not_modified"):
+                    unchanged += 1
+                    msg.info(f"URL sem mudanças: {url}")
+                    continue
                 if not text:
                     text = f"(Stub) conteúdo não extraído; URL: {url}"
                 
@@ -110,6 +132,11 @@ class A2URLReader(Reader):
                         "language": meta.get("language") or language_hint,
                         "source_domain": url_host(url),
                         "enable_etl": enable_etl,  # Flag para hook posterior
+                        "source_fingerprint": {
+                            "source": url,
+                            "etag": meta.get("etag"),
+                            "last_modified": meta.get("last_modified"),
+                        },
                     }
                 )
                 
@@ -120,6 +147,9 @@ class A2URLReader(Reader):
                 msg.fail(f"Erro ao carregar URL {url}: {str(e)}")
                 continue
         
+        if urls and unchanged == len(urls):
+            raise SourceUnchanged(f"Nenhuma das {unchanged} URLs mudou desde a última importação")
+        
         return documents
 
 
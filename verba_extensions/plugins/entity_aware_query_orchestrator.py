@@ -8,38 +8,12 @@ import re
 from typing import Dict, List, Any
 from wasabi import msg
 
-# Lazy load - cache de modelos por idioma
-_nlp_models = {}  # {"pt": nlp_pt, "en": nlp_en}
-_gazetteer = None
+from goldenverba.components.spacy_registry import NER, get_spacy_registry
+from verba_extensions.utils.gazetteer_index import index_for, load_gazetteer_file
 
 def load_gazetteer(path: str = None) -> Dict:
-    """Carrega gazetteer"""
-    global _gazetteer
-    if _gazetteer is not None:
-        return _gazetteer
-    
-    import json
-    if path is None:
-        possible_paths = [
-            "verba_extensions/etl/resources/gazetteer.json",
-            "verba_extensions/resources/gazetteer.json",
-            "resources/gazetteer.json",
-        ]
-        for p in possible_paths:
-            if os.path.exists(p):
-                path = p
-                break
-    
-    if path and os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-            _gazetteer = {item["entity_id"]: item["aliases"] for item in raw}
-            return _gazetteer
-        except:
-            pass
-    
-    return {}
+    """Carrega gazetteer (em cache, recarregado quando o arquivo muda)"""
+    return load_gazetteer_file(path)
 
 def detect_query_language(query: str) -> str:
     """Detecta idioma da query (pt, en, etc.)"""
@@ -67,62 +41,15 @@ def detect_query_language(query: str) -> str:
         return "pt"  # Default para português
 
 def get_nlp(language: str = None):
-    """Lazy load spaCy com suporte multi-idioma
+    """spaCy (somente NER) do registry compartilhado, com suporte multi-idioma
     
     Args:
-        language: Código do idioma ("pt", "en"). Se None, usa default ou detecta.
+        language: Código do idioma ("pt", "en"). Se None, usa o idioma de SPACY_MODEL.
     
     Returns:
-        Modelo spaCy apropriado ou None se não disponível
+        Pipeline spaCy apropriado (fallback para pt) ou None se não disponível
     """
-    global _nlp_models
-    
-    # Se language não fornecido, tentar usar default da env var
-    if language is None:
-        model_name = os.getenv("SPACY_MODEL", "pt_core_news_sm")
-        # Inferir idioma do nome do modelo
-        if "pt_core" in model_name or "pt" in model_name:
-            language = "pt"
-        elif "en_core" in model_name or "en" in model_name:
-            language = "en"
-        else:
-            language = "pt"  # Default
-    
-    # Retornar modelo já carregado
-    if language in _nlp_models:
-        return _nlp_models[language]
-    
-    # Mapear idioma para modelo spaCy
-    model_map = {
-        "pt": "pt_core_news_sm",
-        "en": "en_core_web_sm",
-    }
-    
-    model_name = model_map.get(language, "pt_core_news_sm")
-    
-    try:
-        import spacy
-        msg.info(f"  Carregando modelo spaCy: {model_name} (idioma: {language})")
-        nlp = spacy.load(model_name)
-        _nlp_models[language] = nlp
-        return nlp
-    except OSError as e:
-        msg.warn(f"  ⚠️ Modelo spaCy '{model_name}' não encontrado para idioma '{language}'")
-        msg.warn(f"  💡 Instale: python -m spacy download {model_name}")
-        # Tentar fallback para português se não for pt
-        if language != "pt" and "pt" in model_map:
-            try:
-                fallback_model = model_map["pt"]
-                msg.info(f"  Tentando fallback: {fallback_model}")
-                nlp = spacy.load(fallback_model)
-                _nlp_models["pt"] = nlp
-                return nlp
-            except:
-                pass
-        return None
-    except Exception as e:
-        msg.warn(f"  ⚠️ Erro ao carregar spaCy: {str(e)}")
-        return None
+    return get_spacy_registry().get(language, NER)
 
 def extract_entities_from_query(query: str, use_gazetteer: bool = False) -> List[str]:
     """Extrai entidades da QUERY usando SpaCy (inteligente, sem gazetteer obrigatório)
@@ -238,43 +165,29 @@ def extract_entities_from_query(query: str, use_gazetteer: bool = False) -> List
             msg.warn("  ⚠️ Gazetteer não disponível - usando modo inteligente (menções de texto)")
             return [m["text"] for m in mentions]
         
-        # Normaliza para entity_ids usando gazetteer
+        # Normaliza para entity_ids usando o índice do gazetteer
+        index = index_for(gaz)
         entity_ids = []
         query_lower = query.lower()
-        mention_texts_lower = [m["text"].lower() for m in mentions]
         
-        for entity_id, aliases in gaz.items():
-            matched = False
-            matched_alias = None
-            
-            for alias in aliases:
-                alias_lower = alias.lower()
-                alias_words = alias_lower.split()
-                
-                # Verifica match exato ou parcial
-                if alias_lower in query_lower:
-                    matched = True
-                    matched_alias = alias
-                    break
-                
-                # Verifica se alias está em alguma menção
-                if any(alias_lower in m for m in mention_texts_lower):
-                    matched = True
-                    matched_alias = alias
-                    break
-                
-                # Busca parcial: verifica se palavras-chave do alias estão na query
-                if len(alias_words) > 1:
-                    words_in_query = sum(1 for word in alias_words if word in query_lower)
-                    if words_in_query >= min(2, len(alias_words)):
-                        matched = True
-                        matched_alias = alias
-                        break
-            
-            if matched:
+        def add_match(alias, ids):
+            for entity_id in ids:
                 if entity_id not in entity_ids:
                     entity_ids.append(entity_id)
-                    msg.info(f"  ✅ Entidade mapeada: '{matched_alias}' → {entity_id}")
+                    msg.info(f"  ✅ Entidade mapeada: '{alias}' → {entity_id}")
+        
+        # Match exato ou parcial: aliases contidos na query (as menções são
+        # trechos da própria query, então uma passada do autômato cobre ambas)
+        for alias, ids in index.find_aliases(query):
+            add_match(alias, ids)
+        
+        # Busca parcial: palavras-chave de aliases compostos presentes na query
+        for alias, ids in index.alias_ids.items():
+            alias_words = alias.split()
+            if len(alias_words) > 1 and not set(ids) <= set(entity_ids):
+                words_in_query = sum(1 for word in alias_words if word in query_lower)
+                if words_in_query >= min(2, len(alias_words)):
+                    add_match(alias, ids)
         
         # Log final
         if entity_ids:
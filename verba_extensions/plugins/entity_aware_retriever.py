@@ -35,6 +35,7 @@ from goldenverba.components.interfaces import Retriever
 from goldenverba.components.types import InputConfig
 from goldenverba.components.chunk import Chunk
 from verba_extensions.compatibility.weaviate_imports import Filter, WEAVIATE_V4
+from verba_extensions.utils.stage_graph import StageGraph
 from typing import Optional, Dict, Any, List, Tuple
 from wasabi import msg
 
@@ -406,7 +407,7 @@ class EntityAwareRetriever(Retriever):
                         query_vector_phase2 = query_embeddings[0]
                     
                     # Configurar fusion type
-                    enable_relative_score = self.config.get("Enable Relative Score Fusion", {}).get("value", True)
+                    enable_relative_score = self._config_value(self.config, "Enable Relative Score Fusion", True)
                     fusion_type = "RELATIVE_SCORE" if enable_relative_score else "RRF"
                     
                     # Configurar query_properties para BM25 boosting
@@ -691,6 +692,188 @@ class EntityAwareRetriever(Retriever):
         
         return group_by if group_by else None
     
+    @staticmethod
+    def _config_value(config: Dict, key: str, default: Any) -> Any:
+        """Lê o valor de um InputConfig da config, com default se ausente"""
+        item = config.get(key)
+        return item.value if isinstance(item, InputConfig) else default
+    
+    def _log_entity_diagnostics(self, query: str) -> None:
+        """Diagnóstico de spaCy/Gazetteer (apenas logs)"""
+        from verba_extensions.plugins.entity_aware_query_orchestrator import get_nlp, load_gazetteer, detect_query_language
+        query_language = detect_query_language(query)
+        msg.info(f"  🌐 DIAGNÓSTICO: Idioma da query detectado: {query_language.upper()}")
+        
+        # Tentar carregar modelo para o idioma detectado
+        nlp_model = get_nlp(language=query_language)
+        gaz = load_gazetteer()
+        
+        if not nlp_model:
+            msg.warn(f"  ⚠️ DIAGNÓSTICO: spaCy não está disponível para {query_language.upper()} - entidades NÃO serão detectadas")
+            if query_language == "pt":
+                msg.warn(f"  💡 Instale: python -m spacy download pt_core_news_sm")
+            elif query_language == "en":
+                msg.warn(f"  💡 Instale: python -m spacy download en_core_web_sm")
+            else:
+                msg.warn(f"  💡 Instale modelo spaCy apropriado para {query_language}")
+        else:
+            model_name = nlp_model.meta.get('name', 'unknown')
+            msg.info(f"  ✅ DIAGNÓSTICO: spaCy está disponível (modelo: {model_name}, idioma: {query_language.upper()})")
+        
+        if not gaz:
+            msg.warn(f"  ⚠️ DIAGNÓSTICO: Gazetteer vazio ou não encontrado - entidades NÃO serão mapeadas")
+            msg.warn(f"  💡 Verifique se existe: verba_extensions/resources/gazetteer.json")
+        else:
+            gaz_size = len(gaz)
+            msg.info(f"  ✅ DIAGNÓSTICO: Gazetteer carregado com {gaz_size} entidades")
+            # Mostrar algumas entidades como exemplo
+            if gaz_size > 0:
+                sample_entities = list(gaz.items())[:3]
+                sample_text = ", ".join([f"{eid} ({len(aliases)} aliases)" for eid, aliases in sample_entities])
+                msg.info(f"  ℹ️ Exemplos: {sample_text}")
+    
+    def _build_query_stages(
+        self,
+        client,
+        query: str,
+        config: Dict,
+        weaviate_manager,
+        embedder: str,
+        labels: List[str],
+        document_uuids: List[str],
+        rag_config: Optional[Dict[str, Any]],
+        cache_ttl: int,
+    ) -> StageGraph:
+        """
+        Monta o grafo de estágios de análise da query.
+        
+        builder ──► alpha
+           │
+           └──► entity_fallback ◄── entities
+        expansion ──► semantic
+        frameworks, diagnostics (independentes)
+        
+        Query building/rewriting, expansão e detecção de frameworks são
+        chamadas LLM/NER independentes e rodam em paralelo. Estágios
+        opcionais são descartados quando o orçamento de latência acaba.
+        """
+        from verba_extensions.plugins.query_parser import parse_query
+        
+        enable_query_rewriting = self._config_value(config, "Enable Query Rewriting", False)
+        enable_dynamic_alpha = self._config_value(config, "Enable Dynamic Alpha", True)
+        enable_query_expansion = self._config_value(config, "Enable Query Expansion", True)
+        
+        async def rewrite():
+            from verba_extensions.plugins.query_rewriter import QueryRewriterPlugin
+            rewriter = QueryRewriterPlugin(cache_ttl_seconds=cache_ttl)
+            strategy = await rewriter.rewrite_query(query, use_cache=True)
+            return {"strategy": strategy, "source": "rewriter"}
+        
+        async def builder_stage(_):
+            # QueryBuilder primeiro (mais inteligente, conhece schema)
+            try:
+                from verba_extensions.plugins.query_builder import QueryBuilderPlugin
+                builder = QueryBuilderPlugin(cache_ttl_seconds=cache_ttl)
+                normalized = weaviate_manager._normalize_embedder_name(embedder)
+                collection_name = weaviate_manager.embedding_table.get(embedder, f"VERBA_Embedding_{normalized}")
+                strategy = await builder.build_query(
+                    user_query=query,
+                    client=client,
+                    collection_name=collection_name,
+                    use_cache=True,
+                    validate=False,  # Não precisa validar aqui, já está executando
+                    auto_detect_aggregation=True,  # Detecta agregações automaticamente
+                    rag_config=rag_config,  # Usa o generator configurado (mesmo do chat)
+                    labels=labels,  # Idioma dominante apenas dos documentos filtrados
+                    document_uuids=document_uuids,
+                )
+                return {"strategy": strategy, "source": "builder"}
+            except ImportError:
+                pass
+            except Exception as e:
+                msg.warn(f"  Erro no query builder (não crítico): {str(e)}")
+            # Fallback para QueryRewriter (mais simples, não conhece schema)
+            if enable_query_rewriting:
+                try:
+                    return await rewrite()
+                except Exception as e:
+                    msg.warn(f"  Erro no query rewriting (não crítico): {str(e)}")
+            return {"strategy": None, "source": None}
+        
+        async def alpha_stage(inputs):
+            strategy = (inputs["builder"] or {}).get("strategy")
+            if not enable_dynamic_alpha or not strategy:
+                return None
+            from verba_extensions.plugins.alpha_optimizer import AlphaOptimizerPlugin
+            entities = strategy.get("filters", {}).get("entities", []) if inputs["builder"]["source"] == "builder" else []
+            return await AlphaOptimizerPlugin().calculate_optimal_alpha(
+                query=query,
+                entities=entities,
+                intent=strategy.get("intent", "search"),
+            )
+        
+        def diagnostics_stage(_):
+            self._log_entity_diagnostics(query)
+        
+        def entities_stage(_):
+            # Modo inteligente: menções de texto sem gazetteer obrigatório
+            from verba_extensions.plugins.entity_aware_query_orchestrator import extract_entities_from_query
+            entity_texts, entity_ids = [], []
+            try:
+                entity_texts = extract_entities_from_query(query, use_gazetteer=False)
+                # Se há gazetteer, tentar também mapear para entity_ids (opcional)
+                try:
+                    from_gazetteer = extract_entities_from_query(query, use_gazetteer=True)
+                    if from_gazetteer and all(not eid.startswith("ent:") for eid in from_gazetteer):
+                        # Se retornou textos (não entity_ids), usar como fallback
+                        entity_texts = from_gazetteer
+                    else:
+                        entity_ids = from_gazetteer
+                except Exception:
+                    pass
+            except Exception as e:
+                msg.warn(f"  ⚠️ Erro ao extrair entidades (modo inteligente): {str(e)}")
+            return entity_texts, entity_ids
+        
+        def entity_fallback_stage(inputs):
+            # Usa query_parser (sobre a query reescrita) se o modo inteligente não achou nada
+            entity_texts, entity_ids = inputs["entities"] or ([], [])
+            if entity_texts or entity_ids:
+                return entity_texts, entity_ids
+            strategy = (inputs["builder"] or {}).get("strategy") or {}
+            parsed = parse_query(strategy.get("semantic_query") or query)
+            return (
+                [e["text"] for e in parsed["entities"] if e.get("text")],
+                [e["entity_id"] for e in parsed["entities"] if e.get("entity_id")],
+            )
+        
+        async def expansion_stage(_):
+            if not enable_query_expansion:
+                return [query]
+            from verba_extensions.plugins.query_expander import QueryExpanderPlugin
+            query_expander = QueryExpanderPlugin(cache_ttl_seconds=cache_ttl)
+            return await query_expander.expand_query_for_entities(query, use_cache=True)
+        
+        def semantic_stage(inputs):
+            # Termos semânticos da primeira variação expandida (ou da query original)
+            expanded = inputs["expansion"] or [query]
+            return parse_query(expanded[0])["semantic_concepts"]
+        
+        async def frameworks_stage(_):
+            from verba_extensions.utils.framework_detector import get_framework_detector
+            return await get_framework_detector().detect_frameworks(query)
+        
+        graph = StageGraph.from_env()
+        graph.add("builder", builder_stage, default={"strategy": None, "source": None})
+        graph.add("alpha", alpha_stage, deps=["builder"], optional=True)
+        graph.add("diagnostics", diagnostics_stage, optional=True)
+        graph.add("entities", entities_stage, default=([], []))
+        graph.add("entity_fallback", entity_fallback_stage, deps=["builder", "entities"], default=([], []))
+        graph.add("expansion", expansion_stage, optional=True, default=[query])
+        graph.add("semantic", semantic_stage, deps=["expansion"], default=[])
+        graph.add("frameworks", frameworks_stage, optional=True, default={})
+        return graph
+    
     async def retrieve(
         self,
         client,
@@ -713,7 +896,6 @@ class EntityAwareRetriever(Retriever):
         4. Retorna chunks ordenados por relevância
         """
         from goldenverba.components.retriever.WindowRetriever import WindowRetriever
-        from verba_extensions.plugins.query_parser import parse_query
         
         msg.info(f"EntityAwareRetriever processando: '{query}'")
         
@@ -816,35 +998,26 @@ class EntityAwareRetriever(Retriever):
                     msg.warn(f"  ⚠️ Erro ao executar aggregation: {str(e)}, usando busca normal")
                     is_aggregation_query = False
         
-        # 0. QUERY BUILDING (antes de parsing) - QueryBuilder inteligente com schema
+        # 0. ANÁLISE DA QUERY - estágios independentes rodam em paralelo
+        graph = self._build_query_stages(
+            client, query, config, weaviate_manager, embedder,
+            labels, document_uuids, rag_config, cache_ttl,
+        )
+        stage_results = await graph.run()
+        debug_info["stage_timings"] = graph.summary()
+        msg.info(
+            "  ⏱️ Estágios: "
+            + ", ".join(f"{name}={t['ms']:.0f}ms ({t['status']})" for name, t in graph.timings.items())
+        )
+        
         rewritten_query = query
         rewritten_alpha = alpha
         query_filters_from_builder = {}
+        strategy = stage_results["builder"]["strategy"]
+        strategy_source = stage_results["builder"]["source"]
         
-        # Tentar QueryBuilder primeiro (mais inteligente, conhece schema)
-        try:
-            from verba_extensions.plugins.query_builder import QueryBuilderPlugin
-            builder = QueryBuilderPlugin(cache_ttl_seconds=cache_ttl)
-            
-            # Obter collection name
-            normalized = weaviate_manager._normalize_embedder_name(embedder)
-            collection_name = weaviate_manager.embedding_table.get(embedder, f"VERBA_Embedding_{normalized}")
-            
-            # Usar RAG config passado como parâmetro (mesmo do chat)
-            # Construir query conhecendo schema
-            strategy = await builder.build_query(
-                user_query=query,
-                client=client,
-                collection_name=collection_name,
-                use_cache=True,
-                validate=False,  # Não precisa validar aqui, já está executando
-                auto_detect_aggregation=True,  # NOVO: detecta agregações automaticamente
-                rag_config=rag_config,  # Passar RAG config para usar generator configurado (mesmo do chat)
-                labels=labels,  # Passar labels para calcular idioma dominante apenas dos documentos filtrados
-                document_uuids=document_uuids  # Passar document_uuids para calcular idioma dominante apenas dos documentos filtrados
-            )
-            
-            # NOVO: Verificar se é agregação e executar se for
+        if strategy_source == "builder":
+            # Verificar se é agregação e executar se for
             if strategy.get("is_aggregation", False):
                 msg.info("  Query builder: detectou agregação, executando via GraphQL")
                 
@@ -859,13 +1032,11 @@ class EntityAwareRetriever(Retriever):
                         # Parsear resultados
                         parsed_results = aggregation_info["parse"](raw_results)
                         
-                        # Formatar resultados para retorno
-                        # Retornar lista vazia de chunks e contexto com resultados de agregação
+                        # Retornar chunks vazios e contexto com resultados de agregação
                         context = f"Resultados de agregação:\n{json.dumps(parsed_results, indent=2, ensure_ascii=False)}"
                         
                         msg.good(f"  Agregação executada com sucesso: {aggregation_info.get('aggregation_type', 'unknown')}")
                         
-                        # Retornar chunks vazios e contexto com resultados
                         return ([], context)
                         
                     except Exception as e:
@@ -886,37 +1057,6 @@ class EntityAwareRetriever(Retriever):
             debug_info["rewritten_query"] = rewritten_query
             debug_info["query_builder_used"] = True
             
-            # Aplicar alpha sugerido
-            suggested_alpha = strategy.get("alpha")
-            if suggested_alpha is not None and 0.0 <= suggested_alpha <= 1.0:
-                rewritten_alpha = float(suggested_alpha)
-                debug_info["alpha_used"] = rewritten_alpha
-                msg.info(f"  Query builder: alpha ajustado para {rewritten_alpha}")
-            
-            # Alpha Dinâmico (sobrescreve se habilitado)
-            enable_dynamic_alpha = self.config.get("Enable Dynamic Alpha", {}).get("value", True)
-            if enable_dynamic_alpha:
-                try:
-                    from verba_extensions.plugins.alpha_optimizer import AlphaOptimizerPlugin
-                    alpha_optimizer = AlphaOptimizerPlugin()
-                    
-                    # Detectar entidades para cálculo de alpha
-                    detected_entities = builder_entities if builder_entities else []
-                    intent = strategy.get("intent", "search")
-                    
-                    optimal_alpha = await alpha_optimizer.calculate_optimal_alpha(
-                        query=query,
-                        entities=detected_entities,
-                        intent=intent
-                    )
-                    
-                    rewritten_alpha = optimal_alpha
-                    debug_info["alpha_optimized"] = optimal_alpha
-                    debug_info["alpha_optimizer_used"] = True
-                    msg.info(f"  Alpha Dinâmico: ajustado para {optimal_alpha}")
-                except Exception as e:
-                    msg.debug(f"  Alpha Dinâmico não disponível: {str(e)}")
-            
             # Extrair filtros do builder (se houver)
             query_filters_from_builder = strategy.get("filters", {})
             builder_entities = query_filters_from_builder.get("entities", [])
@@ -929,147 +1069,42 @@ class EntityAwareRetriever(Retriever):
             if explanation:
                 debug_info["explanation"] = explanation
                 msg.info(f"  Query builder: {explanation}")
-            
-        except ImportError:
-            # Fallback para QueryRewriter (mais simples, não conhece schema)
-            if enable_query_rewriting:
-                try:
-                    from verba_extensions.plugins.query_rewriter import QueryRewriterPlugin
-                    rewriter = QueryRewriterPlugin(cache_ttl_seconds=cache_ttl)
-                    strategy = await rewriter.rewrite_query(query, use_cache=True)
-                    
-                    # Usar semantic_query para busca vetorial
-                    rewritten_query = strategy.get("semantic_query", query)
-                    debug_info["rewritten_query"] = rewritten_query
-                    debug_info["query_rewriter_used"] = True
-                    
-                    # Aplicar alpha sugerido
-                    suggested_alpha = strategy.get("alpha")
-                    if suggested_alpha is not None and 0.0 <= suggested_alpha <= 1.0:
-                        rewritten_alpha = float(suggested_alpha)
-                        debug_info["alpha_used"] = rewritten_alpha
-                        msg.info(f"  Query rewriting: alpha ajustado para {rewritten_alpha}")
-                    
-                    # Log intent se disponível
-                    intent = strategy.get("intent", "search")
-                    debug_info["intent"] = intent
-                    msg.info(f"  Query rewriting: intent={intent}")
-                    
-                    # Alpha Dinâmico (sobrescreve se habilitado)
-                    enable_dynamic_alpha = self.config.get("Enable Dynamic Alpha", {}).get("value", True)
-                    if enable_dynamic_alpha:
-                        try:
-                            from verba_extensions.plugins.alpha_optimizer import AlphaOptimizerPlugin
-                            alpha_optimizer = AlphaOptimizerPlugin()
-                            
-                            # Detectar entidades para cálculo de alpha (vazio por enquanto, será preenchido depois)
-                            optimal_alpha = await alpha_optimizer.calculate_optimal_alpha(
-                                query=query,
-                                entities=[],
-                                intent=intent
-                            )
-                            
-                            rewritten_alpha = optimal_alpha
-                            debug_info["alpha_optimized"] = optimal_alpha
-                            debug_info["alpha_optimizer_used"] = True
-                            msg.info(f"  Alpha Dinâmico: ajustado para {optimal_alpha}")
-                        except Exception as e:
-                            msg.debug(f"  Alpha Dinâmico não disponível: {str(e)}")
-                    
-                except Exception as e:
-                    msg.warn(f"  Erro no query rewriting (não crítico): {str(e)}")
-                    # Continua com query original
-        except Exception as e:
-            msg.warn(f"  Erro no query builder (não crítico): {str(e)}")
-            # Fallback para QueryRewriter se disponível
-            if enable_query_rewriting:
-                try:
-                    from verba_extensions.plugins.query_rewriter import QueryRewriterPlugin
-                    rewriter = QueryRewriterPlugin(cache_ttl_seconds=cache_ttl)
-                    strategy = await rewriter.rewrite_query(query, use_cache=True)
-                    rewritten_query = strategy.get("semantic_query", query)
-                    suggested_alpha = strategy.get("alpha")
-                    if suggested_alpha is not None and 0.0 <= suggested_alpha <= 1.0:
-                        rewritten_alpha = float(suggested_alpha)
-                except:
-                    pass
-        
-        # 1. PARSE QUERY (usar rewritten_query se disponível)
-        # Se QueryBuilder forneceu entidades, usar elas primeiro
-        builder_entities = query_filters_from_builder.get("entities", [])
         
-        # DIAGNÓSTICO: Verificar se spaCy e Gazetteer estão disponíveis
-        try:
-            from verba_extensions.plugins.entity_aware_query_orchestrator import get_nlp, load_gazetteer, detect_query_language
-            query_language = detect_query_language(query)
-            msg.info(f"  🌐 DIAGNÓSTICO: Idioma da query detectado: {query_language.upper()}")
-            
-            # Tentar carregar modelo para o idioma detectado
-            nlp_model = get_nlp(language=query_language)
-            gaz = load_gazetteer()
-            
-            if not nlp_model:
-                msg.warn(f"  ⚠️ DIAGNÓSTICO: spaCy não está disponível para {query_language.upper()} - entidades NÃO serão detectadas")
-                if query_language == "pt":
-                    msg.warn(f"  💡 Instale: python -m spacy download pt_core_news_sm")
-                elif query_language == "en":
-                    msg.warn(f"  💡 Instale: python -m spacy download en_core_web_sm")
-                else:
-                    msg.warn(f"  💡 Instale modelo spaCy apropriado para {query_language}")
-            else:
-                model_name = nlp_model.meta.get('name', 'unknown')
-                msg.info(f"  ✅ DIAGNÓSTICO: spaCy está disponível (modelo: {model_name}, idioma: {query_language.upper()})")
+        elif strategy_source == "rewriter":
+            # Usar semantic_query para busca vetorial
+            rewritten_query = strategy.get("semantic_query", query)
+            debug_info["rewritten_query"] = rewritten_query
+            debug_info["query_rewriter_used"] = True
             
-            if not gaz:
-                msg.warn(f"  ⚠️ DIAGNÓSTICO: Gazetteer vazio ou não encontrado - entidades NÃO serão mapeadas")
-                msg.warn(f"  💡 Verifique se existe: verba_extensions/resources/gazetteer.json")
-            else:
-                gaz_size = len(gaz)
-                msg.info(f"  ✅ DIAGNÓSTICO: Gazetteer carregado com {gaz_size} entidades")
-                # Mostrar algumas entidades como exemplo
-                if gaz_size > 0:
-                    sample_entities = list(gaz.items())[:3]
-                    sample_text = ", ".join([f"{eid} ({len(aliases)} aliases)" for eid, aliases in sample_entities])
-                    msg.info(f"  ℹ️ Exemplos: {sample_text}")
-        except Exception as e:
-            msg.warn(f"  ⚠️ Erro ao verificar diagnóstico de entidades: {str(e)}")
+            # Log intent se disponível
+            intent = strategy.get("intent", "search")
+            debug_info["intent"] = intent
+            msg.info(f"  Query rewriting: intent={intent}")
         
-        # NOVO: Modo inteligente - detectar entidades automaticamente (sem gazetteer obrigatório)
-        entity_texts = []  # Menções de texto detectadas (modo inteligente)
-        entity_ids = []    # Entity IDs (modo gazetteer, opcional)
+        if strategy:
+            # Aplicar alpha sugerido
+            suggested_alpha = strategy.get("alpha")
+            if suggested_alpha is not None and 0.0 <= suggested_alpha <= 1.0:
+                rewritten_alpha = float(suggested_alpha)
+                debug_info["alpha_used"] = rewritten_alpha
+                msg.info(f"  Alpha sugerido ({strategy_source}): {rewritten_alpha}")
+        
+        # Alpha Dinâmico (sobrescreve se habilitado e concluído dentro do orçamento)
+        optimal_alpha = stage_results.get("alpha")
+        if optimal_alpha is not None:
+            rewritten_alpha = optimal_alpha
+            debug_info["alpha_optimized"] = optimal_alpha
+            debug_info["alpha_optimizer_used"] = True
+            msg.info(f"  Alpha Dinâmico: ajustado para {optimal_alpha}")
+        
+        # 1. ENTIDADES
+        # Se QueryBuilder forneceu entidades, elas têm prioridade (abaixo)
+        builder_entities = query_filters_from_builder.get("entities", [])
         
-        # Tentar extrair entidades usando modo inteligente (sem gazetteer)
-        try:
-            from verba_extensions.plugins.entity_aware_query_orchestrator import extract_entities_from_query
-            # Modo inteligente: retorna menções de texto diretamente
-            entity_texts = extract_entities_from_query(query, use_gazetteer=False)
-            
-            # Se há gazetteer, tentar também mapear para entity_ids (opcional)
-            try:
-                entity_ids_from_gazetteer = extract_entities_from_query(query, use_gazetteer=True)
-                if entity_ids_from_gazetteer and all(not eid.startswith("ent:") for eid in entity_ids_from_gazetteer):
-                    # Se retornou textos (não entity_ids), usar como fallback
-                    entity_texts = entity_ids_from_gazetteer
-                else:
-                    # Se retornou entity_ids, usar eles
-                    entity_ids = entity_ids_from_gazetteer
-            except:
-                pass
-        except Exception as e:
-            msg.warn(f"  ⚠️ Erro ao extrair entidades (modo inteligente): {str(e)}")
-        
-        # Fallback: usar query_parser se modo inteligente não funcionou
-        if not entity_texts and not entity_ids:
-            parse_query_text = rewritten_query if enable_query_rewriting or rewritten_query != query else query
-            parsed = parse_query(parse_query_text)
-            parsed_entity_texts = [e["text"] for e in parsed["entities"] if e.get("text")]
-            parsed_entity_ids = [e["entity_id"] for e in parsed["entities"] if e.get("entity_id")]
-            
-            # Usar textos se não houver entity_ids
-            if parsed_entity_texts:
-                entity_texts = parsed_entity_texts
-            if parsed_entity_ids:
-                entity_ids = parsed_entity_ids
+        # Menções de texto (modo inteligente) e entity IDs (gazetteer, opcional),
+        # com fallback para o query_parser
+        entity_texts, entity_ids = stage_results["entity_fallback"]
+        entity_texts, entity_ids = list(entity_texts), list(entity_ids)
         
         # Combinar entidades do builder (se houver)
         if builder_entities:
@@ -1152,51 +1187,30 @@ class EntityAwareRetriever(Retriever):
             # Usar apenas para boost semântico, NÃO para filtro
             msg.info(f"  ℹ️ Entidades detectadas mas sem sintaxe explícita, usando apenas para boost: {entity_texts}")
         
-        # Query Expansion (Fase 1: Entidades) - antes de detectar entidades
-        enable_query_expansion = self.config.get("Enable Query Expansion", {}).get("value", True)
-        expanded_queries_phase1 = [query]  # Fallback: usar query original
+        # Query Expansion (Fase 1: Entidades) - resultado do estágio "expansion"
+        enable_query_expansion = self._config_value(config, "Enable Query Expansion", True)
+        expanded_queries_phase1 = stage_results["expansion"] or [query]
+        if enable_query_expansion and graph.timings.get("expansion", {}).get("status") == "ok":
+            msg.info(f"  Query Expansion (Fase 1): {len(expanded_queries_phase1)} variações geradas")
+            debug_info["query_expansion_phase1"] = expanded_queries_phase1
         
-        if enable_query_expansion:
-            try:
-                from verba_extensions.plugins.query_expander import QueryExpanderPlugin
-                query_expander = QueryExpanderPlugin(cache_ttl_seconds=cache_ttl)
-                expanded_queries_phase1 = await query_expander.expand_query_for_entities(query, use_cache=True)
-                msg.info(f"  Query Expansion (Fase 1): {len(expanded_queries_phase1)} variações geradas")
-                debug_info["query_expansion_phase1"] = expanded_queries_phase1
-            except Exception as e:
-                msg.debug(f"  Query Expansion não disponível: {str(e)}")
-        
-        # Detectar entidades de TODAS as variações expandidas
-        # Usar a primeira variação expandida para parsing (ou query original se não expandiu)
-        parse_query_text = expanded_queries_phase1[0] if expanded_queries_phase1 else query
-        
-        # Obter termos semânticos
-        parsed = parse_query(parse_query_text)
-        semantic_terms = parsed["semantic_concepts"]
+        # Termos semânticos da primeira variação expandida (ou query original)
+        semantic_terms = stage_results["semantic"]
         
         msg.info(f"  🔍 Conceitos semânticos: {semantic_terms}")
         
-        # Detectar frameworks mencionados na query
-        detected_frameworks = []
-        detected_companies = []
-        detected_sectors = []
+        # Frameworks mencionados na query
+        framework_data = stage_results["frameworks"] or {}
+        detected_frameworks = framework_data.get("frameworks", [])
+        detected_companies = framework_data.get("companies", [])
+        detected_sectors = framework_data.get("sectors", [])
         
-        try:
-            from verba_extensions.utils.framework_detector import get_framework_detector
-            framework_detector = get_framework_detector()
-            framework_data = await framework_detector.detect_frameworks(query)
-            detected_frameworks = framework_data.get("frameworks", [])
-            detected_companies = framework_data.get("companies", [])
-            detected_sectors = framework_data.get("sectors", [])
-            
-            if detected_frameworks:
-                msg.info(f"  🔍 Frameworks detectados na query: {detected_frameworks}")
-            if detected_companies:
-                msg.info(f"  🔍 Empresas detectadas na query: {detected_companies}")
-            if detected_sectors:
-                msg.info(f"  🔍 Setores detectados na query: {detected_sectors}")
-        except Exception as e:
-            msg.debug(f"  Erro ao detectar frameworks na query (não crítico): {str(e)}")
+        if detected_frameworks:
+            msg.info(f"  🔍 Frameworks detectados na query: {detected_frameworks}")
+        if detected_companies:
+            msg.info(f"  🔍 Empresas detectadas na query: {detected_companies}")
+        if detected_sectors:
+            msg.info(f"  🔍 Setores detectados na query: {detected_sectors}")
         
         # Para compatibilidade: entity_ids usado para filtro
         entity_ids = final_entity_ids
@@ -1556,7 +1570,7 @@ class EntityAwareRetriever(Retriever):
                 use_multi_vector = False
         
         # 3.6. VERIFICAR TWO-PHASE SEARCH MODE
-        two_phase_mode = self.config.get("Two-Phase Search Mode", {}).get("value", "auto")
+        two_phase_mode = self._config_value(config, "Two-Phase Search Mode", "auto")
         should_use_two_phase = False
         
         if two_phase_mode == "enabled":
@@ -1729,7 +1743,7 @@ class EntityAwareRetriever(Retriever):
                         if query_vector:
                             
                             # Obter configuração de Relative Score Fusion
-                            enable_relative_score = self.config.get("Enable Relative Score Fusion", {}).get("value", True)
+                            enable_relative_score = self._config_value(config, "Enable Relative Score Fusion", True)
                             fusion_type = "RELATIVE_SCORE" if enable_relative_score else "RRF"
                             
                             # Configurar query_properties para BM25 boosting
@@ -1785,7 +1799,7 @@ class EntityAwareRetriever(Retriever):
                 # Se multi-vector não foi usado, usar busca normal
                 if not use_multi_vector:
                     # Obter configuração de Relative Score Fusion
-                    enable_relative_score = self.config.get("Enable Relative Score Fusion", {}).get("value", True)
+                    enable_relative_score = self._config_value(config, "Enable Relative Score Fusion", True)
                     fusion_type = "RELATIVE_SCORE" if enable_relative_score else None
                     
                     # Configurar query_properties para BM25 boosting
@@ -1817,7 +1831,7 @@ class EntityAwareRetriever(Retriever):
                         entity_property = "section_entity_ids"
                     
                     # Obter configuração de Relative Score Fusion
-                    enable_relative_score = self.config.get("Enable Relative Score Fusion", {}).get("value", True)
+                    enable_relative_score = self._config_value(config, "Enable Relative Score Fusion", True)
                     fusion_type = "RELATIVE_SCORE" if enable_relative_score else None
                     
                     # Configurar query_properties para BM25 boosting
@@ -1895,7 +1909,7 @@ class EntityAwareRetriever(Retriever):
                                     combined_fallback_filter = Filter.all_of(fallback_filters_list)
                                 
                                 # Obter configuração de Relative Score Fusion para fallback
-                                enable_relative_score = self.config.get("Enable Relative Score Fusion", {}).get("value", True)
+                                enable_relative_score = self._config_value(config, "Enable Relative Score Fusion", True)
                                 fusion_type = "RELATIVE_SCORE" if enable_relative_score else None
                                 query_properties = ["content", "title^2"]
                                 
@@ -1927,7 +1941,7 @@ class EntityAwareRetriever(Retriever):
                             msg.info(f"  💡 Tentando modo BOOST (sem filtro, apenas boost semântico)")
                             
                             # Obter configuração de Relative Score Fusion para fallback
-                            enable_relative_score = self.config.get("Enable Relative Score Fusion", {}).get("value", True)
+                            enable_relative_score = self._config_value(config, "Enable Relative Score Fusion", True)
                             fusion_type = "RELATIVE_SCORE" if enable_relative_score else None
                             query_properties = ["content", "title^2"]
                             
@@ -1955,7 +1969,7 @@ class EntityAwareRetriever(Retriever):
                     msg.info(f"  Executando: Hybrid search sem filtros")
                     
                     # Obter configuração de Relative Score Fusion
-                    enable_relative_score = self.config.get("Enable Relative Score Fusion", {}).get("value", True)
+                    enable_relative_score = self._config_value(config, "Enable Relative Score Fusion", True)
                     fusion_type = "RELATIVE_SCORE" if enable_relative_score else None
                     
                     # Configurar query_properties para BM25 boosting
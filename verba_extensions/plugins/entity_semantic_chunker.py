@@ -121,6 +121,7 @@ class EntitySemanticChunker(Chunker):
     def __init__(self) -> None:
         super().__init__()
         self.name = "Entity-Semantic"
+        self.requires_spacy_doc = True
         self.requires_library = ["numpy", "sklearn"]
         self.description = (
             "Section-aware + entity guardrails + semantic breakpoints (intra-section)"
@@ -11,9 +11,8 @@ Estratégia Híbrida:
 from typing import Dict, List, Any, Optional
 from wasabi import msg
 
-# Lazy load
-_nlp = None
-_gazetteer = None
+from goldenverba.components.spacy_registry import get_spacy_registry
+from verba_extensions.utils.gazetteer_index import index_for, load_gazetteer_file
 
 
 def detect_query_language(query: str) -> str:
@@ -40,76 +39,14 @@ def detect_query_language(query: str) -> str:
             return "en"
         return "pt"  # Default para português
 
-# Cache de modelos por idioma
-_nlp_models = {}
-
 def get_nlp(language: str = None):
-    """Lazy load spaCy com suporte multi-idioma"""
-    global _nlp_models
-    
-    # Se language não fornecido, detectar da query ou usar default
-    if language is None:
-        language = "pt"  # Default
-    
-    # Retornar modelo já carregado
-    if language in _nlp_models:
-        return _nlp_models[language]
-    
-    # Mapear idioma para modelo spaCy
-    model_map = {
-        "pt": "pt_core_news_sm",
-        "en": "en_core_web_sm",
-    }
-    
-    model_name = model_map.get(language, "pt_core_news_sm")
-    
-    try:
-        import spacy
-        _nlp_models[language] = spacy.load(model_name)
-        return _nlp_models[language]
-    except OSError:
-        msg.warn(f"spaCy model '{model_name}' not found for language '{language}', NLP parsing disabled")
-        # Tentar fallback para português
-        if language != "pt":
-            try:
-                _nlp_models["pt"] = spacy.load("pt_core_news_sm")
-                return _nlp_models["pt"]
-            except:
-                pass
-        return None
-    except:
-        return None
+    """spaCy completo (POS, dependências e NER) do registry compartilhado"""
+    return get_spacy_registry().get(language or "pt")
 
 
 def load_gazetteer(path: str = None) -> Dict:
-    """Carrega gazetteer"""
-    global _gazetteer
-    if _gazetteer is not None:
-        return _gazetteer
-    
-    import json
-    import os
-    if path is None:
-        possible_paths = [
-            "verba_extensions/etl/resources/gazetteer.json",
-            "verba_extensions/resources/gazetteer.json",
-            "resources/gazetteer.json",
-        ]
-        for p in possible_paths:
-            if os.path.exists(p):
-                path = p
-                break
-    
-    if path and os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                raw = json.load(f)
-            _gazetteer = {item["entity_id"]: item["aliases"] for item in raw}
-            return _gazetteer
-        except:
-            pass
-    
-    return {}
+    """Carrega gazetteer (em cache, recarregado quando o arquivo muda)"""
+    return load_gazetteer_file(path)
 
 
 def classify_token(token) -> str:
@@ -247,15 +184,7 @@ def parse_query(query: str) -> Dict[str, Any]:
 def _lookup_entity_in_gazetteer(text: str) -> Optional[str]:
     """Procura um texto no gazetteer"""
     
-    gaz = load_gazetteer()
-    text_lower = text.lower()
-    
-    for entity_id, aliases in gaz.items():
-        for alias in aliases:
-            if alias.lower() == text_lower:
-                return entity_id
-    
-    return None
+    return index_for(load_gazetteer()).lookup(text)
 
 
 def format_query_for_display(parsed_query: Dict[str, Any]) -> str:
@@ -5,12 +5,18 @@ Reranking inteligente de chunks usando cross-encoders ou LLM scoring.
 Melhora relevância dos resultados finais antes de enviar para LLM.
 """
 
+import os
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
+
 from goldenverba.components.chunk import Chunk
+from verba_extensions.utils.cross_encoder import get_cross_encoder_engine
 
 logger = logging.getLogger(__name__)
 
+STOPWORDS = {'a', 'o', 'e', 'de', 'da', 'do', 'em', 'para', 'com', 'que', 'é', 'um', 'uma'}
+
 
 class RerankerPlugin:
     """
@@ -30,7 +36,8 @@ class RerankerPlugin:
         # Configuração padrão
         self.default_top_k = 5
         self.use_metadata = True
-        self.use_cross_encoder = False  # Requer modelo instalado
+        # Requer transformers + onnxruntime/torch (ver utils/cross_encoder.py)
+        self.use_cross_encoder = os.getenv("VERBA_RERANKER_CROSS_ENCODER", "false").lower() == "true"
         self.use_llm_scoring = False  # Requer API key
         
     async def process_chunk(
@@ -103,18 +110,13 @@ class RerankerPlugin:
         top_k = config.get("top_k", self.default_top_k)
         
         # Log para debug
-        import logging
-        logger = logging.getLogger(__name__)
         logger.info(f"RERANKER: Recebeu {len(chunks)} chunks, top_k={top_k} (default={self.default_top_k})")
         
-        # Calcula scores para cada chunk
-        scored_chunks = []
-        for chunk in chunks:
-            score = await self._calculate_relevance_score(chunk, query, config)
-            scored_chunks.append((score, chunk))
+        # Calcula scores de todos os candidatos (cross-encoder em uma chamada só)
+        scores = await self._score_candidates(chunks, query, config)
         
-        # Ordena por score (maior primeiro)
-        scored_chunks.sort(key=lambda x: x[0], reverse=True)
+        # Ordena por score (maior primeiro, estável em empates)
+        scored_chunks = sorted(zip(scores, chunks), key=lambda x: x[0], reverse=True)
         
         # Retorna top_k chunks
         reranked = [chunk for _, chunk in scored_chunks[:top_k]]
@@ -125,58 +127,91 @@ class RerankerPlugin:
         
         return reranked
     
-    async def _calculate_relevance_score(
+    async def _score_candidates(
         self,
-        chunk: Chunk,
+        chunks: List[Chunk],
         query: str,
         config: Dict[str, Any]
-    ) -> float:
+    ) -> List[float]:
         """
-        Calcula score de relevância para um chunk.
+        Calcula scores de relevância de todos os chunks.
+        
+        Keywords, metadata e tamanho são baratos e ficam por chunk; o
+        cross-encoder pontua todos os pares em uma única chamada em lote.
+        O score de cada chunk é a média dos scores ponderados disponíveis.
         
         Args:
-            chunk: Chunk a scorear
+            chunks: Chunks candidatos
             query: Query do usuário
-            config: Configuração
+            config: Configuração (aceita 'use_cross_encoder')
         
         Returns:
-            Score de relevância (0.0 a 1.0)
+            Scores (0.0 a 1.0), na ordem de `chunks`
         """
-        scores = []
-        
-        # 1. Metadata-based scoring
-        if self.use_metadata and chunk.meta:
-            metadata_score = self._score_by_metadata(chunk, query)
-            scores.append(metadata_score * 0.4)  # 40% weight
-        
-        # 2. Keyword matching
-        keyword_score = self._score_by_keywords(chunk.content, query)
-        scores.append(keyword_score * 0.3)  # 30% weight
-        
-        # 3. Content length score (prefer chunks médios)
-        length_score = self._score_by_length(len(chunk.content))
-        scores.append(length_score * 0.1)  # 10% weight
-        
-        # 4. Cross-encoder scoring (se disponível)
-        if self.use_cross_encoder:
+        parts = []
+        for chunk in chunks:
+            scores = []
+            
+            # 1. Metadata-based scoring
+            if self.use_metadata and chunk.meta:
+                scores.append(self._score_by_metadata(chunk, query) * 0.4)  # 40% weight
+            
+            # 2. Keyword matching
+            scores.append(self._score_by_keywords(chunk.content, query) * 0.3)  # 30% weight
+            
+            # 3. Content length score (prefer chunks médios)
+            scores.append(self._score_by_length(len(chunk.content)) * 0.1)  # 10% weight
+            parts.append(scores)
+        
+        # 4. Cross-encoder (20%): um forward pass em lote para todos os pares
+        use_cross_encoder = config.get("use_cross_encoder", self.use_cross_encoder)
+        if use_cross_encoder:
             try:
-                cross_score = await self._score_cross_encoder(chunk.content, query)
-                scores.append(cross_score * 0.2)  # 20% weight
+                engine = get_cross_encoder_engine()
+                if engine.available():
+                    contents = [chunk.content or "" for chunk in chunks]
+                    keys = [
+                        str(getattr(chunk, "uuid", None) or chunk.chunk_id)
+                        for chunk in chunks
+                    ]
+                    cross_scores = await asyncio.to_thread(engine.score, query, contents, keys)
+                    for scores, cross_score in zip(parts, cross_scores):
+                        scores.append(float(cross_score) * 0.2)  # 20% weight
             except Exception as e:
                 logger.debug(f"Cross-encoder scoring failed: {e}")
         
         # 5. LLM scoring (se disponível)
         if self.use_llm_scoring:
             try:
-                llm_score = await self._score_llm(chunk, query)
-                scores.append(llm_score * 0.3)  # 30% weight
+                llm_scores = await asyncio.gather(
+                    *(self._score_llm(chunk, query) for chunk in chunks)
+                )
+                for scores, llm_score in zip(parts, llm_scores):
+                    scores.append(llm_score * 0.3)  # 30% weight
             except Exception as e:
                 logger.debug(f"LLM scoring failed: {e}")
         
         # Média ponderada dos scores
-        if scores:
-            return sum(scores) / len(scores)
-        return 0.5  # Score neutro
+        return [sum(scores) / len(scores) for scores in parts]
+    
+    async def _calculate_relevance_score(
+        self,
+        chunk: Chunk,
+        query: str,
+        config: Dict[str, Any]
+    ) -> float:
+        """
+        Calcula score de relevância para um chunk.
+        
+        Args:
+            chunk: Chunk a scorear
+            query: Query do usuário
+            config: Configuração
+        
+        Returns:
+            Score de relevância (0.0 a 1.0)
+        """
+        return (await self._score_candidates([chunk], query, config))[0]
     
     def _score_by_metadata(
         self,
@@ -246,8 +281,7 @@ class RerankerPlugin:
         query_words = query.lower().split()
         
         # Remove stopwords simples
-        stopwords = {'a', 'o', 'e', 'de', 'da', 'do', 'em', 'para', 'com', 'que', 'é', 'um', 'uma'}
-        query_words = [w for w in query_words if w not in stopwords]
+        query_words = [w for w in query_words if w not in STOPWORDS]
         
         if not query_words:
             return 0.5
@@ -293,6 +327,9 @@ class RerankerPlugin:
         """
         Calcula score usando cross-encoder (requer modelo).
         
+        Para vários chunks prefira `_score_candidates`, que pontua todos os
+        pares em uma única chamada em lote.
+        
         Args:
             content: Conteúdo do chunk
             query: Query do usuário
@@ -300,9 +337,9 @@ class RerankerPlugin:
         Returns:
             Score do cross-encoder (0.0 a 1.0)
         """
-        # TODO: Implementar com sentence-transformers cross-encoder
-        # Por enquanto retorna score neutro
-        return 0.5
+        engine = get_cross_encoder_engine()
+        scores = await asyncio.to_thread(engine.score, query, [content])
+        return float(scores[0])
     
     async def _score_llm(
         self,
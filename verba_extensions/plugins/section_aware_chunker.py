@@ -99,6 +99,7 @@ class SectionAwareChunker(Chunker):
     def __init__(self):
         super().__init__()
         self.name = "Section-Aware"
+        self.requires_spacy_doc = True
         self.description = "Chunking que respeita limites de seções para melhor coerência semântica"
         self.config = {
             "Chunk Size": InputConfig(
@@ -164,8 +164,12 @@ class TikaReader(Reader):
             if not self._check_tika_available(tika_server):
                 raise Exception(f"Servidor Tika não está disponível em {tika_server}")
             
-            # Decodifica conteúdo
-            decoded_bytes = fileConfig.content if isinstance(fileConfig.content, bytes) else fileConfig.content.encode() if isinstance(fileConfig.content, str) else None
+            # Decodifica conteúdo (uploads binários já chegam em arquivo)
+            if getattr(fileConfig, "content_path", None):
+                from goldenverba.server.uploads import read_file_bytes
+                decoded_bytes = read_file_bytes(fileConfig)
+            else:
+                decoded_bytes = fileConfig.content if isinstance(fileConfig.content, bytes) else fileConfig.content.encode() if isinstance(fileConfig.content, str) else None
             
             if not decoded_bytes:
                 decoded_bytes = fileConfig.content.encode('utf-8') if hasattr(fileConfig, 'content') else b''
@@ -192,8 +192,12 @@ class UniversalA2Reader(Reader):
             try:
                 msg.info(f"[UNIVERSAL-READER] Usando Tika para '{fileConfig.filename}' (formato: {extension})")
                 
-                # Decodifica conteúdo
-                decoded_bytes = fileConfig.content if isinstance(fileConfig.content, bytes) else fileConfig.content.encode() if isinstance(fileConfig.content, str) else None
+                # Decodifica conteúdo (uploads binários já chegam em arquivo)
+                if getattr(fileConfig, "content_path", None):
+                    from goldenverba.server.uploads import read_file_bytes
+                    decoded_bytes = read_file_bytes(fileConfig)
+                else:
+                    decoded_bytes = fileConfig.content if isinstance(fileConfig.content, bytes) else fileConfig.content.encode() if isinstance(fileConfig.content, str) else None
                 if not decoded_bytes:
                     decoded_bytes = fileConfig.content.encode('utf-8') if hasattr(fileConfig, 'content') else b''
                 
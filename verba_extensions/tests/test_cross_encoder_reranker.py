@@ -0,0 +1,116 @@
+"""
+Testes unitários para CrossEncoderEngine e o scoring em lote do RerankerPlugin
+"""
+
+import asyncio
+import unittest
+
+import numpy as np
+
+from goldenverba.components.chunk import Chunk
+from verba_extensions.plugins import reranker as reranker_module
+from verba_extensions.plugins.reranker import RerankerPlugin
+from verba_extensions.utils.cross_encoder import CrossEncoderEngine, logits_to_scores
+
+
+class FakePredictor:
+    """Logit = número de palavras da query presentes no texto"""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, pairs):
+        self.batches.append([text for _, text in pairs])
+        return np.array(
+            [[sum(w in text for w in query.split())] for query, text in pairs],
+            dtype=np.float32,
+        )
+
+
+def make_chunk(i, content, meta=None):
+    chunk = Chunk(content=content, chunk_id=f"chunk-{i}", content_without_overlap=content)
+    chunk.uuid = f"uuid-{i}"
+    chunk.meta = meta or {}
+    return chunk
+
+
+class TestCrossEncoderEngine(unittest.TestCase):
+
+    def test_length_sorted_micro_batches_keep_input_order(self):
+        """Micro-batches ordenados por tamanho; scores voltam na ordem original"""
+        predictor = FakePredictor()
+        engine = CrossEncoderEngine(batch_size=2, predict=predictor)
+        texts = ["apple ai e muito mais texto", "ai", "nada", "apple"]
+
+        scores = engine.score("apple ai", texts, keys=["a", "b", "c", "d"])
+
+        self.assertEqual(predictor.batches, [["ai", "nada"], ["apple", "apple ai e muito mais texto"]])
+        expected = logits_to_scores(np.array([2, 1, 0, 1], dtype=np.float32))
+        np.testing.assert_allclose(scores, expected, rtol=1e-6)
+        self.assertEqual(engine.stats["batches"], 2)
+
+    def test_scores_are_cached_per_query_and_key(self):
+        """Mesma query (normalizada) e mesmo chunk não são re-pontuados"""
+        predictor = FakePredictor()
+        engine = CrossEncoderEngine(predict=predictor)
+
+        first = engine.score("Apple AI", ["apple", "ai"], keys=["a", "b"])
+        second = engine.score("  apple   ai ", ["apple", "ai", "apple ai"], keys=["a", "b", "c"])
+
+        self.assertEqual(len(predictor.batches), 2)
+        self.assertEqual(predictor.batches[1], ["apple ai"])
+        np.testing.assert_allclose(second[:2], first)
+        self.assertEqual(engine.stats["cache_hits"], 2)
+
+    def test_logits_to_scores(self):
+        """Logits de 1 ou 2 classes viram scores entre 0 e 1"""
+        np.testing.assert_allclose(logits_to_scores([0.0]), [0.5])
+        np.testing.assert_allclose(logits_to_scores([[0.0, 0.0], [0.0, 10.0]]), [0.5, 1.0], atol=1e-4)
+
+
+class TestRerankerBatchScoring(unittest.TestCase):
+
+    def setUp(self):
+        self.plugin = RerankerPlugin()
+        self.chunks = [
+            make_chunk(0, "Apple investe em inteligencia artificial.", {"enriched": {"companies": ["Apple"], "keywords": ["apple", "ai"]}}),
+            make_chunk(1, "Microsoft trabalha com cloud computing.", {"source": "x"}),
+            make_chunk(2, "", {}),
+            make_chunk(3, "apple " * 400, {}),
+        ]
+
+    def test_batch_scores_match_per_chunk_helpers(self):
+        """Scores em lote equivalem aos helpers por chunk"""
+        query = "Apple AI de inovação"
+        scores = asyncio.run(self.plugin._score_candidates(self.chunks, query, {}))
+
+        for chunk, score in zip(self.chunks, scores):
+            parts = [
+                self.plugin._score_by_keywords(chunk.content, query) * 0.3,
+                self.plugin._score_by_length(len(chunk.content)) * 0.1,
+            ]
+            if chunk.meta:
+                parts.append(self.plugin._score_by_metadata(chunk, query) * 0.4)
+            self.assertAlmostEqual(score, sum(parts) / len(parts))
+
+    def test_cross_encoder_scores_all_candidates_in_one_call(self):
+        """Com cross-encoder, todos os pares vão em um único batch"""
+        predictor = FakePredictor()
+        engine = CrossEncoderEngine(predict=predictor)
+        original = reranker_module.get_cross_encoder_engine
+        reranker_module.get_cross_encoder_engine = lambda: engine
+        try:
+            reranked = asyncio.run(
+                self.plugin.process_chunks(self.chunks, "apple", {"top_k": 2, "use_cross_encoder": True})
+            )
+        finally:
+            reranker_module.get_cross_encoder_engine = original
+
+        self.assertEqual(len(predictor.batches), 1)
+        self.assertEqual(len(predictor.batches[0]), 4)
+        self.assertEqual(len(reranked), 2)
+        self.assertNotIn("chunk-2", [chunk.chunk_id for chunk in reranked])
+
+
+if __name__ == "__main__":
+    unittest.main()
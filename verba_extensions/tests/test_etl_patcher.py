@@ -0,0 +1,126 @@
+"""
+Testes unitários para o patch ETL em lote (busca por UUID + upsert)
+"""
+
+import asyncio
+import unittest
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from weaviate.collections.classes.batch import BatchObjectReturn
+
+from verba_extensions.etl import etl_a2_intelligent
+from verba_extensions.utils.etl_patcher import ETLPatcher
+
+SCHEMA = ["content", "entity_mentions", "entities_local_ids", "primary_entity_id", "etl_version"]
+
+
+class FakeCollection:
+    """Collection falsa que registra consultas, batches e updates"""
+
+    def __init__(self, n, references=False):
+        self.objects = {
+            str(uuid.UUID(int=i + 1)): SimpleNamespace(
+                uuid=uuid.UUID(int=i + 1),
+                properties={"content": f"Apple chunk {i}", "doc_uuid": "doc-1"},
+                vector={"default": [float(i), 0.5]},
+            )
+            for i in range(n)
+        }
+        self.fetches = []
+        self.batches = []
+        self.updates = []
+        self.query = SimpleNamespace(fetch_objects=self._fetch_objects)
+        self.data = SimpleNamespace(insert_many=self._insert_many, update=self._update)
+        self.config = SimpleNamespace(get=self._config)
+        self.references = [SimpleNamespace(name="article_ref")] if references else []
+
+    async def _config(self):
+        return SimpleNamespace(properties=[SimpleNamespace(name=n) for n in SCHEMA], references=self.references)
+
+    async def _fetch_objects(self, filters=None, limit=None, include_vector=False, return_properties=None):
+        wanted = [str(value) for value in filters.value]
+        self.fetches.append((len(wanted), include_vector, return_properties))
+        return SimpleNamespace(objects=[self.objects[key] for key in wanted if key in self.objects][:limit])
+
+    async def _insert_many(self, objects):
+        self.batches.append(len(objects))
+        response = BatchObjectReturn()
+        for index, data_object in enumerate(objects):
+            self.objects[str(data_object.uuid)] = SimpleNamespace(
+                uuid=data_object.uuid, properties=data_object.properties, vector={"default": data_object.vector}
+            )
+            response.uuids[index] = data_object.uuid
+        return response
+
+    async def _update(self, uuid, properties):
+        self.updates.append(str(uuid))
+        self.objects[str(uuid)].properties.update(properties)
+
+
+async def tag(batch):
+    return [{"etl_version": "test", "primary_entity_id": props["content"].split()[0]} for props in batch]
+
+
+class TestETLPatcher(unittest.TestCase):
+
+    def test_fetches_by_id_in_batches_and_upserts_with_vectors(self):
+        """Só os UUIDs pedidos, em batches, gravados por upsert com o vetor original"""
+        coll = FakeCollection(1000)
+        targets = [str(uuid.UUID(int=i + 1)) for i in range(500, 950)] + ["missing"]
+
+        result = asyncio.run(ETLPatcher(coll, batch_size=200, concurrency=2).run(targets, tag))
+
+        self.assertEqual(result["patched"], 450)
+        self.assertEqual(result["found"], 450)
+        self.assertEqual([f[0] for f in coll.fetches], [200, 200, 50])
+        self.assertTrue(all(f[1] for f in coll.fetches))
+        self.assertEqual(sum(coll.batches), 450)
+        self.assertEqual(coll.updates, [])
+
+        patched = coll.objects[targets[0]]
+        self.assertEqual(patched.properties["etl_version"], "test")
+        self.assertEqual(patched.properties["doc_uuid"], "doc-1")
+        self.assertEqual(patched.vector["default"], [500.0, 0.5])
+        self.assertNotIn("etl_version", coll.objects[str(uuid.UUID(int=1))].properties)
+
+    def test_collections_with_references_use_update(self):
+        """Sem upsert: data.update por objeto, lendo só as propriedades pedidas"""
+        coll = FakeCollection(10, references=True)
+        targets = list(coll.objects)
+
+        result = asyncio.run(
+            ETLPatcher(coll, batch_size=4, upsert=False).run(targets, tag, read_properties=["content"])
+        )
+
+        self.assertEqual(result["patched"], 10)
+        self.assertEqual(sorted(coll.updates), sorted(targets))
+        self.assertEqual(coll.batches, [])
+        self.assertEqual({f[2][0] for f in coll.fetches}, {"content"})
+
+    def test_intelligent_etl_filters_props_by_schema(self):
+        """ETL inteligente grava apenas campos do schema, sem data.update"""
+        coll = FakeCollection(5)
+        client = SimpleNamespace(collections=SimpleNamespace(get=lambda name: coll))
+        mentions = [{"text": "Apple", "label": "ORG", "confidence": 0.9}]
+
+        async def extract(texts):
+            return [mentions for _ in texts]
+
+        with patch.object(etl_a2_intelligent, "extract_entities_intelligent_batch", extract), \
+                patch.object(etl_a2_intelligent, "load_gazetteer", return_value={}):
+            result = asyncio.run(
+                etl_a2_intelligent.run_etl_patch_for_passage_uuids(lambda: client, list(coll.objects), None, "Chunks")
+            )
+
+        self.assertEqual(result["patched"], 5)
+        self.assertEqual(coll.updates, [])
+        props = next(iter(coll.objects.values())).properties
+        self.assertEqual(props["primary_entity_id"], "Apple")
+        self.assertEqual(props["entities_local_ids"], ["Apple"])
+        self.assertNotIn("section_entity_ids", props)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Testes unitários para GazetteerIndex e a extração de entidades pré-chunking
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from verba_extensions.integration import chunking_hook
+from verba_extensions.plugins import a2_etl_hook
+from verba_extensions.utils.gazetteer_index import (
+    AhoCorasick,
+    GazetteerIndex,
+    load_gazetteer_file,
+)
+
+GAZ = {
+    "ent:org:google": ["Google", "Google Cloud", "GCP"],
+    "ent:org:microsoft": ["Microsoft", "Azure"],
+    "ent:org:apple": ["Apple", "Apple Inc"],
+}
+
+
+class FakeNLP:
+    """NER falso: marca como ORG cada alias encontrado; conta as chamadas"""
+
+    def __init__(self, names):
+        self.names = names
+        self.calls = 0
+
+    def __call__(self, text):
+        self.calls += 1
+        ents = []
+        for name in self.names:
+            start = text.find(name)
+            while start >= 0:
+                ents.append(SimpleNamespace(text=name, label_="ORG", start_char=start, end_char=start + len(name)))
+                start = text.find(name, start + 1)
+        return SimpleNamespace(ents=sorted(ents, key=lambda e: e.start_char))
+
+
+def linear_match_aliases(text, gaz):
+    """Implementação anterior (varredura linear) usada como referência"""
+    t_lower = text.lower()
+    return sorted({eid for eid, aliases in gaz.items() if any(a.lower() in t_lower for a in aliases)})
+
+
+class TestGazetteerIndex(unittest.TestCase):
+
+    def test_automaton_finds_overlapping_patterns(self):
+        """Aho-Corasick encontra padrões sobrepostos e contidos em outros"""
+        automaton = AhoCorasick(["he", "she", "his", "hers"])
+        found = sorted((end, automaton.patterns[i]) for end, i in automaton.iter("ushers"))
+        self.assertEqual(found, [(4, "he"), (4, "she"), (6, "hers")])
+
+    def test_find_ids_matches_linear_scan(self):
+        """Busca por autômato equivale à varredura linear de aliases"""
+        index = GazetteerIndex(GAZ)
+        for text in ["Migração do GCP para AZURE", "apple inc e google", "nada aqui", "microsoftware"]:
+            self.assertEqual(sorted(index.find_ids(text)), linear_match_aliases(text, GAZ))
+            self.assertEqual(a2_etl_hook.match_aliases(text, GAZ), linear_match_aliases(text, GAZ))
+
+    def test_lookup_and_mentions_are_exact(self):
+        """Normalização por alias exato, ignorando caixa"""
+        index = GazetteerIndex(GAZ)
+        self.assertEqual(index.lookup("google cloud"), "ent:org:google")
+        self.assertIsNone(index.lookup("Google Clou"))
+        self.assertEqual(index.ids_for_mentions(["AZURE", "Apple Inc", "Oracle"]), {"ent:org:microsoft", "ent:org:apple"})
+
+    def test_file_cache_reloads_on_mtime_change(self):
+        """Mesmo objeto enquanto o arquivo não muda; recarrega quando o mtime muda"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "gazetteer.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump([{"entity_id": "ent:org:apple", "aliases": ["Apple"]}], f)
+
+            first = load_gazetteer_file(path)
+            self.assertIs(load_gazetteer_file(path), first)
+            self.assertIs(first.index, first.index)
+
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump([{"entity_id": "ent:org:vale", "aliases": ["Vale"]}], f)
+            stat = os.stat(path)
+            os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+
+            second = load_gazetteer_file(path)
+            self.assertIsNot(second, first)
+            self.assertEqual(second.index.lookup("vale"), "ent:org:vale")
+
+        self.assertEqual(load_gazetteer_file(os.path.join(tmp, "ausente.json")), {})
+
+
+class TestPreChunkingExtraction(unittest.TestCase):
+
+    def test_single_ner_pass_with_entity_ids(self):
+        """NER roda uma vez; spans recebem entity_id via lookup"""
+        nlp = FakeNLP(["Apple", "GCP", "Oracle"])
+        document = SimpleNamespace(content="Apple usa GCP. Oracle e Apple competem.")
+
+        with patch.object(a2_etl_hook, "get_nlp", return_value=nlp), \
+                patch.object(a2_etl_hook, "load_gazetteer", return_value=GAZ):
+            result = chunking_hook.extract_entities_pre_chunking(document)
+
+        self.assertEqual(nlp.calls, 1)
+        self.assertEqual(len(result["entities"]), 4)
+        self.assertEqual(result["entity_ids"], ["ent:org:apple", "ent:org:google"])
+        self.assertEqual(
+            [(s["text"], s["entity_id"]) for s in result["entity_spans"]],
+            [("Apple", "ent:org:apple"), ("GCP", "ent:org:google"), ("Oracle", None), ("Apple", "ent:org:apple")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Testes unitários para a fila de ingestão do A2 Ingestor (JobStore + IngestWorkers)
+"""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from verba_extensions.etl.jobs import HostThrottle, IngestWorkers, JobStore, RetryableError
+
+OPTIONS = {"tenant": "news_v1", "run_etl": True}
+
+
+class TestIngestJobs(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "jobs.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resume_after_restart(self):
+        """Itens em andamento voltam para a fila e o job termina uma única vez"""
+        store = JobStore(self.path)
+        job_id = store.create_job(["https://a.com/1", "https://a.com/2", "https://a.com/1"], OPTIONS)
+        first = store.claim(1)[0]
+        store.complete(first, {"passage_uuids": ["p1", "p2"]})
+        store.claim(1)  # processo cai com este item em "running"
+        store.close()
+
+        restarted = JobStore(self.path)
+        self.assertEqual(restarted.recover(), [])
+        job = restarted.get_job(job_id)
+        self.assertEqual((job["total"], job["pending"], job["done"]), (2, 1, 1))
+
+        item = restarted.claim(5)[0]
+        self.assertEqual((item["url"], item["attempts"], item["options"]), ("https://a.com/2", 2, OPTIONS))
+        restarted.complete(item, {"passage_uuids": ["p3"]})
+        self.assertTrue(restarted.finish_if_done(job_id))
+        self.assertFalse(restarted.finish_if_done(job_id))
+        self.assertEqual(restarted.passage_uuids(job_id), ["p1", "p2", "p3"])
+
+        # Caiu no meio do ETL: o próximo start roda o ETL de novo
+        restarted.close()
+        self.assertEqual(JobStore(self.path).recover(), [job_id])
+
+    def test_workers_retry_transient_errors_and_run_etl_once(self):
+        """Falha transitória volta para a fila; falha definitiva não; ETL roda uma vez por job"""
+        store = JobStore(self.path)
+        calls = {}
+        finished = []
+
+        async def handler(item):
+            url = item["url"]
+            calls[url] = calls.get(url, 0) + 1
+            if url.endswith("flaky") and calls[url] == 1:
+                raise RetryableError("HTTP 503")
+            if url.endswith("gone"):
+                raise ValueError("HTTP 404")
+            return {"passage_uuids": [url]}
+
+        async def on_job_done(job, passages):
+            finished.append((job["job_id"], sorted(passages)))
+
+        async def run():
+            workers = IngestWorkers(store, handler, on_job_done, workers=3, retry_base=0.01, poll_interval=0.02)
+            await workers.start()
+            job_id = store.create_job(["https://a.com/ok", "https://b.com/flaky", "https://c.com/gone"], OPTIONS)
+            workers.notify()
+            for _ in range(200):
+                if store.get_job(job_id)["status"] == "done":
+                    break
+                await asyncio.sleep(0.01)
+            await workers.stop()
+            return job_id
+
+        job_id = asyncio.run(run())
+        job = store.get_job(job_id)
+
+        self.assertEqual((job["status"], job["done"], job["failed"]), ("done", 2, 1))
+        self.assertEqual(calls["https://b.com/flaky"], 2)
+        self.assertEqual(calls["https://c.com/gone"], 1)
+        self.assertIn("HTTP 404", job["failures"][0]["error"])
+        self.assertEqual(finished, [(job_id, ["https://a.com/ok", "https://b.com/flaky"])])
+
+        self.assertEqual(store.retry_failed(job_id), 1)
+        self.assertEqual(store.get_job(job_id)["pending"], 1)
+
+    def test_worker_survives_store_errors(self):
+        """Erro do SQLite fora do handler falha o item, mas não derruba o worker"""
+        store = JobStore(self.path)
+        broken = {"claim": 1, "complete": 1}
+
+        def flaky(name):
+            original = getattr(store, name)
+
+            def call(*args, **kwargs):
+                if broken[name]:
+                    broken[name] -= 1
+                    raise RuntimeError("database is locked")
+                return original(*args, **kwargs)
+
+            return call
+
+        store.claim = flaky("claim")
+        store.complete = flaky("complete")
+
+        async def handler(item):
+            return {"passage_uuids": [item["url"]]}
+
+        async def run():
+            workers = IngestWorkers(store, handler, workers=1, poll_interval=0.01)
+            job_id = store.create_job(["https://a.com/1", "https://a.com/2"], OPTIONS)
+            await workers.start()
+            for _ in range(200):
+                if store.get_job(job_id)["status"] == "done":
+                    break
+                await asyncio.sleep(0.01)
+            running = workers.get_stats()["running"]
+            await workers.stop()
+            return job_id, running
+
+        job_id, running = asyncio.run(run())
+        job = store.get_job(job_id)
+        self.assertTrue(running)
+        self.assertEqual((job["status"], job["done"], job["failed"]), ("done", 1, 1))
+        self.assertIn("database is locked", job["failures"][0]["error"])
+
+    def test_sources_are_kept_per_tenant(self):
+        """Fingerprint da URL sobrevive a restart e é separado por tenant"""
+        store = JobStore(self.path)
+        store.record_source("news_v1", "https://a.com/1", etag='"v1"', content_hash="h1")
+        store.record_source("news_v1", "https://a.com/1", etag='"v2"', content_hash="h2")
+        store.close()
+
+        restarted = JobStore(self.path)
+        self.assertEqual(
+            restarted.get_source("news_v1", "https://a.com/1"),
+            {"etag": '"v2"', "last_modified": None, "content_hash": "h2"},
+        )
+        self.assertIsNone(restarted.get_source("outro", "https://a.com/1"))
+
+    def test_host_throttle_limits_each_host(self):
+        """Concorrência limitada por host, sem segurar outros hosts"""
+        throttle = HostThrottle(concurrency=1, delay=0)
+        active = {}
+        peak = {}
+
+        async def fetch(url):
+            async with throttle.slot(url):
+                host = url.split("/")[2]
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+                await asyncio.sleep(0.01)
+                active[host] -= 1
+
+        async def run():
+            started = asyncio.get_running_loop().time()
+            await asyncio.gather(*(fetch(f"https://{host}.com/{i}") for i in range(4) for host in "ab"))
+            return asyncio.get_running_loop().time() - started
+
+        took = asyncio.run(run())
+        self.assertEqual(peak, {"a.com": 1, "b.com": 1})
+        self.assertLess(took, 0.08)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Testes unitários para o pool de NER (ETL pré-chunking e pós-import fora do event loop)
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from verba_extensions.integration import chunking_hook
+from verba_extensions.utils import ner_pool
+from verba_extensions.utils.ner_pool import NERPool, split_text
+
+NAMES = ["Apple", "Microsoft"]
+
+
+def fake_spans(text):
+    """NER falso: marca como ORG cada ocorrência de NAMES"""
+    spans = []
+    for name in NAMES:
+        start = text.find(name)
+        while start >= 0:
+            spans.append({"text": name, "label": "ORG", "start": start, "end": start + len(name)})
+            start = text.find(name, start + 1)
+    return sorted(spans, key=lambda span: span["start"])
+
+
+def fake_ner_batch(texts, language=None, n_process=None, batch_size=None):
+    return [fake_spans(text) for text in texts]
+
+
+class FakeNLP:
+    def __call__(self, text):
+        return SimpleNamespace(ents=[
+            SimpleNamespace(text=s["text"], label_=s["label"], start_char=s["start"], end_char=s["end"])
+            for s in fake_spans(text)
+        ])
+
+
+class TestNERPool(unittest.TestCase):
+
+    def test_split_text_keeps_offsets(self):
+        """Trechos cobrem o texto inteiro, cortados em espaço/quebra de linha"""
+        text = " ".join(f"palavra{i}" for i in range(2000))
+        pieces = split_text(text, 1000)
+
+        self.assertEqual("".join(piece for _, piece in pieces), text)
+        self.assertTrue(all(len(piece) <= 1000 for _, piece in pieces))
+        for offset, piece in pieces:
+            self.assertEqual(text[offset : offset + len(piece)], piece)
+            self.assertTrue(piece.endswith(" ") or offset + len(piece) == len(text))
+
+    def test_extract_document_recombines_offsets(self):
+        """Spans de documentos divididos em trechos voltam com os offsets do documento"""
+        text = ("Apple compra ações da Microsoft. " + "texto " * 300) * 20
+        pool = NERPool(processes=0, batch_size=4, max_chars=1000, languages=[])
+
+        with patch.object(ner_pool, "ner_batch", fake_ner_batch):
+            spans = asyncio.run(pool.extract_document(text))
+
+        self.assertEqual(spans, fake_spans(text))
+        self.assertGreater(pool.batches, 1)
+
+    def test_max_pending_limits_batches_in_flight(self):
+        """No máximo max_pending lotes rodam ao mesmo tempo; o resto espera"""
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_batch(texts, language=None, n_process=None, batch_size=None):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return fake_ner_batch(texts)
+
+        pool = NERPool(processes=0, batch_size=1, max_pending=2, languages=[])
+        with patch.object(ner_pool, "ner_batch", slow_batch):
+            results = asyncio.run(pool.extract([f"Apple {i}" for i in range(8)]))
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual(peak, 2)
+        self.assertEqual(pool.get_stats()["pending"], 0)
+
+    def test_async_pre_chunking_matches_sync(self):
+        """ETL pré-chunking pelo pool produz o mesmo resultado da versão síncrona"""
+        document = SimpleNamespace(content="A Apple e a Microsoft anunciaram parceria. A Apple lidera.", meta={})
+        pool = NERPool(processes=0, languages=[])
+
+        with patch("verba_extensions.plugins.a2_etl_hook.get_nlp", return_value=FakeNLP()), \
+                patch("verba_extensions.plugins.a2_etl_hook.load_gazetteer", return_value={}), \
+                patch.object(ner_pool, "get_ner_pool", return_value=pool), \
+                patch.object(ner_pool, "ner_batch", fake_ner_batch):
+            expected = chunking_hook.extract_entities_pre_chunking(document)
+            result = asyncio.run(chunking_hook.aextract_entities_pre_chunking(document))
+
+        self.assertEqual(result, expected)
+        self.assertEqual(len(result["entity_spans"]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
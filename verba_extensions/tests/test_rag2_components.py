@@ -13,6 +13,10 @@ Testa todos os componentes:
 import pytest
 import time
 import json
+import asyncio
+import os
+import tempfile
+import numpy as np
 from typing import List
 from unittest.mock import Mock, patch, AsyncMock
 from fastapi import FastAPI, Request
@@ -24,7 +28,9 @@ from verba_extensions.utils.embeddings_cache import (
     get_cached_embedding,
     get_cache_key,
     get_cache_stats,
-    clear_cache
+    clear_cache,
+    EmbeddingCache,
+    make_embedding_key,
 )
 from verba_extensions.utils.telemetry import get_telemetry, TelemetryCollector
 from verba_extensions.utils.uuid import (
@@ -199,6 +205,66 @@ class TestEmbeddingsCache:
         assert result2 == [0.9, 0.8, 0.7]  # Novo embedding, não do cache
 
 
+class TestPersistentEmbeddingCache:
+    """Testes para EmbeddingCache (float32 + LRU + SQLite)"""
+
+    def setup_method(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "embeddings.sqlite")
+        self.calls = []
+
+    async def _compute(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(t)), 0.5] for t in texts]
+
+    def test_only_misses_are_computed(self):
+        """Testa que apenas textos não cacheados (e únicos) vão para o provider"""
+        cache = EmbeddingCache(path=None)
+        asyncio.run(cache.aget_or_compute_many("OpenAI", "m", ["a", "bb"], self._compute))
+        vectors = asyncio.run(
+            cache.aget_or_compute_many("OpenAI", "m", ["a", "ccc", "ccc", "bb"], self._compute)
+        )
+        assert self.calls == [["a", "bb"], ["ccc"]]
+        assert vectors == [[1.0, 0.5], [3.0, 0.5], [3.0, 0.5], [2.0, 0.5]]
+
+    def test_key_includes_embedder_and_model(self):
+        """Testa que chave separa embedder/modelo e normaliza espaços"""
+        assert make_embedding_key("OpenAI", "m1", "a  b") == make_embedding_key("OpenAI", "m1", " a b ")
+        assert make_embedding_key("OpenAI", "m1", "a") != make_embedding_key("OpenAI", "m2", "a")
+        assert make_embedding_key("Cohere", "m1", "a") != make_embedding_key("OpenAI", "m1", "a")
+
+    def test_persistence_survives_restart(self):
+        """Testa que hits sobrevivem a um novo processo (novo EmbeddingCache)"""
+        cache = EmbeddingCache(path=self.path)
+        asyncio.run(cache.aget_or_compute_many("OpenAI", "m", ["persist"], self._compute))
+        cache.close()
+
+        reopened = EmbeddingCache(path=self.path)
+        vectors = asyncio.run(
+            reopened.aget_or_compute_many("OpenAI", "m", ["persist"], self._compute)
+        )
+        assert len(self.calls) == 1
+        assert vectors == [[7.0, 0.5]]
+        assert reopened.get_stats()["disk_hits"] == 1
+
+    def test_disk_bytes_ignore_rewritten_keys(self):
+        """Testa que regravar chaves existentes não infla o contador de bytes em disco"""
+        cache = EmbeddingCache(path=self.path)
+        vector = np.zeros(4, dtype=np.float32)
+        for _ in range(3):
+            cache._disk_put_many({"k1": vector, "k2": vector})
+        assert cache.get_stats()["disk_bytes"] == 2 * vector.nbytes
+        cache.close()
+
+    def test_memory_lru_bounded_by_bytes(self):
+        """Testa que o LRU em memória respeita o limite em bytes (float32)"""
+        cache = EmbeddingCache(path=None, max_memory_bytes=16)
+        asyncio.run(cache.aget_or_compute_many("OpenAI", "m", ["a", "b", "c"], self._compute))
+        stats = cache.get_stats()
+        assert stats["memory_bytes"] <= 16
+        assert stats["memory_entries"] == 2
+
+
 class TestTelemetryCollector:
     """Testes para Telemetry Collector"""
     
@@ -483,6 +549,7 @@ if __name__ == "__main__":
     test_classes = [
         TestTelemetryMiddleware,
         TestEmbeddingsCache,
+        TestPersistentEmbeddingCache,
         TestTelemetryCollector,
         TestUUIDDeterministic,
         TestTextPreprocessing,
@@ -0,0 +1,95 @@
+"""
+Testes unitários para StageGraph
+"""
+
+import asyncio
+import time
+import unittest
+
+from verba_extensions.utils.stage_graph import StageGraph
+
+
+class TestStageGraph(unittest.TestCase):
+
+    def test_independent_stages_run_concurrently(self):
+        """Estágios independentes rodam em paralelo e dependentes recebem resultados"""
+        async def slow(value):
+            await asyncio.sleep(0.1)
+            return value
+
+        async def first(_):
+            return await slow("a")
+
+        async def second(_):
+            return await slow("b")
+
+        async def combine(inputs):
+            return inputs["first"] + inputs["second"]
+
+        graph = StageGraph(budget=5.0)
+        graph.add("first", first)
+        graph.add("second", second)
+        graph.add("combine", combine, deps=["first", "second"])
+
+        start = time.monotonic()
+        results = asyncio.run(graph.run())
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(results["combine"], "ab")
+        self.assertLess(elapsed, 0.19)
+        self.assertEqual(graph.timings["combine"]["status"], "ok")
+
+    def test_sync_stages_run_in_thread(self):
+        """Funções síncronas também são aceitas"""
+        graph = StageGraph()
+        graph.add("parse", lambda _: ["conceito"])
+        graph.add("count", lambda inputs: len(inputs["parse"]), deps=["parse"])
+        results = asyncio.run(graph.run())
+        self.assertEqual(results["count"], 1)
+
+    def test_timeout_and_error_use_default(self):
+        """Timeout e erro usam o default e não interrompem os dependentes"""
+        async def hang(_):
+            await asyncio.sleep(1)
+
+        async def fail(_):
+            raise RuntimeError("LLM indisponível")
+
+        graph = StageGraph(budget=5.0)
+        graph.add("builder", hang, timeout=0.01, default={"strategy": None})
+        graph.add("expansion", fail, default=["query"])
+        graph.add("after", lambda inputs: inputs["builder"], deps=["builder"])
+        results = asyncio.run(graph.run())
+
+        self.assertEqual(results["builder"], {"strategy": None})
+        self.assertEqual(results["expansion"], ["query"])
+        self.assertEqual(results["after"], {"strategy": None})
+        self.assertEqual(graph.timings["builder"]["status"], "timeout")
+        self.assertEqual(graph.timings["expansion"]["status"], "error")
+
+    def test_budget_cancels_and_skips_optional_stages(self):
+        """Opcionais são cancelados/pulados quando o orçamento acaba; obrigatórios não"""
+        async def slow(_):
+            await asyncio.sleep(0.1)
+            return "ok"
+
+        graph = StageGraph(budget=0.03)
+        graph.add("required", slow)
+        graph.add("optional", slow, optional=True, default="default")
+        graph.add("late", slow, deps=["required"], optional=True, default="late")
+        results = asyncio.run(graph.run())
+
+        self.assertEqual(results["required"], "ok")
+        self.assertEqual(results["optional"], "default")
+        self.assertEqual(results["late"], "late")
+        self.assertEqual(graph.timings["optional"]["status"], "budget")
+        self.assertEqual(graph.timings["late"]["status"], "skipped")
+
+    def test_unknown_dependency_is_rejected(self):
+        graph = StageGraph()
+        with self.assertRaises(ValueError):
+            graph.add("alpha", lambda _: None, deps=["builder"])
+
+
+if __name__ == "__main__":
+    unittest.main()
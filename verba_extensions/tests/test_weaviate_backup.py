@@ -0,0 +1,170 @@
+"""
+Testes unitários para o backup/restore em shards de weaviate_backup
+"""
+
+import asyncio
+import json
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+from weaviate.collections.classes.batch import BatchObjectReturn
+
+from verba_extensions.utils import weaviate_backup
+from verba_extensions.utils.weaviate_backup import (
+    backup_collection,
+    restore_collection,
+    verify_backup_file,
+)
+
+
+def make_objects(n):
+    return [
+        SimpleNamespace(
+            uuid=uuid.UUID(int=i + 1),
+            properties={"content": f"chunk {i}", "doc_uuid": "doc-1", "chunk_id": i},
+            vector={"default": [i / 10, 0.5, -1.0]},
+        )
+        for i in range(n)
+    ]
+
+
+class FakeCollection:
+    """Collection falsa: cursor por uuid, insert_many e consulta por ids"""
+
+    def __init__(self, objects=(), fail_after=None):
+        self.objects = {str(o.uuid): o for o in objects}
+        self.fail_after = fail_after
+        self.inserted = []
+        self.data = SimpleNamespace(insert_many=self._insert_many)
+        self.query = SimpleNamespace(fetch_objects=self._fetch_objects)
+
+    async def _iterate(self, after):
+        for i, key in enumerate(k for k in sorted(self.objects) if after is None or k > after):
+            if self.fail_after is not None and i >= self.fail_after:
+                raise ConnectionError("conexão perdida")
+            yield self.objects[key]
+
+    def iterator(self, include_vector=False, after=None, cache_size=None):
+        return self._iterate(after)
+
+    async def _insert_many(self, objects):
+        response = BatchObjectReturn()
+        for index, data_object in enumerate(objects):
+            key = str(data_object.uuid)
+            self.objects[key] = SimpleNamespace(
+                uuid=data_object.uuid, properties=data_object.properties, vector={"default": data_object.vector}
+            )
+            self.inserted.append(key)
+            response.uuids[index] = data_object.uuid
+        return response
+
+    async def _fetch_objects(self, filters=None, limit=None, return_properties=None):
+        wanted = {str(value) for value in filters.value}
+        return SimpleNamespace(objects=[o for key, o in self.objects.items() if key in wanted])
+
+
+class FakeClient:
+    def __init__(self, collections):
+        self._collections = collections
+        self.collections = SimpleNamespace(exists=self._exists, get=self._collections.__getitem__)
+
+    async def _exists(self, name):
+        return name in self._collections
+
+
+class TestWeaviateBackup(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.backup_dir = Path(self.tmp.name) / "backup.json"
+        self.source = FakeCollection(make_objects(7))
+        self.target = FakeCollection()
+        self.client = FakeClient({"Source": self.source, "Target": self.target})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def backup(self, **kwargs):
+        return asyncio.run(
+            backup_collection(self.client, "Source", str(self.backup_dir), shard_size=3, compression="gzip", **kwargs)
+        )
+
+    def test_round_trip_in_shards(self):
+        """Backup em shards gzip com manifest; restore devolve propriedades e vetores"""
+        result = self.backup()
+        self.assertTrue(result["success"])
+        self.assertEqual(result["shards"], 3)
+        self.assertEqual(result["backup_file"], str(self.backup_dir.with_suffix("")))
+
+        manifest = json.loads((self.backup_dir.with_suffix("") / "manifest.json").read_text())
+        self.assertTrue(manifest["complete"])
+        self.assertEqual([s["count"] for s in manifest["shards"]], [3, 3, 1])
+
+        verification = asyncio.run(verify_backup_file(result["backup_file"]))
+        self.assertTrue(verification["valid"], verification["errors"])
+        self.assertEqual(verification["total_chunks"], 7)
+
+        restored = asyncio.run(restore_collection(self.client, result["backup_file"], "Target", batch_size=2))
+        self.assertTrue(restored["success"], restored["errors"])
+        self.assertEqual(restored["total_restored"], 7)
+        for key, original in self.source.objects.items():
+            copy = self.target.objects[key]
+            self.assertEqual(copy.properties, original.properties)
+            for a, b in zip(copy.vector["default"], original.vector["default"]):
+                self.assertAlmostEqual(a, b, places=6)
+
+    def test_interrupted_backup_resumes_after_last_shard(self):
+        """Backup interrompido continua do último uuid do último shard completo"""
+        self.source.fail_after = 4
+        self.assertFalse(self.backup()["success"])
+
+        self.source.fail_after = None
+        result = self.backup()
+        self.assertTrue(result["success"])
+        self.assertEqual(result["total_chunks"], 7)
+
+        asyncio.run(restore_collection(self.client, result["backup_file"], "Target"))
+        self.assertEqual(sorted(self.target.inserted), sorted(self.source.objects))
+
+    def test_restore_resumes_and_skips_existing(self):
+        """Shards já restaurados são pulados; objetos existentes não são reinseridos"""
+        result = self.backup()
+        backup_dir = Path(result["backup_file"])
+        (backup_dir / "restore-Target.json").write_text(json.dumps({"completed": ["shard-00000.ndjson.gz"]}))
+        existing = make_objects(7)[3]
+        self.target.objects[str(existing.uuid)] = existing
+
+        restored = asyncio.run(restore_collection(self.client, result["backup_file"], "Target"))
+
+        self.assertTrue(restored["success"], restored["errors"])
+        self.assertEqual(restored["shards_resumed"], 1)
+        self.assertEqual(restored["shards_restored"], 2)
+        self.assertEqual(restored["skipped"], 1)
+        self.assertEqual(len(self.target.inserted), 3)
+        self.assertFalse((backup_dir / "restore-Target.json").exists())
+
+    def test_corrupted_shard_is_detected(self):
+        """Checksum inválido é apontado pela verificação e impede o restore do shard"""
+        result = self.backup()
+        shard = Path(result["backup_file"]) / "shard-00001.ndjson.gz"
+        shard.write_bytes(shard.read_bytes()[:-4] + b"xxxx")
+
+        verification = asyncio.run(verify_backup_file(result["backup_file"]))
+        self.assertFalse(verification["valid"])
+        self.assertIn("Checksum inválido em shard-00001.ndjson.gz", verification["errors"])
+
+        restored = asyncio.run(restore_collection(self.client, result["backup_file"], "Target"))
+        self.assertFalse(restored["success"])
+        self.assertEqual(restored["total_restored"], 4)
+
+    def test_vectors_are_packed_float32(self):
+        encoded = weaviate_backup.encode_vector([1.0, 2.0, 3.0])
+        self.assertEqual(len(encoded), 16)
+        self.assertEqual(weaviate_backup.decode_vector(encoded), [1.0, 2.0, 3.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
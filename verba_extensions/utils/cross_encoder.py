@@ -0,0 +1,288 @@
+"""
+Motor de cross-encoder para reranking em CPU.
+
+O `RerankerPlugin` pontuava os chunks um por um e o cross-encoder era um
+stub que devolvia 0.5. `CrossEncoderEngine` pontua todos os pares
+(query, chunk) de uma vez:
+
+- o modelo é carregado uma única vez por processo (`get_cross_encoder_engine`)
+- backend ONNX Runtime (exportado via optimum e quantizado em int8 com
+  `quantize_dynamic`) quando disponível; senão transformers/torch, com
+  quantização dinâmica int8 das camadas Linear
+- os textos são truncados em `max_tokens` e agrupados em micro-batches
+  ordenados por tamanho, o que reduz padding em cada forward pass
+- scores ficam em um LRU por (hash da query, uuid do chunk), então a mesma
+  pergunta não re-pontua os mesmos candidatos
+
+Dependências opcionais: `transformers` + (`optimum[onnxruntime]` ou `torch`).
+Sem elas `available()` retorna False e o reranker segue só com os scores
+de keywords/metadata.
+
+Variáveis de ambiente:
+- VERBA_RERANKER_CROSS_ENCODER: habilita o cross-encoder no RerankerPlugin (default: false)
+- VERBA_RERANKER_MODEL: modelo cross-encoder (default: cross-encoder/mmarco-mMiniLMv2-L12-H384-v1)
+- VERBA_RERANKER_BACKEND: auto, onnx ou torch (default: auto)
+- VERBA_RERANKER_QUANTIZE: quantização int8 (default: true)
+- VERBA_RERANKER_MAX_TOKENS: tokens por par (query + chunk) (default: 256)
+- VERBA_RERANKER_BATCH_SIZE: pares por micro-batch (default: 32)
+- VERBA_RERANKER_CACHE_SIZE: scores mantidos em cache (default: 8192)
+- VERBA_RERANKER_ONNX_DIR: diretório do modelo ONNX exportado (default: ~/.cache/verba/reranker)
+"""
+
+import os
+import hashlib
+import threading
+import importlib.util
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from wasabi import msg
+
+DEFAULT_MODEL = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+
+Predictor = Callable[[List[Tuple[str, str]]], Sequence]
+
+
+def _has_module(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha1(" ".join(query.lower().split()).encode()).hexdigest()
+
+
+def logits_to_scores(logits) -> np.ndarray:
+    """Converte logits (n,), (n,1) ou (n,2) em scores 0..1"""
+    logits = np.asarray(logits, dtype=np.float32)
+    if logits.ndim == 2 and logits.shape[1] == 2:
+        shifted = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(shifted)
+        return exp[:, 1] / exp.sum(axis=1)
+    return 1.0 / (1.0 + np.exp(-logits.reshape(-1)))
+
+
+class CrossEncoderEngine:
+    """Cross-encoder carregado uma vez, com batches por tamanho e cache de scores"""
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        backend: str = "auto",
+        quantize: bool = True,
+        max_tokens: int = 256,
+        batch_size: int = 32,
+        cache_size: int = 8192,
+        onnx_dir: Optional[str] = None,
+        predict: Optional[Predictor] = None,
+    ):
+        self.model_name = model_name
+        self.backend = backend
+        self.quantize = quantize
+        self.max_tokens = max_tokens
+        self.batch_size = max(1, batch_size)
+        self.cache_size = cache_size
+        self.onnx_dir = onnx_dir or os.path.expanduser("~/.cache/verba/reranker")
+        self._predict = predict
+        self._load_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self.stats = {"pairs_scored": 0, "cache_hits": 0, "batches": 0}
+
+    @classmethod
+    def from_env(cls) -> "CrossEncoderEngine":
+        return cls(
+            model_name=os.getenv("VERBA_RERANKER_MODEL", DEFAULT_MODEL),
+            backend=os.getenv("VERBA_RERANKER_BACKEND", "auto").lower(),
+            quantize=os.getenv("VERBA_RERANKER_QUANTIZE", "true").lower() == "true",
+            max_tokens=int(os.getenv("VERBA_RERANKER_MAX_TOKENS", "256")),
+            batch_size=int(os.getenv("VERBA_RERANKER_BATCH_SIZE", "32")),
+            cache_size=int(os.getenv("VERBA_RERANKER_CACHE_SIZE", "8192")),
+            onnx_dir=os.getenv("VERBA_RERANKER_ONNX_DIR") or None,
+        )
+
+    def available(self) -> bool:
+        if self._predict is not None:
+            return True
+        if not _has_module("transformers"):
+            return False
+        if self.backend == "onnx":
+            return _has_module("optimum") and _has_module("onnxruntime")
+        if self.backend == "torch":
+            return _has_module("torch")
+        return (_has_module("optimum") and _has_module("onnxruntime")) or _has_module("torch")
+
+    ### Carregamento
+
+    def _get_predictor(self) -> Predictor:
+        if self._predict is None:
+            with self._load_lock:
+                if self._predict is None:
+                    use_onnx = self.backend == "onnx" or (
+                        self.backend == "auto"
+                        and _has_module("optimum")
+                        and _has_module("onnxruntime")
+                    )
+                    self._predict = self._load_onnx() if use_onnx else self._load_torch()
+        return self._predict
+
+    def _tokenize(self, tokenizer, pairs: List[Tuple[str, str]], return_tensors: str):
+        queries = [query for query, _ in pairs]
+        texts = [text for _, text in pairs]
+        return tokenizer(
+            queries,
+            texts,
+            padding=True,
+            truncation="longest_first",
+            max_length=self.max_tokens,
+            return_tensors=return_tensors,
+        )
+
+    def _load_onnx(self) -> Predictor:
+        import onnxruntime
+        from transformers import AutoTokenizer
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+
+        export_dir = os.path.join(self.onnx_dir, self.model_name.replace("/", "__"))
+        model_path = os.path.join(export_dir, "model.onnx")
+        if not os.path.exists(model_path):
+            msg.info(f"Exporting cross-encoder {self.model_name} to ONNX in {export_dir}")
+            model = ORTModelForSequenceClassification.from_pretrained(self.model_name, export=True)
+            model.save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(self.model_name).save_pretrained(export_dir)
+
+        if self.quantize:
+            quantized_path = os.path.join(export_dir, "model_int8.onnx")
+            if not os.path.exists(quantized_path):
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+
+                quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+            model_path = quantized_path
+
+        tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = onnxruntime.InferenceSession(
+            model_path, options, providers=["CPUExecutionProvider"]
+        )
+        input_names = {i.name for i in session.get_inputs()}
+        msg.good(f"Loaded cross-encoder {self.model_name} (onnx, int8={self.quantize})")
+
+        def predict(pairs):
+            encoded = self._tokenize(tokenizer, pairs, "np")
+            feeds = {
+                name: np.asarray(value, dtype=np.int64)
+                for name, value in encoded.items()
+                if name in input_names
+            }
+            return session.run(None, feeds)[0]
+
+        return predict
+
+    def _load_torch(self) -> Predictor:
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        model.eval()
+        if self.quantize:
+            model = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        msg.good(f"Loaded cross-encoder {self.model_name} (torch, int8={self.quantize})")
+
+        def predict(pairs):
+            encoded = self._tokenize(tokenizer, pairs, "pt")
+            with torch.inference_mode():
+                return model(**encoded).logits.float().numpy()
+
+        return predict
+
+    ### Scoring
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._cache_lock:
+            score = self._cache.get(key)
+            if score is not None:
+                self._cache.move_to_end(key)
+            return score
+
+    def _cache_set(self, key: Tuple[str, str], score: float) -> None:
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = score
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def score(
+        self,
+        query: str,
+        texts: List[str],
+        keys: Optional[List[str]] = None,
+    ) -> np.ndarray:
+        """
+        Scores 0..1 de cada (query, texto), na ordem de `texts`.
+
+        `keys` (ex: uuid do chunk) identifica cada texto no cache; sem elas
+        o cache usa o hash do próprio texto.
+        """
+        scores = np.zeros(len(texts), dtype=np.float32)
+        if not texts:
+            return scores
+
+        qhash = query_hash(query)
+        cache_keys = [
+            (qhash, str(key) if key is not None else hashlib.sha1(text.encode()).hexdigest())
+            for key, text in zip(keys or [None] * len(texts), texts)
+        ]
+
+        missing = []
+        for i, key in enumerate(cache_keys):
+            cached = self._cache_get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                scores[i] = cached
+                self.stats["cache_hits"] += 1
+        if not missing:
+            return scores
+
+        predict = self._get_predictor()
+        # Ordena por tamanho para que cada micro-batch tenha pouco padding;
+        # textos muito longos são truncados pelo tokenizer em max_tokens
+        char_budget = self.max_tokens * 8
+        missing.sort(key=lambda i: len(texts[i]))
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start : start + self.batch_size]
+            pairs = [(query, texts[i][:char_budget]) for i in batch]
+            batch_scores = logits_to_scores(predict(pairs))
+            self.stats["batches"] += 1
+            self.stats["pairs_scored"] += len(batch)
+            for i, value in zip(batch, batch_scores):
+                scores[i] = float(value)
+                self._cache_set(cache_keys[i], float(value))
+        return scores
+
+    def clear_cache(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+
+_engine: Optional[CrossEncoderEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_cross_encoder_engine() -> CrossEncoderEngine:
+    """Retorna o motor compartilhado do processo (singleton)"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = CrossEncoderEngine.from_env()
+    return _engine
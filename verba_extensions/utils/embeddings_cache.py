@@ -46,13 +46,46 @@ Impacto esperado:
 - Economia de custo de APIs (OpenAI, Cohere, etc.)
 - Melhoria de performance (especialmente em processamento batch)
 
+Cache persistente (EmbeddingCache):
+    A API síncrona acima é mantida por compatibilidade. O EmbeddingManager usa
+    o EmbeddingCache, que:
+    - usa chave (embedder, modelo, hash do texto normalizado)
+    - guarda vetores como arrays float32 em um LRU limitado por bytes
+    - persiste em SQLite, então hits sobrevivem a restarts
+    - tem API async (`aget_or_compute` / `aget_or_compute_many`) que envia
+      apenas os misses (deduplicados) para o provider em um único batch
+
+    from verba_extensions.utils.embeddings_cache import get_embedding_cache
+
+    cache = get_embedding_cache()
+    vectors = await cache.aget_or_compute_many(
+        "OpenAI", "text-embedding-3-small", texts,
+        compute_fn=lambda misses: embedder.vectorize(config, misses),
+    )
+
+    Variáveis de ambiente:
+    - VERBA_EMBEDDING_CACHE: "false" desabilita o cache (default: true)
+    - VERBA_EMBEDDING_CACHE_PATH: arquivo SQLite ("memory" = sem persistência)
+      (default: ~/.cache/verba/embeddings.sqlite)
+    - VERBA_EMBEDDING_CACHE_MB: limite do LRU em memória (default: 256)
+    - VERBA_EMBEDDING_CACHE_DISK_MB: limite do arquivo SQLite (default: 2048)
+
 Documentação completa: GUIA_INTEGRACAO_RAG2_COMPONENTES.md
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
-from typing import Callable, List, Optional
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Awaitable, Callable, List, Optional
+
+import numpy as np
 
 
 # Cache global in-memory
@@ -159,3 +192,290 @@ def set_cache(entries: dict[str, List[float]]) -> None:
     global _embeddings_cache
     _embeddings_cache = entries.copy()
 
+
+
+# ---------------------------------------------------------------------------
+# Cache persistente (float32 + LRU por bytes + SQLite)
+# ---------------------------------------------------------------------------
+
+
+def normalize_text(text: str) -> str:
+    """Normaliza texto para a chave de cache (unicode NFC + espaços colapsados)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_embedding_key(embedder: str, model: str, text: str) -> str:
+    """Chave determinística (embedder, modelo, hash do texto normalizado)"""
+    text_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{embedder}|{model}|{text_hash}"
+
+
+class EmbeddingCache:
+    """
+    Cache de embeddings em dois níveis: LRU em memória (float32, limitado por
+    bytes) e arquivo SQLite opcional (também limitado por bytes, LRU por
+    último acesso).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_memory_bytes: int = 256 * 1024 * 1024,
+        max_disk_bytes: int = 2048 * 1024 * 1024,
+    ):
+        self.path = path
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        if path:
+            self._open_db(path)
+
+    # --- SQLite -----------------------------------------------------------
+
+    def _open_db(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_accessed ON embeddings(accessed_at)"
+        )
+        row = self._db.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()
+        self._disk_bytes = row[0]
+        self._db.commit()
+
+    def _disk_get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found = {}
+        if self._db is None or not keys:
+            return found
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                part = keys[i : i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    part,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+                if rows:
+                    now = time.time()
+                    self._db.executemany(
+                        "UPDATE embeddings SET accessed_at = ? WHERE key = ?",
+                        [(now, key) for key, _ in rows],
+                    )
+            self._db.commit()
+        return found
+
+    def _disk_put_many(self, items: dict[str, np.ndarray]) -> None:
+        if self._db is None or not items:
+            return
+        now = time.time()
+        keys = list(items)
+        with self._lock:
+            # INSERT OR REPLACE: o tamanho das linhas substituídas sai do contador
+            replaced = 0
+            for i in range(0, len(keys), 500):
+                part = keys[i : i + 500]
+                placeholders = ",".join("?" * len(part))
+                replaced += self._db.execute(
+                    f"SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings WHERE key IN ({placeholders})",
+                    part,
+                ).fetchone()[0]
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, accessed_at) VALUES (?, ?, ?)",
+                [(key, vector.tobytes(), now) for key, vector in items.items()],
+            )
+            self._disk_bytes += sum(vector.nbytes for vector in items.values()) - replaced
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune_disk()
+            self._db.commit()
+
+    def _prune_disk(self) -> None:
+        """Remove entradas menos acessadas até ficar em 90% do limite"""
+        target = int(self.max_disk_bytes * 0.9)
+        while self._disk_bytes > target:
+            rows = self._db.execute(
+                "SELECT key, LENGTH(vector) FROM embeddings ORDER BY accessed_at LIMIT 1000"
+            ).fetchall()
+            if not rows:
+                self._disk_bytes = 0
+                break
+            self._db.executemany(
+                "DELETE FROM embeddings WHERE key = ?", [(key,) for key, _ in rows]
+            )
+            self._disk_bytes -= sum(size for _, size in rows)
+            self.stats["evictions"] += len(rows)
+
+    # --- Memória ------------------------------------------------------------
+
+    def _memory_put(self, key: str, vector: np.ndarray) -> None:
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous.nbytes
+            self._memory[key] = vector
+            self._memory_bytes += vector.nbytes
+            while self._memory_bytes > self.max_memory_bytes and self._memory:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted.nbytes
+                self.stats["evictions"] += 1
+
+    def _memory_get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+            return vector
+
+    # --- API pública --------------------------------------------------------
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        """Busca chaves na memória e depois no SQLite (bloqueante)"""
+        found = {}
+        missing = []
+        for key in keys:
+            vector = self._memory_get(key)
+            if vector is not None:
+                found[key] = vector
+            else:
+                missing.append(key)
+        if missing:
+            from_disk = self._disk_get_many(missing)
+            for key, vector in from_disk.items():
+                self._memory_put(key, vector)
+                found[key] = vector
+            self.stats["disk_hits"] += len(from_disk)
+        return found
+
+    def put_many(self, items: dict[str, np.ndarray]) -> None:
+        """Grava vetores na memória e no SQLite (bloqueante)"""
+        for key, vector in items.items():
+            self._memory_put(key, vector)
+        self._disk_put_many(items)
+
+    async def aget_or_compute_many(
+        self,
+        embedder: str,
+        model: str,
+        texts: list[str],
+        compute_fn: Callable[[list[str]], Awaitable[list[list[float]]]],
+    ) -> list[list[float]]:
+        """
+        Retorna embeddings para todos os textos, chamando compute_fn uma única
+        vez com os textos únicos que não estão no cache.
+        """
+        keys = [make_embedding_key(embedder, model, text) for text in texts]
+        found = await asyncio.to_thread(self.get_many, list(dict.fromkeys(keys)))
+
+        misses: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in misses:
+                misses[key] = text
+
+        self.stats["hits"] += len(texts) - sum(1 for key in keys if key in misses)
+        self.stats["misses"] += len(misses)
+
+        if misses:
+            computed = await compute_fn(list(misses.values()))
+            if len(computed) != len(misses):
+                raise Exception(
+                    f"Embedding cache: expected {len(misses)} vectors, got {len(computed)}"
+                )
+            new_items = {
+                key: np.asarray(vector, dtype=np.float32)
+                for key, vector in zip(misses.keys(), computed)
+            }
+            await asyncio.to_thread(self.put_many, new_items)
+            found.update(new_items)
+
+        return [found[key].tolist() for key in keys]
+
+    async def aget_or_compute(
+        self,
+        embedder: str,
+        model: str,
+        text: str,
+        compute_fn: Callable[[str], Awaitable[list[float]]],
+    ) -> list[float]:
+        """Versão para um único texto (queries)"""
+
+        async def _compute(misses: list[str]) -> list[list[float]]:
+            return [await compute_fn(misses[0])]
+
+        vectors = await self.aget_or_compute_many(embedder, model, [text], _compute)
+        return vectors[0]
+
+    def get_stats(self) -> dict:
+        hits = self.stats["hits"]
+        total = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": (hits / total * 100) if total > 0 else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes,
+            "path": self.path,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+                self._disk_bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Retorna o EmbeddingCache global (configurado por variáveis de ambiente),
+    ou None se desabilitado via VERBA_EMBEDDING_CACHE=false
+    """
+    global _embedding_cache
+    if os.getenv("VERBA_EMBEDDING_CACHE", "true").lower() == "false":
+        return None
+    if _embedding_cache is None:
+        path = os.getenv(
+            "VERBA_EMBEDDING_CACHE_PATH",
+            os.path.join(os.path.expanduser("~"), ".cache", "verba", "embeddings.sqlite"),
+        )
+        if path.lower() in ("", "memory"):
+            path = None
+        memory_mb = int(os.getenv("VERBA_EMBEDDING_CACHE_MB", "256"))
+        disk_mb = int(os.getenv("VERBA_EMBEDDING_CACHE_DISK_MB", "2048"))
+        try:
+            _embedding_cache = EmbeddingCache(
+                path=path,
+                max_memory_bytes=memory_mb * 1024 * 1024,
+                max_disk_bytes=disk_mb * 1024 * 1024,
+            )
+        except Exception:
+            # Sem permissão de escrita etc. - cai para cache só em memória
+            _embedding_cache = EmbeddingCache(
+                path=None, max_memory_bytes=memory_mb * 1024 * 1024
+            )
+    return _embedding_cache
@@ -0,0 +1,185 @@
+"""
+Patch ETL em lote: busca por UUID e upsert preservando vetores.
+
+O ETL pós-import buscava `fetch_objects(limit=len(uuids))` sem filtro e
+ficava só com os UUIDs desejados (objetos arbitrários, a maioria dos alvos
+perdida em collections grandes) e depois fazia um `data.update` por chunk.
+`ETLPatcher` divide os UUIDs em batches, busca cada batch com
+`Filter.by_id().contains_any(...)` e grava as propriedades novas com
+`insert_many` (upsert pelo mesmo uuid, com o vetor original) via
+`ChunkWriter`. Um documento de 5k chunks vira ~25 consultas + ~25 batches,
+com no máximo `concurrency` batches em voo.
+
+Upsert substitui o objeto inteiro; collections com referências (que a
+busca não devolve) usam `data.update` por objeto, com concorrência limitada.
+
+Variáveis de ambiente:
+- VERBA_ETL_BATCH_SIZE: UUIDs por consulta/batch (default: 200)
+- VERBA_ETL_CONCURRENCY: batches em voo (default: 4)
+"""
+
+import os
+import uuid
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from wasabi import msg
+
+from goldenverba.components.weaviate_writer import ChunkWriter
+
+# data.update simultâneos por batch quando não é possível usar upsert
+UPDATE_CONCURRENCY = 16
+
+
+def object_vector(obj):
+    """Vetor para DataObject: lista para "default", dict para named vectors"""
+    vector = getattr(obj, "vector", None)
+    if not vector:
+        return None
+    if isinstance(vector, dict) and list(vector) == ["default"]:
+        return vector["default"]
+    return vector
+
+
+def valid_uuids(uuids: Iterable[Any]) -> List[str]:
+    """UUIDs únicos e válidos (um inválido derrubaria a consulta do batch inteiro)"""
+    valid = []
+    for value in uuids:
+        try:
+            valid.append(str(uuid.UUID(str(value))))
+        except ValueError:
+            msg.warn(f"[ETL] UUID inválido ignorado: {str(value)[:40]}")
+    return list(dict.fromkeys(valid))
+
+
+def batched(items: List[str], size: int) -> Iterable[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class ETLPatcher:
+    """Aplica propriedades ETL a uma lista de UUIDs em batches"""
+
+    def __init__(self, collection, batch_size: int = 200, concurrency: int = 4, upsert: bool = True):
+        self.collection = collection
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.upsert = upsert
+
+    @classmethod
+    def from_env(cls, collection, upsert: bool = True) -> "ETLPatcher":
+        return cls(
+            collection,
+            batch_size=int(os.getenv("VERBA_ETL_BATCH_SIZE", "200")),
+            concurrency=int(os.getenv("VERBA_ETL_CONCURRENCY", "4")),
+            upsert=upsert,
+        )
+
+    async def fetch_batch(
+        self,
+        uuids: List[str],
+        return_properties: Optional[List[str]] = None,
+        include_vector: bool = False,
+    ) -> List[Any]:
+        """Objetos de um batch de UUIDs (uma consulta filtrada por id)"""
+        from weaviate.classes.query import Filter
+
+        kwargs = {
+            "filters": Filter.by_id().contains_any(list(uuids)),
+            "limit": len(uuids),
+            "include_vector": include_vector,
+        }
+        if return_properties:
+            kwargs["return_properties"] = return_properties
+        response = await self.collection.query.fetch_objects(**kwargs)
+        return response.objects
+
+    async def run(
+        self,
+        uuids: List[str],
+        compute: Callable[[List[Dict[str, Any]]], Awaitable[List[Optional[Dict[str, Any]]]]],
+        read_properties: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Busca os objetos, calcula as propriedades novas de cada batch com
+        `await compute([properties, ...])` (uma entrada por objeto; None/vazio
+        = não atualizar) e grava em lote.
+
+        `read_properties` limita a busca quando não há upsert (o upsert precisa
+        de todas as propriedades para não perder campos).
+
+        Returns:
+            {"patched", "found", "total", "batches", "errors"}
+        """
+        stats = {"patched": 0, "found": 0, "total": len(uuids), "batches": 0, "errors": []}
+        uuids = valid_uuids(uuids)
+        if not uuids:
+            return stats
+
+        writer = (
+            ChunkWriter(self.collection, batch_size=self.batch_size, max_concurrency=self.concurrency)
+            if self.upsert
+            else None
+        )
+        semaphore = asyncio.Semaphore(self.concurrency)
+        update_slots = asyncio.Semaphore(UPDATE_CONCURRENCY)
+        done = 0
+
+        async def update(obj, props) -> bool:
+            async with update_slots:
+                try:
+                    await self.collection.data.update(uuid=obj.uuid, properties=props)
+                    return True
+                except Exception as e:
+                    stats["errors"].append(f"{str(obj.uuid)[:8]}: {type(e).__name__}: {str(e)[:100]}")
+                    return False
+
+        async def run_batch(batch: List[str]):
+            nonlocal done
+            async with semaphore:
+                try:
+                    objects = await self.fetch_batch(
+                        batch,
+                        return_properties=None if self.upsert else read_properties,
+                        include_vector=self.upsert,
+                    )
+                except Exception as e:
+                    stats["errors"].append(f"Erro ao buscar {len(batch)} chunks: {type(e).__name__}: {str(e)[:100]}")
+                    return
+                stats["found"] += len(objects)
+
+                try:
+                    updates = await compute([obj.properties or {} for obj in objects])
+                except Exception as e:
+                    stats["errors"].append(f"Erro ao calcular {len(objects)} chunks: {type(e).__name__}: {str(e)[:100]}")
+                    return
+                changes = [(obj, props) for obj, props in zip(objects, updates) if props]
+
+                if writer is not None:
+                    from weaviate.collections.classes.data import DataObject
+
+                    result = await writer.write(
+                        DataObject(
+                            uuid=obj.uuid,
+                            properties={**obj.properties, **props},
+                            vector=object_vector(obj),
+                        )
+                        for obj, props in changes
+                    )
+                    stats["patched"] += result.inserted
+                    stats["errors"].extend(result.errors)
+                else:
+                    results = await asyncio.gather(*(update(obj, props) for obj, props in changes))
+                    stats["patched"] += sum(results)
+
+                stats["batches"] += 1
+                done += len(batch)
+                msg.info(f"[ETL] Progresso: {done}/{len(uuids)} chunks ({stats['patched']} atualizados)")
+
+        await asyncio.gather(*(run_batch(batch) for batch in batched(uuids, self.batch_size)))
+
+        if stats["found"] < stats["total"]:
+            msg.warn(f"[ETL] Apenas {stats['found']}/{stats['total']} chunks encontrados na collection")
+        if stats["errors"]:
+            msg.warn(f"[ETL] {len(stats['errors'])} erro(s) no patch; primeiro: {stats['errors'][0]}")
+        return stats
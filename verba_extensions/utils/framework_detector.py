@@ -48,18 +48,15 @@ class FrameworkDetector:
         except Exception as e:
             msg.warn(f"⚠️  Erro ao carregar Gliner: {str(e)} - usando fallback")
         
-        # Tenta carregar spaCy para detecção de empresas
+        # spaCy (somente NER) para detecção de empresas, do registry compartilhado:
+        # português primeiro, inglês como fallback
         try:
-            import spacy
-            # Tenta carregar modelo português primeiro
-            try:
-                self.spacy_nlp = spacy.load("pt_core_news_sm")
-            except OSError:
-                # Fallback para inglês
-                try:
-                    self.spacy_nlp = spacy.load("en_core_web_sm")
-                except OSError:
-                    msg.info("ℹ️  spaCy não disponível - empresas serão detectadas via keywords")
+            from goldenverba.components.spacy_registry import NER, get_spacy_registry
+
+            registry = get_spacy_registry()
+            self.spacy_nlp = registry.get("pt", NER) or registry.get("en", NER)
+            if self.spacy_nlp is None:
+                msg.info("ℹ️  spaCy não disponível - empresas serão detectadas via keywords")
         except ImportError:
             msg.info("ℹ️  spaCy não disponível - empresas serão detectadas via keywords")
         except Exception as e:
@@ -0,0 +1,203 @@
+"""
+Índice compilado de gazetteer para normalização e busca de aliases.
+
+Normalizar uma menção ou procurar aliases em um texto percorria o gazetteer
+inteiro, alias por alias (`for eid, aliases in gaz.items(): ...`), em cada
+span, chunk e query. `GazetteerIndex` compila o gazetteer uma vez:
+
+- mapa alias (casefold) -> entity_ids: normalização de menção em O(1)
+- autômato Aho-Corasick com todos os aliases: uma única passada sobre o
+  texto encontra todos os aliases contidos nele (mesma semântica de
+  substring do antigo `alias.lower() in texto.lower()`)
+
+`load_gazetteer_file` devolve um `Gazetteer` (dict {entity_id: [aliases]}
+com o índice construído sob demanda), em cache por arquivo e recarregado
+quando o mtime muda. Para dicts comuns, `index_for` compila na hora.
+
+Uso:
+    gaz = load_gazetteer_file("verba_extensions/etl/resources/gazetteer.json")
+    gaz.index.lookup("GCP")                     # "ent:org:google"
+    gaz.index.find_ids("Apple e Microsoft ...") # {"ent:org:apple", ...}
+"""
+
+import os
+import json
+import threading
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from wasabi import msg
+
+DEFAULT_GAZETTEER_PATHS = [
+    "verba_extensions/etl/resources/gazetteer.json",
+    "verba_extensions/resources/gazetteer.json",
+    "resources/gazetteer.json",
+]
+
+
+def fold(text: str) -> str:
+    return text.casefold()
+
+
+class AhoCorasick:
+    """Autômato Aho-Corasick para busca de vários padrões em uma passada"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for pattern in patterns:
+            if pattern:
+                self._insert(pattern)
+        self._build()
+
+    def _insert(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                # Saídas do estado de falha também terminam aqui
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Gera (posição final exclusiva, índice do padrão) para cada ocorrência"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_index in out[state]:
+                yield i + 1, pattern_index
+
+
+class GazetteerIndex:
+    """Gazetteer compilado: mapa de aliases + autômato Aho-Corasick"""
+
+    def __init__(self, gazetteer: Dict[str, List[str]]):
+        self.alias_ids: Dict[str, List[str]] = {}
+        for entity_id, aliases in gazetteer.items():
+            for alias in aliases or []:
+                key = fold(alias)
+                if not key:
+                    continue
+                ids = self.alias_ids.setdefault(key, [])
+                if entity_id not in ids:
+                    ids.append(entity_id)
+        self.automaton = AhoCorasick(self.alias_ids)
+
+    def __len__(self) -> int:
+        return len(self.alias_ids)
+
+    def lookup(self, text: str) -> Optional[str]:
+        """entity_id do alias exatamente igual a `text` (ignorando caixa)"""
+        ids = self.alias_ids.get(fold(text))
+        return ids[0] if ids else None
+
+    def ids_for_mentions(self, mentions: Iterable[str]) -> Set[str]:
+        """entity_ids com algum alias exatamente igual a uma das menções"""
+        found: Set[str] = set()
+        for mention in mentions:
+            found.update(self.alias_ids.get(fold(mention), ()))
+        return found
+
+    def find_aliases(self, text: str) -> Iterator[Tuple[str, List[str]]]:
+        """(alias, entity_ids) para cada alias contido em `text`, uma vez cada"""
+        seen: Set[int] = set()
+        for _, pattern_index in self.automaton.iter(fold(text)):
+            if pattern_index not in seen:
+                seen.add(pattern_index)
+                alias = self.automaton.patterns[pattern_index]
+                yield alias, self.alias_ids[alias]
+
+    def find_ids(self, text: str) -> Set[str]:
+        """entity_ids com algum alias contido em `text`"""
+        found: Set[str] = set()
+        for _, ids in self.find_aliases(text):
+            found.update(ids)
+        return found
+
+
+class Gazetteer(dict):
+    """dict {entity_id: [aliases]} com `index` compilado na primeira consulta"""
+
+    _index: Optional[GazetteerIndex] = None
+
+    @property
+    def index(self) -> GazetteerIndex:
+        if self._index is None:
+            self._index = GazetteerIndex(self)
+        return self._index
+
+
+def index_for(gazetteer: Dict[str, List[str]]) -> GazetteerIndex:
+    """Índice do gazetteer (reaproveitado quando vem de `load_gazetteer_file`)"""
+    if isinstance(gazetteer, Gazetteer):
+        return gazetteer.index
+    return GazetteerIndex(gazetteer)
+
+
+_cache: Dict[str, Tuple[float, Gazetteer]] = {}
+_cache_lock = threading.Lock()
+
+
+def find_gazetteer_path(paths: Optional[List[str]] = None) -> Optional[str]:
+    for path in paths or DEFAULT_GAZETTEER_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_gazetteer_file(path: Optional[str] = None) -> Gazetteer:
+    """
+    Carrega o gazetteer JSON ([{entity_id, aliases}]) em cache por arquivo.
+
+    O arquivo só é relido (e o índice recompilado) quando o mtime muda;
+    arquivo ausente ou inválido resulta em gazetteer vazio.
+    """
+    path = path or find_gazetteer_path()
+    if not path:
+        return Gazetteer()
+    try:
+        key = os.path.abspath(path)
+        mtime = os.path.getmtime(key)
+    except OSError:
+        return Gazetteer()
+
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(key, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            gazetteer = Gazetteer((item["entity_id"], item["aliases"]) for item in raw)
+        except Exception as e:
+            msg.warn(f"Gazetteer inválido em {path}: {str(e)}")
+            gazetteer = Gazetteer()
+        _cache[key] = (mtime, gazetteer)
+        return gazetteer
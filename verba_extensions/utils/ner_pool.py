@@ -0,0 +1,243 @@
+"""
+Pool de processos para o NER (spaCy) do ETL, fora do event loop.
+
+O ETL pré-chunking e o ETL pós-import rodavam `nlp(texto)` de forma síncrona
+dentro do código async do import: documentos grandes travavam o servidor
+inteiro (inclusive /api/health e a geração em streaming) por segundos.
+`NERPool` envia lotes de textos para um `ProcessPoolExecutor` cujos workers
+carregam os modelos spaCy na inicialização (os idiomas de
+VERBA_SPACY_PRELOAD) e rodam `nlp.pipe(...)` só com o NER. Os workers
+devolvem spans serializáveis ({text, label, start, end}), não `Doc`s.
+
+Back-pressure: no máximo VERBA_NER_MAX_PENDING lotes em fila ou em
+execução; os chamadores seguintes esperam (sem bloquear o event loop).
+Documentos grandes são divididos em trechos de até VERBA_NER_MAX_CHARS
+caracteres (o limite do spaCy é 1M), processados em paralelo e
+recombinados com os offsets originais.
+
+Variáveis de ambiente:
+- VERBA_NER_PROCESSES: processos do pool (default: 1; 0 = thread, ainda fora do event loop)
+- VERBA_NER_BATCH_SIZE: textos por lote / batch_size do nlp.pipe (default: 32)
+- VERBA_NER_MAX_PENDING: lotes em fila ou em execução (default: 8)
+- VERBA_NER_MAX_CHARS: tamanho máximo de cada trecho de um documento (default: 100000)
+
+Uso:
+    pool = get_ner_pool()
+    spans = await pool.extract_document(document.content)       # um texto grande
+    per_text = await pool.extract(["chunk 1", "chunk 2"], "en")  # um lote de textos
+"""
+
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from wasabi import msg
+
+from goldenverba.components.spacy_registry import (
+    NER,
+    get_preload_pipelines,
+    get_spacy_registry,
+)
+
+Span = Dict[str, Any]
+
+
+def doc_spans(doc) -> List[Span]:
+    return [
+        {"text": e.text, "label": e.label_, "start": e.start_char, "end": e.end_char}
+        for e in doc.ents
+    ]
+
+
+def ner_batch(
+    texts: List[str],
+    language: Optional[str] = None,
+    n_process: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> List[List[Span]]:
+    """NER em lote com nlp.pipe (roda no worker); uma lista de spans por texto"""
+    view = get_spacy_registry().get(language, NER)
+    if view is None:
+        return [[] for _ in texts]
+    return [doc_spans(doc) for doc in view.pipe(texts, n_process=n_process, batch_size=batch_size)]
+
+
+def _init_worker(languages: List[str]) -> None:
+    """Carrega os modelos NER uma vez por processo, antes do primeiro lote"""
+    # Já estamos em um worker: o parse de documentos não abre outro pool aqui
+    os.environ["VERBA_SPACY_PARSE_PROCESSES"] = "0"
+    registry = get_spacy_registry()
+    for language in languages:
+        registry.get(language, NER)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def split_text(text: str, max_chars: int) -> List[Tuple[int, str]]:
+    """Divide o texto em (offset, trecho) de até max_chars, cortando em quebra de linha ou espaço"""
+    pieces = []
+    start = 0
+    while len(text) - start > max_chars:
+        end = start + max_chars
+        cut = text.rfind("\n", start, end)
+        if cut <= start:
+            cut = text.rfind(" ", start, end)
+        if cut <= start:
+            cut = end - 1
+        pieces.append((start, text[start : cut + 1]))
+        start = cut + 1
+    if start < len(text):
+        pieces.append((start, text[start:]))
+    return pieces
+
+
+class NERPool:
+    """Executa NER em lotes num pool de processos, com fila limitada"""
+
+    def __init__(
+        self,
+        processes: int = 1,
+        batch_size: int = 32,
+        max_pending: int = 8,
+        max_chars: int = 100_000,
+        languages: Optional[List[str]] = None,
+    ):
+        self.processes = max(0, processes)
+        self.batch_size = max(1, batch_size)
+        self.max_pending = max(1, max_pending)
+        self.max_chars = max(1000, max_chars)
+        self.languages = languages if languages is not None else list(
+            dict.fromkeys(language for language, _ in get_preload_pipelines())
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop = None
+        self.pending = 0
+        self.batches = 0
+        self.texts = 0
+        self.restarts = 0
+
+    @classmethod
+    def from_env(cls) -> "NERPool":
+        return cls(
+            processes=int(os.getenv("VERBA_NER_PROCESSES", "1")),
+            batch_size=int(os.getenv("VERBA_NER_BATCH_SIZE", "32")),
+            max_pending=int(os.getenv("VERBA_NER_MAX_PENDING", "8")),
+            max_chars=int(os.getenv("VERBA_NER_MAX_CHARS", "100000")),
+        )
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.processes == 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_worker,
+                initargs=(self.languages,),
+            )
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._slots_loop = loop
+        return self._slots
+
+    async def start(self) -> None:
+        """Sobe os workers (e carrega os modelos) antes do primeiro import"""
+        executor = self._get_executor()
+        if executor is None:
+            await asyncio.to_thread(_init_worker, self.languages)
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, _ping) for _ in range(self.processes)))
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Executa `fn(*args)` no pool, sob o mesmo limite de lotes pendentes
+        (`fn` precisa ser uma função de módulo, picklável)
+        """
+        self.pending += 1
+        try:
+            async with self._get_slots():
+                executor = self._get_executor()
+                if executor is not None:
+                    loop = asyncio.get_running_loop()
+                    try:
+                        return await loop.run_in_executor(executor, fn, *args)
+                    except BrokenProcessPool:
+                        # Worker morreu (ex.: OOM): recria o pool no próximo lote
+                        if self._executor is executor:
+                            msg.warn("[NER-POOL] Worker encerrado inesperadamente; recriando o pool")
+                            self.restarts += 1
+                            self._executor = None
+                            executor.shutdown(wait=False, cancel_futures=True)
+                return await asyncio.to_thread(fn, *args)
+        finally:
+            self.pending -= 1
+
+    async def _run_batch(self, texts: List[str], language: Optional[str]) -> List[List[Span]]:
+        self.batches += 1
+        self.texts += len(texts)
+        # Dentro de um worker o nlp.pipe roda com um processo só
+        n_process = 1 if self.processes else None
+        return await self.run(ner_batch, texts, language, n_process, self.batch_size)
+
+    async def extract(self, texts: List[str], language: Optional[str] = None) -> List[List[Span]]:
+        """Spans de cada texto, com o modelo NER do idioma (None = idioma de SPACY_MODEL)"""
+        if not texts:
+            return []
+        batches = [texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(self._run_batch(batch, language) for batch in batches))
+        return [spans for batch in results for spans in batch]
+
+    async def extract_document(self, text: str, language: Optional[str] = None) -> List[Span]:
+        """Spans de um texto grande, dividido em trechos e recombinado com os offsets originais"""
+        if not text:
+            return []
+        pieces = split_text(text, self.max_chars)
+        results = await self.extract([piece for _, piece in pieces], language)
+        return [
+            {**span, "start": span["start"] + offset, "end": span["end"] + offset}
+            for (offset, _), spans in zip(pieces, results)
+            for span in spans
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "processes": self.processes,
+            "running": self._executor is not None,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "batches": self.batches,
+            "texts": self.texts,
+            "restarts": self.restarts,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pool: Optional[NERPool] = None
+
+
+def get_ner_pool() -> NERPool:
+    """Pool de NER do processo (criado no primeiro uso)"""
+    global _pool
+    if _pool is None:
+        _pool = NERPool.from_env()
+    return _pool
+
+
+def close_ner_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
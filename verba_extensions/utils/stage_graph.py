@@ -0,0 +1,165 @@
+"""
+Execução concorrente de estágios com dependências, timeout e orçamento.
+
+O `EntityAwareRetriever` executava query building, alpha dinâmico, extração
+de entidades, expansão de query e detecção de frameworks um após o outro,
+embora vários sejam chamadas LLM/NLP independentes. `StageGraph` recebe os
+estágios com suas dependências e inicia cada um assim que as dependências
+terminam:
+
+- cada estágio tem timeout próprio; em erro ou timeout o resultado é o
+  `default` do estágio e os dependentes seguem normalmente
+- estágios opcionais são pulados quando o orçamento de latência já acabou
+  e cancelados (status "budget") se ainda estiverem rodando quando ele se
+  esgota
+- estágios obrigatórios sempre rodam (limitados apenas pelo próprio timeout)
+- tempos e status de cada estágio ficam em `timings` (para o `debug_info`)
+
+Funções síncronas (spaCy, regex) rodam em thread com `asyncio.to_thread`
+para não bloquear o event loop enquanto as chamadas LLM estão pendentes.
+
+Uso:
+    graph = StageGraph(budget=8.0)
+    graph.add("builder", build, timeout=6.0)
+    graph.add("alpha", optimize_alpha, deps=["builder"], optional=True)
+    results = await graph.run()
+    graph.timings  # {"builder": {"ms": 812.4, "status": "ok"}, ...}
+
+Variáveis de ambiente:
+- VERBA_RETRIEVAL_BUDGET: orçamento em segundos para os estágios opcionais (default: 8.0)
+- VERBA_RETRIEVAL_STAGE_TIMEOUT: timeout padrão de cada estágio em segundos (default: 10.0)
+"""
+
+import os
+import time
+import asyncio
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from wasabi import msg
+
+
+@dataclass
+class Stage:
+    """Estágio do grafo; `func` recebe o dict de resultados das dependências"""
+
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    deps: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+    optional: bool = False
+    default: Any = None
+
+
+class StageGraph:
+    """Executa estágios em paralelo respeitando dependências e orçamento"""
+
+    def __init__(self, budget: float = 8.0, default_timeout: float = 10.0):
+        self.budget = budget
+        self.default_timeout = default_timeout
+        self.stages: Dict[str, Stage] = {}
+        self.results: Dict[str, Any] = {}
+        self.timings: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def from_env(cls) -> "StageGraph":
+        return cls(
+            budget=float(os.getenv("VERBA_RETRIEVAL_BUDGET", "8.0")),
+            default_timeout=float(os.getenv("VERBA_RETRIEVAL_STAGE_TIMEOUT", "10.0")),
+        )
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[Dict[str, Any]], Any],
+        deps: Optional[List[str]] = None,
+        timeout: Optional[float] = None,
+        optional: bool = False,
+        default: Any = None,
+    ) -> "StageGraph":
+        for dep in deps or []:
+            if dep not in self.stages:
+                raise ValueError(f"Estágio '{name}' depende de '{dep}', que não foi adicionado")
+        self.stages[name] = Stage(name, func, list(deps or []), timeout, optional, default)
+        return self
+
+    async def _call(self, stage: Stage) -> Any:
+        inputs = {dep: self.results.get(dep) for dep in stage.deps}
+        if inspect.iscoroutinefunction(stage.func):
+            return await stage.func(inputs)
+        return await asyncio.to_thread(stage.func, inputs)
+
+    async def _execute(self, stage: Stage, started: float) -> None:
+        # Dependências terminam antes de o estágio ser iniciado (ver run)
+        remaining = self.budget - (time.monotonic() - started)
+        if stage.optional and remaining <= 0:
+            self.results[stage.name] = stage.default
+            self.timings[stage.name] = {"ms": 0.0, "status": "skipped"}
+            return
+
+        timeout = stage.timeout if stage.timeout is not None else self.default_timeout
+        # Opcionais não passam do fim do orçamento
+        budget_limited = stage.optional and remaining < timeout
+        if budget_limited:
+            timeout = remaining
+
+        stage_start = time.monotonic()
+        status = "ok"
+        try:
+            self.results[stage.name] = await asyncio.wait_for(self._call(stage), timeout)
+        except asyncio.TimeoutError:
+            status = "budget" if budget_limited else "timeout"
+            self.results[stage.name] = stage.default
+        except asyncio.CancelledError:
+            status = "cancelled"
+            self.results[stage.name] = stage.default
+            raise
+        except Exception as e:
+            status = "error"
+            self.results[stage.name] = stage.default
+            msg.warn(f"  Estágio '{stage.name}' falhou (não crítico): {str(e)}")
+        finally:
+            self.timings[stage.name] = {
+                "ms": round((time.monotonic() - stage_start) * 1000, 1),
+                "status": status,
+            }
+
+    async def run(self) -> Dict[str, Any]:
+        """Executa todos os estágios e devolve {nome: resultado}"""
+        started = time.monotonic()
+        done: set = set()
+        running: Dict[asyncio.Task, Stage] = {}
+        pending = dict(self.stages)
+
+        try:
+            while pending or running:
+                # Inicia todos os estágios cujas dependências já terminaram
+                for name, stage in list(pending.items()):
+                    if all(dep in done for dep in stage.deps):
+                        del pending[name]
+                        task = asyncio.ensure_future(self._execute(stage, started))
+                        running[task] = stage
+
+                finished, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in finished:
+                    stage = running.pop(task)
+                    if not task.cancelled():
+                        task.result()
+                    done.add(stage.name)
+        finally:
+            for task, stage in running.items():
+                task.cancel()
+                self.results.setdefault(stage.name, stage.default)
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return self.results
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "budget_ms": round(self.budget * 1000, 1),
+            "stages": dict(self.timings),
+        }
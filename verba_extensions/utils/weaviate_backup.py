@@ -3,127 +3,324 @@ Weaviate Backup Utility
 Exporta e restaura collections completas do Weaviate
 
 Funcionalidades:
-- Exportar todos os chunks de uma collection para JSON
-- Validar integridade do backup
-- Restaurar chunks de um backup
+- Exportar todos os chunks de uma collection em shards NDJSON comprimidos
+- Validar integridade do backup (manifest com contagens e checksums)
+- Restaurar chunks de um backup em paralelo, retomando de onde parou
+
+Formato (diretório):
+    manifest.json                 coleção, compressão, shards (arquivo, objetos,
+                                  sha256, último uuid) e flag `complete`
+    shard-00000.ndjson.zst        um objeto por linha: uuid, properties e
+    shard-00001.ndjson.zst        vetores float32 little-endian em base64
+    restore-<collection>.json     shards já restaurados (removido ao concluir)
+
+A exportação lê a collection pelo cursor (`iterator(include_vector=True)`,
+paginação por `after=uuid`, sem o custo quadrático de `offset`) e escreve
+cada objeto assim que chega, então a memória não cresce com o tamanho da
+collection. Um backup interrompido continua do último shard completo.
+
+Compressão zstd quando `zstandard` está instalado; senão gzip. Backups
+antigos (um único arquivo JSON com "chunks") continuam restauráveis.
 """
 
+import io
+import os
+import gzip
 import json
+import base64
 import asyncio
-from typing import List, Dict, Optional, Any
+import hashlib
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
 from wasabi import msg
-from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BACKUP_FORMAT = "verba-ndjson-v1"
+MANIFEST_FILE = "manifest.json"
+REQUIRED_PROPS = ["content", "doc_uuid"]
+SHARD_EXTENSIONS = {"zstd": ".ndjson.zst", "gzip": ".ndjson.gz"}
+
+
+### Codificação
+
+
+def encode_vector(vector: List[float]) -> str:
+    """Vetor -> float32 little-endian em base64 (~4 bytes por dimensão)"""
+    return base64.b64encode(np.asarray(vector, dtype="<f4").tobytes()).decode("ascii")
+
+
+def decode_vector(data: str) -> List[float]:
+    return np.frombuffer(base64.b64decode(data), dtype="<f4").tolist()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _object_to_record(obj) -> Dict[str, Any]:
+    vectors = obj.vector if isinstance(getattr(obj, "vector", None), dict) else {}
+    return {
+        "uuid": str(obj.uuid),
+        "properties": dict(obj.properties) if obj.properties else {},
+        "vectors": {name: encode_vector(v) for name, v in vectors.items() if v},
+    }
+
+
+def _record_vector(record: Dict[str, Any]):
+    """Vetor para DataObject: lista para "default", dict para named vectors"""
+    if "vector" in record:  # formato JSON legado
+        return record["vector"] or None
+    vectors = {name: decode_vector(v) for name, v in (record.get("vectors") or {}).items()}
+    if not vectors:
+        return None
+    if list(vectors) == ["default"]:
+        return vectors["default"]
+    return vectors
+
+
+### Arquivos
+
+
+class _HashingWriter:
+    """Arquivo binário que calcula sha256 e tamanho do que é escrito"""
+
+    def __init__(self, path: Path):
+        self.file = open(path, "wb")
+        self.sha256 = hashlib.sha256()
+        self.bytes = 0
+
+    def write(self, data) -> int:
+        self.sha256.update(data)
+        self.bytes += len(data)
+        return self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class _ShardWriter:
+    """Escreve um shard NDJSON comprimido em `<nome>.tmp` e renomeia ao fechar"""
+
+    def __init__(self, path: Path, compression: str):
+        self.path = path
+        self.tmp_path = path.with_name(path.name + ".tmp")
+        self.raw = _HashingWriter(self.tmp_path)
+        if compression == "zstd":
+            self.stream = zstandard.ZstdCompressor(level=3).stream_writer(self.raw, closefd=False)
+        else:
+            self.stream = gzip.GzipFile(fileobj=self.raw, mode="wb", compresslevel=6)
+        self.count = 0
+        self.last_uuid: Optional[str] = None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=_json_default)
+        self.stream.write(line.encode("utf-8") + b"\n")
+        self.count += 1
+        self.last_uuid = record["uuid"]
+
+    def close(self) -> Dict[str, Any]:
+        self.stream.close()
+        self.raw.close()
+        os.replace(self.tmp_path, self.path)
+        return {
+            "file": self.path.name,
+            "count": self.count,
+            "bytes": self.raw.bytes,
+            "sha256": self.raw.sha256.hexdigest(),
+            "last_uuid": self.last_uuid,
+        }
+
+
+def _open_shard(path: Path, compression: str):
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Backup comprimido com zstd: instale 'zstandard' para restaurar")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True))
+    return gzip.open(path, "rb")
+
+
+def iter_shard(path: Path, compression: str) -> Iterator[Dict[str, Any]]:
+    """Lê os objetos de um shard linha a linha"""
+    with _open_shard(path, compression) as lines:
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+
+
+def file_sha256(path: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _backup_dir(output_file: str) -> Path:
+    # Chamadores antigos passam "<nome>.json"; o backup vira o diretório "<nome>"
+    path = Path(output_file)
+    return path.with_suffix("") if path.suffix == ".json" else path
+
+
+### Backup
 
 
 async def backup_collection(
     client,
     collection_name: str,
     output_file: str,
-    batch_size: int = 100
+    batch_size: int = 1000,
+    shard_size: int = 50000,
+    compression: Optional[str] = None,
+    resume: bool = True,
 ) -> Dict[str, Any]:
     """
-    Exporta collection completa para backup.
-    
+    Exporta collection completa para um diretório de backup.
+
     Args:
         client: Cliente Weaviate
         collection_name: Nome da collection a fazer backup
-        output_file: Caminho do arquivo de saída (JSON)
-        batch_size: Tamanho do batch para exportação (padrão: 100)
-    
+        output_file: Diretório de saída (sufixo ".json" é removido)
+        batch_size: Objetos por página do cursor (padrão: 1000)
+        shard_size: Objetos por shard (padrão: 50000)
+        compression: "zstd" ou "gzip" (padrão: zstd se disponível)
+        resume: Continua um backup incompleto a partir do último shard
+
     Returns:
         Dict com:
         - success: bool
         - total_chunks: int
-        - backup_file: str
+        - backup_file: str (diretório do backup)
+        - shards: int
         - errors: List[str]
     """
+    backup_dir = _backup_dir(output_file)
     result = {
         "success": False,
         "total_chunks": 0,
-        "backup_file": output_file,
+        "backup_file": str(backup_dir),
+        "shards": 0,
         "errors": [],
         "timestamp": datetime.now().isoformat()
     }
-    
+
     try:
         # Verifica se collection existe
         if not await client.collections.exists(collection_name):
             result["errors"].append(f"Collection '{collection_name}' não existe")
             return result
-        
+
         collection = client.collections.get(collection_name)
-        
-        # Exporta em batches para não sobrecarregar memória
-        all_chunks = []
-        offset = 0
-        total_exported = 0
-        
-        msg.info(f"📦 Iniciando backup de '{collection_name}'...")
-        
-        while True:
-            try:
-                # Busca batch de chunks
-                results = await collection.query.fetch_objects(
-                    limit=batch_size,
-                    offset=offset
-                )
-                
-                if not results.objects:
-                    break
-                
-                # Processa cada chunk
-                for obj in results.objects:
-                    chunk_data = {
-                        "uuid": str(obj.uuid),
-                        "properties": dict(obj.properties) if obj.properties else {},
-                        "vector": obj.vector.get("default") if hasattr(obj, "vector") and obj.vector else None
-                    }
-                    all_chunks.append(chunk_data)
-                    total_exported += 1
-                
-                offset += batch_size
-                
-                # Log progresso a cada 1000 chunks
-                if total_exported % 1000 == 0:
-                    msg.info(f"  📦 Exportados {total_exported} chunks...")
-                
-                # Yield para não bloquear event loop
-                await asyncio.sleep(0)
-                
-            except Exception as e:
-                result["errors"].append(f"Erro ao exportar batch (offset {offset}): {str(e)}")
-                msg.warn(f"Erro no batch {offset}: {str(e)}")
-                break
-        
-        # Valida integridade do backup
-        validation_result = _validate_backup_integrity(all_chunks)
-        if not validation_result["valid"]:
-            result["errors"].extend(validation_result["errors"])
-            msg.warn("⚠️ Backup tem problemas de integridade")
-        
-        # Salva backup em arquivo
-        backup_data = {
-            "collection_name": collection_name,
-            "timestamp": result["timestamp"],
-            "total_chunks": len(all_chunks),
-            "chunks": all_chunks,
-            "validation": validation_result
-        }
-        
-        output_path = Path(output_file)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(backup_data, f, indent=2, ensure_ascii=False)
-        
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = backup_dir / MANIFEST_FILE
+
+        manifest = _read_json(manifest_path) if resume else None
+        if (
+            manifest
+            and manifest.get("format") == BACKUP_FORMAT
+            and manifest.get("collection_name") == collection_name
+            and not manifest.get("complete")
+        ):
+            compression = manifest["compression"]
+            msg.info(f"📦 Retomando backup de '{collection_name}' após {len(manifest['shards'])} shards...")
+        else:
+            compression = compression or ("zstd" if zstandard is not None else "gzip")
+            if compression == "zstd" and zstandard is None:
+                result["errors"].append("Compressão zstd requer o pacote 'zstandard'")
+                return result
+            manifest = {
+                "format": BACKUP_FORMAT,
+                "collection_name": collection_name,
+                "timestamp": result["timestamp"],
+                "compression": compression,
+                "vector_encoding": "float32-le-base64",
+                "shard_size": shard_size,
+                "shards": [],
+                "total_chunks": 0,
+                "complete": False,
+            }
+            msg.info(f"📦 Iniciando backup de '{collection_name}' ({compression})...")
+
+        after = manifest["shards"][-1]["last_uuid"] if manifest["shards"] else None
+        missing_props = {prop: manifest.get("missing_props", {}).get(prop, 0) for prop in REQUIRED_PROPS}
+        extension = SHARD_EXTENSIONS[compression]
+        writer: Optional[_ShardWriter] = None
+
+        def close_shard():
+            shard = writer.close()
+            manifest["shards"].append(shard)
+            manifest["total_chunks"] += shard["count"]
+            manifest["missing_props"] = missing_props
+            # Manifest atualizado a cada shard: permite retomar o backup
+            _write_json_atomic(manifest_path, manifest)
+
+        async for obj in collection.iterator(include_vector=True, after=after, cache_size=batch_size):
+            if writer is None:
+                shard_path = backup_dir / f"shard-{len(manifest['shards']):05d}{extension}"
+                writer = _ShardWriter(shard_path, compression)
+
+            record = _object_to_record(obj)
+            for prop in REQUIRED_PROPS:
+                if prop not in record["properties"]:
+                    missing_props[prop] += 1
+            writer.write(record)
+
+            if writer.count >= shard_size:
+                close_shard()
+                writer = None
+                msg.info(f"  📦 Exportados {manifest['total_chunks']} chunks...")
+
+        if writer is not None:
+            close_shard()
+
+        warnings = [
+            f"{count} chunks não têm propriedade '{prop}'"
+            for prop, count in missing_props.items()
+            if count
+        ]
+        if not manifest["total_chunks"]:
+            warnings.append("Backup está vazio")
+        manifest["complete"] = True
+        manifest["validation"] = {"valid": True, "errors": [], "warnings": warnings}
+        _write_json_atomic(manifest_path, manifest)
+
         result["success"] = True
-        result["total_chunks"] = len(all_chunks)
-        
-        msg.good(f"✅ Backup concluído: {len(all_chunks)} chunks salvos em '{output_file}'")
-        
+        result["total_chunks"] = manifest["total_chunks"]
+        result["shards"] = len(manifest["shards"])
+
+        msg.good(
+            f"✅ Backup concluído: {manifest['total_chunks']} chunks em "
+            f"{len(manifest['shards'])} shards em '{backup_dir}'"
+        )
+
         return result
-        
+
     except Exception as e:
         result["errors"].append(f"Erro ao fazer backup: {str(e)}")
         msg.fail(f"Erro ao fazer backup: {str(e)}")
@@ -133,10 +330,10 @@ async def backup_collection(
 def _validate_backup_integrity(chunks: List[Dict]) -> Dict[str, Any]:
     """
     Valida integridade do backup.
-    
+
     Args:
         chunks: Lista de chunks do backup
-    
+
     Returns:
         Dict com:
         - valid: bool
@@ -148,11 +345,11 @@ def _validate_backup_integrity(chunks: List[Dict]) -> Dict[str, Any]:
         "errors": [],
         "warnings": []
     }
-    
+
     if not chunks:
         result["warnings"].append("Backup está vazio")
         return result
-    
+
     # Valida UUIDs
     uuids = set()
     for i, chunk in enumerate(chunks):
@@ -165,150 +362,218 @@ def _validate_backup_integrity(chunks: List[Dict]) -> Dict[str, Any]:
                 result["errors"].append(f"UUID duplicado: {uuid}")
                 result["valid"] = False
             uuids.add(uuid)
-    
+
     # Valida propriedades obrigatórias
-    required_props = ["content", "doc_uuid"]
     for i, chunk in enumerate(chunks):
         props = chunk.get("properties", {})
-        for prop in required_props:
+        for prop in REQUIRED_PROPS:
             if prop not in props:
                 result["warnings"].append(f"Chunk {i} (UUID: {chunk.get('uuid', 'unknown')}) não tem propriedade '{prop}'")
-    
+
     return result
 
 
+### Restore
+
+
+async def _filter_existing(collection, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Remove registros cujos UUIDs já existem (uma consulta por batch)"""
+    from weaviate.classes.query import Filter
+
+    try:
+        response = await collection.query.fetch_objects(
+            filters=Filter.by_id().contains_any([r["uuid"] for r in records]),
+            limit=len(records),
+            return_properties=[],
+        )
+    except Exception:
+        # Se erro ao verificar, tenta inserir mesmo assim (insert com uuid sobrescreve)
+        return records
+    existing = {str(obj.uuid) for obj in response.objects}
+    return [r for r in records if r["uuid"] not in existing]
+
+
+async def _restore_records(
+    collection,
+    writer,
+    records: Iterator[Dict[str, Any]],
+    batch_size: int,
+    skip_existing: bool,
+    totals: Dict[str, Any],
+) -> None:
+    """Restaura um fluxo de registros em batches (leitura do disco em thread)"""
+    from weaviate.collections.classes.data import DataObject
+
+    def read_batch():
+        return [record for _, record in zip(range(batch_size), records)]
+
+    while True:
+        batch = await asyncio.to_thread(read_batch)
+        if not batch:
+            return
+        if skip_existing:
+            remaining = await _filter_existing(collection, batch)
+            totals["skipped"] += len(batch) - len(remaining)
+            batch = remaining
+        if not batch:
+            continue
+        write_result = await writer.write(
+            DataObject(
+                properties=record.get("properties", {}),
+                uuid=record["uuid"],
+                vector=_record_vector(record),
+            )
+            for record in batch
+        )
+        totals["restored"] += write_result.inserted
+        totals["errors"].extend(write_result.errors)
+
+
 async def restore_collection(
     client,
     backup_file: str,
     collection_name: Optional[str] = None,
-    batch_size: int = 50,
-    skip_existing: bool = True
+    batch_size: int = 200,
+    skip_existing: bool = True,
+    concurrency: int = 4,
+    resume: bool = True,
+    verify_checksums: bool = True,
 ) -> Dict[str, Any]:
     """
     Restaura collection de um backup.
-    
+
     Args:
         client: Cliente Weaviate
-        backup_file: Caminho do arquivo de backup (JSON)
+        backup_file: Diretório do backup (ou arquivo JSON legado)
         collection_name: Nome da collection de destino (usa do backup se None)
-        batch_size: Tamanho do batch para inserção (padrão: 50)
+        batch_size: Tamanho do batch para inserção (padrão: 200)
         skip_existing: Se True, pula chunks que já existem
-    
+        concurrency: Shards restaurados em paralelo (padrão: 4)
+        resume: Pula shards já restaurados em uma execução anterior
+        verify_checksums: Confere o sha256 de cada shard antes de restaurar
+
     Returns:
         Dict com:
         - success: bool
         - total_restored: int
+        - skipped: int
+        - shards_restored / shards_resumed: int
         - errors: List[str]
     """
+    from goldenverba.components.weaviate_writer import ChunkWriter
+
     result = {
         "success": False,
         "total_restored": 0,
         "errors": [],
-        "skipped": 0
+        "skipped": 0,
+        "shards_restored": 0,
+        "shards_resumed": 0,
     }
-    
+
     try:
-        # Carrega backup
         backup_path = Path(backup_file)
+        if not backup_path.exists() and _backup_dir(backup_file).is_dir():
+            backup_path = _backup_dir(backup_file)
         if not backup_path.exists():
             result["errors"].append(f"Arquivo de backup não encontrado: {backup_file}")
             return result
-        
-        with open(backup_path, "r", encoding="utf-8") as f:
-            backup_data = json.load(f)
-        
-        # Valida estrutura do backup
-        if "chunks" not in backup_data:
-            result["errors"].append("Backup inválido: não contém 'chunks'")
-            return result
-        
-        chunks = backup_data["chunks"]
-        target_collection_name = collection_name or backup_data.get("collection_name")
-        
+
+        if backup_path.is_dir():
+            manifest = _read_json(backup_path / MANIFEST_FILE)
+            if not manifest or manifest.get("format") != BACKUP_FORMAT:
+                result["errors"].append("Backup inválido: manifest.json ausente ou desconhecido")
+                return result
+            source_name = manifest.get("collection_name")
+            total = manifest.get("total_chunks", 0)
+        else:
+            # Formato legado: um único JSON com todos os chunks
+            with open(backup_path, "r", encoding="utf-8") as f:
+                backup_data = json.load(f)
+            if "chunks" not in backup_data:
+                result["errors"].append("Backup inválido: não contém 'chunks'")
+                return result
+            manifest = None
+            source_name = backup_data.get("collection_name")
+            total = len(backup_data["chunks"])
+
+        target_collection_name = collection_name or source_name
         if not target_collection_name:
             result["errors"].append("Nome da collection não especificado e não encontrado no backup")
             return result
-        
-        msg.info(f"📥 Restaurando {len(chunks)} chunks para '{target_collection_name}'...")
-        
+
+        msg.info(f"📥 Restaurando {total} chunks para '{target_collection_name}'...")
+
         # Verifica se collection existe
         if not await client.collections.exists(target_collection_name):
             result["errors"].append(f"Collection '{target_collection_name}' não existe. Crie a collection antes de restaurar.")
             return result
-        
+
         collection = client.collections.get(target_collection_name)
-        
-        # Restaura em batches
-        restored = 0
-        skipped = 0
-        
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i + batch_size]
-            
-            try:
-                # Prepara objetos para inserção
-                objects_to_insert = []
-                for chunk in batch:
-                    # Verifica se já existe (se skip_existing)
-                    if skip_existing:
-                        try:
-                            exists = await collection.data.exists(chunk["uuid"])
-                            if exists:
-                                skipped += 1
-                                continue
-                        except Exception:
-                            # Se erro ao verificar, tenta inserir mesmo assim
-                            pass
-                    
-                    # Prepara objeto
-                    obj_data = {
-                        "uuid": chunk["uuid"],
-                        "properties": chunk.get("properties", {})
-                    }
-                    
-                    # Adiciona vetor se disponível
-                    if chunk.get("vector"):
-                        obj_data["vector"] = chunk["vector"]
-                    
-                    objects_to_insert.append(obj_data)
-                
-                # Insere batch
-                if objects_to_insert:
-                    # Weaviate v4 usa insert_many para batch
-                    try:
-                        await collection.data.insert_many(objects_to_insert)
-                        restored += len(objects_to_insert)
-                    except Exception as e:
-                        # Se insert_many falhar, tenta inserir um por um
-                        for obj in objects_to_insert:
-                            try:
-                                await collection.data.insert(**obj)
-                                restored += 1
-                            except Exception as insert_error:
-                                result["errors"].append(f"Erro ao inserir chunk {obj['uuid']}: {str(insert_error)}")
-                
-                # Log progresso
-                if (i + batch_size) % 500 == 0 or (i + batch_size) >= len(chunks):
-                    msg.info(f"  📥 Restaurados {restored} chunks (pulados: {skipped})...")
-                
-                # Yield para não bloquear event loop
-                await asyncio.sleep(0)
-                
-            except Exception as e:
-                result["errors"].append(f"Erro ao restaurar batch {i}-{i+batch_size}: {str(e)}")
-                msg.warn(f"Erro no batch {i}: {str(e)}")
-        
+        # Um writer para todos os shards: a janela de requests em voo é global
+        writer = ChunkWriter(collection, batch_size=batch_size, max_concurrency=max(1, concurrency))
+        totals = {"restored": 0, "skipped": 0, "errors": result["errors"]}
+
+        if manifest is None:
+            await _restore_records(
+                collection, writer, iter(backup_data["chunks"]), batch_size, skip_existing, totals
+            )
+        else:
+            state_path = backup_path / f"restore-{target_collection_name}.json"
+            state = (_read_json(state_path) if resume else None) or {"completed": []}
+            completed = set(state["completed"])
+            state_lock = asyncio.Lock()
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+            compression = manifest["compression"]
+
+            async def restore_shard(shard: Dict[str, Any]):
+                if shard["file"] in completed:
+                    result["shards_resumed"] += 1
+                    return
+                async with semaphore:
+                    path = backup_path / shard["file"]
+                    if verify_checksums:
+                        digest = await asyncio.to_thread(file_sha256, path)
+                        if digest != shard["sha256"]:
+                            result["errors"].append(f"Checksum inválido em {shard['file']}")
+                            return
+                    errors_before = len(result["errors"])
+                    await _restore_records(
+                        collection,
+                        writer,
+                        iter_shard(path, compression),
+                        batch_size,
+                        skip_existing,
+                        totals,
+                    )
+                    if len(result["errors"]) > errors_before:
+                        return
+                    async with state_lock:
+                        completed.add(shard["file"])
+                        state["completed"] = sorted(completed)
+                        _write_json_atomic(state_path, state)
+                    result["shards_restored"] += 1
+                    msg.info(
+                        f"  📥 {shard['file']}: restaurados {totals['restored']} chunks "
+                        f"(pulados: {totals['skipped']})..."
+                    )
+
+            await asyncio.gather(*[restore_shard(shard) for shard in manifest["shards"]])
+
+            if not result["errors"] and state_path.exists():
+                state_path.unlink()
+
         result["success"] = len(result["errors"]) == 0
-        result["total_restored"] = restored
-        result["skipped"] = skipped
-        
+        result["total_restored"] = totals["restored"]
+        result["skipped"] = totals["skipped"]
+
         if result["success"]:
-            msg.good(f"✅ Restauração concluída: {restored} chunks restaurados, {skipped} pulados")
+            msg.good(f"✅ Restauração concluída: {totals['restored']} chunks restaurados, {totals['skipped']} pulados")
         else:
-            msg.warn(f"⚠️ Restauração concluída com erros: {restored} chunks restaurados, {len(result['errors'])} erros")
-        
+            msg.warn(f"⚠️ Restauração concluída com erros: {totals['restored']} chunks restaurados, {len(result['errors'])} erros")
+
         return result
-        
+
     except Exception as e:
         result["errors"].append(f"Erro ao restaurar backup: {str(e)}")
         msg.fail(f"Erro ao restaurar backup: {str(e)}")
@@ -317,11 +582,14 @@ async def restore_collection(
 
 async def verify_backup_file(backup_file: str) -> Dict[str, Any]:
     """
-    Verifica integridade de um arquivo de backup sem restaurar.
-    
+    Verifica integridade de um backup sem restaurar.
+
+    Para backups em diretório confere, shard a shard, sha256 e número de
+    objetos contra o manifest (lendo cada shard em streaming).
+
     Args:
-        backup_file: Caminho do arquivo de backup
-    
+        backup_file: Diretório do backup (ou arquivo JSON legado)
+
     Returns:
         Dict com resultado da verificação
     """
@@ -333,37 +601,74 @@ async def verify_backup_file(backup_file: str) -> Dict[str, Any]:
         "collection_name": None,
         "timestamp": None
     }
-    
+
     try:
         backup_path = Path(backup_file)
+        if not backup_path.exists() and _backup_dir(backup_file).is_dir():
+            backup_path = _backup_dir(backup_file)
         if not backup_path.exists():
             result["errors"].append(f"Arquivo não encontrado: {backup_file}")
             return result
-        
+
+        if backup_path.is_dir():
+            manifest = _read_json(backup_path / MANIFEST_FILE)
+            if not manifest or manifest.get("format") != BACKUP_FORMAT:
+                result["errors"].append("Backup inválido: manifest.json ausente ou desconhecido")
+                return result
+
+            result["collection_name"] = manifest.get("collection_name")
+            result["timestamp"] = manifest.get("timestamp")
+            result["total_chunks"] = manifest.get("total_chunks", 0)
+            result["warnings"].extend(manifest.get("validation", {}).get("warnings", []))
+            if not manifest.get("complete"):
+                result["errors"].append("Backup incompleto (interrompido antes do fim)")
+
+            def check_shard(shard):
+                path = backup_path / shard["file"]
+                if not path.exists():
+                    return f"Shard ausente: {shard['file']}"
+                if file_sha256(path) != shard["sha256"]:
+                    return f"Checksum inválido em {shard['file']}"
+                count = 0
+                for record in iter_shard(path, manifest["compression"]):
+                    if "uuid" not in record:
+                        return f"Objeto sem UUID em {shard['file']}"
+                    count += 1
+                if count != shard["count"]:
+                    return f"{shard['file']}: {count} objetos, manifest indica {shard['count']}"
+                return None
+
+            for shard in manifest["shards"]:
+                error = await asyncio.to_thread(check_shard, shard)
+                if error:
+                    result["errors"].append(error)
+
+            result["valid"] = len(result["errors"]) == 0
+            return result
+
         with open(backup_path, "r", encoding="utf-8") as f:
             backup_data = json.load(f)
-        
+
         # Valida estrutura
         if "chunks" not in backup_data:
             result["errors"].append("Backup inválido: não contém 'chunks'")
             return result
-        
+
         result["collection_name"] = backup_data.get("collection_name")
         result["timestamp"] = backup_data.get("timestamp")
         result["total_chunks"] = len(backup_data["chunks"])
-        
+
         # Valida integridade
         validation = _validate_backup_integrity(backup_data["chunks"])
         result["errors"].extend(validation["errors"])
         result["warnings"].extend(validation["warnings"])
         result["valid"] = validation["valid"] and len(validation["errors"]) == 0
-        
+
         return result
-        
+
     except json.JSONDecodeError as e:
         result["errors"].append(f"Erro ao decodificar JSON: {str(e)}")
         return result
     except Exception as e:
         result["errors"].append(f"Erro ao verificar backup: {str(e)}")
         return result
-